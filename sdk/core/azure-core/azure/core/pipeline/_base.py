@@ -170,21 +170,14 @@ class Pipeline(AbstractContextManager, Generic[HTTPRequestType, HTTPResponseType
         requests = multipart_mixed_info[0]  # type: List[HTTPRequestType]
         policies = multipart_mixed_info[1]  # type: List[SansIOHTTPPolicy]
 
-        # Apply on_requests concurrently to all requests
-        import concurrent.futures
-
-        def prepare_requests(req):
+        # The policies are run in place: they are CPU bound, and a pool of threads
+        # started for each batch costs more than it saves
+        for req in requests:
             context = PipelineContext(None)
             pipeline_request = PipelineRequest(req, context)
             for policy in policies:
                 _await_result(policy.on_request, pipeline_request)
 
-        with concurrent.futures.ThreadPoolExecutor() as executor:
-            # List comprehension to raise exceptions if happened
-            [  # pylint: disable=expression-not-assigned
-                _ for _ in executor.map(prepare_requests, requests)
-            ]
-
     def run(self, request, **kwargs):
         # type: (HTTPRequestType, Any) -> PipelineResponse
         """Runs the HTTP Request through the chained policies.
@@ -26,6 +26,7 @@
 
 from ._base import HttpTransport, HttpRequest, HttpResponse
 from ._requests_basic import RequestsTransport, RequestsTransportResponse
+from ._requests_pooled import PooledRequestsTransport, ConnectionPoolStats
 
 __all__ = [
     'HttpTransport',
@@ -33,6 +34,8 @@ __all__ = [
     'HttpResponse',
     'RequestsTransport',
     'RequestsTransportResponse',
+    'PooledRequestsTransport',
+    'ConnectionPoolStats',
 ]
 
 #pylint: disable=unused-import
@@ -25,13 +25,6 @@
 # --------------------------------------------------------------------------
 from __future__ import absolute_import
 import abc
-from email.message import Message
-
-try:
-    from email import message_from_bytes as message_parser
-except ImportError:  # 2.7
-    from email import message_from_string as message_parser  # type: ignore
-from io import BytesIO
 import json
 import logging
 import os
@@ -62,7 +55,6 @@ from typing import (
     Iterator,
 )
 
-from six.moves.http_client import HTTPConnection, HTTPResponse as _HTTPResponse
 
 from azure.core.pipeline import (
     ABC,
@@ -72,6 +64,14 @@ from azure.core.pipeline import (
     PipelineContext,
 )
 from .._base import _await_result
+from ._multipart import (
+    encode_multipart_mixed,
+    get_boundary,
+    new_boundary,
+    parse_response,
+    serialize_request,
+    split_multipart,
+)
 
 
 if TYPE_CHECKING:
@@ -138,33 +138,13 @@ def _urljoin(base_url, stub_url):
     return parsed.geturl()
 
 
-class _HTTPSerializer(HTTPConnection, object):
-    """Hacking the stdlib HTTPConnection to serialize HTTP request as strings.
-    """
-
-    def __init__(self, *args, **kwargs):
-        self.buffer = b""
-        kwargs.setdefault("host", "fakehost")
-        super(_HTTPSerializer, self).__init__(*args, **kwargs)
-
-    def putheader(self, header, *values):
-        if header in ["Host", "Accept-Encoding"]:
-            return
-        super(_HTTPSerializer, self).putheader(header, *values)
-
-    def send(self, data):
-        self.buffer += data
-
-
 def _serialize_request(http_request):
-    serializer = _HTTPSerializer()
-    serializer.request(
-        method=http_request.method,
-        url=http_request.url,
-        body=http_request.body,
-        headers=http_request.headers,
+    return serialize_request(
+        http_request.method,
+        http_request.url,
+        http_request.headers,
+        http_request.body,
     )
-    return serializer.buffer
 
 
 class HttpTransport(
@@ -399,39 +379,13 @@ class HttpRequest(object):
             return
 
         requests = self.multipart_mixed_info[0]  # type: List[HttpRequest]
-        boundary = self.multipart_mixed_info[2]  # type: Optional[str]
+        boundary = self.multipart_mixed_info[2] or new_boundary()  # type: str
 
         # Update the main request with the body
-        main_message = Message()
-        main_message.add_header("Content-Type", "multipart/mixed")
-        if boundary:
-            main_message.set_boundary(boundary)
-        for i, req in enumerate(requests):
-            part_message = Message()
-            part_message.add_header("Content-Type", "application/http")
-            part_message.add_header("Content-Transfer-Encoding", "binary")
-            part_message.add_header("Content-ID", str(i))
-            part_message.set_payload(req.serialize())
-            main_message.attach(part_message)
-
-        try:
-            from email.policy import HTTP
-
-            full_message = main_message.as_bytes(policy=HTTP)
-            eol = b"\r\n"
-        except ImportError:  # Python 2.7
-            # Right now we decide to not support Python 2.7 on serialization, since
-            # it doesn't serialize a valid HTTP request (and our main scenario Storage refuses it)
-            raise NotImplementedError(
-                "Multipart request are not supported on Python 2.7"
-            )
-            # full_message = main_message.as_string()
-            # eol = b'\n'
-        _, _, body = full_message.split(eol, 2)
-        self.set_bytes_body(body)
-        self.headers["Content-Type"] = (
-            "multipart/mixed; boundary=" + main_message.get_boundary()
+        self.set_bytes_body(
+            encode_multipart_mixed([req.serialize() for req in requests], boundary)
         )
+        self.headers["Content-Type"] = "multipart/mixed; boundary=" + boundary
 
     def serialize(self):
         # type: () -> bytes
@@ -493,26 +447,20 @@ class _HttpResponseBase(object):
             http_response_type = HttpClientTransportResponse
 
         body_as_bytes = self.body()
-        # In order to use email.message parser, I need full HTTP bytes. Faking something to make the parser happy
-        http_body = (
-            b"Content-Type: "
-            + self.content_type.encode("ascii")
-            + b"\r\n\r\n"
-            + body_as_bytes
-        )
-
-        message = message_parser(http_body)  # type: Message
+        parts = split_multipart(body_as_bytes, get_boundary(self.content_type))
 
-        # Rebuild an HTTP response from pure string
+        # Rebuild an HTTP response from each part, without copying it out of the body first
         requests = self.request.multipart_mixed_info[0]  # type: List[HttpRequest]
         responses = []
-        for request, raw_reponse in zip(requests, message.get_payload()):
-            if raw_reponse.get_content_type() == "application/http":
+        for request, (headers, start, end) in zip(requests, parts):
+            content_type = next(
+                (value for name, value in headers if name.lower() == "content-type"), ""
+            )
+            if content_type.split(";")[0].strip().lower() == "application/http":
                 responses.append(
-                    _deserialize_response(
-                        raw_reponse.get_payload(decode=True),
+                    http_response_type(
                         request,
-                        http_response_type=http_response_type,
+                        parse_response(body_as_bytes, start, end, method=request.method),
                     )
                 )
             else:
@@ -549,10 +497,9 @@ class HttpResponse(_HttpResponseBase):  # pylint: disable=abstract-method
         if self.request.multipart_mixed_info:
             policies = self.request.multipart_mixed_info[1]  # type: List[SansIOHTTPPolicy]
 
-            # Apply on_response concurrently to all requests
-            import concurrent.futures
-
-            def parse_responses(response):
+            # The policies are run in place: they are CPU bound, and a pool of threads
+            # started for each batch costs more than it saves
+            for response in responses:
                 http_request = response.request
                 context = PipelineContext(None)
                 pipeline_request = PipelineRequest(http_request, context)
@@ -563,12 +510,6 @@ class HttpResponse(_HttpResponseBase):  # pylint: disable=abstract-method
                 for policy in policies:
                     _await_result(policy.on_response, pipeline_request, pipeline_response)
 
-            with concurrent.futures.ThreadPoolExecutor() as executor:
-                # List comprehension to raise exceptions if happened
-                [  # pylint: disable=expression-not-assigned
-                    _ for _ in executor.map(parse_responses, responses)
-                ]
-
         return responses
 
 
@@ -602,29 +543,6 @@ class HttpClientTransportResponse(_HttpClientTransportResponse, HttpResponse):
     """
 
 
-class BytesIOSocket(object):
-    """Mocking the "makefile" of socket for HTTPResponse.
-
-    This can be used to create a http.client.HTTPResponse object
-    based on bytes and not a real socket.
-    """
-
-    def __init__(self, bytes_data):
-        self.bytes_data = bytes_data
-
-    def makefile(self, *_):
-        return BytesIO(self.bytes_data)
-
-
-def _deserialize_response(
-    http_response_as_bytes, http_request, http_response_type=HttpClientTransportResponse
-):
-    local_socket = BytesIOSocket(http_response_as_bytes)
-    response = _HTTPResponse(local_socket, method=http_request.method)
-    response.begin()
-    return http_response_type(http_request, response)
-
-
 class PipelineClientBase(object):
     """Base class for pipeline clients.
 
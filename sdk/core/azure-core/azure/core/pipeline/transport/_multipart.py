@@ -0,0 +1,258 @@
+# --------------------------------------------------------------------------
+#
+# Copyright (c) Microsoft Corporation. All rights reserved.
+#
+# The MIT License (MIT)
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the ""Software""), to
+# deal in the Software without restriction, including without limitation the
+# rights to use, copy, modify, merge, publish, distribute, sublicense, and/or
+# sell copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED *AS IS*, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+# IN THE SOFTWARE.
+#
+# --------------------------------------------------------------------------
+"""Byte level encoding and decoding of multipart/mixed bodies of application/http parts.
+
+The batch bodies are built and split in a single pass over the bytes, without
+going through the email package or http.client.
+"""
+from io import BytesIO
+import uuid
+
+from typing import Any, List, Optional, Tuple  # pylint: disable=unused-import
+
+import six
+
+_CRLF = b"\r\n"
+_METHODS_EXPECTING_BODY = ("PATCH", "POST", "PUT")
+_PART_HEADERS = (
+    b"Content-Type: application/http\r\n"
+    b"Content-Transfer-Encoding: binary\r\n"
+    b"Content-ID: "
+)
+
+
+def _to_bytes(value):
+    # type: (Any) -> bytes
+    if isinstance(value, six.binary_type):
+        return value
+    if not isinstance(value, six.text_type):
+        value = six.text_type(value)
+    # Like http.client, the request line and the headers are latin-1
+    return value.encode("latin-1")
+
+
+def serialize_request(method, url, headers, body=None):
+    # type: (str, str, Any, Optional[Any]) -> bytes
+    """Serialize an HTTP request as bytes, following the application/http spec.
+
+    The Host and Accept-Encoding headers are not added, and the Content-Length header
+    is, unless given, for a body or a method expecting one.
+
+    :param str method: The HTTP method.
+    :param str url: The URL, as it is written in the request line.
+    :param headers: The headers, as a mapping.
+    :param body: The body, as bytes or str.
+    :rtype: bytes
+    """
+    if isinstance(body, bytearray):
+        body = bytes(body)
+    elif body is not None and not isinstance(body, six.binary_type):
+        if not isinstance(body, six.text_type):
+            raise TypeError("Only bytes or str bodies can be serialized, not {}".format(type(body)))
+        body = body.encode("latin-1")
+
+    lines = [_to_bytes(method) + b" " + _to_bytes(url) + b" HTTP/1.1"]
+    has_content_length = False
+    for name, value in headers.items():
+        if name.lower() == "content-length":
+            has_content_length = True
+        lines.append(_to_bytes(name) + b": " + _to_bytes(value))
+    if not has_content_length:
+        if body is not None:
+            lines.append(b"Content-Length: " + _to_bytes(len(body)))
+        elif method.upper() in _METHODS_EXPECTING_BODY:
+            lines.append(b"Content-Length: 0")
+    lines.append(_CRLF)
+    serialized = _CRLF.join(lines)
+    return serialized + body if body else serialized
+
+
+def new_boundary():
+    # type: () -> str
+    return "batch_" + str(uuid.uuid4())
+
+
+def encode_multipart_mixed(parts, boundary):
+    # type: (List[bytes], str) -> bytes
+    """Build a multipart/mixed body of application/http parts.
+
+    :param list[bytes] parts: The serialized requests. The Content-ID of a part is its index.
+    :param str boundary: The boundary, that must not appear in any part.
+    :rtype: bytes
+    """
+    delimiter = b"--" + _to_bytes(boundary)
+    pieces = []
+    for index, part in enumerate(parts):
+        pieces.append(delimiter + _CRLF)
+        pieces.append(_PART_HEADERS + _to_bytes(index) + _CRLF + _CRLF)
+        pieces.append(part)
+        pieces.append(_CRLF)
+    pieces.append(delimiter + b"--" + _CRLF)
+    return b"".join(pieces)
+
+
+def get_boundary(content_type):
+    # type: (str) -> str
+    """The boundary parameter of a multipart Content-Type header.
+
+    :raises ValueError: If the content type has no boundary.
+    """
+    for parameter in content_type.split(";")[1:]:
+        name, _, value = parameter.partition("=")
+        if name.strip().lower() == "boundary":
+            value = value.strip()
+            if len(value) > 1 and value[0] == value[-1] == '"':
+                value = value[1:-1]
+            if value:
+                return value
+    raise ValueError("No boundary in the content type {!r}".format(content_type))
+
+
+def _parse_headers(data, pos, end):
+    # type: (bytes, int, int) -> Tuple[List[Tuple[str, str]], int]
+    """Parse the header lines of data[pos:end], up to an empty line or the end.
+
+    Lines may end with CRLF or LF alone.
+
+    :returns: The headers, in order, and the position after the empty line.
+    """
+    headers = []  # type: List[Tuple[str, str]]
+    while pos < end:
+        line_end = data.find(b"\n", pos, end)
+        if line_end < 0:
+            line_end = end
+        line = data[pos:line_end].rstrip(b"\r")
+        pos = line_end + 1
+        if not line:
+            break
+        if line[:1] in (b" ", b"\t") and headers:
+            # Folded header value
+            name, value = headers[-1]
+            headers[-1] = (name, value + " " + line.strip().decode("latin-1"))
+            continue
+        name, separator, value = line.partition(b":")
+        if separator:
+            headers.append((name.strip().decode("latin-1"), value.strip().decode("latin-1")))
+    return headers, min(pos, end)
+
+
+def split_multipart(data, boundary):
+    # type: (bytes, str) -> List[Tuple[List[Tuple[str, str]], int, int]]
+    """Split a multipart body, in place.
+
+    The preamble and the epilogue are ignored, and a last part missing the closing
+    delimiter runs to the end of the data.
+
+    :returns: For each part, its headers and the positions of its content in data.
+    """
+    delimiter = b"--" + _to_bytes(boundary)
+    # The line break before a delimiter is part of the delimiter
+    next_delimiter = b"\n" + delimiter
+    parts = []
+    found = data.find(delimiter)
+    if found < 0:
+        return parts
+    pos = found + len(delimiter)
+    end = len(data)
+    while data[pos:pos + 2] != b"--":
+        line_end = data.find(b"\n", pos)
+        if line_end < 0:
+            break
+        headers, content_start = _parse_headers(data, line_end + 1, end)
+        # An empty content shares its line break with the end of the headers
+        found = data.find(next_delimiter, max(content_start - 1, line_end))
+        if found < 0:
+            parts.append((headers, content_start, end))
+            break
+        content_end = found - 1 if data[found - 1:found] == b"\r" else found
+        parts.append((headers, content_start, max(content_end, content_start)))
+        pos = found + len(next_delimiter)
+    return parts
+
+
+class HTTPPartResponse(object):
+    """An HTTP response parsed from bytes, with the interface of http.client.HTTPResponse
+    used by the transport responses.
+    """
+
+    def __init__(self, status, reason, headers, body):
+        # type: (int, str, List[Tuple[str, str]], bytes) -> None
+        self.status = status
+        self.reason = reason
+        self._headers = headers
+        self._body = BytesIO(body)
+
+    def getheaders(self):
+        # type: () -> List[Tuple[str, str]]
+        return self._headers
+
+    def getheader(self, name, default=None):
+        # type: (str, Optional[str]) -> Optional[str]
+        name = name.lower()
+        values = [value for header, value in self._headers if header.lower() == name]
+        return ", ".join(values) if values else default
+
+    def read(self, amt=None):
+        # type: (Optional[int]) -> bytes
+        return self._body.read(amt)
+
+
+def parse_response(data, start=0, end=None, method=None):
+    # type: (bytes, int, Optional[int], Optional[str]) -> HTTPPartResponse
+    """Parse the HTTP response in data[start:end].
+
+    The body stops at the Content-Length, if given, and is empty for the responses that
+    cannot have one.
+
+    :raises ValueError: If the data does not start with a valid status line.
+    """
+    if end is None:
+        end = len(data)
+    line_end = data.find(b"\n", start, end)
+    if line_end < 0:
+        line_end = end
+    status_line = data[start:line_end].rstrip(b"\r").decode("latin-1")
+    try:
+        version, status, reason = (status_line.split(None, 2) + [""])[:3]
+        status_code = int(status)
+    except ValueError:
+        raise ValueError("Invalid HTTP status line {!r}".format(status_line))
+    if not version.startswith("HTTP/") or not 100 <= status_code <= 999:
+        raise ValueError("Invalid HTTP status line {!r}".format(status_line))
+
+    headers, body_start = _parse_headers(data, line_end + 1, end)
+    if status_code in (204, 304) or status_code < 200 or (method or "").upper() == "HEAD":
+        body_end = body_start
+    else:
+        body_end = end
+        for name, value in headers:
+            if name.lower() == "content-length":
+                try:
+                    body_end = min(body_start + max(int(value), 0), end)
+                except ValueError:
+                    pass
+                break
+    return HTTPPartResponse(status_code, reason.strip(), headers, data[body_start:body_end])
@@ -0,0 +1,194 @@
+# --------------------------------------------------------------------------
+#
+# Copyright (c) Microsoft Corporation. All rights reserved.
+#
+# The MIT License (MIT)
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the ""Software""), to
+# deal in the Software without restriction, including without limitation the
+# rights to use, copy, modify, merge, publish, distribute, sublicense, and/or
+# sell copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED *AS IS*, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+# IN THE SOFTWARE.
+#
+# --------------------------------------------------------------------------
+from __future__ import absolute_import
+import threading
+from typing import Any, Dict, Optional  # pylint: disable=unused-import
+
+from urllib3.util.retry import Retry # type: ignore
+import requests
+
+from ._requests_basic import RequestsTransport
+
+# The connections kept open to each host, enough for the chunks of parallel transfers
+DEFAULT_POOL_MAXSIZE = 32
+# The hosts whose pools of connections are kept, the least recently used pool being closed beyond
+DEFAULT_POOL_CONNECTIONS = 10
+
+
+class ConnectionPoolStats(object):
+    """The use of the connections to a host, since its pool was opened.
+
+    :ivar str host: The scheme, host and port of the pool, e.g. "https://account.blob.core.windows.net:443".
+    :ivar int requests_sent: The number of requests sent to the host.
+    :ivar int connections_opened:
+        The number of connections opened to the host, each with a TCP and TLS handshake,
+        including the connections opened again after they were dropped.
+    :ivar int idle_connections: The number of connections of the pool not in use.
+    """
+
+    def __init__(self, host, requests_sent, connections_opened, idle_connections):
+        # type: (str, int, int, int) -> None
+        self.host = host
+        self.requests_sent = requests_sent
+        self.connections_opened = connections_opened
+        self.idle_connections = idle_connections
+
+    @property
+    def connections_reused(self):
+        # type: () -> int
+        """The number of requests sent on a connection kept alive, rather than on a new one."""
+        return max(self.requests_sent - self.connections_opened, 0)
+
+    def __repr__(self):
+        return "ConnectionPoolStats(host={!r}, requests_sent={}, connections_opened={}, idle_connections={})".format(
+            self.host, self.requests_sent, self.connections_opened, self.idle_connections)
+
+
+class PooledRequestsTransport(RequestsTransport):
+    """A requests HTTP sender, safe to share between threads, with a bounded pool of connections per host.
+
+    Each thread sends its requests with its own `requests.Session`, and all the sessions
+    mount the same adapter, so that the connections to a host are pooled for all of them.
+    At most `pool_maxsize` connections are kept open to a host. With `pool_block`, the default,
+    a request waits for a connection of a full pool to be free, rather than opening another
+    connection which would be discarded after use, making a new handshake for every such request.
+    A response streamed holds its connection until it is read or closed.
+
+    One transport can be given to all the clients of a process, with the `transport` keyword.
+    With `shared=True`, the clients leaving their context or closed do not close the transport,
+    which stays open until its own `close()`.
+
+    :keyword int pool_maxsize: The largest number of connections kept open to a host. Defaults to 32.
+    :keyword int pool_connections:
+        The number of hosts whose pools of connections are kept. Defaults to 10.
+    :keyword bool pool_block:
+        Whether a request waits for a connection when the pool of its host is full. Defaults to True.
+    :keyword bool shared:
+        Whether the transport is shared by clients, and only closed by its own `close()`. Defaults to False.
+    :keyword bool use_env_settings: Uses proxy settings from environment. Defaults to True.
+
+    .. admonition:: Example:
+
+        .. code-block:: python
+
+            transport = PooledRequestsTransport(pool_maxsize=64, shared=True)
+            client = PipelineClient(base_url, transport=transport)
+    """
+
+    def __init__(self, **kwargs):
+        # type: (Any) -> None
+        if kwargs.pop('session', None) is not None:
+            raise ValueError("A PooledRequestsTransport creates the session of each thread.")
+        kwargs.pop('session_owner', None)
+        self.pool_maxsize = kwargs.pop('pool_maxsize', DEFAULT_POOL_MAXSIZE)
+        self.pool_connections = kwargs.pop('pool_connections', DEFAULT_POOL_CONNECTIONS)
+        self.pool_block = kwargs.pop('pool_block', True)
+        if self.pool_maxsize < 1 or self.pool_connections < 1:
+            raise ValueError("pool_maxsize and pool_connections must be greater than 0.")
+        self._shared = kwargs.pop('shared', False)
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        # The sessions are only held by their threads, the adapter owning the connections
+        self._adapter = None  # type: Optional[requests.adapters.HTTPAdapter]
+        # Incremented when the transport is closed, so that the threads start new sessions
+        self._generation = 0
+        super(PooledRequestsTransport, self).__init__(**kwargs)
+
+    @property
+    def session(self):
+        # type: () -> Optional[requests.Session]
+        """The session of the current thread, if it sent a request since the transport was opened."""
+        if getattr(self._local, 'generation', None) != self._generation:
+            return None
+        return self._local.session
+
+    @session.setter
+    def session(self, session):
+        # type: (Optional[requests.Session]) -> None
+        self._local.session = session
+        self._local.generation = self._generation
+
+    def __exit__(self, *args):  # pylint: disable=arguments-differ
+        if not self._shared:
+            self.close()
+
+    def _init_session(self, session):
+        # type: (requests.Session) -> None
+        session.trust_env = self._use_env_settings
+        if self._adapter is None:
+            disable_retries = Retry(total=False, redirect=False, raise_on_status=False)
+            self._adapter = requests.adapters.HTTPAdapter(
+                pool_connections=self.pool_connections,
+                pool_maxsize=self.pool_maxsize,
+                pool_block=self.pool_block,
+                max_retries=disable_retries)
+        for p in self._protocols:
+            session.mount(p, self._adapter)
+
+    def open(self):
+        if self.session is None:
+            session = requests.Session()
+            with self._lock:
+                self._init_session(session)
+            self.session = session
+
+    def close(self):
+        with self._lock:
+            adapter, self._adapter = self._adapter, None
+            self._generation += 1
+        if adapter is not None:
+            adapter.close()
+
+    def pool_stats(self):
+        # type: () -> Dict[str, ConnectionPoolStats]
+        """The use of the connections to each host whose pool is open.
+
+        The keep-alive of the connections shows in their reuse: a pool with many more
+        connections opened than `pool_maxsize` is either too small, or its connections
+        are dropped by the host or the network.
+
+        :returns: The statistics of the pools, by the scheme, host and port of their host.
+        :rtype: dict[str, ~azure.core.pipeline.transport.ConnectionPoolStats]
+        """
+        with self._lock:
+            adapter = self._adapter
+        if adapter is None:
+            return {}
+        pools = adapter.poolmanager.pools
+        stats = {}
+        for key in pools.keys():
+            pool = pools.get(key)
+            if pool is None:
+                # Closed since listed
+                continue
+            host = "{}://{}:{}".format(pool.scheme, pool.host, pool.port)
+            idle = 0
+            if pool.pool is not None:
+                # The free slots of a pool hold None rather than a connection
+                with pool.pool.mutex:
+                    idle = sum(1 for connection in pool.pool.queue if connection is not None)
+            stats[host] = ConnectionPoolStats(host, pool.num_requests, pool.num_connections, idle)
+        return stats
@@ -25,11 +25,17 @@
 # --------------------------------------------------------------------------
 import sys
 
-from ._poller import LROPoller, NoPolling, PollingMethod
-__all__ = ['LROPoller', 'NoPolling', 'PollingMethod']
+from ._poller import LROPoller, NoPolling, PollingMethod, as_completed, wait_all
+from ._scheduler import PollingScheduler, get_polling_scheduler, set_polling_scheduler
+__all__ = [
+    'LROPoller', 'NoPolling', 'PollingMethod', 'as_completed', 'wait_all',
+    'PollingScheduler', 'get_polling_scheduler', 'set_polling_scheduler'
+]
 
 #pylint: disable=unused-import
 if sys.version_info >= (3, 5, 2):
     # Not executed on old Python, no syntax error
-    from ._async_poller import AsyncNoPolling, AsyncPollingMethod, async_poller
-    __all__ += ['AsyncNoPolling', 'AsyncPollingMethod', 'async_poller']
+    from ._async_poller import (
+        AsyncNoPolling, AsyncPollingMethod, async_poller, async_as_completed, async_wait_all
+    )
+    __all__ += ['AsyncNoPolling', 'AsyncPollingMethod', 'async_poller', 'async_as_completed', 'async_wait_all']
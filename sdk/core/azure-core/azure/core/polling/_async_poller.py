@@ -23,6 +23,7 @@
 # IN THE SOFTWARE.
 #
 # --------------------------------------------------------------------------
+import asyncio
 from ._poller import NoPolling as _NoPolling
 
 class AsyncPollingMethod(object):
@@ -78,3 +79,48 @@ async def async_poller(client, initial_response, deserialization_callback, polli
 
     await polling_method.run()
     return polling_method.resource()
+
+
+def _bounded_tasks(pollers, max_concurrency):
+    if max_concurrency is None:
+        return [asyncio.ensure_future(poller) for poller in pollers]
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def run(poller):
+        async with semaphore:
+            return await poller
+    return [asyncio.ensure_future(run(poller)) for poller in pollers]
+
+
+def async_as_completed(pollers, max_concurrency=None):
+    """Run several long running operations, yielding awaitables in completion order.
+
+    Uses asyncio. Each awaitable returns the deserialized resource of the next
+    completed operation, or raises its error.
+
+    :param pollers: The long running operations, as returned by "async_poller" (or any awaitable).
+    :param int max_concurrency: Maximum number of operations polled at the same time.
+     If None, all the operations are polled concurrently.
+    :rtype: iterator[awaitable]
+    """
+    return asyncio.as_completed(_bounded_tasks(pollers, max_concurrency))
+
+
+async def async_wait_all(pollers, timeout=None, max_concurrency=None):
+    """Run several long running operations, and wait on them for a global length of time.
+
+    Uses asyncio. Operations not done when the timeout expires keep running.
+
+    :param pollers: The long running operations, as returned by "async_poller" (or any awaitable).
+    :param float timeout: Maximum time to wait for all the operations (in seconds).
+     If None, wait until all operations are done.
+    :param int max_concurrency: Maximum number of operations polled at the same time.
+     If None, all the operations are polled concurrently.
+    :returns: A 2-tuple of sets of asyncio tasks: done and not done. Call "result()" on a done
+     task to get the deserialized resource, or to raise the operation error.
+    :rtype: tuple[set[asyncio.Task], set[asyncio.Task]]
+    """
+    tasks = _bounded_tasks(pollers, max_concurrency)
+    if not tasks:
+        return set(), set()
+    return await asyncio.wait(tasks, timeout=timeout)
@@ -23,17 +23,23 @@
 # IN THE SOFTWARE.
 #
 # --------------------------------------------------------------------------
+import collections
+import functools
+import inspect
 import threading
+import time
 import uuid
 try:
     from urlparse import urlparse # type: ignore # pylint: disable=unused-import
 except ImportError:
     from urllib.parse import urlparse
 
-from typing import Any, Callable, Union, List, Optional, TYPE_CHECKING
+from typing import Any, Callable, Union, Iterable, Iterator, List, Optional, TYPE_CHECKING
+from six.moves import queue
 from azure.core.pipeline.transport._base import HttpResponse  # type: ignore
 from azure.core.tracing.decorator import distributed_trace
 from azure.core.tracing.common import with_current_context
+from ._scheduler import get_polling_scheduler
 
 if TYPE_CHECKING:
     import requests
@@ -64,6 +70,21 @@ class PollingMethod(object):
         # type: () -> Any
         raise NotImplementedError("This method needs to be implemented")
 
+def _supports_stepping(polling_method):
+    # type: (PollingMethod) -> bool
+    """Whether a polling method can be driven by the PollingScheduler.
+
+    It needs a synchronous ``step`` method. An async polling method may inherit a ``step``
+    from its sync counterpart, which cannot be run on the threads of the scheduler.
+    """
+    step = getattr(polling_method, "step", None)
+    if not callable(step):
+        return False
+    # inspect.iscoroutinefunction is not available on Python 2, which has no async polling methods
+    iscoroutinefunction = getattr(inspect, "iscoroutinefunction", lambda func: False)
+    return not (iscoroutinefunction(step) or iscoroutinefunction(getattr(polling_method, "run", None)))
+
+
 class NoPolling(PollingMethod):
     """An empty poller that returns the deserialized initial response.
     """
@@ -115,6 +136,11 @@ class LROPoller(object):
     :type deserialization_callback: callable or msrest.serialization.Model
     :param polling_method: The polling strategy to adopt
     :type polling_method: ~azure.core.polling.PollingMethod
+
+    If the polling method has a synchronous ``step`` method (doing one status check and returning the
+    delay before the next one, or None when done), the operation is driven by the
+    process-wide :class:`~azure.core.polling.PollingScheduler` instead of a dedicated thread.
+    See :func:`~azure.core.polling.set_polling_scheduler`.
     """
 
     def __init__(self, client, initial_response, deserialization_callback, polling_method):
@@ -136,14 +162,20 @@ class LROPoller(object):
         # Prepare thread execution
         self._thread = None
         self._done = None
+        self._completed = None  # Set once callbacks ran, when driven by a PollingScheduler
         self._exception = None
         if not self._polling_method.finished():
             self._done = threading.Event()
-            self._thread = threading.Thread(
-                target=with_current_context(self._start),
-                name="LROPoller({})".format(uuid.uuid4()))
-            self._thread.daemon = True
-            self._thread.start()
+            scheduler = get_polling_scheduler()
+            if scheduler is not None and _supports_stepping(self._polling_method):
+                self._completed = threading.Event()
+                scheduler.schedule(with_current_context(self._step))
+            else:
+                self._thread = threading.Thread(
+                    target=with_current_context(self._start),
+                    name="LROPoller({})".format(uuid.uuid4()))
+                self._thread.daemon = True
+                self._thread.start()
 
     def _start(self):
         """Start the long running operation.
@@ -160,6 +192,31 @@ class LROPoller(object):
         finally:
             self._done.set()
 
+        self._run_callbacks()
+
+    def _step(self):
+        # type: () -> Optional[float]
+        """Run one step of the long running operation, on the polling scheduler.
+        On completion, runs any callbacks.
+
+        :returns: The delay before the next step, or None if the operation is done.
+        """
+        try:
+            delay = self._polling_method.step()  # type: ignore
+            if delay is not None:
+                return delay
+        except Exception as err: #pylint: disable=broad-except
+            self._exception = err
+
+        self._done.set()
+        try:
+            self._run_callbacks()
+        finally:
+            self._completed.set()
+        return None
+
+    def _run_callbacks(self):
+        # type: () -> None
         callbacks, self._callbacks = self._callbacks, []
         while callbacks:
             for call in callbacks:
@@ -198,9 +255,12 @@ class LROPoller(object):
          operation to complete (in seconds).
         :raises ~azure.core.exceptions.HttpResponseError: Server problem with the query.
         """
-        if self._thread is None:
+        if self._completed is not None:
+            self._completed.wait(timeout=timeout)
+        elif self._thread is None:
             return
-        self._thread.join(timeout=timeout)
+        else:
+            self._thread.join(timeout=timeout)
         try:
             # Let's handle possible None in forgiveness here
             raise self._exception  # type: ignore
@@ -214,6 +274,8 @@ class LROPoller(object):
         :returns: 'True' if the process has completed, else 'False'.
         :rtype: bool
         """
+        if self._completed is not None:
+            return self._completed.is_set()
         return self._thread is None or not self._thread.is_alive()
 
     def add_done_callback(self, func):
@@ -240,3 +302,70 @@ class LROPoller(object):
         if self._done is None or self._done.is_set():
             raise ValueError("Process is complete.")
         self._callbacks = [c for c in self._callbacks if c != func]
+
+
+DoneAndNotDonePollers = collections.namedtuple("DoneAndNotDonePollers", "done not_done")
+
+# How often pending pollers are checked, in case a completion notification was missed
+_COMPLETED_CHECK_INTERVAL = 1
+
+
+def _completed_pollers(pollers, timeout=None):
+    # type: (Iterable[LROPoller], Optional[float]) -> Iterator[LROPoller]
+    """Yield pollers as they complete, until all are done or the timeout expires."""
+    pending = set(pollers)
+    completed = queue.Queue()  # type: queue.Queue
+    def notify(poller, _):
+        completed.put(poller)
+    for poller in pending:
+        poller.add_done_callback(functools.partial(notify, poller))
+
+    deadline = None if timeout is None else time.time() + timeout
+    while pending:
+        wait_time = _COMPLETED_CHECK_INTERVAL
+        if deadline is not None:
+            wait_time = min(wait_time, deadline - time.time())
+            if wait_time <= 0:
+                return
+        try:
+            finished = [completed.get(timeout=wait_time)]
+        except queue.Empty:
+            # Callbacks added while a poller was completing might not run
+            finished = [poller for poller in pending if poller.done()]
+        for poller in finished:
+            if poller in pending:
+                pending.remove(poller)
+                yield poller
+
+
+def as_completed(pollers):
+    # type: (Iterable[LROPoller]) -> Iterator[LROPoller]
+    """Wait on several long running operations, yielding each poller as its operation completes.
+
+    Status checks are not serialized: each poller keeps being driven by the polling scheduler
+    (or its own thread), and this only waits on their completion.
+
+    :param pollers: The pollers to wait on.
+    :type pollers: iterable[~azure.core.polling.LROPoller]
+    :returns: An iterator of the pollers, in completion order. Call "result()" on a poller to get
+     the deserialized resource, or to raise the operation error.
+    :rtype: iterator[~azure.core.polling.LROPoller]
+    """
+    return _completed_pollers(pollers)
+
+
+def wait_all(pollers, timeout=None):
+    # type: (Iterable[LROPoller], Optional[float]) -> DoneAndNotDonePollers
+    """Wait on several long running operations, for a global length of time.
+
+    :param pollers: The pollers to wait on.
+    :type pollers: iterable[~azure.core.polling.LROPoller]
+    :param float timeout: Maximum time to wait for all the operations (in seconds).
+     If None, wait until all operations are done.
+    :returns: A named 2-tuple of sets: "done", the pollers of the completed operations,
+     and "not_done", the pollers of the operations still running.
+    :rtype: tuple[set[~azure.core.polling.LROPoller], set[~azure.core.polling.LROPoller]]
+    """
+    pollers = set(pollers)
+    done = set(_completed_pollers(pollers, timeout))
+    return DoneAndNotDonePollers(done, pollers - done)
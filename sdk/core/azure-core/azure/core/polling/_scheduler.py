@@ -0,0 +1,167 @@
+# --------------------------------------------------------------------------
+#
+# Copyright (c) Microsoft Corporation. All rights reserved.
+#
+# The MIT License (MIT)
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the ""Software""), to
+# deal in the Software without restriction, including without limitation the
+# rights to use, copy, modify, merge, publish, distribute, sublicense, and/or
+# sell copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED *AS IS*, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+# IN THE SOFTWARE.
+#
+# --------------------------------------------------------------------------
+import heapq
+import itertools
+import logging
+import threading
+import time
+
+from typing import Callable, List, Optional, Tuple  # pylint: disable=unused-import
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class PollingScheduler(object):
+    """Drive many long running operations from a small pool of worker threads.
+
+    Work is registered as a "step" callable. The scheduler calls it once its
+    delay has elapsed; the step returns the number of seconds to wait before it
+    should be called again, or None when it is done. Pending steps are kept in a
+    heap ordered by due time, so N outstanding operations cost N small records
+    and at most ``max_workers`` threads.
+
+    :param int max_workers: The maximum number of worker threads. Defaults to 10.
+    """
+
+    def __init__(self, max_workers=10):
+        # type: (int) -> None
+        if max_workers < 1:
+            raise ValueError("max_workers must be greater than 0")
+        self._max_workers = max_workers
+        self._queue = []  # type: List[Tuple[float, int, Callable[[], Optional[float]]]]
+        self._counter = itertools.count()
+        self._condition = threading.Condition()
+        self._workers = []  # type: List[threading.Thread]
+        self._idle_workers = 0
+        self._closed = False
+
+    def __len__(self):
+        # type: () -> int
+        """Number of steps waiting to be run."""
+        with self._condition:
+            return len(self._queue)
+
+    def schedule(self, step, delay=0):
+        # type: (Callable[[], Optional[float]], float) -> None
+        """Run a step after a delay, then again as long as it asks to be.
+
+        :param callable step: A callable taking no argument, returning the delay in
+         seconds before its next run, or None if it should not be run again.
+         Exceptions raised by the step are logged and stop its scheduling.
+        :param float delay: Time to wait before the first run, in seconds.
+        :raises RuntimeError: If the scheduler is closed.
+        """
+        with self._condition:
+            if self._closed:
+                raise RuntimeError("Cannot schedule on a closed PollingScheduler")
+            heapq.heappush(self._queue, (time.time() + delay, next(self._counter), step))
+            if self._idle_workers == 0 and len(self._workers) < self._max_workers:
+                self._start_worker()
+            self._condition.notify()
+
+    def close(self):
+        # type: () -> None
+        """Stop the worker threads. Steps not yet run are discarded."""
+        with self._condition:
+            self._closed = True
+            self._queue = []
+            self._condition.notify_all()
+
+    def _start_worker(self):
+        # type: () -> None
+        worker = threading.Thread(
+            target=self._work,
+            name="PollingScheduler-{}".format(len(self._workers))
+        )
+        worker.daemon = True
+        self._workers.append(worker)
+        worker.start()
+
+    def _next_step(self):
+        # type: () -> Optional[Callable[[], Optional[float]]]
+        with self._condition:
+            self._idle_workers += 1
+            try:
+                while not self._closed:
+                    if not self._queue:
+                        self._condition.wait()
+                        continue
+                    timeout = self._queue[0][0] - time.time()
+                    if timeout <= 0:
+                        return heapq.heappop(self._queue)[2]
+                    self._condition.wait(timeout)
+                return None
+            finally:
+                self._idle_workers -= 1
+
+    def _work(self):
+        # type: () -> None
+        while True:
+            step = self._next_step()
+            if step is None:
+                return
+            try:
+                delay = step()
+            except Exception:  # pylint: disable=broad-except
+                _LOGGER.warning("Unexpected error in polling step %r", step, exc_info=True)
+                continue
+            if delay is not None:
+                try:
+                    self.schedule(step, delay)
+                except RuntimeError:
+                    return
+
+
+_DEFAULT_SCHEDULER_LOCK = threading.Lock()
+_UNSET = object()
+_DEFAULT_SCHEDULER = _UNSET  # type: ignore
+
+
+def get_polling_scheduler():
+    # type: () -> Optional[PollingScheduler]
+    """Return the process-wide scheduler used by LROPoller.
+
+    It is created on first use, unless :func:`set_polling_scheduler` was called.
+
+    :rtype: ~azure.core.polling.PollingScheduler or None
+    """
+    global _DEFAULT_SCHEDULER  # pylint: disable=global-statement
+    with _DEFAULT_SCHEDULER_LOCK:
+        if _DEFAULT_SCHEDULER is _UNSET:
+            _DEFAULT_SCHEDULER = PollingScheduler()
+        return _DEFAULT_SCHEDULER  # type: ignore
+
+
+def set_polling_scheduler(scheduler):
+    # type: (Optional[PollingScheduler]) -> None
+    """Set the process-wide scheduler used by LROPoller.
+
+    :param scheduler: The scheduler to use. If None, each poller runs in its own thread.
+    :type scheduler: ~azure.core.polling.PollingScheduler or None
+    """
+    global _DEFAULT_SCHEDULER  # pylint: disable=global-statement
+    with _DEFAULT_SCHEDULER_LOCK:
+        _DEFAULT_SCHEDULER = scheduler
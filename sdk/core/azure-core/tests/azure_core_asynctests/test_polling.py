@@ -0,0 +1,93 @@
+#--------------------------------------------------------------------------
+#
+# Copyright (c) Microsoft Corporation. All rights reserved.
+#
+# The MIT License (MIT)
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the ""Software""), to
+# deal in the Software without restriction, including without limitation the
+# rights to use, copy, modify, merge, publish, distribute, sublicense, and/or
+# sell copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED *AS IS*, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+# IN THE SOFTWARE.
+#
+#--------------------------------------------------------------------------
+import asyncio
+
+import pytest
+
+from azure.core.polling import AsyncPollingMethod, async_poller, async_as_completed, async_wait_all
+
+
+class PollingSleep(AsyncPollingMethod):
+    """An async poller that sleeps before finishing.
+    """
+    running = 0
+    max_running = 0
+
+    def __init__(self, sleep=0.01):
+        self._sleep = sleep
+        self._finished = False
+        self._initial_response = None
+        self._deserialization_callback = None
+
+    def initialize(self, _, initial_response, deserialization_callback):
+        self._initial_response = initial_response
+        self._deserialization_callback = deserialization_callback
+
+    async def run(self):
+        PollingSleep.running += 1
+        PollingSleep.max_running = max(PollingSleep.max_running, PollingSleep.running)
+        try:
+            await asyncio.sleep(self._sleep)
+        finally:
+            PollingSleep.running -= 1
+        self._finished = True
+
+    def status(self):
+        return "succeeded" if self._finished else "running"
+
+    def finished(self):
+        return self._finished
+
+    def resource(self):
+        return self._deserialization_callback(self._initial_response)
+
+
+@pytest.mark.asyncio
+async def test_async_as_completed():
+    PollingSleep.max_running = 0
+    pollers = [
+        async_poller(None, sleep, lambda r: r, PollingSleep(sleep))
+        for sleep in (0.05, 0.01, 0.03, 0.02)
+    ]
+    results = [await result for result in async_as_completed(pollers, max_concurrency=2)]
+    assert sorted(results) == [0.01, 0.02, 0.03, 0.05]
+    assert PollingSleep.max_running == 2
+
+
+@pytest.mark.asyncio
+async def test_async_wait_all():
+    pollers = [
+        async_poller(None, sleep, lambda r: r, PollingSleep(sleep))
+        for sleep in (0.01, 1)
+    ]
+    done, not_done = await async_wait_all(pollers, timeout=0.5)
+    assert [task.result() for task in done] == [0.01]
+    assert len(not_done) == 1
+    for task in not_done:
+        task.cancel()
+
+    done, not_done = await async_wait_all([])
+    assert not done and not not_done
@@ -0,0 +1,156 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See LICENSE.txt in the project root for
+# license information.
+# -------------------------------------------------------------------------
+"""Compare the multipart/mixed encoder and decoder with the previous email based path.
+
+Run with "python tests/multipart_performance.py", on Python 3. The batch size and the
+number of rounds can be given as arguments.
+"""
+import concurrent.futures
+from email import message_from_bytes
+from email.message import Message
+from email.policy import HTTP
+from http.client import HTTPConnection, HTTPResponse
+from io import BytesIO
+import sys
+import timeit
+
+from azure.core.pipeline import PipelineContext, PipelineRequest, PipelineResponse
+from azure.core.pipeline.policies import HeadersPolicy
+from azure.core.pipeline.transport import HttpRequest, HttpResponse
+from azure.core.pipeline.transport._base import HttpClientTransportResponse
+
+
+class _HTTPSerializer(HTTPConnection, object):
+    # the serializer of the requests before the byte level encoder
+    def __init__(self, *args, **kwargs):
+        self.buffer = b""
+        kwargs.setdefault("host", "fakehost")
+        super(_HTTPSerializer, self).__init__(*args, **kwargs)
+
+    def putheader(self, header, *values):
+        if header in ["Host", "Accept-Encoding"]:
+            return
+        super(_HTTPSerializer, self).putheader(header, *values)
+
+    def send(self, data):
+        self.buffer += data
+
+
+class _BytesIOSocket(object):
+    # the "makefile" of a socket, to parse the responses with http.client
+    def __init__(self, bytes_data):
+        self.bytes_data = bytes_data
+
+    def makefile(self, *_):
+        return BytesIO(self.bytes_data)
+
+
+def _deserialize_response(http_response_as_bytes, http_request):
+    response = HTTPResponse(_BytesIOSocket(http_response_as_bytes), method=http_request.method)
+    response.begin()
+    return HttpClientTransportResponse(http_request, response)
+
+
+def email_encode(requests, boundary):
+    main_message = Message()
+    main_message.add_header("Content-Type", "multipart/mixed")
+    main_message.set_boundary(boundary)
+    for i, req in enumerate(requests):
+        serializer = _HTTPSerializer()
+        serializer.request(method=req.method, url=req.url, body=req.body, headers=req.headers)
+        part_message = Message()
+        part_message.add_header("Content-Type", "application/http")
+        part_message.add_header("Content-Transfer-Encoding", "binary")
+        part_message.add_header("Content-ID", str(i))
+        part_message.set_payload(serializer.buffer)
+        main_message.attach(part_message)
+    _, _, body = main_message.as_bytes(policy=HTTP).split(b"\r\n", 2)
+    return body
+
+
+def email_decode(response, policies):
+    http_body = b"Content-Type: " + response.content_type.encode("ascii") + b"\r\n\r\n" + response.body()
+    message = message_from_bytes(http_body)
+    requests = response.request.multipart_mixed_info[0]
+    responses = [
+        _deserialize_response(part.get_payload(decode=True), request)
+        for request, part in zip(requests, message.get_payload())
+    ]
+
+    def parse_responses(part):
+        context = PipelineContext(None)
+        pipeline_request = PipelineRequest(part.request, context)
+        pipeline_response = PipelineResponse(part.request, part, context=context)
+        for policy in policies:
+            policy.on_response(pipeline_request, pipeline_response)
+
+    with concurrent.futures.ThreadPoolExecutor() as executor:
+        list(executor.map(parse_responses, responses))
+    return responses
+
+
+class MockResponse(HttpResponse):
+    def __init__(self, request, body, content_type):
+        super(MockResponse, self).__init__(request, None)
+        self._body = body
+        self.content_type = content_type
+
+    def body(self):
+        return self._body
+
+
+def batch(count):
+    policy = HeadersPolicy({'x-ms-date': 'Thu, 14 Jun 2018 16:46:54 GMT'})
+    requests = []
+    for index in range(count):
+        request = HttpRequest("DELETE", "/container/blob{}".format(index), headers={
+            "x-ms-version": "2019-07-07",
+            "Authorization": "SharedKey account:G4jjBXA7LI/RnWKIOQ8i9xH4p76pAQ+4Fs4R1VxasaE=",
+        })
+        requests.append(request)
+    request = HttpRequest("POST", "http://account.blob.core.windows.net/?comp=batch")
+    request.set_multipart_mixed(*requests, policies=[policy], boundary="batch_357de4f7-6d0b-4e02-8cd2-6361411a9525")
+
+    boundary = "batchresponse_66925647-d0cb-4109-b6d3-28efe3e1e5ed"
+    part = (
+        "--{}\r\n"
+        "Content-Type: application/http\r\n"
+        "Content-ID: {}\r\n"
+        "\r\n"
+        "HTTP/1.1 202 Accepted\r\n"
+        "x-ms-delete-type-permanent: true\r\n"
+        "x-ms-request-id: 778fdc83-801e-0000-62ff-0334671e284f\r\n"
+        "x-ms-version: 2019-07-07\r\n"
+        "\r\n"
+    )
+    body = "".join(part.format(boundary, index) for index in range(count)) + "--{}--\r\n".format(boundary)
+    response = MockResponse(request, body.encode("ascii"), "multipart/mixed; boundary=" + boundary)
+    return request, response, [policy]
+
+
+def main(count=256, rounds=20):
+    request, response, policies = batch(count)
+    requests = request.multipart_mixed_info[0]
+
+    request.prepare_multipart_body()
+    assert request.body == email_encode(requests, request.multipart_mixed_info[2])
+    assert [part.status_code for part in response.parts()] == \
+        [part.status_code for part in email_decode(response, policies)]
+
+    timings = [
+        ("encode, email", lambda: email_encode(requests, request.multipart_mixed_info[2])),
+        ("encode, bytes", request.prepare_multipart_body),
+        ("decode, email", lambda: email_decode(response, policies)),
+        ("decode, bytes", response.parts),
+    ]
+    print("{} sub-requests, best of {} rounds".format(count, rounds))
+    for name, call in timings:
+        best = min(timeit.repeat(call, number=1, repeat=rounds))
+        print("{:<16}{:>10.2f} ms".format(name, best * 1000))
+
+
+if __name__ == "__main__":
+    main(*[int(arg) for arg in sys.argv[1:]])
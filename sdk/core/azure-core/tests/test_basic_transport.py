@@ -14,13 +14,19 @@ except ImportError:
     import mock
 
 from azure.core.pipeline.transport import HttpRequest, HttpResponse, RequestsTransport
-from azure.core.pipeline.transport._base import HttpClientTransportResponse, HttpTransport, _deserialize_response
+from azure.core.pipeline.transport._base import HttpClientTransportResponse, HttpTransport
+from azure.core.pipeline.transport._multipart import parse_response
 from azure.core.pipeline.policies import HeadersPolicy
 from azure.core.pipeline import Pipeline
 import logging
 import pytest
 
 
+def _deserialize_response(http_response_as_bytes, http_request):
+    response = parse_response(http_response_as_bytes, method=http_request.method)
+    return HttpClientTransportResponse(http_request, response)
+
+
 @pytest.mark.skipif(sys.version_info < (3, 6), reason="Multipart serialization not supported on 2.7 + dict order not deterministic on 3.5")
 def test_http_request_serialization():
     # Method + Url
@@ -386,6 +392,53 @@ def test_recursive_multipart_receive():
     internal_response0 = internal_response[0]
     assert internal_response0.status_code == 400
 
+def test_multipart_roundtrip_without_email():
+    # the byte level encoder and decoder handle bodies, quoted boundaries and empty parts
+    from azure.core.pipeline.transport._multipart import (
+        encode_multipart_mixed, get_boundary, parse_response, serialize_request, split_multipart
+    )
+
+    req0 = HttpRequest("PUT", "/container0/blob0", headers={"x-ms-blob-type": "BlockBlob"})
+    req0.set_bytes_body(b"\r\n--not-a-boundary\r\n")
+    req1 = HttpRequest("DELETE", "/container1/blob1")
+    req2 = HttpRequest("POST", "/container2/blob2")
+
+    request = HttpRequest("POST", "http://account.blob.core.windows.net/?comp=batch")
+    request.set_multipart_mixed(req0, req1, req2)
+    request.prepare_multipart_body()
+
+    content_type = request.headers["Content-Type"]
+    assert content_type.startswith("multipart/mixed; boundary=batch_")
+    boundary = get_boundary(content_type)
+    assert get_boundary('multipart/mixed; charset=utf-8; boundary="{}"'.format(boundary)) == boundary
+    with pytest.raises(ValueError):
+        get_boundary("multipart/mixed")
+
+    parts = split_multipart(request.body, boundary)
+    assert len(parts) == 3
+    assert [request.body[start:end] for _, start, end in parts] == [
+        serialize_request("PUT", "/container0/blob0", req0.headers, req0.body),
+        b"DELETE /container1/blob1 HTTP/1.1\r\n\r\n",
+        b"POST /container2/blob2 HTTP/1.1\r\nContent-Length: 0\r\n\r\n",
+    ]
+    assert [headers for headers, _, _ in parts][2] == [
+        ("Content-Type", "application/http"),
+        ("Content-Transfer-Encoding", "binary"),
+        ("Content-ID", "2"),
+    ]
+
+    # an empty part, and a body stopped at its Content-Length
+    body = encode_multipart_mixed([b"", b"HTTP/1.1 201 Created\r\nContent-Length: 2\r\n\r\nokignored"], "b")
+    parts = split_multipart(body, "b")
+    assert parts[0][1] == parts[0][2]
+    response = parse_response(body, parts[1][1], parts[1][2])
+    assert (response.status, response.reason, response.read()) == (201, "Created", b"ok")
+    assert response.getheader("content-length") == "2"
+    with pytest.raises(ValueError):
+        parse_response(b"HTTP/1.1 OK\r\n\r\n")
+    assert parse_response(b"HTTP/1.1 204 No Content\r\n\r\nextra").read() == b""
+
+
 def test_close_unopened_transport():
     transport = RequestsTransport()
     transport.close()
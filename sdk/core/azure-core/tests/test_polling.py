@@ -172,3 +172,113 @@ def test_broken_poller(client):
     with pytest.raises(ValueError) as excinfo:
         poller.result()
     assert "Something bad happened" in str(excinfo.value)
+
+
+class PollingSteps(PollingTwoSteps):
+    """A poller that is driven by the PollingScheduler.
+    """
+    def __init__(self, steps=3):
+        super(PollingSteps, self).__init__()
+        self._steps = steps
+
+    def run(self):
+        raise AssertionError("Should be driven by the scheduler")
+
+    def step(self):
+        self._steps -= 1
+        if self._steps:
+            return 0.01
+        self._finished = True
+        return None
+
+def test_scheduler():
+    scheduler = PollingScheduler(max_workers=2)
+    calls = []
+    def make_step(name, count):
+        def step():
+            calls.append(name)
+            return 0.01 if calls.count(name) < count else None
+        return step
+
+    scheduler.schedule(make_step("a", 3))
+    scheduler.schedule(make_step("b", 2), delay=0.05)
+    for _ in range(100):
+        if len(calls) == 5:
+            break
+        time.sleep(0.01)
+    assert sorted(calls) == ["a", "a", "a", "b", "b"]
+    assert len(scheduler) == 0
+    assert len(scheduler._workers) <= 2
+
+    scheduler.close()
+    with pytest.raises(RuntimeError):
+        scheduler.schedule(make_step("c", 1))
+
+    with pytest.raises(ValueError):
+        PollingScheduler(max_workers=0)
+
+def test_poller_scheduled(client):
+    initial_response = "Initial response"
+    def deserialization_callback(response):
+        return "Treated: "+response
+
+    method = PollingSteps(steps=3)
+    poller = LROPoller(client, initial_response, deserialization_callback, method)
+    assert poller._thread is None
+
+    done_cb = mock.MagicMock()
+    poller.add_done_callback(done_cb)
+
+    result = poller.result()
+    assert poller.done()
+    assert result == "Treated: "+initial_response
+    assert poller.status() == "succeeded"
+    done_cb.assert_called_once_with(method)
+
+    class PollingStepsError(PollingSteps):
+        def step(self):
+            raise ValueError("Something bad happened")
+
+    poller = LROPoller(client, initial_response, deserialization_callback, PollingStepsError())
+    with pytest.raises(ValueError) as excinfo:
+        poller.result()
+    assert "Something bad happened" in str(excinfo.value)
+
+def test_poller_without_scheduler(client):
+    scheduler = get_polling_scheduler()
+    set_polling_scheduler(None)
+    try:
+        class PollingStepsWithRun(PollingSteps):
+            def run(self):
+                self._finished = True
+
+        poller = LROPoller(client, "Initial response", lambda r: r, PollingStepsWithRun())
+        assert poller._thread is not None
+        assert poller.result() == "Initial response"
+    finally:
+        set_polling_scheduler(scheduler)
+
+def test_wait_all(client):
+    initial_response = "Initial response"
+    def deserialization_callback(response):
+        return "Treated: "+response
+
+    pollers = [
+        LROPoller(client, initial_response, deserialization_callback, PollingSteps(steps=steps))
+        for steps in (3, 1, 2)
+    ]
+    pollers.append(LROPoller(client, initial_response, deserialization_callback, NoPolling()))
+    completed = list(as_completed(pollers))
+    assert set(completed) == set(pollers)
+    assert all(poller.result() == "Treated: "+initial_response for poller in completed)
+
+    done, not_done = wait_all(pollers, timeout=1)
+    assert done == set(pollers)
+    assert not not_done
+
+    method = PollingTwoSteps(sleep=1)
+    slow_poller = LROPoller(client, initial_response, deserialization_callback, method)
+    done, not_done = wait_all([slow_poller, pollers[0]], timeout=0.1)
+    assert done == {pollers[0]}
+    assert not_done == {slow_poller}
+    slow_poller.wait()
@@ -0,0 +1,165 @@
+# --------------------------------------------------------------------------
+#
+# Copyright (c) Microsoft Corporation. All rights reserved.
+#
+# The MIT License (MIT)
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the ""Software""), to
+# deal in the Software without restriction, including without limitation the
+# rights to use, copy, modify, merge, publish, distribute, sublicense, and/or
+# sell copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED *AS IS*, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+# IN THE SOFTWARE.
+#
+# --------------------------------------------------------------------------
+import concurrent.futures
+import gc
+import threading
+import time
+import weakref
+
+import pytest
+from six.moves.BaseHTTPServer import BaseHTTPRequestHandler, HTTPServer
+from six.moves.socketserver import ThreadingMixIn
+
+from azure.core import PipelineClient
+from azure.core.pipeline.transport import HttpRequest, PooledRequestsTransport
+
+
+class _Server(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+    def __init__(self):
+        HTTPServer.__init__(self, ('127.0.0.1', 0), _Handler)
+        self.lock = threading.Lock()
+        self.connections = 0
+        self.max_connections = 0
+
+    @property
+    def url(self):
+        return "http://127.0.0.1:{}/".format(self.server_address[1])
+
+
+class _Handler(BaseHTTPRequestHandler):
+    # keep the connections alive, counting those open at once
+    protocol_version = "HTTP/1.1"
+
+    def setup(self):
+        BaseHTTPRequestHandler.setup(self)
+        with self.server.lock:
+            self.server.connections += 1
+            self.server.max_connections = max(self.server.max_connections, self.server.connections)
+
+    def finish(self):
+        with self.server.lock:
+            self.server.connections -= 1
+        BaseHTTPRequestHandler.finish(self)
+
+    def do_GET(self):
+        time.sleep(0.005)
+        body = b"pooled"
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    server = _Server()
+    thread = threading.Thread(target=server.serve_forever)
+    thread.daemon = True
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def test_pooled_transport_threads(server):
+    transport = PooledRequestsTransport(pool_maxsize=4)
+    sessions = set()
+
+    def send(_):
+        response = transport.send(HttpRequest("GET", server.url))
+        sessions.add(transport.session)
+        return response.body()
+
+    with transport:
+        with concurrent.futures.ThreadPoolExecutor(max_workers=16) as executor:
+            assert list(executor.map(send, range(200))) == [b"pooled"] * 200
+
+        # a session per thread, sharing the connections of the host
+        assert len(sessions) == 16
+        assert len(set(id(session.get_adapter(server.url)) for session in sessions)) == 1
+        stats = transport.pool_stats()
+        assert list(stats) == [server.url.rstrip("/")]
+        host_stats = stats[server.url.rstrip("/")]
+        assert host_stats.requests_sent == 200
+        assert host_stats.connections_opened <= 4
+        assert host_stats.connections_reused == 200 - host_stats.connections_opened
+        assert host_stats.idle_connections == host_stats.connections_opened
+        assert server.max_connections <= 4
+
+    assert transport.pool_stats() == {}
+    assert transport.session is None
+
+
+def test_pooled_transport_shared(server):
+    transport = PooledRequestsTransport(shared=True)
+    for _ in range(2):
+        with PipelineClient(server.url, transport=transport) as client:
+            response = client._pipeline.run(client.get(server.url))
+            assert response.http_response.body() == b"pooled"
+
+    # the clients left the transport open, with its connection kept alive
+    host_stats = transport.pool_stats()[server.url.rstrip("/")]
+    assert host_stats.requests_sent == 2
+    assert host_stats.connections_opened == 1
+    transport.close()
+    assert transport.pool_stats() == {}
+
+    # a closed transport opens new sessions
+    assert transport.send(HttpRequest("GET", server.url)).body() == b"pooled"
+    transport.close()
+
+
+def test_pooled_transport_thread_exit(server):
+    transport = PooledRequestsTransport(shared=True)
+    sessions = []
+
+    def send():
+        assert transport.send(HttpRequest("GET", server.url)).body() == b"pooled"
+        sessions.append(weakref.ref(transport.session))
+
+    threads = [threading.Thread(target=send) for _ in range(50)]
+    for thread in threads:
+        thread.start()
+        thread.join()
+
+    # the sessions of the threads ended are released, their connections staying in the pool
+    gc.collect()
+    assert len(sessions) == 50
+    assert all(session() is None for session in sessions)
+    assert transport.pool_stats()[server.url.rstrip("/")].connections_opened == 1
+    transport.close()
+
+
+def test_pooled_transport_options():
+    with pytest.raises(ValueError):
+        PooledRequestsTransport(pool_maxsize=0)
+    with pytest.raises(ValueError):
+        PooledRequestsTransport(session=object())
@@ -24,6 +24,7 @@
 #
 # --------------------------------------------------------------------------
 import json
+from contextlib import contextmanager
 
 try:
     from urlparse import urlparse
@@ -371,6 +372,7 @@ class ARMPolling(PollingMethod):
         self._pipeline_response = None  # Will hold latest received response
         self._operation_config = operation_config
         self._lro_options = lro_options
+        self._stepping = False  # True once "step" has been called
 
     def status(self):
         """Return the current status as a string.
@@ -419,8 +421,33 @@ class ARMPolling(PollingMethod):
             raise HttpResponseError(response=initial_response.http_response, error=err)
 
     def run(self):
-        try:
+        with self._translate_polling_errors():
             self._poll()
+
+    def step(self):
+        """Do a single status check, without sleeping.
+
+        This is the non-blocking counterpart of "run", used by
+        ~azure.core.polling.PollingScheduler: the first call only returns the
+        initial delay, next calls update the status.
+
+        :returns: The delay in seconds before the next call, or None if the operation is done.
+        :rtype: float or None
+        :raises: HttpResponseError if the operation failed.
+        """
+        with self._translate_polling_errors():
+            if self._stepping:
+                self.update_status()
+            self._stepping = True
+            if not self.finished():
+                return self._get_delay()
+            self._end_polling()
+        return None
+
+    @contextmanager
+    def _translate_polling_errors(self):
+        try:
+            yield
         except BadStatus as err:
             self._operation.status = "Failed"
             raise HttpResponseError(
@@ -455,6 +482,13 @@ class ARMPolling(PollingMethod):
             self._delay()
             self.update_status()
 
+        self._end_polling()
+
+    def _end_polling(self):
+        """Check the final status and do the final GET if needed.
+
+        :raises: OperationFailed if operation status 'Failed' or 'Canceled'.
+        """
         if failed(self._operation.status):
             raise OperationFailed("Operation failed or canceled")
 
@@ -471,17 +505,21 @@ class ARMPolling(PollingMethod):
     def _sleep(self, delay):
         self._transport.sleep(delay)
 
-    def _delay(self):
+    def _get_delay(self):
         """Check for a 'retry-after' header to set timeout,
         otherwise use configured timeout.
         """
         if self._pipeline_response is None:
-            return
+            return 0
         response = self._pipeline_response.http_response
         if response.headers.get("retry-after"):
-            self._sleep(int(response.headers["retry-after"]))
-        else:
-            self._sleep(self._timeout)
+            return int(response.headers["retry-after"])
+        return self._timeout
+
+    def _delay(self):
+        if self._pipeline_response is None:
+            return
+        self._sleep(self._get_delay())
 
     def update_status(self):
         """Update the current status of the LRO.
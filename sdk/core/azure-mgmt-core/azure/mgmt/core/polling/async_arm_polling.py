@@ -23,8 +23,7 @@
 # IN THE SOFTWARE.
 #
 # --------------------------------------------------------------------------
-from azure.core.exceptions import HttpResponseError
-from .arm_polling import failed, BadStatus, BadResponse, OperationFailed, ARMPolling
+from .arm_polling import failed, BadResponse, OperationFailed, ARMPolling
 
 __all__ = ["AsyncARMPolling"]
 
@@ -34,26 +33,8 @@ class AsyncARMPolling(ARMPolling):
     """
 
     async def run(self):
-        try:
+        with self._translate_polling_errors():
             await self._poll()
-        except BadStatus as err:
-            self._operation.status = "Failed"
-            raise HttpResponseError(
-                response=self._pipeline_response.http_response, error=err
-            )
-
-        except BadResponse as err:
-            self._operation.status = "Failed"
-            raise HttpResponseError(
-                response=self._pipeline_response.http_response,
-                message=str(err),
-                error=err,
-            )
-
-        except OperationFailed as err:
-            raise HttpResponseError(
-                response=self._pipeline_response.http_response, error=err
-            )
 
     async def _poll(self):
         """Poll status of operation so long as operation is incomplete and
@@ -87,16 +68,9 @@ class AsyncARMPolling(ARMPolling):
         await self._transport.sleep(delay)
 
     async def _delay(self):
-        """Check for a 'retry-after' header to set timeout,
-        otherwise use configured timeout.
-        """
         if self._pipeline_response is None:
             return
-        response = self._pipeline_response.http_response
-        if response.headers.get("retry-after"):
-            await self._sleep(int(response.headers["retry-after"]))
-        else:
-            await self._sleep(self._timeout)
+        await self._sleep(self._get_delay())
 
     async def update_status(self):
         """Update the current status of the LRO.
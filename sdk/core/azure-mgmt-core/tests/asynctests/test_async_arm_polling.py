@@ -40,6 +40,7 @@ from requests import Request, Response
 from msrest import Deserializer
 
 from azure.core.polling import async_poller
+from azure.core.polling._poller import _supports_stepping
 from azure.core.exceptions import DecodeError, HttpResponseError
 from azure.core import AsyncPipelineClient
 from azure.core.pipeline import PipelineResponse, AsyncPipeline
@@ -49,6 +50,7 @@ from azure.mgmt.core.polling.async_arm_polling import (
     AsyncARMPolling,
 )
 from azure.mgmt.core.polling.arm_polling import (
+    ARMPolling,
     LongRunningOperation,
     BadStatus
 )
@@ -594,3 +596,21 @@ async def test_long_running_negative():
     LOCATION_BODY = json.dumps({ 'name': TEST_NAME })
     POLLING_STATUS = 200
 
+
+@pytest.mark.asyncio
+async def test_long_running_no_status_link():
+    response = TestArmPolling.mock_send(
+        'DELETE', 202,
+        {'location': LOCATION_URL})
+    polling_method = AsyncARMPolling(0)
+    polling_method.initialize(CLIENT, response, TestArmPolling.mock_outputs)
+    polling_method._operation.location_url = None
+    with pytest.raises(HttpResponseError) as error:
+        await polling_method.run()
+    assert "Unable to find status link for polling." in str(error.value)
+
+
+def test_async_polling_not_stepped():
+    # The step inherited from ARMPolling cannot drive the async polling
+    assert _supports_stepping(ARMPolling(0))
+    assert not _supports_stepping(AsyncARMPolling(0))
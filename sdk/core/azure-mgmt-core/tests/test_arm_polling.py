@@ -580,3 +580,26 @@ class TestArmPolling(object):
         LOCATION_BODY = json.dumps({ 'name': TEST_NAME })
         POLLING_STATUS = 200
 
+
+    def test_long_running_step(self):
+        # Test stepping from azure-asyncoperation header, as done by the PollingScheduler
+        response = TestArmPolling.mock_send(
+            'PUT', 201,
+            {'azure-asyncoperation': ASYNC_URL, 'retry-after': '2'})
+        polling = ARMPolling(0)
+        polling.initialize(CLIENT, response, TestArmPolling.mock_outputs)
+        assert polling.step() == 2  # Initial delay, no status update
+        assert not polling.finished()
+        assert polling.step() is None
+        assert polling.finished()
+        assert polling.resource().name == TEST_NAME
+
+        # Test stepping from an invalid status code
+        response = TestArmPolling.mock_send(
+            'PUT', 201,
+            {'location': ERROR})
+        polling = ARMPolling(0)
+        polling.initialize(CLIENT, response, TestArmPolling.mock_outputs)
+        assert polling.step() == 0
+        with pytest.raises(BadEndpointError):
+            polling.step()
@@ -16,6 +16,14 @@ from ._download import StorageStreamDownloader
 from ._shared_access_signature import generate_account_sas, generate_container_sas, generate_blob_sas
 from ._shared.policies import ExponentialRetry, LinearRetry
 from ._shared.response_handlers import PartialBatchErrorException
+from ._shared.tuning import TransferTuner, TransferReport
+from ._shared.transfers import DirectoryTransferReport, FileTransfer
+from ._transfer_manager import BlobTransferManager
+from ._batch import BlobBatchExecutor, BlobBatchResult
+from ._lean_listing import BlobRecord
+from ._properties_cache import BlobPropertiesCache
+from ._incremental_sync import PageBlobSync, PageBlobSyncReport
+from ._append_writer import AppendBlobWriter, AppendBlobWriterMetrics
 from ._shared.models import(
     LocationMode,
     ResourceTypes,
@@ -206,5 +214,18 @@ __all__ = [
     'generate_container_sas',
     'generate_blob_sas',
     'PartialBatchErrorException',
-    'ContainerEncryptionScope'
+    'ContainerEncryptionScope',
+    'TransferTuner',
+    'TransferReport',
+    'BlobTransferManager',
+    'DirectoryTransferReport',
+    'FileTransfer',
+    'BlobBatchExecutor',
+    'BlobBatchResult',
+    'BlobRecord',
+    'BlobPropertiesCache',
+    'PageBlobSync',
+    'PageBlobSyncReport',
+    'AppendBlobWriter',
+    'AppendBlobWriterMetrics'
 ]
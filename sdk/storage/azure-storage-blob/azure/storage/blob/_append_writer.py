@@ -0,0 +1,295 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+
+import threading
+import time
+from collections import deque
+
+import six
+
+from typing import (  # pylint: disable=unused-import
+    Optional, Any, Iterable, List, Union, TypeVar, TYPE_CHECKING
+)
+
+from azure.core.exceptions import HttpResponseError, ResourceNotFoundError
+
+from ._shared.models import StorageErrorCode
+
+if TYPE_CHECKING:
+    BlobClient = TypeVar("BlobClient")
+
+# The largest block of an Append Block request
+MAX_APPEND_BLOCK_SIZE = 4 * 1024 * 1024
+
+
+class AppendBlobWriterMetrics(object):
+    """The appends made by an :class:`AppendBlobWriter`.
+
+    :ivar int writes: The number of records written to the writer.
+    :ivar int appends: The number of blocks appended to the blob.
+    :ivar int bytes_appended: The number of bytes appended to the blob.
+    :ivar float last_latency: The time taken by the last append, in seconds.
+    :ivar float max_latency: The longest time taken by an append, in seconds.
+    :ivar float total_latency: The time taken by all the appends, in seconds.
+    """
+
+    def __init__(self):
+        self.writes = 0
+        self.appends = 0
+        self.bytes_appended = 0
+        self.last_latency = 0.0
+        self.max_latency = 0.0
+        self.total_latency = 0.0
+
+    @property
+    def average_latency(self):
+        # type: () -> float
+        """The average time taken by an append, in seconds."""
+        return self.total_latency / self.appends if self.appends else 0.0
+
+    @property
+    def average_block_size(self):
+        # type: () -> float
+        """The average number of bytes of the blocks appended, grown by the group commit of small writes."""
+        return float(self.bytes_appended) / self.appends if self.appends else 0.0
+
+    def _record(self, size, latency):
+        self.appends += 1
+        self.bytes_appended += size
+        self.last_latency = latency
+        self.max_latency = max(self.max_latency, latency)
+        self.total_latency += latency
+
+    def __repr__(self):
+        return "AppendBlobWriterMetrics(writes={}, appends={}, bytes_appended={}, average_latency={:.3f}s)".format(
+            self.writes, self.appends, self.bytes_appended, self.average_latency)
+
+
+class AppendBlobWriter(object):  # pylint: disable=too-many-instance-attributes
+    """A file-like writer appending to an append blob, grouping small writes into large blocks.
+
+    The writes are buffered and appended in blocks of up to `max_block_size` bytes, once the
+    buffer is full or `flush_interval` seconds after its first write. The blocks are appended
+    in order by a background thread, one at a time, while the next block is buffered, and each
+    is conditioned on the append position it is expected at: an append retried by the pipeline
+    after a lost response is then recognized, rather than appended twice. A single writer should
+    append to a blob at a time.
+
+    A write larger than the block size is split across blocks. The appends in flight are waited
+    for by :func:`flush` and :func:`close`, which raise the error of a failed append.
+
+    :param blob_client: The client of the append blob, which is created if it does not exist.
+    :type blob_client: ~azure.storage.blob.BlobClient
+    :param int max_block_size: The largest block appended, up to 4 MiB, which is the default.
+    :param float flush_interval:
+        The longest time a write is buffered, in seconds, or None to only append full blocks
+        and flushed writes. Defaults to 1 second.
+    :param int max_pending_blocks:
+        The largest number of full blocks waiting to be appended, after which the writes
+        wait. Defaults to 4.
+    :keyword bool overwrite: Whether the blob is replaced by an empty append blob. Defaults to False.
+    :keyword str encoding: The encoding of the text written. Defaults to UTF-8.
+    :keyword int timeout:
+        The timeout parameter is expressed in seconds, for each request.
+
+    Any other keyword, like `lease`, `maxsize_condition` or `validate_content`, is passed to
+    each `append_block` call.
+    """
+
+    def __init__(
+            self, blob_client,  # type: BlobClient
+            max_block_size=MAX_APPEND_BLOCK_SIZE,  # type: int
+            flush_interval=1.0,  # type: Optional[float]
+            max_pending_blocks=4,  # type: int
+            **kwargs  # type: Any
+        ):
+        # type: (...) -> None
+        if not 0 < max_block_size <= MAX_APPEND_BLOCK_SIZE:
+            raise ValueError("max_block_size must be greater than 0 and up to {}.".format(MAX_APPEND_BLOCK_SIZE))
+        if max_pending_blocks < 1:
+            raise ValueError("max_pending_blocks must be greater than 0.")
+        self.blob_client = blob_client
+        self.max_block_size = max_block_size
+        self.flush_interval = flush_interval
+        self.max_pending_blocks = max_pending_blocks
+        self.metrics = AppendBlobWriterMetrics()
+        self._overwrite = kwargs.pop('overwrite', False)
+        self._encoding = kwargs.pop('encoding', 'UTF-8')
+        self._timeout = kwargs.get('timeout')
+        self._append_options = kwargs
+        self._position = None  # type: Optional[int]
+        self._buffer = []  # type: List[bytes]
+        self._buffered = 0
+        self._buffer_started = 0.0
+        self._blocks = deque()  # type: deque
+        self._in_flight = 0
+        self._error = None  # type: Optional[BaseException]
+        self._closed = False
+        self._changed = threading.Condition()
+        self._thread = None  # type: Optional[threading.Thread]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    @property
+    def closed(self):
+        # type: () -> bool
+        return self._closed
+
+    @staticmethod
+    def writable():
+        # type: () -> bool
+        return True
+
+    def _check_open(self):
+        if self._closed:
+            raise ValueError("I/O operation on closed file.")
+        if self._error is not None:
+            raise self._error  # pylint: disable=raising-bad-type
+
+    def _buffer_data(self, data):
+        # Add data to the buffer, sealing the blocks filled, and return the data left once one is
+        if isinstance(data, six.text_type):
+            data = data.encode(self._encoding)
+        if not self._buffered:
+            self._buffer_started = time.time()
+        room = self.max_block_size - self._buffered
+        self._buffer.append(data[:room])
+        self._buffered += len(self._buffer[-1])
+        if self._buffered < self.max_block_size:
+            return b""
+        self._seal()
+        return data[room:]
+
+    def _seal(self):
+        if self._buffered:
+            self._blocks.append(b"".join(self._buffer))
+            self._buffer = []
+            self._buffered = 0
+
+    def _next_timeout(self):
+        # The time left before the buffer is sealed, or None to wait for a write or a flush
+        if not self._buffered or self.flush_interval is None:
+            return None
+        return max(self._buffer_started + self.flush_interval - time.time(), 0)
+
+    def _open(self):
+        if not self._overwrite:
+            try:
+                return self.blob_client.get_blob_properties(timeout=self._timeout).size
+            except ResourceNotFoundError:
+                pass
+        self.blob_client.create_append_blob(timeout=self._timeout)
+        return 0
+
+    def _append(self, block):
+        if self._position is None:
+            self._position = self._open()
+        started = time.time()
+        try:
+            self.blob_client.append_block(
+                block, length=len(block), appendpos_condition=self._position, **self._append_options)
+        except HttpResponseError as error:
+            # An append retried after its response was lost finds the blob already grown by the block
+            if getattr(error, 'error_code', None) != StorageErrorCode.append_position_condition_not_met or \
+                    self.blob_client.get_blob_properties(timeout=self._timeout).size != self._position + len(block):
+                raise
+        self._position += len(block)
+        self.metrics._record(len(block), time.time() - started)  # pylint: disable=protected-access
+
+    def _start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._append_blocks, name="AppendBlobWriter")
+            self._thread.daemon = True
+            self._thread.start()
+
+    def _append_blocks(self):
+        while True:
+            with self._changed:
+                while not self._blocks:
+                    timeout = self._next_timeout()
+                    if timeout == 0:
+                        self._seal()
+                    elif self._closed:
+                        return
+                    else:
+                        self._changed.wait(timeout)
+                block = self._blocks.popleft()
+                self._in_flight += 1
+                self._changed.notify_all()
+            try:
+                self._append(block)
+            except BaseException as error:  # pylint: disable=broad-except
+                with self._changed:
+                    self._error = error
+                    self._blocks.clear()
+                    self._in_flight -= 1
+                    self._changed.notify_all()
+                return
+            with self._changed:
+                self._in_flight -= 1
+                self._changed.notify_all()
+
+    def write(self, data):
+        # type: (Union[bytes, str]) -> int
+        """Buffer data to append to the blob.
+
+        :param data: The data written. Text is encoded with the encoding of the writer.
+        :type data: bytes or str
+        :returns: The number of bytes or characters written.
+        :rtype: int
+        """
+        with self._changed:
+            self._check_open()
+            self._start()
+            self.metrics.writes += 1
+            remaining = data
+            while remaining:
+                # Wake the thread up to time the new buffer, or append the blocks filled
+                started = not self._buffered
+                remaining = self._buffer_data(remaining)
+                if started or self._blocks:
+                    self._changed.notify_all()
+                while len(self._blocks) >= self.max_pending_blocks and self._error is None:
+                    self._changed.wait()
+                self._check_open()
+            return len(data)
+
+    def writelines(self, lines):
+        # type: (Iterable[Union[bytes, str]]) -> None
+        for line in lines:
+            self.write(line)
+
+    def flush(self):
+        # type: () -> None
+        """Append the data buffered, and wait for the appends in flight."""
+        with self._changed:
+            self._check_open()
+            if not self._buffered and not self._blocks and not self._in_flight:
+                return
+            self._start()
+            self._seal()
+            self._changed.notify_all()
+            while (self._blocks or self._in_flight) and self._error is None:
+                self._changed.wait()
+            self._check_open()
+
+    def close(self):
+        # type: () -> None
+        """Flush the writer, and stop its thread. The error of a failed append is raised."""
+        if self._closed:
+            return
+        try:
+            self.flush()
+        finally:
+            with self._changed:
+                self._closed = True
+                self._changed.notify_all()
+            if self._thread is not None:
+                self._thread.join()
@@ -0,0 +1,287 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from typing import (  # pylint: disable=unused-import
+    Union, Optional, Any, Iterable, Iterator, List, Tuple, TypeVar, TYPE_CHECKING
+)
+
+from azure.core.exceptions import AzureError, ServiceRequestError, ServiceResponseError
+
+from ._container_client import _get_blob_name
+
+if TYPE_CHECKING:
+    from azure.core.pipeline.transport import HttpResponse
+    from ._models import BlobProperties, StandardBlobTier, PremiumPageBlobTier
+    ContainerClient = TypeVar("ContainerClient")
+
+# The largest number of sub-requests accepted in a batch by the service
+MAX_BATCH_SIZE = 256
+
+
+def _is_transient(status_code):
+    # Same as the retry policy: no response, a timeout, or a server error other than 501 and 505
+    if status_code is None:
+        return True
+    return status_code == 408 or (status_code >= 500 and status_code not in (501, 505))
+
+
+class BlobBatchResult(object):
+    """The result of the operation on one blob of a bulk operation.
+
+    :ivar blob: The blob, as given: its name or its BlobProperties.
+    :vartype blob: str or ~azure.storage.blob.BlobProperties
+    :ivar str name: The name of the blob.
+    :ivar int status_code:
+        The status code of the sub-response of the blob or, if the whole batch failed,
+        of the batch response. None if no response was received.
+    :ivar str error_code: The error code of the service, if the operation failed.
+    :ivar response: The sub-response of the blob, if any.
+    :vartype response: ~azure.core.pipeline.transport.HttpResponse
+    :ivar error: The error of the batch request, if the whole batch failed.
+    :vartype error: ~azure.core.exceptions.AzureError
+    :ivar int attempts: The number of batches the operation was sent in.
+    """
+
+    def __init__(self, blob, name):
+        self.blob = blob
+        self.name = name
+        self.status_code = None  # type: Optional[int]
+        self.error_code = None  # type: Optional[str]
+        self.response = None  # type: Optional[HttpResponse]
+        self.error = None  # type: Optional[AzureError]
+        self.attempts = 0
+
+    @property
+    def succeeded(self):
+        # type: () -> bool
+        """Whether the operation succeeded on the blob."""
+        return self.status_code is not None and 200 <= self.status_code < 300
+
+    def __repr__(self):
+        return "BlobBatchResult(name={!r}, status_code={!r}, error_code={!r}, attempts={})".format(
+            self.name, self.status_code, self.error_code, self.attempts)
+
+
+class BatchShards(object):
+    """Cut the blobs into batches, sending the operations to retry before the new ones.
+
+    The blobs are pulled from their iterator as the batches are built, so that an iterator
+    of any length, like the one of `list_blobs`, is never held in memory.
+    """
+
+    def __init__(self, batch_size, max_retries, retry_backoff):
+        self.batch_size = batch_size
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+        self.exhausted = False
+        self._retries = deque()  # type: deque
+
+    def start_batch(self):
+        # type: () -> List[BlobBatchResult]
+        batch = []
+        while self._retries and len(batch) < self.batch_size:
+            batch.append(self._retries.popleft())
+        return batch
+
+    def delay(self, batch):
+        # type: (List[BlobBatchResult]) -> float
+        """The time to wait before sending a batch, backing off exponentially on retries."""
+        attempts = max(result.attempts for result in batch)
+        return self.retry_backoff * 2 ** (attempts - 1) if attempts else 0
+
+    def complete(self, batch, parts, error):
+        # type: (List[BlobBatchResult], Optional[List[HttpResponse]], Optional[AzureError]) -> List[BlobBatchResult]
+        """Record the responses of a batch.
+
+        :returns: The results that are final, while the transient failures are kept to be retried.
+        """
+        finished = []
+        status_code = getattr(error, 'status_code', None)
+        for index, result in enumerate(batch):
+            result.attempts += 1
+            if parts is None:
+                result.status_code, result.response, result.error = status_code, None, error
+                result.error_code = getattr(error, 'error_code', None)
+            elif index < len(parts):
+                part = parts[index]
+                result.status_code, result.response, result.error = part.status_code, part, None
+                result.error_code = part.headers.get('x-ms-error-code')
+            else:
+                # The batch response is missing the sub-response
+                result.status_code, result.response, result.error, result.error_code = None, None, None, None
+            if not result.succeeded and _is_transient(result.status_code) and result.attempts <= self.max_retries:
+                self._retries.append(result)
+            else:
+                finished.append(result)
+        return finished
+
+
+def transient_batch_error(error):
+    # type: (AzureError) -> AzureError
+    """The error of a whole batch, returned to be retried if it is transient, or raised."""
+    status_code = getattr(error, 'status_code', None)
+    if isinstance(error, (ServiceRequestError, ServiceResponseError)) or \
+            (status_code is not None and _is_transient(status_code)):
+        return error
+    raise error
+
+
+class BlobBatchExecutor(object):
+    """Run bulk operations on any number of blobs of a container, in concurrent batches.
+
+    The blobs are given as an iterable, e.g. straight from `list_blobs`, and sent in batches
+    of up to 256 operations, with up to `max_concurrency` batches in flight. The operations
+    that fail with a transient error, like a server busy sub-response, are sent again in a
+    later batch, and the result of each blob is yielded once it is final.
+
+    :param container_client: The client of the container.
+    :type container_client: ~azure.storage.blob.ContainerClient
+    :param int max_concurrency: The largest number of batch requests in flight. Defaults to 4.
+    :param int batch_size: The number of operations of a batch, up to 256, which is the default.
+    :param int max_retries:
+        The number of times an operation failing with a transient error is sent again.
+        Defaults to 3.
+    :param float retry_backoff:
+        The delay before the first retry, in seconds, doubled for each attempt after it.
+        Defaults to 1.
+    """
+
+    def __init__(
+            self, container_client,  # type: ContainerClient
+            max_concurrency=4,  # type: int
+            batch_size=MAX_BATCH_SIZE,  # type: int
+            max_retries=3,  # type: int
+            retry_backoff=1.0  # type: float
+        ):
+        # type: (...) -> None
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be greater than 0.")
+        if not 0 < batch_size <= MAX_BATCH_SIZE:
+            raise ValueError("batch_size must be between 1 and {}.".format(MAX_BATCH_SIZE))
+        self.container_client = container_client
+        self.max_concurrency = max_concurrency
+        self.batch_size = batch_size
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+
+    def _send_batch(self, operation, batch, delay):
+        if delay:
+            time.sleep(delay)
+        try:
+            return batch, list(operation(*[result.blob for result in batch])), None
+        except AzureError as error:
+            return batch, None, transient_batch_error(error)
+
+    def _run(self, operation, blobs):
+        # type: (Any, Iterable[Union[str, BlobProperties]]) -> Iterator[BlobBatchResult]
+        shards = BatchShards(self.batch_size, self.max_retries, self.retry_backoff)
+        source = iter(blobs)
+        with ThreadPoolExecutor(self.max_concurrency) as executor:
+            running = set()
+            while True:
+                while len(running) < self.max_concurrency:
+                    batch = shards.start_batch()
+                    while not shards.exhausted and len(batch) < self.batch_size:
+                        try:
+                            blob = next(source)
+                        except StopIteration:
+                            shards.exhausted = True
+                        else:
+                            batch.append(BlobBatchResult(blob, _get_blob_name(blob)))
+                    if not batch:
+                        break
+                    running.add(executor.submit(self._send_batch, operation, batch, shards.delay(batch)))
+                if not running:
+                    return
+                done, running = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    for result in shards.complete(*future.result()):
+                        yield result
+
+    def delete_blobs(self, blobs, **kwargs):
+        # type: (Iterable[Union[str, BlobProperties]], **Any) -> Iterator[BlobBatchResult]
+        """Marks the specified blobs or snapshots for deletion.
+
+        :param blobs:
+            The blobs to delete, as an iterable of blob names or BlobProperties.
+        :type blobs: Iterable[str or ~azure.storage.blob.BlobProperties]
+        :keyword str delete_snapshots:
+            Required if a blob has associated snapshots. Values include:
+             - "only": Deletes only the blobs snapshots.
+             - "include": Deletes the blob along with all snapshots.
+        :keyword ~datetime.datetime if_modified_since:
+            A DateTime value. Azure expects the date value passed in to be UTC.
+            Specify this header to perform the operation only
+            if the resource has been modified since the specified time.
+        :keyword ~datetime.datetime if_unmodified_since:
+            A DateTime value. Azure expects the date value passed in to be UTC.
+            Specify this header to perform the operation only if
+            the resource has not been modified since the specified date/time.
+        :keyword int timeout:
+            The timeout parameter is expressed in seconds, for each batch request.
+        :returns: The result of each blob, as it is final. The results of a batch are in
+            order, while the batches complete in any order.
+        :rtype: Iterator[~azure.storage.blob.BlobBatchResult]
+        :raises ~azure.core.exceptions.HttpResponseError:
+            If a batch request fails as a whole with an error that is not transient,
+            like an authentication failure.
+        """
+        kwargs['raise_on_any_failure'] = False
+
+        def delete(*batch):
+            return self.container_client.delete_blobs(*batch, **kwargs)
+        return self._run(delete, blobs)
+
+    def set_standard_blob_tier_blobs(self, standard_blob_tier, blobs, **kwargs):
+        # type: (Union[str, StandardBlobTier], Iterable[Union[str, BlobProperties]], **Any) -> Iterator[BlobBatchResult]
+        """Sets the tier of block blobs.
+
+        :param standard_blob_tier:
+            Indicates the tier to be set on the blobs. Options include 'Hot', 'Cool',
+            'Archive'.
+        :type standard_blob_tier: str or ~azure.storage.blob.StandardBlobTier
+        :param blobs:
+            The blobs, as an iterable of blob names or BlobProperties.
+        :type blobs: Iterable[str or ~azure.storage.blob.BlobProperties]
+        :keyword int timeout:
+            The timeout parameter is expressed in seconds, for each batch request.
+        :returns: The result of each blob, as it is final.
+        :rtype: Iterator[~azure.storage.blob.BlobBatchResult]
+        """
+        if standard_blob_tier is None:
+            raise ValueError("A StandardBlobTier must be specified")
+        kwargs['raise_on_any_failure'] = False
+
+        def set_tier(*batch):
+            return self.container_client.set_standard_blob_tier_blobs(standard_blob_tier, *batch, **kwargs)
+        return self._run(set_tier, blobs)
+
+    def set_premium_page_blob_tier_blobs(self, premium_page_blob_tier, blobs, **kwargs):
+        # type: (Union[str, PremiumPageBlobTier], Iterable[Union[str, BlobProperties]], **Any) -> Iterator[BlobBatchResult]
+        """Sets the tier of page blobs on premium accounts.
+
+        :param premium_page_blob_tier:
+            A page blob tier value to set the blobs to.
+        :type premium_page_blob_tier: ~azure.storage.blob.PremiumPageBlobTier
+        :param blobs:
+            The blobs, as an iterable of blob names or BlobProperties.
+        :type blobs: Iterable[str or ~azure.storage.blob.BlobProperties]
+        :keyword int timeout:
+            The timeout parameter is expressed in seconds, for each batch request.
+        :returns: The result of each blob, as it is final.
+        :rtype: Iterator[~azure.storage.blob.BlobBatchResult]
+        """
+        if premium_page_blob_tier is None:
+            raise ValueError("A PremiumPageBlobTier must be specified")
+        kwargs['raise_on_any_failure'] = False
+
+        def set_tier(*batch):
+            return self.container_client.set_premium_page_blob_tier_blobs(premium_page_blob_tier, *batch, **kwargs)
+        return self._run(set_tier, blobs)
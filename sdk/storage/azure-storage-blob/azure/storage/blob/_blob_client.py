@@ -5,6 +5,7 @@
 # --------------------------------------------------------------------------
 # pylint: disable=too-many-lines,no-self-use
 
+import copy
 from io import BytesIO
 from typing import (  # pylint: disable=unused-import
     Union, Optional, Any, IO, Iterable, AnyStr, Dict, List, Tuple,
@@ -17,6 +18,8 @@ except ImportError:
     from urllib2 import quote, unquote # type: ignore
 
 import six
+from azure.core import MatchConditions
+from azure.core.exceptions import HttpResponseError
 from azure.core.tracing.decorator import distributed_trace
 
 from ._shared import encode_base64
@@ -39,6 +42,7 @@ from ._generated.models import ( # pylint: disable=unused-import
     CpkInfo)
 from ._serialize import get_modify_conditions, get_source_conditions, get_cpk_scope_info, get_api_version
 from ._deserialize import get_page_ranges_result, deserialize_blob_properties, deserialize_blob_stream
+from ._checkpoint import TransferJournal, stream_fingerprint
 from ._upload_helpers import (
     upload_block_blob,
     upload_append_blob,
@@ -46,6 +50,7 @@ from ._upload_helpers import (
 from ._models import BlobType, BlobBlock
 from ._download import StorageStreamDownloader
 from ._lease import BlobLeaseClient, get_access_conditions
+from ._properties_cache import invalidates_properties, is_conditional
 
 if TYPE_CHECKING:
     from datetime import datetime
@@ -105,6 +110,10 @@ class BlobClient(StorageAccountHostsMixin):  # pylint: disable=too-many-public-m
         the exceeded part will be downloaded in chunks (could be parallel). Defaults to 32*1024*1024, or 32MB.
     :keyword int max_chunk_get_size: The maximum chunk size used for downloading a blob. Defaults to 4*1024*1024,
         or 4MB.
+    :keyword ~azure.storage.blob.BlobPropertiesCache properties_cache:
+        A cache of the blob properties, which can be shared by clients. `get_blob_properties` then
+        returns the cached properties, revalidated with a conditional request once they expire,
+        and the writes through this client invalidate them.
 
     .. admonition:: Example:
 
@@ -155,11 +164,19 @@ class BlobClient(StorageAccountHostsMixin):  # pylint: disable=too-many-public-m
             except TypeError:
                 self.snapshot = snapshot or path_snapshot
 
+        self._properties_cache = kwargs.pop('properties_cache', None)
         self._query_str, credential = self._format_query_string(sas_token, credential, snapshot=self.snapshot)
         super(BlobClient, self).__init__(parsed_url, service='blob', credential=credential, **kwargs)
         self._client = AzureBlobStorage(self.url, pipeline=self._pipeline)
         self._client._config.version = get_api_version(kwargs, VERSION)  # pylint: disable=protected-access
 
+    def _properties_cache_key(self):
+        return self.primary_hostname, self.container_name, self.blob_name, self.snapshot
+
+    def _invalidate_properties(self):
+        if self._properties_cache is not None:
+            self._properties_cache.invalidate(self._properties_cache_key())
+
     def _format_url(self, hostname):
         container_name = self.container_name
         if isinstance(container_name, six.text_type):
@@ -334,7 +351,10 @@ class BlobClient(StorageAccountHostsMixin):  # pylint: disable=too-many-public-m
         validate_content = kwargs.pop('validate_content', False)
         content_settings = kwargs.pop('content_settings', None)
         overwrite = kwargs.pop('overwrite', False)
-        max_concurrency = kwargs.pop('max_concurrency', 1)
+        autotune = kwargs.pop('autotune', None)
+        # An autotuned upload chooses its concurrency, unless the caller bounds it
+        max_concurrency = kwargs.pop('max_concurrency', 1 if autotune is None else None)
+        checkpoint = kwargs.pop('checkpoint', None)
         cpk = kwargs.pop('cpk', None)
         cpk_info = None
         if cpk:
@@ -366,9 +386,21 @@ class BlobClient(StorageAccountHostsMixin):  # pylint: disable=too-many-public-m
         kwargs['blob_settings'] = self._config
         kwargs['max_concurrency'] = max_concurrency
         kwargs['encryption_options'] = encryption_options
+        if autotune is not None and blob_type != BlobType.BlockBlob:
+            raise ValueError("Autotuning is only supported for block blobs.")
+        if checkpoint is not None:
+            if blob_type != BlobType.BlockBlob or autotune is not None or self.key_encryption_key is not None:
+                raise ValueError("Checkpoints are only supported for block blobs, "
+                                 "without autotuning or client-side encryption.")
+            kwargs['journal'] = TransferJournal.load(checkpoint, {
+                'blob': '/'.join([self.primary_hostname, self.container_name, self.blob_name]),
+                'size': length,
+                'block_size': self._config.max_block_size,
+                'source': stream_fingerprint(stream)})
         if blob_type == BlobType.BlockBlob:
             kwargs['client'] = self._client.block_blob
             kwargs['data'] = data
+            kwargs['tuner'] = autotune
         elif blob_type == BlobType.PageBlob:
             kwargs['client'] = self._client.page_blob
         elif blob_type == BlobType.AppendBlob:
@@ -380,6 +412,7 @@ class BlobClient(StorageAccountHostsMixin):  # pylint: disable=too-many-public-m
         return kwargs
 
     @distributed_trace
+    @invalidates_properties
     def upload_blob(  # pylint: disable=too-many-locals
             self, data,  # type: Union[Iterable[AnyStr], IO[AnyStr]]
             blob_type=BlobType.BlockBlob,  # type: Union[str, BlobType]
@@ -408,7 +441,7 @@ class BlobClient(StorageAccountHostsMixin):  # pylint: disable=too-many-public-m
         :keyword ~azure.storage.blob.ContentSettings content_settings:
             ContentSettings object used to set blob properties. Used to set content type, encoding,
             language, disposition, md5, and cache control.
-        :keyword bool validate_content:
+        :keyword validate_content:
             If true, calculates an MD5 hash for each chunk of the blob. The storage
             service checks the hash of the content that has arrived with the hash
             that was sent. This is primarily valuable for detecting bitflips on
@@ -417,6 +450,10 @@ class BlobClient(StorageAccountHostsMixin):  # pylint: disable=too-many-public-m
             blob. Also note that if enabled, the memory-efficient upload algorithm
             will not be used because computing the MD5 hash requires buffering
             entire blocks, and doing so defeats the purpose of the memory-efficient algorithm.
+            Set to "crc64" to send a CRC64 hash instead, in the x-ms-content-crc64 header.
+            The CRC64 is computed in Python, at a few MB per second while holding the GIL, which
+            throttles parallel transfers, unless the C extension of the crcmod package is installed.
+        :paramtype validate_content: bool or str
         :keyword lease:
             Required if the blob has an active lease. If specified, upload_blob only succeeds if the
             blob's lease is active and matches this ID. Value can be a BlobLeaseClient object
@@ -455,6 +492,18 @@ class BlobClient(StorageAccountHostsMixin):  # pylint: disable=too-many-public-m
         :keyword int max_concurrency:
             Maximum number of parallel connections to use when the blob size exceeds
             64MB.
+        :keyword ~azure.storage.blob.TransferTuner autotune:
+            Tune the block size and the number of parallel connections while the blob is
+            uploaded in blocks, between the bounds of the tuner. The max_concurrency given, if any, is
+            the largest number of parallel connections the tuner may use. The settings reached,
+            and the achieved throughput, are available from the tuner's report() afterwards.
+            Only supported for block blobs.
+        :keyword str checkpoint:
+            The path of a local journal file making the upload resumable. The blocks staged are
+            recorded in it, and when an upload of the same data to the same blob is retried with
+            the same checkpoint, the blocks still staged on the service are not uploaded again.
+            The journal is deleted once the upload is complete. Only supported for block blobs,
+            without autotuning or client-side encryption.
         :keyword ~azure.storage.blob.CustomerProvidedEncryptionKey cpk:
             Encrypts the data on the service-side with the given key.
             Use of customer-provided keys must be done over HTTPS.
@@ -533,7 +582,8 @@ class BlobClient(StorageAccountHostsMixin):  # pylint: disable=too-many-public-m
             'modified_access_conditions': mod_conditions,
             'cpk_info': cpk_info,
             'cls': deserialize_blob_stream,
-            'max_concurrency':kwargs.pop('max_concurrency', 1),
+            'max_concurrency': kwargs.pop('max_concurrency', 1 if kwargs.get('autotune') is None else None),
+            'tuner': kwargs.pop('autotune', None),
             'encoding': kwargs.pop('encoding', None),
             'timeout': kwargs.pop('timeout', None),
             'name': self.blob_name,
@@ -554,7 +604,7 @@ class BlobClient(StorageAccountHostsMixin):  # pylint: disable=too-many-public-m
         :param int length:
             Number of bytes to read from the stream. This is optional, but
             should be supplied for optimal performance.
-        :keyword bool validate_content:
+        :keyword validate_content:
             If true, calculates an MD5 hash for each chunk of the blob. The storage
             service checks the hash of the content that has arrived with the hash
             that was sent. This is primarily valuable for detecting bitflips on
@@ -563,6 +613,11 @@ class BlobClient(StorageAccountHostsMixin):  # pylint: disable=too-many-public-m
             blob. Also note that if enabled, the memory-efficient upload algorithm
             will not be used because computing the MD5 hash requires buffering
             entire blocks, and doing so defeats the purpose of the memory-efficient algorithm.
+            Set to "crc64" to have the service return a CRC64 hash of each chunk instead,
+            checked as the chunk is received.
+            The CRC64 is computed in Python, at a few MB per second while holding the GIL, which
+            throttles parallel transfers, unless the C extension of the crcmod package is installed.
+        :paramtype validate_content: bool or str
         :keyword lease:
             Required if the blob has an active lease. If specified, download_blob only
             succeeds if the blob's lease is active and matches this ID. Value can be a
@@ -592,6 +647,11 @@ class BlobClient(StorageAccountHostsMixin):  # pylint: disable=too-many-public-m
             a secure connection must be established to transfer the key.
         :keyword int max_concurrency:
             The number of parallel connections with which to download.
+        :keyword ~azure.storage.blob.TransferTuner autotune:
+            Tune the chunk size and the number of parallel connections while the blob is
+            downloaded in chunks, between the bounds of the tuner. The max_concurrency given, if any, is
+            the largest number of parallel connections the tuner may use. The settings reached,
+            and the achieved throughput, are available from the tuner's report() afterwards.
         :keyword str encoding:
             Encoding to decode the downloaded bytes. Default is None, i.e. no decoding.
         :keyword int timeout:
@@ -610,11 +670,24 @@ class BlobClient(StorageAccountHostsMixin):  # pylint: disable=too-many-public-m
                 :dedent: 12
                 :caption: Download a blob.
         """
+        cache_properties = self._properties_cache is not None and offset is None and \
+            kwargs.get('cpk') is None and not (self.key_encryption_key or self.key_resolver_function)
+        generation = self._properties_cache.generation if cache_properties else None
         options = self._download_blob_options(
             offset=offset,
             length=length,
             **kwargs)
-        return StorageStreamDownloader(**options)
+        downloader = StorageStreamDownloader(**options)
+        if cache_properties:
+            self._cache_downloaded_properties(downloader.properties, generation)
+        return downloader
+
+    def _cache_downloaded_properties(self, properties, generation):
+        # The properties of a whole download are the properties of the blob, but for its range
+        properties = copy.copy(properties)
+        properties.content_range = None
+        vars(properties).pop('content_md5', None)
+        self._properties_cache.put(self._properties_cache_key(), properties, generation=generation)
 
     @staticmethod
     def _generic_delete_blob_options(delete_snapshots=False, **kwargs):
@@ -640,6 +713,7 @@ class BlobClient(StorageAccountHostsMixin):  # pylint: disable=too-many-public-m
         return options
 
     @distributed_trace
+    @invalidates_properties
     def delete_blob(self, delete_snapshots=False, **kwargs):
         # type: (bool, **Any) -> None
         """Marks the specified blob for deletion.
@@ -701,6 +775,7 @@ class BlobClient(StorageAccountHostsMixin):  # pylint: disable=too-many-public-m
             process_storage_error(error)
 
     @distributed_trace
+    @invalidates_properties
     def undelete_blob(self, **kwargs):
         # type: (**Any) -> None
         """Restores soft-deleted blobs or snapshots.
@@ -772,6 +847,31 @@ class BlobClient(StorageAccountHostsMixin):  # pylint: disable=too-many-public-m
                 :dedent: 8
                 :caption: Getting the properties for a blob.
         """
+        if self._properties_cache is None or is_conditional(kwargs):
+            return self._get_blob_properties(**kwargs)
+        key = self._properties_cache_key()
+        cached, fresh = self._properties_cache.get(key)
+        if fresh:
+            return cached
+        generation = self._properties_cache.generation
+        try:
+            if cached is None:
+                blob_props = self._get_blob_properties(**kwargs)
+            else:
+                blob_props = self._get_blob_properties(
+                    etag=cached.etag, match_condition=MatchConditions.IfModified, **kwargs)
+        except HttpResponseError as error:
+            if cached is not None and error.status_code == 304:
+                self._properties_cache.revalidated(key)
+                return cached
+            if error.status_code == 404:
+                self._properties_cache.invalidate(key)
+            raise
+        self._properties_cache.put(key, blob_props, fetched=True, generation=generation)
+        return blob_props
+
+    def _get_blob_properties(self, **kwargs):
+        # type: (**Any) -> BlobProperties
         # TODO: extract this out as _get_blob_properties_options
         access_conditions = get_access_conditions(kwargs.pop('lease', None))
         mod_conditions = get_modify_conditions(kwargs)
@@ -821,6 +921,7 @@ class BlobClient(StorageAccountHostsMixin):  # pylint: disable=too-many-public-m
         return options
 
     @distributed_trace
+    @invalidates_properties
     def set_http_headers(self, content_settings=None, **kwargs):
         # type: (Optional[ContentSettings], **Any) -> None
         """Sets system properties on the blob.
@@ -889,6 +990,7 @@ class BlobClient(StorageAccountHostsMixin):  # pylint: disable=too-many-public-m
         return options
 
     @distributed_trace
+    @invalidates_properties
     def set_blob_metadata(self, metadata=None, **kwargs):
         # type: (Optional[Dict[str, str]], **Any) -> Dict[str, Union[str, datetime]]
         """Sets user-defined metadata for the blob as one or more name-value pairs.
@@ -998,6 +1100,7 @@ class BlobClient(StorageAccountHostsMixin):  # pylint: disable=too-many-public-m
         return options
 
     @distributed_trace
+    @invalidates_properties
     def create_page_blob(  # type: ignore
             self, size,  # type: int
             content_settings=None,  # type: Optional[ContentSettings]
@@ -1117,6 +1220,7 @@ class BlobClient(StorageAccountHostsMixin):  # pylint: disable=too-many-public-m
         return options
 
     @distributed_trace
+    @invalidates_properties
     def create_append_blob(self, content_settings=None, metadata=None, **kwargs):
         # type: (Optional[ContentSettings], Optional[Dict[str, str]], **Any) -> Dict[str, Union[str, datetime]]
         """Creates a new Append Blob.
@@ -1306,6 +1410,7 @@ class BlobClient(StorageAccountHostsMixin):  # pylint: disable=too-many-public-m
         return options
 
     @distributed_trace
+    @invalidates_properties
     def start_copy_from_url(self, source_url, metadata=None, incremental_copy=False, **kwargs):
         # type: (str, Optional[Dict[str, str]], bool, **Any) -> Dict[str, Union[str, datetime]]
         """Copies a blob asynchronously.
@@ -1466,6 +1571,7 @@ class BlobClient(StorageAccountHostsMixin):  # pylint: disable=too-many-public-m
         return options
 
     @distributed_trace
+    @invalidates_properties
     def abort_copy(self, copy_id, **kwargs):
         # type: (Union[str, Dict[str, Any], BlobProperties], **Any) -> None
         """Abort an ongoing copy operation.
@@ -1547,6 +1653,7 @@ class BlobClient(StorageAccountHostsMixin):  # pylint: disable=too-many-public-m
         return lease
 
     @distributed_trace
+    @invalidates_properties
     def set_standard_blob_tier(self, standard_blob_tier, **kwargs):
         # type: (Union[str, StandardBlobTier], Any) -> None
         """This operation sets the tier on a block blob.
@@ -1645,7 +1752,7 @@ class BlobClient(StorageAccountHostsMixin):  # pylint: disable=too-many-public-m
              the block_id parameter must be the same size for each block.
         :param data: The blob data.
         :param int length: Size of the block.
-        :keyword bool validate_content:
+        :keyword validate_content:
             If true, calculates an MD5 hash for each chunk of the blob. The storage
             service checks the hash of the content that has arrived with the hash
             that was sent. This is primarily valuable for detecting bitflips on
@@ -1654,6 +1761,10 @@ class BlobClient(StorageAccountHostsMixin):  # pylint: disable=too-many-public-m
             blob. Also note that if enabled, the memory-efficient upload algorithm
             will not be used because computing the MD5 hash requires buffering
             entire blocks, and doing so defeats the purpose of the memory-efficient algorithm.
+            Set to "crc64" to send a CRC64 hash instead, in the x-ms-content-crc64 header.
+            The CRC64 is computed in Python, at a few MB per second while holding the GIL, which
+            throttles parallel transfers, unless the C extension of the crcmod package is installed.
+        :paramtype validate_content: bool or str
         :keyword lease:
             Required if the blob has an active lease. Value can be a BlobLeaseClient object
             or the lease ID as a string.
@@ -1725,6 +1836,7 @@ class BlobClient(StorageAccountHostsMixin):  # pylint: disable=too-many-public-m
             'lease_access_conditions': access_conditions,
             'cpk_scope_info': cpk_scope_info,
             'cpk_info': cpk_info,
+            'source_modified_access_conditions': get_source_conditions(kwargs),
             'cls': return_response_headers,
         }
         options.update(kwargs)
@@ -1772,6 +1884,11 @@ class BlobClient(StorageAccountHostsMixin):  # pylint: disable=too-many-public-m
 
             .. versionadded:: 12.2.0
 
+        :keyword str source_etag:
+            The source ETag value, or the wildcard character (*). Used to check if the source has changed,
+            and act according to the condition specified by the `source_match_condition` parameter.
+        :keyword ~azure.core.MatchConditions source_match_condition:
+            The source match condition to use upon the etag.
         :keyword int timeout:
             The timeout parameter is expressed in seconds.
         :returns: Blob property dict.
@@ -1894,6 +2011,7 @@ class BlobClient(StorageAccountHostsMixin):  # pylint: disable=too-many-public-m
         return options
 
     @distributed_trace
+    @invalidates_properties
     def commit_block_list( # type: ignore
             self, block_list,  # type: List[BlobBlock]
             content_settings=None,  # type: Optional[ContentSettings]
@@ -1972,6 +2090,7 @@ class BlobClient(StorageAccountHostsMixin):  # pylint: disable=too-many-public-m
             process_storage_error(error)
 
     @distributed_trace
+    @invalidates_properties
     def set_premium_page_blob_tier(self, premium_page_blob_tier, **kwargs):
         # type: (Union[str, PremiumPageBlobTier], **Any) -> None
         """Sets the page blob tiers on the blob. This API is only supported for page blobs on premium accounts.
@@ -2197,6 +2316,7 @@ class BlobClient(StorageAccountHostsMixin):  # pylint: disable=too-many-public-m
         return options
 
     @distributed_trace
+    @invalidates_properties
     def set_sequence_number(self, sequence_number_action, sequence_number=None, **kwargs):
         # type: (Union[str, SequenceNumberAction], Optional[str], **Any) -> Dict[str, Union[str, datetime]]
         """Sets the blob sequence number.
@@ -2266,6 +2386,7 @@ class BlobClient(StorageAccountHostsMixin):  # pylint: disable=too-many-public-m
         return options
 
     @distributed_trace
+    @invalidates_properties
     def resize_blob(self, size, **kwargs):
         # type: (int, **Any) -> Dict[str, Union[str, datetime]]
         """Resizes a page blob to the specified size.
@@ -2363,6 +2484,7 @@ class BlobClient(StorageAccountHostsMixin):  # pylint: disable=too-many-public-m
         return options
 
     @distributed_trace
+    @invalidates_properties
     def upload_page( # type: ignore
             self, page,  # type: bytes
             offset,  # type: int
@@ -2388,13 +2510,17 @@ class BlobClient(StorageAccountHostsMixin):  # pylint: disable=too-many-public-m
             Required if the blob has an active lease. Value can be a BlobLeaseClient object
             or the lease ID as a string.
         :paramtype lease: ~azure.storage.blob.BlobLeaseClient or str
-        :keyword bool validate_content:
+        :keyword validate_content:
             If true, calculates an MD5 hash of the page content. The storage
             service checks the hash of the content that has arrived
             with the hash that was sent. This is primarily valuable for detecting
             bitflips on the wire if using http instead of https, as https (the default),
             will already validate. Note that this MD5 hash is not stored with the
             blob.
+            Set to "crc64" to send a CRC64 hash instead, in the x-ms-content-crc64 header.
+            The CRC64 is computed in Python, at a few MB per second while holding the GIL, which
+            throttles parallel transfers, unless the C extension of the crcmod package is installed.
+        :paramtype validate_content: bool or str
         :keyword int if_sequence_number_lte:
             If the blob's sequence number is less than or equal to
             the specified value, the request proceeds; otherwise it fails.
@@ -2511,6 +2637,7 @@ class BlobClient(StorageAccountHostsMixin):  # pylint: disable=too-many-public-m
         return options
 
     @distributed_trace
+    @invalidates_properties
     def upload_pages_from_url(self, source_url,  # type: str
                               offset,  # type: int
                               length,  # type: int
@@ -2654,6 +2781,7 @@ class BlobClient(StorageAccountHostsMixin):  # pylint: disable=too-many-public-m
         return options
 
     @distributed_trace
+    @invalidates_properties
     def clear_page(self, offset, length, **kwargs):
         # type: (int, int, **Any) -> Dict[str, Union[str, datetime]]
         """Clears a range of pages.
@@ -2769,6 +2897,7 @@ class BlobClient(StorageAccountHostsMixin):  # pylint: disable=too-many-public-m
         return options
 
     @distributed_trace
+    @invalidates_properties
     def append_block( # type: ignore
             self, data,  # type: Union[AnyStr, Iterable[AnyStr], IO[AnyStr]]
             length=None,  # type: Optional[int]
@@ -2782,13 +2911,17 @@ class BlobClient(StorageAccountHostsMixin):  # pylint: disable=too-many-public-m
         :type data: bytes or str or Iterable
         :param int length:
             Size of the block in bytes.
-        :keyword bool validate_content:
+        :keyword validate_content:
             If true, calculates an MD5 hash of the block content. The storage
             service checks the hash of the content that has arrived
             with the hash that was sent. This is primarily valuable for detecting
             bitflips on the wire if using http instead of https, as https (the default),
             will already validate. Note that this MD5 hash is not stored with the
             blob.
+            Set to "crc64" to send a CRC64 hash instead, in the x-ms-content-crc64 header.
+            The CRC64 is computed in Python, at a few MB per second while holding the GIL, which
+            throttles parallel transfers, unless the C extension of the crcmod package is installed.
+        :paramtype validate_content: bool or str
         :keyword int maxsize_condition:
             Optional conditional header. The max length in bytes permitted for
             the append blob. If the Append Block operation would cause the blob
@@ -2912,6 +3045,7 @@ class BlobClient(StorageAccountHostsMixin):  # pylint: disable=too-many-public-m
         return options
 
     @distributed_trace
+    @invalidates_properties
     def append_block_from_url(self, copy_source_url,  # type: str
                               source_offset=None,  # type: Optional[int]
                               source_length=None,  # type: Optional[int]
@@ -0,0 +1,120 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+
+import json
+import os
+import threading
+
+_JOURNAL_VERSION = 1
+
+
+def stream_fingerprint(stream):
+    """Describe the file behind a stream, so that a changed source file is not resumed.
+
+    :returns: The size and modification time of the file, or None if the stream is not a file.
+    """
+    try:
+        status = os.fstat(stream.fileno())
+    except (AttributeError, EnvironmentError, ValueError):
+        # Not a file, e.g. an in-memory stream
+        return None
+    return [status.st_size, status.st_mtime]
+
+
+class TransferJournal(object):
+    """Append-only journal of the chunks of a transfer, kept in a local file.
+
+    The first line describes the transfer, and each following line records a chunk
+    transferred, as a JSON [key, length] pair. The chunks of a previous journal are only
+    loaded if it describes the same transfer.
+
+    :param str path: The path of the journal file.
+    :param dict header: The description of the transfer.
+    """
+
+    def __init__(self, path, header):
+        self.path = path
+        self.header = dict(header, version=_JOURNAL_VERSION)
+        self.chunks = {}
+        self._file = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load(cls, path, header):
+        journal = cls(path, header)
+        try:
+            with open(path, "r") as journal_file:
+                lines = journal_file.read().splitlines()
+        except (IOError, OSError):
+            return journal
+        try:
+            if not lines or json.loads(lines[0]) != journal.header:
+                return journal
+        except ValueError:
+            return journal
+        for line in lines[1:]:
+            try:
+                key, length = json.loads(line)
+            except ValueError:
+                # The last record was only partly written
+                break
+            journal.chunks[key] = length
+        return journal
+
+    def start(self):
+        """Rewrite the journal with the chunks kept, and open it for recording new ones."""
+        self._file = open(self.path, "w")
+        lines = [json.dumps(self.header)]
+        lines.extend(json.dumps([key, length]) for key, length in self.chunks.items())
+        self._file.write("\n".join(lines) + "\n")
+        self._file.flush()
+
+    def record(self, key, length):
+        with self._lock:
+            self.chunks[key] = length
+            self._file.write(json.dumps([key, length]) + "\n")
+            self._file.flush()
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def remove(self):
+        """Close and delete the journal, once the transfer is complete."""
+        self.close()
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
+
+
+class CheckpointedBlockService(object):
+    """Stage blocks with the wrapped block blob operations, unless they are already staged.
+
+    Staged blocks are recorded in the journal, by block ID.
+    """
+
+    def __init__(self, service, journal):
+        self._service = service
+        self._journal = journal
+
+    def __getattr__(self, name):
+        return getattr(self._service, name)
+
+    def stage_block(self, block_id, content_length, body, **kwargs):
+        if self._journal.chunks.get(block_id) == content_length:
+            return None
+        response = self._service.stage_block(block_id, content_length, body, **kwargs)
+        self._journal.record(block_id, content_length)
+        return response
+
+
+def staged_blocks(block_list):
+    """The sizes of the uncommitted blocks of a generated BlockList, by block ID."""
+    if block_list is None or not block_list.uncommitted_blocks:
+        return {}
+    return {block.name: block.size for block in block_list.uncommitted_blocks}
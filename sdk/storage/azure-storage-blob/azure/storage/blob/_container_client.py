@@ -43,6 +43,9 @@ from ._models import ( # pylint: disable=unused-import
     BlobType,
     BlobPrefix)
 from ._lease import BlobLeaseClient, get_access_conditions
+from ._parallel_listing import ParallelListing
+from ._lean_listing import BlobRecordsPaged, Projection
+from ._properties_cache import cacheable_listing
 from ._blob_client import BlobClient
 
 if TYPE_CHECKING:
@@ -108,6 +111,9 @@ class ContainerClient(StorageAccountHostsMixin):
         the exceeded part will be downloaded in chunks (could be parallel). Defaults to 32*1024*1024, or 32MB.
     :keyword int max_chunk_get_size: The maximum chunk size used for downloading a blob. Defaults to 4*1024*1024,
         or 4MB.
+    :keyword ~azure.storage.blob.BlobPropertiesCache properties_cache:
+        A cache of the blob properties, passed on to the blob clients of the container. The blobs
+        listed with their metadata and copy properties are stored in it.
 
     .. admonition:: Example:
 
@@ -145,11 +151,18 @@ class ContainerClient(StorageAccountHostsMixin):
 
         _, sas_token = parse_query(parsed_url.query)
         self.container_name = container_name
+        self._properties_cache = kwargs.pop('properties_cache', None)
         self._query_str, credential = self._format_query_string(sas_token, credential)
         super(ContainerClient, self).__init__(parsed_url, service='blob', credential=credential, **kwargs)
         self._client = AzureBlobStorage(self.url, pipeline=self._pipeline)
         self._client._config.version = get_api_version(kwargs, VERSION)  # pylint: disable=protected-access
 
+    def _invalidate_properties(self, blobs):
+        if self._properties_cache is not None:
+            for blob in blobs:
+                self._properties_cache.invalidate(
+                    (self.primary_hostname, self.container_name, _get_blob_name(blob), None))
+
     def _format_url(self, hostname):
         container_name = self.container_name
         if isinstance(container_name, six.text_type):
@@ -645,6 +658,12 @@ class ContainerClient(StorageAccountHostsMixin):
         :param list[str] include:
             Specifies one or more additional datasets to include in the response.
             Options include: 'snapshots', 'metadata', 'uncommittedblobs', 'copy', 'deleted'.
+        :keyword list[str] select:
+            The BlobProperties attributes to return, e.g. ['size', 'last_modified']. The blobs
+            are then returned as lightweight BlobRecord items, read straight from the XML of the
+            listing, with only the name, the container and these attributes set. The
+            `content_settings`, `lease` and `copy` attributes are built when first accessed.
+            This is much faster than building the BlobProperties of large listings.
         :keyword int timeout:
             The timeout parameter is expressed in seconds.
         :returns: An iterable (auto-paging) response of BlobProperties.
@@ -664,15 +683,70 @@ class ContainerClient(StorageAccountHostsMixin):
 
         results_per_page = kwargs.pop('results_per_page', None)
         timeout = kwargs.pop('timeout', None)
+        select = kwargs.pop('select', None)
+        if select is not None:
+            command = functools.partial(
+                self._list_blob_records,
+                include=include,
+                timeout=timeout,
+                **kwargs)
+            return ItemPaged(
+                command, prefix=name_starts_with, results_per_page=results_per_page,
+                projection=Projection(select), page_iterator_class=BlobRecordsPaged)
         command = functools.partial(
             self._client.container.list_blob_flat_segment,
             include=include,
             timeout=timeout,
             **kwargs)
+        properties_cache = self._properties_cache if cacheable_listing(include) else None
         return ItemPaged(
             command, prefix=name_starts_with, results_per_page=results_per_page,
+            properties_cache=properties_cache, hostname=self.primary_hostname,
             page_iterator_class=BlobPropertiesPaged)
 
+    def _list_blob_records_request(self, include=None, timeout=None, prefix=None, marker=None, maxresults=None):
+        # type: (Optional[List[str]], Optional[int], Optional[str], Optional[str], Optional[int]) -> HttpRequest
+        """This code is a copy from _generated.
+
+        Once Autorest is able to skip the deserialization of a response this code should be removed.
+        """
+        serialize = self._client._serialize  # pylint: disable=protected-access
+        url = self._client._client.format_url(  # pylint: disable=protected-access
+            self._client.container.list_blob_flat_segment.metadata['url'],
+            url=serialize.url("self._config.url", self._client._config.url, 'str', skip_quote=True))  # pylint: disable=protected-access
+
+        # Construct parameters
+        query_parameters = {}
+        if prefix is not None:
+            query_parameters['prefix'] = serialize.query("prefix", prefix, 'str')
+        if marker is not None:
+            query_parameters['marker'] = serialize.query("marker", marker, 'str')
+        if maxresults is not None:
+            query_parameters['maxresults'] = serialize.query("maxresults", maxresults, 'int', minimum=1)
+        if include is not None:
+            query_parameters['include'] = serialize.query("include", include, '[ListBlobsIncludeItem]', div=',')
+        if timeout is not None:
+            query_parameters['timeout'] = serialize.query("timeout", timeout, 'int', minimum=0)
+        query_parameters['restype'] = serialize.query("restype", "container", 'str')
+        query_parameters['comp'] = serialize.query("comp", "list", 'str')
+
+        # Construct headers
+        header_parameters = {}
+        header_parameters['Accept'] = 'application/xml'
+        header_parameters['x-ms-version'] = serialize.header(
+            "self._config.version", self._client._config.version, 'str')  # pylint: disable=protected-access
+        return self._client._client.get(url, query_parameters, header_parameters)  # pylint: disable=protected-access
+
+    def _list_blob_records(self, include=None, timeout=None, prefix=None, marker=None, maxresults=None, **kwargs):
+        # type: (...) -> Tuple[str, HttpResponse]
+        """List a page of blobs, returning the response without deserializing its blobs."""
+        request = self._list_blob_records_request(
+            include=include, timeout=timeout, prefix=prefix, marker=marker, maxresults=maxresults)
+        response = self._pipeline.run(request, stream=False, **kwargs).http_response
+        if response.status_code != 200:
+            raise StorageErrorException(response, self._client._deserialize)  # pylint: disable=protected-access
+        return response.location_mode, response
+
     @distributed_trace
     def walk_blobs(
             self, name_starts_with=None, # type: Optional[str]
@@ -719,6 +793,64 @@ class ContainerClient(StorageAccountHostsMixin):
             results_per_page=results_per_page,
             delimiter=delimiter)
 
+    @distributed_trace
+    def list_blobs_parallel(self, name_starts_with=None, include=None, **kwargs):
+        # type: (Optional[str], Optional[Any], **Any) -> Iterator[BlobProperties]
+        """Returns a generator to list the blobs under the specified container, listing
+        partitions of the container in parallel.
+
+        The container is partitioned by the virtual directories found under `name_starts_with`
+        with the delimiter, and the blobs of up to `max_concurrency` of them are listed at once.
+        The blobs above the first delimiter are returned as they are found. Alternatively,
+        the partitions can be given as `prefixes`, e.g. "0" to "9" and "a" to "f" for blob
+        names starting with a hexadecimal hash.
+
+        :param str name_starts_with:
+            Filters the results to return only blobs whose names
+            begin with the specified prefix.
+        :param list[str] include:
+            Specifies one or more additional datasets to include in the response.
+            Options include: 'snapshots', 'metadata', 'uncommittedblobs', 'copy', 'deleted'.
+        :keyword str delimiter:
+            The delimiter of the virtual directories partitioning the container. Defaults to "/".
+        :keyword list[str] prefixes:
+            The prefixes of the blob names to list in parallel, instead of the virtual directories.
+            They follow `name_starts_with`, if given. The blobs whose names start with none of them
+            are not listed, and a blob whose name starts with two of them is listed twice.
+        :keyword int max_concurrency:
+            The largest number of partitions listed at once. Defaults to 8.
+        :keyword bool ordered:
+            Whether to return the blobs in name order, like list_blobs. The partitions are then
+            returned one after the other, while the next ones are listed ahead, with a bounded
+            number of pages buffered. Defaults to False, returning the pages of the partitions
+            as they are received.
+        :keyword int results_per_page:
+            The maximum number of blobs to retrieve per call.
+        :keyword int timeout:
+            The timeout parameter is expressed in seconds.
+        :returns: An iterator of BlobProperties.
+        :rtype: Iterator[~azure.storage.blob.BlobProperties]
+        """
+        if include and not isinstance(include, list):
+            include = [include]
+        delimiter = kwargs.pop('delimiter', '/')
+        prefixes = kwargs.pop('prefixes', None)
+        max_concurrency = kwargs.pop('max_concurrency', 8)
+        ordered = kwargs.pop('ordered', False)
+        results_per_page = kwargs.pop('results_per_page', None)
+        if prefixes is not None and name_starts_with:
+            prefixes = [name_starts_with + prefix for prefix in prefixes]
+
+        def list_pages(prefix):
+            return self.list_blobs(
+                name_starts_with=prefix, include=include, results_per_page=results_per_page, **kwargs).by_page()
+
+        # The virtual directories are discovered when the iteration starts
+        items = self.walk_blobs(
+            name_starts_with=name_starts_with, include=include, delimiter=delimiter,
+            results_per_page=results_per_page, **kwargs)
+        return iter(ParallelListing(items, list_pages, max_concurrency, ordered, prefixes=prefixes))
+
     @distributed_trace
     def upload_blob(
             self, name,  # type: Union[str, BlobProperties]
@@ -752,7 +884,7 @@ class ContainerClient(StorageAccountHostsMixin):
         :keyword ~azure.storage.blob.ContentSettings content_settings:
             ContentSettings object used to set blob properties. Used to set content type, encoding,
             language, disposition, md5, and cache control.
-        :keyword bool validate_content:
+        :keyword validate_content:
             If true, calculates an MD5 hash for each chunk of the blob. The storage
             service checks the hash of the content that has arrived with the hash
             that was sent. This is primarily valuable for detecting bitflips on
@@ -761,6 +893,10 @@ class ContainerClient(StorageAccountHostsMixin):
             blob. Also note that if enabled, the memory-efficient upload algorithm
             will not be used, because computing the MD5 hash requires buffering
             entire blocks, and doing so defeats the purpose of the memory-efficient algorithm.
+            Set to "crc64" to send a CRC64 hash instead, in the x-ms-content-crc64 header.
+            The CRC64 is computed in Python, at a few MB per second while holding the GIL, which
+            throttles parallel transfers, unless the C extension of the crcmod package is installed.
+        :paramtype validate_content: bool or str
         :keyword lease:
             Required if the container has an active lease. Value can be a BlobLeaseClient object
             or the lease ID as a string.
@@ -920,7 +1056,7 @@ class ContainerClient(StorageAccountHostsMixin):
         :param int length:
             Number of bytes to read from the stream. This is optional, but
             should be supplied for optimal performance.
-        :keyword bool validate_content:
+        :keyword validate_content:
             If true, calculates an MD5 hash for each chunk of the blob. The storage
             service checks the hash of the content that has arrived with the hash
             that was sent. This is primarily valuable for detecting bitflips on
@@ -929,6 +1065,11 @@ class ContainerClient(StorageAccountHostsMixin):
             blob. Also note that if enabled, the memory-efficient upload algorithm
             will not be used because computing the MD5 hash requires buffering
             entire blocks, and doing so defeats the purpose of the memory-efficient algorithm.
+            Set to "crc64" to have the service return a CRC64 hash of each chunk instead,
+            checked as the chunk is received.
+            The CRC64 is computed in Python, at a few MB per second while holding the GIL, which
+            throttles parallel transfers, unless the C extension of the crcmod package is installed.
+        :paramtype validate_content: bool or str
         :keyword lease:
             Required if the blob has an active lease. If specified, download_blob only
             succeeds if the blob's lease is active and matches this ID. Value can be a
@@ -1115,7 +1256,10 @@ class ContainerClient(StorageAccountHostsMixin):
             req.format_parameters(query_parameters)
             reqs.append(req)
 
-        return self._batch_send(*reqs, **options)
+        try:
+            return self._batch_send(*reqs, **options)
+        finally:
+            self._invalidate_properties(blobs)
 
     def _generate_set_tier_options(
         self, tier, rehydrate_priority=None, request_id=None, lease_access_conditions=None, **kwargs
@@ -1211,7 +1355,10 @@ class ContainerClient(StorageAccountHostsMixin):
             req.format_parameters(query_parameters)
             reqs.append(req)
 
-        return self._batch_send(*reqs, **kwargs)
+        try:
+            return self._batch_send(*reqs, **kwargs)
+        finally:
+            self._invalidate_properties(blobs)
 
     @distributed_trace
     def set_premium_page_blob_tier_blobs(
@@ -1270,7 +1417,10 @@ class ContainerClient(StorageAccountHostsMixin):
             req.format_parameters(query_parameters)
             reqs.append(req)
 
-        return self._batch_send(*reqs, **kwargs)
+        try:
+            return self._batch_send(*reqs, **kwargs)
+        finally:
+            self._invalidate_properties(blobs)
 
     def get_blob_client(
             self, blob,  # type: Union[str, BlobProperties]
@@ -1309,4 +1459,4 @@ class ContainerClient(StorageAccountHostsMixin):
             credential=self.credential, api_version=self.api_version, _configuration=self._config,
             _pipeline=_pipeline, _location_mode=self._location_mode, _hosts=self._hosts,
             require_encryption=self.require_encryption, key_encryption_key=self.key_encryption_key,
-            key_resolver_function=self.key_resolver_function)
+            key_resolver_function=self.key_resolver_function, properties_cache=self._properties_cache)
@@ -4,17 +4,33 @@
 # license information.
 # --------------------------------------------------------------------------
 
+import mmap
+import os
+import stat
 import sys
 import threading
+import time
 import warnings
-from io import BytesIO
+from bisect import bisect_right
+from contextlib import contextmanager
+from io import BytesIO, SEEK_CUR, UnsupportedOperation
+
+import six
+
+try:
+    from fcntl import fcntl, F_GETFL
+except ImportError:  # Windows
+    fcntl = None
 
 from azure.core.exceptions import HttpResponseError
 from azure.core.tracing.common import with_current_context
+from ._shared.checksums import content_checksum, range_validation_flags
 from ._shared.encryption import decrypt_blob
 from ._shared.request_handlers import validate_and_format_range_headers
 from ._shared.response_handlers import process_storage_error, parse_length_from_content_range
+from ._shared.tuning import concurrency_limit, start_tuner
 from ._deserialize import get_page_ranges_result
+from ._checkpoint import TransferJournal
 
 
 def process_range_and_offset(start_range, end_range, length, encryption):
@@ -40,13 +56,21 @@ def process_range_and_offset(start_range, end_range, length, encryption):
     return (start_range, end_range), (start_offset, end_offset)
 
 
-def process_content(data, start_offset, end_offset, encryption):
+def process_content(data, start_offset, end_offset, encryption, validate_content=None):
     if data is None:
         raise ValueError("Response cannot be None.")
+    checksum = content_checksum(validate_content)
     try:
-        content = b"".join(list(data))
+        pieces = []
+        for piece in data:
+            if checksum is not None:
+                checksum.update(piece)
+            pieces.append(piece)
+        content = b"".join(pieces)
     except Exception as error:
         raise HttpResponseError(message="Download stream interrupted.", response=data.response, error=error)
+    if checksum is not None:
+        checksum.check(data.response.headers, response=data.response)
     if content and encryption.get("key") is not None or encryption.get("resolver") is not None:
         try:
             return decrypt_blob(
@@ -63,6 +87,130 @@ def process_content(data, start_offset, end_offset, encryption):
     return content
 
 
+def copy_content(data, view, validate_content=None):
+    """Copy the content of a response into a writable buffer, as it is received."""
+    if data is None:
+        raise ValueError("Response cannot be None.")
+    checksum = content_checksum(validate_content)
+    position = 0
+    try:
+        for piece in data:
+            if checksum is not None:
+                checksum.update(piece)
+            view[position:position + len(piece)] = piece
+            position += len(piece)
+    except Exception as error:
+        raise HttpResponseError(message="Download stream interrupted.", response=data.response, error=error)
+    if position != len(view):
+        raise HttpResponseError(message="Download stream interrupted.", response=data.response)
+    if checksum is not None:
+        checksum.check(data.response.headers, response=data.response)
+
+
+def _writable_view(target, size):
+    view = memoryview(target)
+    if view.readonly or view.itemsize != 1 or len(view) < size:
+        raise ValueError("Target must be a writable bytes-like object of at least {} bytes.".format(size))
+    return view
+
+
+@contextmanager
+def _map_file(stream, size):
+    """Resize a file opened for update, and memory-map it for write access.
+
+    Yields a writable memoryview over the file, or None if it cannot be mapped
+    (empty file, or Python 2.7 mmap not supporting memoryview).
+    """
+    stream.truncate(size)
+    if not size:
+        yield None
+        return
+    mapped = mmap.mmap(stream.fileno(), size, access=mmap.ACCESS_WRITE)
+    try:
+        view = memoryview(mapped)
+    except TypeError:
+        view = None
+    try:
+        yield view
+        mapped.flush()
+    finally:
+        if view is not None:
+            view.release()
+        try:
+            mapped.close()
+        except BufferError:
+            # Some chunk slots are still referenced (failed download), let the GC unmap the file
+            pass
+
+
+def _open_checkpoint(checkpoint, path, header):
+    """Load the journal of a download into a file, and choose the mode to open the file with.
+
+    The file is only updated in place if it was left by the same download.
+    """
+    journal = TransferJournal.load(checkpoint, header)
+    if journal.chunks and os.path.isfile(path) and os.path.getsize(path) == header["size"]:
+        mode = "r+b"
+    else:
+        journal.chunks = {}
+        mode = "wb+"
+    journal.start()
+    return journal, mode
+
+
+class PageRangeIndex(object):
+    """The sorted page ranges of a page blob, searched by bisection.
+
+    :param list[dict[str, int]] ranges: The non-empty page ranges, with inclusive 'start' and 'end' offsets.
+    """
+
+    def __init__(self, ranges):
+        ranges = sorted((page_range['start'], page_range['end']) for page_range in ranges)
+        self.starts = [start for start, _ in ranges]
+        self.ends = [end for _, end in ranges]
+
+    def __len__(self):
+        return len(self.starts)
+
+    def overlaps(self, start, end):
+        """Whether any page range overlaps the range of bytes from start to end, both inclusive."""
+        # The last page range starting at or before end is the only one which may reach start,
+        # as the ranges do not overlap each other
+        index = bisect_right(self.starts, end) - 1
+        return index >= 0 and self.ends[index] >= start
+
+
+_EMPTY_CHUNK = [b""]
+
+
+def empty_chunk(length):
+    """Return a chunk of zeros, shared by the downloads until another length is asked for."""
+    chunk = _EMPTY_CHUNK[0]
+    if len(chunk) != length:
+        chunk = _EMPTY_CHUNK[0] = b"\x00" * length
+    return chunk
+
+
+def leaves_holes(stream):
+    """Whether the empty chunks of a download into a stream can be skipped rather than written.
+
+    This is the case when the stream is a regular file written past its end, where the file
+    system fills any gap with zeros, without allocating them on the disk if it supports sparse files.
+    It is not the case for a file opened for appending, whose writes all go to its end, ignoring
+    the seeks over the empty chunks.
+    """
+    if 'a' in str(getattr(stream, 'mode', '')):
+        return False
+    try:
+        fileno = stream.fileno()
+        if fcntl is not None and fcntl(fileno, F_GETFL) & os.O_APPEND:
+            return False
+        status = os.fstat(fileno)
+        return stat.S_ISREG(status.st_mode) and status.st_size <= stream.tell()
+    except (AttributeError, UnsupportedOperation, EnvironmentError, ValueError):
+        return False
+
+
 class _ChunkDownloader(object):  # pylint: disable=too-many-instance-attributes
     def __init__(
         self,
@@ -77,13 +225,18 @@ class _ChunkDownloader(object):  # pylint: disable=too-many-instance-attributes
         parallel=None,
         validate_content=None,
         encryption_options=None,
+        tuner=None,
+        sparse=False,
         **kwargs
     ):
         self.client = client
         self.non_empty_ranges = non_empty_ranges
+        self.page_ranges = PageRangeIndex(non_empty_ranges) if non_empty_ranges is not None else None
 
         # Information on the download range/chunk size
         self.chunk_size = chunk_size
+        self.tuner = tuner
+        self._chunk_sizes = {}
         self.total_size = total_size
         self.start_index = start_range
         self.end_index = end_range
@@ -95,7 +248,9 @@ class _ChunkDownloader(object):  # pylint: disable=too-many-instance-attributes
 
         # For a parallel download, the stream is always seekable, so we note down the current position
         # in order to seek to the right place when out-of-order chunks come in
-        self.stream_start = stream.tell() if parallel else None
+        self.stream_start = stream.tell() if parallel and stream is not None else None
+        # With a sparse stream, the empty chunks are skipped over rather than written
+        self.sparse = sparse and self.page_ranges is not None
 
         # Download progress so far
         self.progress_total = current_progress
@@ -108,24 +263,38 @@ class _ChunkDownloader(object):  # pylint: disable=too-many-instance-attributes
         self.request_options = kwargs
 
     def _calculate_range(self, chunk_start):
-        if chunk_start + self.chunk_size > self.end_index:
+        chunk_size = self._chunk_sizes.get(chunk_start, self.chunk_size)
+        if chunk_start + chunk_size > self.end_index:
             chunk_end = self.end_index
         else:
-            chunk_end = chunk_start + self.chunk_size
+            chunk_end = chunk_start + chunk_size
         return chunk_start, chunk_end
 
     def get_chunk_offsets(self):
         index = self.start_index
         while index < self.end_index:
+            chunk_size = self.chunk_size
+            if self.tuner is not None:
+                # The tuner may change the chunk size before this chunk is processed
+                chunk_size = self._chunk_sizes[index] = self.tuner.chunk_size
             yield index
-            index += self.chunk_size
+            index += chunk_size
+
+    def _record_chunk(self, length, started):
+        if self.tuner is not None:
+            self.tuner.record(length, time.time() - started)
 
     def process_chunk(self, chunk_start):
+        started = time.time()
         chunk_start, chunk_end = self._calculate_range(chunk_start)
+        if self._skip_empty_chunk(chunk_start, chunk_end):
+            self._update_progress(chunk_end - chunk_start)
+            return
         chunk_data = self._download_chunk(chunk_start, chunk_end - 1)
         length = chunk_end - chunk_start
         if length > 0:
             self._write_to_stream(chunk_data, chunk_start)
+            self._record_chunk(length, started)
             self._update_progress(length)
 
     def yield_chunk(self, chunk_start):
@@ -147,30 +316,27 @@ class _ChunkDownloader(object):  # pylint: disable=too-many-instance-attributes
         else:
             self.stream.write(chunk_data)
 
+    def _skip_empty_chunk(self, chunk_start, chunk_end):
+        if not self.sparse or chunk_end <= chunk_start or not self._do_optimize(chunk_start, chunk_end - 1):
+            return False
+        if not self.stream_lock:
+            # The parallel writes seek to their own position, the sequential ones follow on
+            self.stream.seek(chunk_end - chunk_start, SEEK_CUR)
+        return True
+
+    def finish_stream(self):
+        """Extend a sparse stream over the empty chunks skipped at its end, and seek to its end."""
+        if self.sparse:
+            if self.stream_start is not None:
+                self.stream.seek(self.stream_start + (self.end_index - self.start_index))
+            self.stream.truncate()
+
     def _do_optimize(self, given_range_start, given_range_end):
         # If we have no page range list stored, then assume there's data everywhere for that page blob
         # or it's a block blob or append blob
-        if self.non_empty_ranges is None:
+        if self.page_ranges is None:
             return False
-
-        for source_range in self.non_empty_ranges:
-            # Case 1: As the range list is sorted, if we've reached such a source_range
-            # we've checked all the appropriate source_range already and haven't found any overlapping.
-            # so the given range doesn't have any data and download optimization could be applied.
-            # given range:		|   |
-            # source range:			       |   |
-            if given_range_end < source_range['start']:  # pylint:disable=no-else-return
-                return True
-            # Case 2: the given range comes after source_range, continue checking.
-            # given range:				|   |
-            # source range:	|   |
-            elif source_range['end'] < given_range_start:
-                pass
-            # Case 3: source_range and given range overlap somehow, no need to optimize.
-            else:
-                return False
-        # Went through all src_ranges, but nothing overlapped. Optimization will be applied.
-        return True
+        return not self.page_ranges.overlaps(given_range_start, given_range_end)
 
     def _download_chunk(self, chunk_start, chunk_end):
         download_range, offset = process_range_and_offset(
@@ -180,34 +346,71 @@ class _ChunkDownloader(object):  # pylint: disable=too-many-instance-attributes
         # No need to download the empty chunk from server if there's no data in the chunk to be downloaded.
         # Do optimize and create empty chunk locally if condition is met.
         if self._do_optimize(download_range[0], download_range[1]):
-            chunk_data = b"\x00" * self.chunk_size
+            chunk_data = empty_chunk(chunk_end - chunk_start + 1)
         else:
-            range_header, range_validation = validate_and_format_range_headers(
-                download_range[0],
-                download_range[1],
-                check_content_md5=self.validate_content
+            response = self._request_chunk(download_range)
+            chunk_data = process_content(
+                response, offset[0], offset[1], self.encryption_options, self.validate_content)
+        return chunk_data
+
+    def _request_chunk(self, download_range):
+        range_header, range_validation = validate_and_format_range_headers(
+            download_range[0],
+            download_range[1],
+            check_content_md5=self.validate_content
+        )
+        range_md5, range_crc64 = range_validation_flags(self.validate_content, range_validation)
+
+        try:
+            _, response = self.client.download(
+                range=range_header,
+                range_get_content_md5=range_md5,
+                range_get_content_crc64=range_crc64,
+                validate_content=self.validate_content,
+                data_stream_total=self.total_size,
+                download_stream_current=self.progress_total,
+                **self.request_options
             )
+        except HttpResponseError as error:
+            process_storage_error(error)
 
-            try:
-                _, response = self.client.download(
-                    range=range_header,
-                    range_get_content_md5=range_validation,
-                    validate_content=self.validate_content,
-                    data_stream_total=self.total_size,
-                    download_stream_current=self.progress_total,
-                    **self.request_options
-                )
-            except HttpResponseError as error:
-                process_storage_error(error)
+        # This makes sure that if_match is set so that we can validate
+        # that subsequent downloads are to an unmodified blob
+        if self.request_options.get("modified_access_conditions"):
+            self.request_options["modified_access_conditions"].if_match = response.properties.etag
+        return response
 
-            chunk_data = process_content(response, offset[0], offset[1], self.encryption_options)
 
-            # This makes sure that if_match is set so that we can validate
-            # that subsequent downloads are to an unmodified blob
-            if self.request_options.get("modified_access_conditions"):
-                self.request_options["modified_access_conditions"].if_match = response.properties.etag
+class _BufferChunkDownloader(_ChunkDownloader):
+    """Download each chunk straight into its own slot of a writable buffer.
 
-        return chunk_data
+    Slots never overlap, so chunks downloaded in parallel need neither a lock nor a seek.
+    With a journal, the chunks it records are skipped, and each chunk written is recorded.
+    """
+
+    def __init__(self, buffer=None, zero_empty_chunks=True, journal=None, **kwargs):
+        super(_BufferChunkDownloader, self).__init__(**kwargs)
+        self.buffer = buffer
+        self.zero_empty_chunks = zero_empty_chunks
+        self.journal = journal
+
+    def process_chunk(self, chunk_start):
+        started = time.time()
+        chunk_start, chunk_end = self._calculate_range(chunk_start)
+        length = chunk_end - chunk_start
+        if length > 0:
+            if self.journal is not None and self.journal.chunks.get(str(chunk_start)) == length:
+                self._update_progress(length)
+                return
+            slot = self.buffer[chunk_start - self.start_index:chunk_end - self.start_index]
+            if not self._do_optimize(chunk_start, chunk_end - 1):
+                copy_content(self._request_chunk((chunk_start, chunk_end - 1)), slot, self.validate_content)
+            elif self.zero_empty_chunks:
+                slot[:] = empty_chunk(length)
+            self._record_chunk(length, started)
+            self._update_progress(length)
+            if self.journal is not None:
+                self.journal.record(str(chunk_start), length)
 
 
 class _ChunkIterator(object):
@@ -274,6 +477,8 @@ class StorageStreamDownloader(object):  # pylint: disable=too-many-instance-attr
         name=None,
         container=None,
         encoding=None,
+        tuner=None,
+        executor=None,
         **kwargs
     ):
         self.name = name
@@ -286,6 +491,8 @@ class StorageStreamDownloader(object):  # pylint: disable=too-many-instance-attr
         self._start_range = start_range
         self._end_range = end_range
         self._max_concurrency = max_concurrency
+        self._tuner = tuner
+        self._executor = executor
         self._encoding = encoding
         self._validate_content = validate_content
         self._encryption_options = encryption_options or {}
@@ -341,7 +548,8 @@ class StorageStreamDownloader(object):  # pylint: disable=too-many-instance-attr
                 self._response,
                 self._initial_offset[0],
                 self._initial_offset[1],
-                self._encryption_options
+                self._encryption_options,
+                self._validate_content
             )
 
     def __len__(self):
@@ -355,11 +563,13 @@ class StorageStreamDownloader(object):  # pylint: disable=too-many-instance-attr
             end_range_required=False,
             check_content_md5=self._validate_content
         )
+        range_md5, range_crc64 = range_validation_flags(self._validate_content, range_validation)
 
         try:
             location_mode, response = self._clients.blob.download(
                 range=range_header,
-                range_get_content_md5=range_validation,
+                range_get_content_md5=range_md5,
+                range_get_content_crc64=range_crc64,
                 validate_content=self._validate_content,
                 data_stream_total=None,
                 download_stream_current=0,
@@ -507,12 +717,14 @@ class StorageStreamDownloader(object):  # pylint: disable=too-many-instance-attr
         :param stream:
             The stream to download to. This can be an open file-handle,
             or any writable stream. The stream must be seekable if the download
-            uses more than one parallel connection.
+            uses more than one parallel connection. When a page blob is downloaded
+            to the end of a file, its empty pages are skipped over rather than written,
+            leaving them as holes of a sparse file.
         :returns: The number of bytes read.
         :rtype: int
         """
         # The stream must be seekable if parallel download is required
-        parallel = self._max_concurrency > 1
+        parallel = self._is_parallel()
         if parallel:
             error_message = "Target stream handle must be seekable."
             if sys.version_info >= (3,) and not stream.seekable():
@@ -546,18 +758,145 @@ class StorageStreamDownloader(object):  # pylint: disable=too-many-instance-attr
             validate_content=self._validate_content,
             encryption_options=self._encryption_options,
             use_location=self._location_mode,
+            tuner=self._tuner,
+            sparse=self._is_sparse_target(stream),
             **self._request_options
         )
-        if parallel:
-            import concurrent.futures
-            executor = concurrent.futures.ThreadPoolExecutor(self._max_concurrency)
-            list(executor.map(
+        self._process_chunks(downloader, parallel)
+        downloader.finish_stream()
+        return self.size
+
+    def _is_sparse_target(self, stream):
+        encrypted = self._encryption_options.get("key") is not None or \
+            self._encryption_options.get("resolver") is not None
+        return self._non_empty_ranges is not None and not encrypted and leaves_holes(stream)
+
+    def _is_parallel(self):
+        return concurrency_limit(self._tuner, self._max_concurrency) > 1
+
+    def _process_chunks(self, downloader, parallel):
+        max_workers = start_tuner(self._tuner, self._config.max_chunk_get_size, self._max_concurrency)
+        if not parallel:
+            for chunk in downloader.get_chunk_offsets():
+                downloader.process_chunk(chunk)
+            return
+
+        import concurrent.futures
+        if self._executor is not None:
+            # A shared executor bounds the requests in flight across transfers
+            self._schedule_chunks(self._executor, downloader, max_workers)
+            return
+        with concurrent.futures.ThreadPoolExecutor(max_workers) as executor:
+            if self._tuner is None:
+                list(executor.map(
                     with_current_context(downloader.process_chunk),
                     downloader.get_chunk_offsets()
                 ))
-        else:
-            for chunk in downloader.get_chunk_offsets():
-                downloader.process_chunk(chunk)
+                return
+            self._schedule_chunks(executor, downloader, max_workers)
+
+    def _schedule_chunks(self, executor, downloader, max_workers):
+        import concurrent.futures
+        # An autotuned download adjusts the number of chunks in flight as it goes
+        dl_tasks = downloader.get_chunk_offsets()
+        running_futures = set()
+        while True:
+            try:
+                while len(running_futures) < (self._tuner.concurrency if self._tuner else max_workers):
+                    running_futures.add(executor.submit(
+                        with_current_context(downloader.process_chunk), next(dl_tasks)))
+            except StopIteration:
+                break
+            done, running_futures = concurrent.futures.wait(
+                running_futures, return_when=concurrent.futures.FIRST_COMPLETED)
+            for future in done:
+                future.result()
+        for future in concurrent.futures.as_completed(running_futures):
+            future.result()
+
+    def download_into(self, target, checkpoint=None):
+        """Download the contents of this blob straight into a buffer or a file.
+
+        Unlike readinto, each chunk is written into its own slot of the target as it
+        is received, so parallel connections never wait on each other, and no
+        intermediate copy of the chunk is made. Client-side encryption is not supported.
+
+        :param target:
+            A writable bytes-like object (e.g. a bytearray, or a memoryview over one) of
+            at least `size` bytes, or the path of a file. The file is created, or truncated,
+            with the size of the download and is written through a memory map.
+        :type target: bytearray or memoryview or str
+        :param str checkpoint:
+            The path of a local journal file making a download into a file resumable. The
+            chunks written are recorded in it, and when the download of the same range of
+            the same version (ETag) of the blob into the same file is retried with the same
+            checkpoint, these chunks are not downloaded again. The journal is deleted once
+            the download is complete.
+        :returns: The number of bytes read.
+        :rtype: int
+        """
+        if self._encryption_options.get("key") is not None or self._encryption_options.get("resolver") is not None:
+            raise ValueError("download_into does not support client-side encryption, use readinto instead.")
+        if isinstance(target, six.string_types):
+            journal, mode = None, "wb+"
+            if checkpoint is not None:
+                journal, mode = _open_checkpoint(checkpoint, target, self._checkpoint_header())
+            try:
+                with open(target, mode) as stream, _map_file(stream, self.size) as view:
+                    if view is None:
+                        size = self.readinto(stream)
+                    else:
+                        # A new file was just extended with zeros, empty pages can be left as holes
+                        size = self._download_into_view(view, zero_empty_chunks=mode != "wb+", journal=journal)
+                if journal is not None:
+                    journal.remove()
+                return size
+            finally:
+                if journal is not None:
+                    journal.close()
+        if checkpoint is not None:
+            raise ValueError("A checkpoint is only supported when downloading into a file.")
+        return self._download_into_view(_writable_view(target, self.size), zero_empty_chunks=True)
+
+    def _checkpoint_header(self):
+        return {
+            "blob": "/".join([self.container, self.name]),
+            "etag": self.properties.etag,
+            "offset": self._start_range or 0,
+            "size": self.size
+        }
+
+    def _download_into_view(self, view, zero_empty_chunks, journal=None):
+        content_length = len(self._current_content)
+        view[:content_length] = self._current_content
+        if self._download_complete:
+            return self.size
+
+        data_end = self._file_size
+        if self._end_range is not None:
+            # Use the length unless it is over the end of the file
+            data_end = min(self._file_size, self._end_range + 1)
+
+        parallel = self._is_parallel()
+        downloader = _BufferChunkDownloader(
+            buffer=view[content_length:self.size],
+            zero_empty_chunks=zero_empty_chunks,
+            journal=journal,
+            client=self._clients.blob,
+            non_empty_ranges=self._non_empty_ranges,
+            total_size=self.size,
+            chunk_size=self._config.max_chunk_get_size,
+            current_progress=self._first_get_size,
+            start_range=self._initial_range[1] + 1,  # Start where the first download ended
+            end_range=data_end,
+            parallel=parallel,
+            validate_content=self._validate_content,
+            encryption_options=self._encryption_options,
+            use_location=self._location_mode,
+            tuner=self._tuner,
+            **self._request_options
+        )
+        self._process_chunks(downloader, parallel)
         return self.size
 
     def download_to_stream(self, stream, max_concurrency=1):
@@ -0,0 +1,250 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from typing import (  # pylint: disable=unused-import
+    Optional, Any, Dict, List, Tuple, Union, TypeVar, TYPE_CHECKING
+)
+
+from ._download import empty_chunk
+
+if TYPE_CHECKING:
+    from ._models import BlobProperties
+    BlobClient = TypeVar("BlobClient")
+
+# The largest body of a Put Page or Put Page From URL request
+MAX_PAGE_WRITE_SIZE = 4 * 1024 * 1024
+
+
+def coalesce_page_ranges(ranges, max_size=None):
+    # type: (List[Dict[str, int]], Optional[int]) -> List[Tuple[int, int]]
+    """Merge the adjacent or overlapping page ranges, and split them into writes of up to max_size bytes.
+
+    :param list[dict[str, int]] ranges: The page ranges, with inclusive 'start' and 'end' offsets.
+    :returns: The (offset, length) of the writes, in order.
+    :rtype: list[tuple[int, int]]
+    """
+    merged = []  # type: List[List[int]]
+    for start, end in sorted((page_range['start'], page_range['end']) for page_range in ranges):
+        if merged and start <= merged[-1][1] + 1:
+            merged[-1][1] = max(merged[-1][1], end)
+        else:
+            merged.append([start, end])
+    writes = []
+    for start, end in merged:
+        while start <= end:
+            stop = end if max_size is None else min(end, start + max_size - 1)
+            writes.append((start, stop - start + 1))
+            start = stop + 1
+    return writes
+
+
+class PageBlobSyncReport(object):
+    """The report of an incremental sync of a page blob.
+
+    :ivar int size: The size of the source page blob, in bytes.
+    :ivar int changed_bytes: The number of bytes of the pages changed since the previous snapshot.
+    :ivar int cleared_bytes: The number of bytes of the pages cleared since the previous snapshot.
+    :ivar int writes: The number of writes of changed pages, after they were coalesced.
+    :ivar int clears: The number of ranges of cleared pages.
+    :ivar float elapsed: The duration of the sync, in seconds.
+    """
+
+    def __init__(self, size):
+        self.size = size
+        self.changed_bytes = 0
+        self.cleared_bytes = 0
+        self.writes = 0
+        self.clears = 0
+        self.elapsed = 0.0
+
+    @property
+    def bytes_saved(self):
+        # type: () -> int
+        """The number of bytes not transferred, compared with a copy of the whole blob."""
+        return max(self.size - self.changed_bytes, 0)
+
+    def __repr__(self):
+        return "PageBlobSyncReport(size={}, changed_bytes={}, cleared_bytes={}, bytes_saved={})".format(
+            self.size, self.changed_bytes, self.cleared_bytes, self.bytes_saved)
+
+
+class PageBlobSync(object):
+    """Bring a copy of a page blob, like a managed disk, up to date with only the pages changed.
+
+    The copy, a local image or another page blob, must hold the content of a previous snapshot of
+    the source blob. The page ranges changed and cleared since that snapshot are listed with a
+    single diff request, the adjacent ranges are coalesced into writes of up to 4 MiB, and up to
+    `max_concurrency` writes are run in parallel. The source should be a snapshot, or a blob not
+    written to during the sync.
+
+    :param source_client:
+        The client of the source page blob, or of a snapshot of it.
+    :type source_client: ~azure.storage.blob.BlobClient
+    :param int max_concurrency: The largest number of writes in flight. Defaults to 8.
+    :param int max_write_size:
+        The largest number of bytes of a write, up to 4 MiB, which is the default.
+    """
+
+    def __init__(
+            self, source_client,  # type: BlobClient
+            max_concurrency=8,  # type: int
+            max_write_size=MAX_PAGE_WRITE_SIZE  # type: int
+        ):
+        # type: (...) -> None
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be greater than 0.")
+        if not 0 < max_write_size <= MAX_PAGE_WRITE_SIZE or max_write_size % 512:
+            raise ValueError("max_write_size must be a multiple of 512 up to {}.".format(MAX_PAGE_WRITE_SIZE))
+        self.source_client = source_client
+        self.max_concurrency = max_concurrency
+        self.max_write_size = max_write_size
+
+    def _get_diff(self, previous_snapshot, previous_snapshot_url, timeout):
+        if previous_snapshot_url is not None:
+            return self.source_client.get_page_range_diff_for_managed_disk(previous_snapshot_url, timeout=timeout)
+        return self.source_client.get_page_ranges(previous_snapshot_diff=previous_snapshot, timeout=timeout)
+
+    def _plan(self, size, changed, cleared):
+        report = PageBlobSyncReport(size)
+        # The pages past the end of a blob which shrank since the snapshot are dropped by the resize
+        writes = [(offset, min(length, size - offset))
+                  for offset, length in coalesce_page_ranges(changed, self.max_write_size) if offset < size]
+        clears = [(offset, min(length, size - offset))
+                  for offset, length in coalesce_page_ranges(cleared) if offset < size]
+        report.writes, report.clears = len(writes), len(clears)
+        report.changed_bytes = sum(length for _, length in writes)
+        report.cleared_bytes = sum(length for _, length in clears)
+        return report, writes, clears
+
+    @staticmethod
+    def _sync_options(previous_snapshot, kwargs):
+        previous_snapshot_url = kwargs.pop('previous_snapshot_url', None)
+        if (previous_snapshot is None) == (previous_snapshot_url is None):
+            raise ValueError("Either previous_snapshot or previous_snapshot_url must be specified.")
+        return previous_snapshot_url, kwargs.pop('timeout', None)
+
+    @staticmethod
+    def _operations(write, writes, clear, clears):
+        return deque([(write, w) for w in writes] + [(clear, c) for c in clears])
+
+    def _run(self, write, writes, clear, clears):
+        operations = self._operations(write, writes, clear, clears)
+
+        def worker():
+            try:
+                while True:
+                    try:
+                        operation, (offset, length) = operations.popleft()
+                    except IndexError:
+                        # The last operations were taken by the other workers
+                        return
+                    operation(offset, length)
+            except BaseException:
+                # Stop the other workers once their operation in flight is done
+                operations.clear()
+                raise
+
+        with ThreadPoolExecutor(self.max_concurrency) as executor:
+            for future in [executor.submit(worker) for _ in range(self.max_concurrency)]:
+                future.result()
+
+    def sync_to_file(self, path, previous_snapshot=None, **kwargs):
+        # type: (str, Optional[Union[str, Dict[str, Any], BlobProperties]], **Any) -> PageBlobSyncReport
+        """Update a local image holding the content of a previous snapshot of the source blob.
+
+        The changed pages are downloaded and written in place, the cleared pages are zeroed,
+        and the file is resized to the size of the source blob.
+
+        :param str path: The path of the local image.
+        :param previous_snapshot:
+            The previous snapshot, as a snapshot ID string, or the dict or BlobProperties
+            returned by `create_snapshot` or `get_blob_properties`.
+        :type previous_snapshot: str or dict(str, Any) or ~azure.storage.blob.BlobProperties
+        :keyword str previous_snapshot_url:
+            The URL of a previous snapshot of a managed disk, instead of previous_snapshot.
+        :keyword int timeout:
+            The timeout parameter is expressed in seconds, for each request.
+        :returns: The report of the sync.
+        :rtype: ~azure.storage.blob.PageBlobSyncReport
+        """
+        started = time.time()
+        previous_snapshot_url, timeout = self._sync_options(previous_snapshot, kwargs)
+        size = self.source_client.get_blob_properties(timeout=timeout).size
+        report, writes, clears = self._plan(size, *self._get_diff(previous_snapshot, previous_snapshot_url, timeout))
+        lock = threading.Lock()
+        with open(path, 'r+b') as image:
+            image.truncate(report.size)
+
+            def write(offset, data):
+                with lock:
+                    image.seek(offset)
+                    image.write(data)
+
+            def download(offset, length):
+                write(offset, self.source_client.download_blob(offset=offset, length=length, timeout=timeout).readall())
+
+            def clear(offset, length):
+                for start in range(offset, offset + length, self.max_write_size):
+                    write(start, empty_chunk(min(self.max_write_size, offset + length - start)))
+
+            self._run(download, writes, clear, clears)
+        report.elapsed = time.time() - started
+        return report
+
+    def sync_to_blob(self, target_client, previous_snapshot=None, **kwargs):
+        # type: (BlobClient, Optional[Union[str, Dict[str, Any], BlobProperties]], **Any) -> PageBlobSyncReport
+        """Update a page blob holding the content of a previous snapshot of the source blob.
+
+        The changed pages are copied by the service with `upload_pages_from_url`, the cleared
+        pages are cleared with `clear_page`, and the target is resized to the size of the source.
+
+        :param target_client: The client of the target page blob.
+        :type target_client: ~azure.storage.blob.BlobClient
+        :param previous_snapshot:
+            The previous snapshot, as a snapshot ID string, or the dict or BlobProperties
+            returned by `create_snapshot` or `get_blob_properties`.
+        :type previous_snapshot: str or dict(str, Any) or ~azure.storage.blob.BlobProperties
+        :keyword str previous_snapshot_url:
+            The URL of a previous snapshot of a managed disk, instead of previous_snapshot.
+        :keyword str source_url:
+            The URL the service reads the changed pages from, authorized with a SAS or public
+            access. Defaults to the URL of the source client, which includes its SAS token, if any.
+        :keyword bool copy_from_url:
+            Whether the service copies the changed pages from the source URL. If False, they
+            are downloaded and uploaded with `upload_page` instead, e.g. when the source cannot
+            be given a SAS. Defaults to True.
+        :keyword int timeout:
+            The timeout parameter is expressed in seconds, for each request.
+        :returns: The report of the sync.
+        :rtype: ~azure.storage.blob.PageBlobSyncReport
+        """
+        started = time.time()
+        previous_snapshot_url, timeout = self._sync_options(previous_snapshot, kwargs)
+        source_url = kwargs.pop('source_url', None) or self.source_client.url
+        copy_from_url = kwargs.pop('copy_from_url', True)
+        size = self.source_client.get_blob_properties(timeout=timeout).size
+        report, writes, clears = self._plan(size, *self._get_diff(previous_snapshot, previous_snapshot_url, timeout))
+        if target_client.get_blob_properties(timeout=timeout).size != report.size:
+            target_client.resize_blob(report.size, timeout=timeout)
+
+        def copy(offset, length):
+            if copy_from_url:
+                target_client.upload_pages_from_url(source_url, offset, length, offset, timeout=timeout)
+            else:
+                data = self.source_client.download_blob(offset=offset, length=length, timeout=timeout).readall()
+                target_client.upload_page(data, offset, length, timeout=timeout)
+
+        def clear(offset, length):
+            target_client.clear_page(offset, length, timeout=timeout)
+
+        self._run(copy, writes, clear, clears)
+        report.elapsed = time.time() - started
+        return report
@@ -0,0 +1,285 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+# pylint: disable=protected-access
+
+import datetime
+from base64 import b64decode
+from xml.etree import ElementTree
+
+from typing import (  # pylint: disable=unused-import
+    Any, Dict, List, Optional, Tuple
+)
+
+from msrest.serialization import Deserializer, TZ_UTC
+
+from ._shared.response_handlers import process_storage_error
+from ._generated.models import StorageErrorException
+from ._models import BlobPropertiesPaged, BlobType, ContentSettings, CopyProperties, LeaseProperties
+
+
+_MONTHS = {name: index + 1 for index, name in enumerate(
+    ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec'])}
+
+
+def _deserialize_rfc(text):
+    # The listing dates are all in the "Wed, 09 Sep 2009 09:20:02 GMT" form
+    try:
+        _, day, month, year, clock, _ = text.split(' ')
+        hour, minute, second = clock.split(':')
+        return datetime.datetime(
+            int(year), _MONTHS[month], int(day), int(hour), int(minute), int(second), tzinfo=TZ_UTC)
+    except (KeyError, ValueError):
+        return Deserializer.deserialize_rfc(text)
+
+
+def _deserialize_bool(text):
+    return text.lower() == 'true'
+
+
+def _deserialize_bytearray(text):
+    return bytearray(b64decode(text))
+
+
+# The XML elements of a listed blob, with the BlobProperties attributes they are read into
+_BLOB_FIELDS = {
+    'Deleted': ('deleted', _deserialize_bool),
+    'Snapshot': ('snapshot', None),
+}
+
+_PROPERTY_FIELDS = {
+    'Creation-Time': ('creation_time', _deserialize_rfc),
+    'Last-Modified': ('last_modified', _deserialize_rfc),
+    'Etag': ('etag', None),
+    'Content-Length': ('size', int),
+    'x-ms-blob-sequence-number': ('page_blob_sequence_number', int),
+    'BlobType': ('blob_type', BlobType),
+    'ServerEncrypted': ('server_encrypted', _deserialize_bool),
+    'EncryptionScope': ('encryption_scope', None),
+    'DeletedTime': ('deleted_time', _deserialize_rfc),
+    'RemainingRetentionDays': ('remaining_retention_days', int),
+    'AccessTier': ('blob_tier', None),
+    'AccessTierInferred': ('blob_tier_inferred', _deserialize_bool),
+    'ArchiveStatus': ('archive_status', None),
+    'AccessTierChangeTime': ('blob_tier_change_time', _deserialize_rfc),
+}
+
+
+def _property(properties, tag, deserialize=None):
+    text = properties.findtext(tag)
+    if not text:
+        return None
+    return deserialize(text) if deserialize else text
+
+
+def _content_settings(properties):
+    return ContentSettings(
+        content_type=_property(properties, 'Content-Type'),
+        content_encoding=_property(properties, 'Content-Encoding'),
+        content_language=_property(properties, 'Content-Language'),
+        content_disposition=_property(properties, 'Content-Disposition'),
+        cache_control=_property(properties, 'Cache-Control'),
+        content_md5=_property(properties, 'Content-MD5', _deserialize_bytearray))
+
+
+def _lease(properties):
+    lease = LeaseProperties()
+    lease.status = _property(properties, 'LeaseStatus')
+    lease.state = _property(properties, 'LeaseState')
+    lease.duration = _property(properties, 'LeaseDuration')
+    return lease
+
+
+def _copy(properties):
+    copy = CopyProperties()
+    copy.id = _property(properties, 'CopyId')
+    copy.status = _property(properties, 'CopyStatus')
+    copy.source = _property(properties, 'CopySource')
+    copy.progress = _property(properties, 'CopyProgress')
+    copy.completion_time = _property(properties, 'CopyCompletionTime', _deserialize_rfc)
+    copy.status_description = _property(properties, 'CopyStatusDescription')
+    copy.incremental_copy = _property(properties, 'IncrementalCopy', _deserialize_bool) or None
+    copy.destination_snapshot = _property(properties, 'DestinationSnapshot')
+    return copy
+
+
+# The sub-objects of a record, built from its Properties element when first accessed
+_SUB_OBJECTS = {
+    'content_settings': _content_settings,
+    'lease': _lease,
+    'copy': _copy,
+}
+
+SELECTABLE_FIELDS = frozenset(
+    [field for field, _ in _BLOB_FIELDS.values()] +
+    [field for field, _ in _PROPERTY_FIELDS.values()] +
+    list(_SUB_OBJECTS) + ['metadata'])
+
+
+class BlobRecord(object):
+    """The properties of a listed blob, limited to the fields selected for the listing.
+
+    A record has the attributes of :class:`~azure.storage.blob.BlobProperties`. The fields
+    that were not selected are `None`, and the `content_settings`, `lease` and `copy`
+    properties are only built when first accessed.
+
+    :ivar str name:
+        The name of the blob.
+    :ivar str container:
+        The container in which the blob resides.
+    """
+    __slots__ = (
+        'name', 'container', 'deleted', 'snapshot', 'metadata', 'encrypted_metadata',
+        'creation_time', 'last_modified', 'etag', 'size', 'page_blob_sequence_number',
+        'blob_type', 'server_encrypted', 'encryption_scope', 'deleted_time',
+        'remaining_retention_days', 'blob_tier', 'blob_tier_inferred', 'archive_status',
+        'blob_tier_change_time', 'content_settings', 'lease', 'copy', '_properties',
+    )
+
+    def __init__(self, name=None, container=None, properties=None):
+        self.name = name
+        self.container = container
+        self._properties = properties
+
+    def __getattr__(self, name):
+        # Only called for the fields not set: they were not selected, not in the listing,
+        # or are sub-objects to build from the Properties element kept for them.
+        if name in _SUB_OBJECTS and self._properties is not None:
+            value = _SUB_OBJECTS[name](self._properties)
+            setattr(self, name, value)
+            return value
+        if name in _FIELDS:
+            return None
+        raise AttributeError(name)
+
+    def __getitem__(self, key):
+        if key not in _FIELDS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def keys(self):
+        return [key for key in self.__slots__ if key in _FIELDS]
+
+    def __repr__(self):
+        return 'BlobRecord({})'.format(
+            {key: getattr(self, key) for key in self.keys() if getattr(self, key) is not None})
+
+
+_FIELDS = frozenset(key for key in BlobRecord.__slots__ if not key.startswith('_'))
+
+
+class Projection(object):  # pylint: disable=too-few-public-methods
+    """The XML elements to read for the selected fields.
+
+    :param list[str] select: The BlobProperties attributes to read for each blob.
+    :raises ValueError: If an attribute cannot be selected.
+    """
+
+    def __init__(self, select):
+        unknown = set(select) - SELECTABLE_FIELDS
+        if unknown:
+            raise ValueError("Unknown blob properties selected: {}.".format(', '.join(sorted(unknown))))
+        selected = set(select)
+        self.blob_fields = {tag: field for tag, field in _BLOB_FIELDS.items() if field[0] in selected}
+        self.property_fields = {tag: field for tag, field in _PROPERTY_FIELDS.items() if field[0] in selected}
+        self.metadata = 'metadata' in selected
+        self.keep_properties = bool(selected.intersection(_SUB_OBJECTS))
+
+
+def _read_fields(record, element, fields):
+    for child in element:
+        field = fields.get(child.tag)
+        if field is not None and child.text is not None:
+            name, deserialize = field
+            setattr(record, name, deserialize(child.text) if deserialize else child.text)
+
+
+def parse_blob_records(body, projection, container=None):
+    # type: (bytes, Projection, Optional[str]) -> Tuple[Dict[str, Any], List[BlobRecord]]
+    """Parse the XML of a page of a flat listing into records of the selected fields.
+
+    :returns: The attributes of the enumeration, and the records of its blobs.
+    """
+    root = ElementTree.fromstring(body)
+    container = root.get('ContainerName') or container
+    enumeration = {
+        'service_endpoint': root.get('ServiceEndpoint'),
+        'container': container,
+    }
+    records = []
+    for element in root:
+        if element.tag != 'Blobs':
+            enumeration[element.tag] = element.text or None
+            continue
+        for blob in element:
+            if blob.tag != 'Blob':
+                continue
+            record = BlobRecord(container=container)
+            for child in blob:
+                tag = child.tag
+                if tag == 'Name':
+                    record.name = child.text
+                elif tag == 'Properties':
+                    _read_fields(record, child, projection.property_fields)
+                    if projection.keep_properties:
+                        record._properties = child
+                elif tag == 'Metadata':
+                    if projection.metadata:
+                        record.metadata = {item.tag: item.text for item in child}
+                        record.encrypted_metadata = child.get('Encrypted')
+                elif tag in projection.blob_fields and child.text is not None:
+                    name, deserialize = projection.blob_fields[tag]
+                    setattr(record, name, deserialize(child.text) if deserialize else child.text)
+            if projection.metadata and record.metadata is None:
+                record.metadata = {}
+            records.append(record)
+    return enumeration, records
+
+
+def extract_records(paged, get_next_return):
+    """Read a page of records, and the attributes of its enumeration into the paged iterator."""
+    paged.location_mode, response = get_next_return
+    enumeration, paged.current_page = parse_blob_records(
+        response.body(), paged._projection, paged.container)
+    paged.service_endpoint = enumeration['service_endpoint']
+    paged.container = enumeration['container']
+    paged.prefix = enumeration.get('Prefix')
+    paged.marker = enumeration.get('Marker')
+    max_results = enumeration.get('MaxResults')
+    paged.results_per_page = int(max_results) if max_results else None
+    return enumeration.get('NextMarker'), paged.current_page
+
+
+class BlobRecordsPaged(BlobPropertiesPaged):
+    """An Iterable of BlobRecords, parsed from the XML of the listing.
+
+    The command returns the location mode and the HTTP response of a page, rather than the
+    generated models of its blobs.
+
+    :param callable command: Function to retrieve the next page of items.
+    :param projection: The XML elements to read for the fields selected.
+    """
+    def __init__(self, command, projection=None, **kwargs):
+        super(BlobRecordsPaged, self).__init__(command, **kwargs)
+        self._projection = projection or Projection([])
+
+    def _get_next_cb(self, continuation_token):
+        try:
+            return self._command(
+                prefix=self.prefix,
+                marker=continuation_token or None,
+                maxresults=self.results_per_page,
+                use_location=self.location_mode)
+        except StorageErrorException as error:
+            process_storage_error(error)
+
+    def _extract_data_cb(self, get_next_return):
+        return extract_records(self, get_next_return)
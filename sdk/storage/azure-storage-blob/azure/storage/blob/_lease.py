@@ -16,6 +16,7 @@ from azure.core.tracing.decorator import distributed_trace
 from ._shared.response_handlers import return_response_headers, process_storage_error
 from ._generated.models import StorageErrorException, LeaseAccessConditions
 from ._serialize import get_modify_conditions
+from ._properties_cache import invalidates_properties
 
 if TYPE_CHECKING:
     from datetime import datetime
@@ -65,11 +66,19 @@ class BlobLeaseClient(object):
         self.etag = None
         if hasattr(client, 'blob_name'):
             self._client = client._client.blob  # type: ignore # pylint: disable=protected-access
+            # The state of the lease is part of the properties of the blob cached by its client
+            self._blob_client = client
         elif hasattr(client, 'container_name'):
             self._client = client._client.container  # type: ignore # pylint: disable=protected-access
+            self._blob_client = None
         else:
             raise TypeError("Lease must use either BlobClient or ContainerClient.")
 
+    def _invalidate_properties(self):
+        invalidate = getattr(self._blob_client, '_invalidate_properties', None)
+        if invalidate is not None:
+            invalidate()
+
     def __enter__(self):
         return self
 
@@ -77,6 +86,7 @@ class BlobLeaseClient(object):
         self.release()
 
     @distributed_trace
+    @invalidates_properties
     def acquire(self, lease_duration=-1, **kwargs):
         # type: (int, **Any) -> None
         """Requests a new lease.
@@ -126,6 +136,7 @@ class BlobLeaseClient(object):
         self.etag = kwargs.get('etag')  # type: str
 
     @distributed_trace
+    @invalidates_properties
     def renew(self, **kwargs):
         # type: (Any) -> None
         """Renews the lease.
@@ -172,6 +183,7 @@ class BlobLeaseClient(object):
         self.last_modified = response.get('last_modified')   # type: datetime
 
     @distributed_trace
+    @invalidates_properties
     def release(self, **kwargs):
         # type: (Any) -> None
         """Release the lease.
@@ -216,6 +228,7 @@ class BlobLeaseClient(object):
         self.last_modified = response.get('last_modified')   # type: datetime
 
     @distributed_trace
+    @invalidates_properties
     def change(self, proposed_lease_id, **kwargs):
         # type: (str, Any) -> None
         """Change the lease ID of an active lease.
@@ -260,6 +273,7 @@ class BlobLeaseClient(object):
         self.last_modified = response.get('last_modified')   # type: datetime
 
     @distributed_trace
+    @invalidates_properties
     def break_lease(self, lease_break_period=None, **kwargs):
         # type: (Optional[int], Any) -> int
         """Break the lease, if the container or blob has an active lease.
@@ -557,6 +557,8 @@ class BlobPropertiesPaged(PageIterator):
     :param location_mode: Specifies the location the request should be sent to.
         This mode only applies for RA-GRS accounts which allow secondary read access.
         Options include 'primary' or 'secondary'.
+    :param properties_cache: A BlobPropertiesCache to store the properties of the blobs listed in.
+    :param str hostname: The primary hostname of the account, keying the cached properties.
     """
     def __init__(
             self, command,
@@ -565,7 +567,9 @@ class BlobPropertiesPaged(PageIterator):
             results_per_page=None,
             continuation_token=None,
             delimiter=None,
-            location_mode=None):
+            location_mode=None,
+            properties_cache=None,
+            hostname=None):
         super(BlobPropertiesPaged, self).__init__(
             get_next=self._get_next_cb,
             extract_data=self._extract_data_cb,
@@ -580,8 +584,13 @@ class BlobPropertiesPaged(PageIterator):
         self.delimiter = delimiter
         self.current_page = None
         self.location_mode = location_mode
+        self._properties_cache = properties_cache
+        self._hostname = hostname
+        self._generation = None
 
     def _get_next_cb(self, continuation_token):
+        if self._properties_cache is not None:
+            self._generation = self._properties_cache.generation
         try:
             return self._command(
                 prefix=self.prefix,
@@ -609,6 +618,9 @@ class BlobPropertiesPaged(PageIterator):
         if isinstance(item, BlobItem):
             blob = BlobProperties._from_generated(item)  # pylint: disable=protected-access
             blob.container = self.container
+            if self._properties_cache is not None and not blob.deleted:
+                self._properties_cache.put(
+                    (self._hostname, blob.container, blob.name, blob.snapshot), blob, generation=self._generation)
             return blob
         return item
 
@@ -0,0 +1,159 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from typing import (  # pylint: disable=unused-import
+    Any, Callable, Iterable, Iterator, List, Optional, Tuple, TYPE_CHECKING
+)
+
+from six.moves import queue
+
+from ._models import BlobProperties
+
+# The pages of blobs listed ahead of the consumer, for each partition when ordered
+MAX_BUFFERED_PAGES = 2
+_POLL_INTERVAL = 0.1
+
+
+class _PartitionDone(object):  # pylint: disable=too-few-public-methods
+    def __init__(self, error=None):
+        self.error = error
+
+
+class ParallelListingBase(object):
+    """The partitions of a listing, listed in parallel with at most `max_concurrency` of them at once.
+
+    The partitions are the items found while discovering the virtual directories, the blobs
+    and the directories, or the prefixes given.
+    As the prefixes delimited at the same level, or given without overlap, are each a
+    contiguous range of names, the partitions listed one after the other in the order of
+    their names return the blobs in name order.
+
+    :param items: The BlobProperties and BlobPrefix items of the discovery.
+    :param callable list_pages: Return the pages of the blobs starting with a prefix.
+    :param int max_concurrency: The largest number of listings in progress.
+    :param bool ordered:
+        Whether to return the blobs in the order of the partitions. The partitions are then
+        listed ahead of the current one, each keeping at most `MAX_BUFFERED_PAGES` pages.
+    :param list[str] prefixes: The prefixes to list, instead of the entries of the discovery.
+    """
+
+    def __init__(self, items, list_pages, max_concurrency, ordered, prefixes=None):
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be greater than 0.")
+        if prefixes is not None and any(not prefix for prefix in prefixes):
+            raise ValueError("The prefixes must not be empty.")
+        self.items = items
+        self.prefixes = prefixes
+        self.list_pages = list_pages
+        self.max_concurrency = max_concurrency
+        self.ordered = ordered
+        self.partitions = []  # type: List[Tuple[str, Any]]
+
+    def _set_partitions(self, items):
+        # type: (List[Any]) -> None
+        if self.prefixes is None:
+            entries = [(item.name, item if isinstance(item, BlobProperties) else None) for item in items]
+        else:
+            entries = [(prefix, None) for prefix in self.prefixes]
+        if self.ordered:
+            entries.sort(key=lambda partition: partition[0])
+        self.partitions = entries
+
+
+class ParallelListing(ParallelListingBase):
+    """List the blobs of the partitions on a pool of threads.
+
+    The listings put their pages in bounded queues, and stop when the iteration is closed.
+    """
+
+    def __init__(self, *args, **kwargs):
+        # type: (*Any, **Any) -> None
+        super(ParallelListing, self).__init__(*args, **kwargs)
+        self._closed = threading.Event()
+
+    def _put(self, output, item):
+        # Wait for room in the buffer, unless the listing was closed by the consumer
+        while not self._closed.is_set():
+            try:
+                output.put(item, timeout=_POLL_INTERVAL)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def _list_partition(self, prefix, output):
+        if self._closed.is_set():
+            return
+        error = None
+        try:
+            for page in self.list_pages(prefix):
+                if self._closed.is_set() or not self._put(output, list(page)):
+                    return
+        except Exception as exc:  # pylint: disable=broad-except
+            error = exc
+        self._put(output, _PartitionDone(error))
+
+    @staticmethod
+    def _pages(output):
+        while True:
+            item = output.get()
+            if isinstance(item, _PartitionDone):
+                if item.error is not None:
+                    raise item.error
+                return
+            yield item
+
+    def _ordered(self, executor):
+        outputs = {}  # type: dict
+        started = 0
+        for index, (_, blob) in enumerate(self.partitions):
+            # Keep listing the next prefixes while the current one is consumed
+            while started < len(self.partitions) and started < index + self.max_concurrency:
+                prefix, started_blob = self.partitions[started]
+                if started_blob is None:
+                    outputs[started] = queue.Queue(MAX_BUFFERED_PAGES)
+                    executor.submit(self._list_partition, prefix, outputs[started])
+                started += 1
+            if blob is not None:
+                yield blob
+                continue
+            for page in self._pages(outputs.pop(index)):
+                for item in page:
+                    yield item
+
+    def _unordered(self, executor):
+        output = queue.Queue(MAX_BUFFERED_PAGES * self.max_concurrency)
+        running = 0
+        for prefix, blob in self.partitions:
+            if blob is None:
+                executor.submit(self._list_partition, prefix, output)
+                running += 1
+        for _, blob in self.partitions:
+            if blob is not None:
+                yield blob
+        while running:
+            item = output.get()
+            if isinstance(item, _PartitionDone):
+                running -= 1
+                if item.error is not None:
+                    raise item.error
+                continue
+            for blob in item:
+                yield blob
+
+    def __iter__(self):
+        # type: () -> Iterator[BlobProperties]
+        self._set_partitions(list(self.items) if self.prefixes is None else [])
+        executor = ThreadPoolExecutor(self.max_concurrency)
+        try:
+            for blob in (self._ordered(executor) if self.ordered else self._unordered(executor)):
+                yield blob
+        finally:
+            self._closed.set()
+            executor.shutdown(wait=True)
@@ -0,0 +1,154 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+
+import copy
+import functools
+import threading
+import time
+from collections import OrderedDict
+
+from typing import (  # pylint: disable=unused-import
+    Any, Callable, Optional, Tuple, TYPE_CHECKING
+)
+
+if TYPE_CHECKING:
+    from ._models import BlobProperties  # pylint: disable=unused-import
+
+
+# The keywords of get_blob_properties that the service must evaluate, bypassing the cache
+_CONDITIONS = ('lease', 'if_modified_since', 'if_unmodified_since', 'etag', 'match_condition', 'cpk')
+
+
+def is_conditional(kwargs):
+    """Whether the keywords of a request include access conditions or a customer-provided key."""
+    return any(kwargs.get(name) is not None for name in _CONDITIONS)
+
+
+def cacheable_listing(include):
+    """Whether the blobs of a listing have the properties returned by get_blob_properties."""
+    return bool(include) and 'metadata' in include and 'copy' in include
+
+
+class BlobPropertiesCache(object):
+    """A least recently used cache of blob properties, which can be shared by clients.
+
+    The cache is given to a BlobClient or ContainerClient with the `properties_cache` keyword,
+    and is passed on to the blob clients they create. The properties of a blob, keyed by its
+    URL and snapshot, are stored when they are fetched with `get_blob_properties`, when the whole
+    blob is downloaded, and when it is listed with its metadata and copy properties.
+
+    `get_blob_properties` returns the cached properties without a request for `ttl` seconds.
+    After that they are revalidated with a conditional request (If-None-Match with the cached
+    etag), which returns them again if the blob has not changed. The writes to a blob through
+    a client with the cache, or through a BlobLeaseClient of that client, invalidate its properties;
+    writes by other clients are only seen once the cached properties are revalidated.
+
+    :param int max_size: The largest number of blobs to keep the properties of.
+    :param float ttl:
+        The number of seconds for which cached properties are returned without a request.
+        With 0, every lookup is revalidated.
+    :ivar int hits: The number of lookups returned from the cache without a request.
+    :ivar int revalidations: The number of lookups returned from the cache after a conditional request.
+    :ivar int misses: The number of lookups that fetched the properties from the service.
+    :ivar int evictions: The number of blobs evicted as the least recently used.
+    """
+
+    def __init__(self, max_size=1024, ttl=30):
+        # type: (int, float) -> None
+        if max_size < 1:
+            raise ValueError("max_size must be greater than 0.")
+        if ttl < 0:
+            raise ValueError("ttl must not be negative.")
+        self.max_size = max_size
+        self.ttl = ttl
+        self.hits = 0
+        self.revalidations = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()  # type: OrderedDict
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    @property
+    def generation(self):
+        # type: () -> int
+        """The number of invalidations so far, to be given to `put` with properties fetched after it."""
+        return self._generation
+
+    def get(self, key):
+        # type: (Tuple) -> Tuple[Optional[BlobProperties], bool]
+        """Return a copy of the cached properties of a blob, and whether they are still fresh.
+
+        A fresh lookup counts as a hit. Stale properties must be revalidated.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None, False
+            properties, expiry = entry
+            self._entries.pop(key)
+            self._entries[key] = entry
+            fresh = time.time() < expiry
+            if fresh:
+                self.hits += 1
+        return copy.deepcopy(properties), fresh
+
+    def put(self, key, properties, fetched=False, generation=None):
+        # type: (Tuple, BlobProperties, bool, Optional[int]) -> None
+        """Store the properties of a blob, counting a miss if they were fetched for a lookup.
+
+        The properties are not stored if a blob was invalidated since the `generation` given,
+        as a write may have completed while they were fetched.
+        """
+        properties = copy.deepcopy(properties)
+        with self._lock:
+            if fetched:
+                self.misses += 1
+            if generation is not None and generation != self._generation:
+                return
+            self._entries.pop(key, None)
+            self._entries[key] = (properties, time.time() + self.ttl)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def revalidated(self, key):
+        # type: (Tuple) -> None
+        """Keep the properties of a blob fresh for another `ttl`, as the service found them unchanged."""
+        with self._lock:
+            self.revalidations += 1
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries[key] = (entry[0], time.time() + self.ttl)
+
+    def invalidate(self, key):
+        # type: (Tuple) -> None
+        """Remove the properties of a blob."""
+        with self._lock:
+            self._generation += 1
+            self._entries.pop(key, None)
+
+    def clear(self):
+        # type: () -> None
+        """Remove the properties of all the blobs."""
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+
+
+def invalidates_properties(func):
+    # type: (Callable) -> Callable
+    """Invalidate the cached properties of the blob of a client once the decorated write has run."""
+    @functools.wraps(func)
+    def wrapper(self, *args, **kwargs):
+        try:
+            return func(self, *args, **kwargs)
+        finally:
+            self._invalidate_properties()  # pylint: disable=protected-access
+    return wrapper
@@ -0,0 +1,116 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+
+import asyncio
+import time
+
+from .transfers import DirectoryTransferReport, is_retryable, _RETRY_BACKOFF
+
+
+class AsyncTaskPool(object):
+    """Run coroutines as tasks, with at most `max_concurrency` of them running at once.
+
+    Passed as the `executor` of the chunked transfers, it bounds the chunks in flight
+    across all of them.
+    """
+
+    def __init__(self, max_concurrency):
+        self.max_concurrency = max_concurrency
+        self._semaphore = None
+
+    def submit(self, coro):
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return asyncio.ensure_future(self._run(coro))
+
+    async def _run(self, coro):
+        async with self._semaphore:
+            return await coro
+
+
+class AsyncTransferManagerBase(object):
+    """Run the transfers of many files as tasks, with bounded concurrency.
+
+    Up to `max_file_concurrency` files are in progress at once, while the chunks of all of
+    them are scheduled on a single pool running at most `max_concurrency` of them at once.
+    """
+
+    def __init__(self, max_concurrency=8, max_file_concurrency=8, max_retries=2, progress_hook=None):
+        if max_concurrency < 1 or max_file_concurrency < 1:
+            raise ValueError("max_concurrency and max_file_concurrency must be greater than 0.")
+        self._max_concurrency = max_concurrency
+        self._max_file_concurrency = max_file_concurrency
+        self._max_retries = max_retries
+        self._progress_hook = progress_hook
+        self._pool = AsyncTaskPool(max_concurrency) if max_concurrency > 1 else None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        await self.close()
+
+    async def close(self):
+        """Provided for symmetry with the clients, the tasks end with the transfers."""
+
+    def _transfer_options(self):
+        # The keywords given to the client operations, to run their chunks on the shared pool
+        if self._pool is None:
+            return {'max_concurrency': 1}
+        return {'max_concurrency': self._max_concurrency, 'executor': self._pool}
+
+    async def _transfer(self, transfer, transfer_file):
+        while True:
+            transfer.attempts += 1
+            transfer.error = None
+            started = time.time()
+            try:
+                await transfer_file(transfer)
+            except Exception as error:  # pylint: disable=broad-except
+                transfer.error = error
+            transfer.elapsed = time.time() - started
+            if transfer.error is None or transfer.attempts > self._max_retries or not is_retryable(transfer.error):
+                break
+            await asyncio.sleep(_RETRY_BACKOFF * 2 ** (transfer.attempts - 1))
+        if self._progress_hook:
+            self._progress_hook(transfer)
+        return transfer
+
+    async def _run(self, items, transfer_file, describe=None):
+        """Transfer files, and report on them.
+
+        :param items: The files to transfer, as an iterable or an async iterable.
+        :param transfer_file: A coroutine function transferring a single file.
+        :param describe:
+            A callable returning the :class:`FileTransfer` of an item, or None to skip it.
+            By default, the items are :class:`FileTransfer`.
+        :rtype: DirectoryTransferReport
+        """
+        started = time.time()
+        # Only list the files as they can be started
+        slots = asyncio.BoundedSemaphore(self._max_file_concurrency)
+        running = []
+
+        async def schedule(item):
+            transfer = describe(item) if describe else item
+            if transfer is None:
+                return
+            await slots.acquire()
+            task = asyncio.ensure_future(self._transfer(transfer, transfer_file))
+            task.add_done_callback(lambda _: slots.release())
+            running.append(task)
+
+        if hasattr(items, '__aiter__'):
+            async for item in items:
+                await schedule(item)
+        else:
+            for item in items:
+                await schedule(item)
+        done = [await task for task in running]
+        return DirectoryTransferReport(
+            succeeded=[transfer for transfer in done if transfer.error is None],
+            failed=[transfer for transfer in done if transfer.error is not None],
+            elapsed=time.time() - started)
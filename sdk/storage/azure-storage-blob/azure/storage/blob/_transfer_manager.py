@@ -0,0 +1,253 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+
+from typing import (  # pylint: disable=unused-import
+    Optional, Any, Callable, Dict, List, Tuple, TypeVar, TYPE_CHECKING
+)
+
+from azure.core import MatchConditions
+from azure.core.tracing.common import with_current_context
+
+from ._blob_client import BlobClient
+from ._shared.transfers import FileTransfer, TransferManagerBase, local_path, walk_local_files
+
+if TYPE_CHECKING:
+    from ._shared.transfers import DirectoryTransferReport
+    from ._models import BlobProperties
+    ContainerClient = TypeVar("ContainerClient")
+
+# The largest number of blocks committed to a block blob
+_MAX_BLOCKS = 50000
+# The size of the blocks staged by a server-side copy, up to the 100 MiB of a Put Block From URL
+_COPY_BLOCK_SIZE = 8 * 1024 * 1024
+
+
+def copy_block_ranges(size, block_size=_COPY_BLOCK_SIZE):
+    # type: (int, int) -> List[Tuple[str, int, int]]
+    """Split a blob of `size` bytes into the blocks of a server-side copy.
+
+    The block size is grown to keep a large blob within the 50,000 blocks of a block blob,
+    and the block IDs are the zero-padded offsets of the blocks, so that they are all the
+    same length, and the same blocks get the same IDs when a copy is started over.
+
+    :returns: The (block ID, offset, length) of the blocks, in order.
+    :rtype: list[tuple[str, int, int]]
+    """
+    block_size = max(block_size, -(-size // _MAX_BLOCKS))
+    return [("{0:016d}".format(offset), offset, min(block_size, size - offset))
+            for offset in range(0, size, block_size)]
+
+
+def _copy_conditions(overwrite):
+    # Fail the commit, rather than replace the target, if it exists and must not be overwritten
+    if overwrite:
+        return {}
+    return {'etag': '*', 'match_condition': MatchConditions.IfMissing}
+
+
+class BlobTransferManager(TransferManagerBase):
+    """Upload and download directory trees to and from a container, or copy blobs into it.
+
+    Up to `max_file_concurrency` files are transferred in parallel, and the blocks or chunks
+    of large files are scheduled on a single pool of `max_concurrency` threads, shared by all
+    the files instead of a pool per file. A file whose transfer fails with an error that the
+    pipeline does not retry, like a connection dropped while streaming, is transferred again.
+    The copies are made by the service, block by block, and no data goes through the client.
+
+    :param container_client: The client of the container.
+    :type container_client: ~azure.storage.blob.ContainerClient
+    :param int max_concurrency:
+        The largest number of block or chunk requests in flight, across all the files.
+        Defaults to 8.
+    :param int max_file_concurrency: The largest number of files in progress. Defaults to 8.
+    :param int max_retries:
+        The number of times the transfer of a file is started over after an error.
+        Defaults to 2.
+    :param callable progress_hook:
+        A callback called with the :class:`~azure.storage.blob.FileTransfer` of each file,
+        once it is transferred or failed.
+    """
+
+    def __init__(
+            self, container_client,  # type: ContainerClient
+            max_concurrency=8,  # type: int
+            max_file_concurrency=8,  # type: int
+            max_retries=2,  # type: int
+            progress_hook=None  # type: Optional[Callable[[FileTransfer], None]]
+        ):
+        # type: (...) -> None
+        super(BlobTransferManager, self).__init__(
+            max_concurrency=max_concurrency,
+            max_file_concurrency=max_file_concurrency,
+            max_retries=max_retries,
+            progress_hook=progress_hook)
+        self.container_client = container_client
+
+    def upload_directory(self, source, prefix="", **kwargs):
+        # type: (str, str, **Any) -> DirectoryTransferReport
+        """Upload the files under a local directory to blobs.
+
+        :param str source: The path of the local directory.
+        :param str prefix:
+            The prefix of the blob names, e.g. "backups/". A file is uploaded to the blob
+            named after the prefix and its path relative to the directory.
+        :keyword bool overwrite: Whether the blobs to upload should overwrite the current data.
+        :keyword ~azure.storage.blob.ContentSettings content_settings:
+            The ContentSettings of the blobs.
+        :keyword int timeout:
+            The timeout parameter is expressed in seconds. This method may make
+            multiple calls to the Azure service and the timeout will apply to
+            each call individually.
+        :returns: The report of the transfer, listing the files transferred and failed.
+        :rtype: ~azure.storage.blob.DirectoryTransferReport
+        """
+        kwargs.update(self._transfer_options())
+
+        def upload(transfer):
+            with open(transfer.path, "rb") as data:
+                self.container_client.upload_blob(transfer.name, data, length=transfer.size, **kwargs)
+
+        return self._run(walk_local_files(source, prefix), upload)
+
+    def download_directory(self, destination, prefix=None, **kwargs):
+        # type: (str, Optional[str], **Any) -> DirectoryTransferReport
+        """Download the blobs whose names start with a prefix into a local directory.
+
+        :param str destination: The path of the local directory.
+        :param str prefix:
+            The prefix of the blobs to download, e.g. "backups/". A blob is downloaded to
+            the path of its name after the prefix, under the directory. By default, the
+            whole container is downloaded.
+        :keyword int timeout:
+            The timeout parameter is expressed in seconds. This method may make
+            multiple calls to the Azure service and the timeout will apply to
+            each call individually.
+        :returns: The report of the transfer, listing the files transferred and failed.
+        :rtype: ~azure.storage.blob.DirectoryTransferReport
+        """
+        prefix = prefix or ""
+        timeout = kwargs.get('timeout')
+        kwargs.update(self._transfer_options())
+
+        def describe(blob):
+            # Skip the blobs marking directories
+            if blob.name.endswith("/"):
+                return None
+            return FileTransfer(blob.name, None, blob.size)
+
+        def download(transfer):
+            transfer.path = local_path(destination, transfer.name[len(prefix):])
+            downloader = self.container_client.download_blob(transfer.name, **kwargs)
+            if self.container_client.key_encryption_key is None:
+                downloader.download_into(transfer.path)
+            else:
+                with open(transfer.path, "wb") as stream:
+                    downloader.readinto(stream)
+
+        blobs = self.container_client.list_blobs(name_starts_with=prefix or None, timeout=timeout)
+        return self._run(blobs, download, describe)
+
+    def _copy(self, target_client, source_url, source, block_size, **kwargs):
+        # type: (BlobClient, str, BlobProperties, int, **Any) -> Dict[str, Any]
+        timeout = kwargs.get('timeout')
+
+        def stage(block):
+            block_id, offset, length = block
+            # Every block is read from the same version of the source, or the copy fails
+            target_client.stage_block_from_url(
+                block_id, source_url, source_offset=offset, source_length=length,
+                source_etag=source.etag, source_match_condition=MatchConditions.IfNotModified, timeout=timeout)
+
+        blocks = copy_block_ranges(source.size, block_size)
+        if self._executor is None:
+            for block in blocks:
+                stage(block)
+        else:
+            for future in [self._executor.submit(with_current_context(stage), block) for block in blocks]:
+                future.result()
+        return target_client.commit_block_list(
+            [block_id for block_id, _, _ in blocks],
+            content_settings=source.content_settings,
+            metadata=source.metadata,
+            **kwargs)
+
+    def copy_blob(self, source_url, name, **kwargs):
+        # type: (str, str, **Any) -> Dict[str, Any]
+        """Copy a blob, from any account, to a block blob of the container.
+
+        The source is split into blocks that the service copies with concurrent
+        `stage_block_from_url` calls, on the shared pool, and the block list is committed
+        once they are all staged. The content settings and metadata of the source are kept.
+        The blocks are all read from the version of the source with the etag of its properties:
+        if the source is modified during the copy, it fails with ResourceModifiedError,
+        without committing the block list.
+
+        :param str source_url:
+            The URL of the source blob, authorized with a SAS or public access.
+        :param str name: The name of the target blob.
+        :keyword source_properties:
+            The properties of the source blob, e.g. listed with its metadata, to save getting them.
+        :paramtype source_properties: ~azure.storage.blob.BlobProperties
+        :keyword bool overwrite: Whether the target should be overwritten if it exists. Defaults to True.
+        :keyword int block_size: The size of the blocks copied, up to 100 MiB. Defaults to 8 MiB.
+        :keyword int timeout:
+            The timeout parameter is expressed in seconds, for each request.
+        :returns: Blob-updated property dict (Etag and last modified).
+        :rtype: dict[str, Any]
+        """
+        source = kwargs.pop('source_properties', None)
+        block_size = kwargs.pop('block_size', _COPY_BLOCK_SIZE)
+        kwargs.update(_copy_conditions(kwargs.pop('overwrite', True)))
+        if source is None:
+            source = BlobClient.from_blob_url(source_url).get_blob_properties(timeout=kwargs.get('timeout'))
+        return self._copy(self.container_client.get_blob_client(name), source_url, source, block_size, **kwargs)
+
+    def copy_blobs(self, source_container_client, prefix=None, **kwargs):
+        # type: (ContainerClient, Optional[str], **Any) -> DirectoryTransferReport
+        """Copy the blobs whose names start with a prefix, from another container, to block blobs.
+
+        The blobs are copied by the service with :func:`copy_blob`, up to `max_file_concurrency`
+        at once, while the blocks of all of them share the pool of `max_concurrency` requests.
+
+        :param source_container_client: The client of the source container, from any account.
+        :type source_container_client: ~azure.storage.blob.ContainerClient
+        :param str prefix:
+            The prefix of the blobs to copy, e.g. "backups/". By default, the whole
+            container is copied.
+        :keyword str source_sas:
+            A SAS token authorizing the service to read the source blobs, if the source
+            container client is not authorized with one and the blobs are not public.
+        :keyword str destination_prefix:
+            The prefix replacing `prefix` in the names of the target blobs.
+            By default, the blobs keep their names.
+        :keyword bool overwrite: Whether the targets should be overwritten if they exist. Defaults to True.
+        :keyword int block_size: The size of the blocks copied, up to 100 MiB. Defaults to 8 MiB.
+        :keyword int timeout:
+            The timeout parameter is expressed in seconds, for each request.
+        :returns: The report of the copy, listing the blobs copied and failed.
+        :rtype: ~azure.storage.blob.DirectoryTransferReport
+        """
+        prefix = prefix or ""
+        source_sas = (kwargs.pop('source_sas', None) or "").lstrip("?")
+        destination_prefix = kwargs.pop('destination_prefix', prefix)
+        sources = {}  # type: Dict[str, BlobProperties]
+
+        def describe(blob):
+            name = destination_prefix + blob.name[len(prefix):]
+            sources[name] = blob
+            return FileTransfer(name, None, blob.size)
+
+        def copy(transfer):
+            blob = sources[transfer.name]
+            source_url = source_container_client.get_blob_client(blob.name).url
+            if source_sas:
+                source_url += ("&" if "?" in source_url else "?") + source_sas
+            self.copy_blob(source_url, transfer.name, source_properties=blob, **kwargs)
+            del sources[transfer.name]
+
+        blobs = source_container_client.list_blobs(
+            name_starts_with=prefix or None, include=['metadata'], timeout=kwargs.get('timeout'))
+        return self._run(blobs, copy, describe)
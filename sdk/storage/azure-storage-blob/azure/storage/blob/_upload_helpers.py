@@ -22,6 +22,7 @@ from ._shared.uploads import (
     PageBlobChunkUploader,
     AppendBlobChunkUploader)
 from ._shared.encryption import generate_blob_encryption_data, encrypt_blob
+from ._checkpoint import CheckpointedBlockService, staged_blocks
 from ._generated.models import (
     StorageErrorException,
     BlockLookupList,
@@ -70,6 +71,9 @@ def upload_block_blob(  # pylint: disable=too-many-locals
         max_concurrency=None,
         blob_settings=None,
         encryption_options=None,
+        tuner=None,
+        journal=None,
+        executor=None,
         **kwargs):
     try:
         if not overwrite and not _any_conditions(**kwargs):
@@ -103,6 +107,20 @@ def upload_block_blob(  # pylint: disable=too-many-locals
                 tier=tier.value if tier else None,
                 **kwargs)
 
+        if journal is not None:
+            # Keep the blocks recorded in the journal that are still staged
+            try:
+                staged = staged_blocks(client.get_block_list(
+                    list_type='uncommitted',
+                    lease_access_conditions=kwargs.get('lease_access_conditions')))
+            except StorageErrorException as error:
+                if error.response.status_code != 404:
+                    raise
+                staged = {}
+            journal.chunks = {k: v for k, v in journal.chunks.items() if staged.get(k) == v}
+            journal.start()
+            client = CheckpointedBlockService(client, journal)
+
         use_original_upload_path = blob_settings.use_byte_buffer or \
             validate_content or encryption_options.get('required') or \
             blob_settings.max_block_size < blob_settings.min_large_block_upload_threshold or \
@@ -121,7 +139,9 @@ def upload_block_blob(  # pylint: disable=too-many-locals
                 total_size=length,
                 chunk_size=blob_settings.max_block_size,
                 max_concurrency=max_concurrency,
+                executor=executor,
                 stream=stream,
+                tuner=tuner,
                 validate_content=validate_content,
                 encryption_options=encryption_options,
                 **kwargs
@@ -133,14 +153,16 @@ def upload_block_blob(  # pylint: disable=too-many-locals
                 total_size=length,
                 chunk_size=blob_settings.max_block_size,
                 max_concurrency=max_concurrency,
+                executor=executor,
                 stream=stream,
+                tuner=tuner,
                 validate_content=validate_content,
                 **kwargs
             )
 
         block_lookup = BlockLookupList(committed=[], uncommitted=[], latest=[])
         block_lookup.latest = block_ids
-        return client.commit_block_list(
+        response = client.commit_block_list(
             block_lookup,
             blob_http_headers=blob_headers,
             cls=return_response_headers,
@@ -148,6 +170,9 @@ def upload_block_blob(  # pylint: disable=too-many-locals
             headers=headers,
             tier=tier.value if tier else None,
             **kwargs)
+        if journal is not None:
+            journal.remove()
+        return response
     except StorageErrorException as error:
         try:
             process_storage_error(error)
@@ -155,6 +180,9 @@ def upload_block_blob(  # pylint: disable=too-many-locals
             if not overwrite:
                 _convert_mod_error(mod_error)
             raise
+    finally:
+        if journal is not None:
+            journal.close()
 
 
 def upload_page_blob(
@@ -167,6 +195,7 @@ def upload_page_blob(
         max_concurrency=None,
         blob_settings=None,
         encryption_options=None,
+        executor=None,
         **kwargs):
     try:
         if not overwrite and not _any_conditions(**kwargs):
@@ -203,6 +232,7 @@ def upload_page_blob(
             chunk_size=blob_settings.max_page_size,
             stream=stream,
             max_concurrency=max_concurrency,
+            executor=executor,
             validate_content=validate_content,
             encryption_options=encryption_options,
             **kwargs)
@@ -226,6 +256,7 @@ def upload_append_blob(  # pylint: disable=unused-argument
         max_concurrency=None,
         blob_settings=None,
         encryption_options=None,
+        executor=None,
         **kwargs):
     try:
         if length == 0:
@@ -248,6 +279,7 @@ def upload_append_blob(  # pylint: disable=unused-argument
                 chunk_size=blob_settings.max_block_size,
                 stream=stream,
                 max_concurrency=max_concurrency,
+                executor=executor,
                 validate_content=validate_content,
                 append_position_access_conditions=append_conditions,
                 **kwargs)
@@ -274,6 +306,7 @@ def upload_append_blob(  # pylint: disable=unused-argument
                 chunk_size=blob_settings.max_block_size,
                 stream=stream,
                 max_concurrency=max_concurrency,
+                executor=executor,
                 validate_content=validate_content,
                 append_position_access_conditions=append_conditions,
                 **kwargs)
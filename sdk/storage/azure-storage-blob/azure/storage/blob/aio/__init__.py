@@ -13,6 +13,10 @@ from ._container_client_async import ContainerClient
 from ._blob_service_client_async import BlobServiceClient
 from ._lease_async import BlobLeaseClient
 from ._download_async import StorageStreamDownloader
+from ._transfer_manager_async import BlobTransferManager
+from ._batch_async import BlobBatchExecutor
+from ._incremental_sync_async import PageBlobSync
+from ._append_writer_async import AppendBlobWriter
 
 
 async def upload_blob_to_url(
@@ -133,5 +137,9 @@ __all__ = [
     'BlobLeaseClient',
     'ExponentialRetry',
     'LinearRetry',
-    'StorageStreamDownloader'
+    'StorageStreamDownloader',
+    'BlobTransferManager',
+    'BlobBatchExecutor',
+    'PageBlobSync',
+    'AppendBlobWriter'
 ]
@@ -0,0 +1,180 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+
+import asyncio
+import time
+
+from typing import (  # pylint: disable=unused-import
+    Optional, Any, Iterable, Union, TYPE_CHECKING
+)
+
+from azure.core.exceptions import HttpResponseError, ResourceNotFoundError
+
+from .._append_writer import AppendBlobWriter as AppendBlobWriterBase
+from .._shared.models import StorageErrorCode
+
+
+class AppendBlobWriter(AppendBlobWriterBase):
+    """A file-like writer appending to an append blob, grouping small writes into large blocks.
+
+    The writes are buffered and appended in blocks of up to `max_block_size` bytes, once the
+    buffer is full or `flush_interval` seconds after its first write. The blocks are appended
+    in order by a background task, one at a time, while the next block is buffered, and each
+    is conditioned on the append position it is expected at: an append retried by the pipeline
+    after a lost response is then recognized, rather than appended twice. A single writer should
+    append to a blob at a time.
+
+    A write larger than the block size is split across blocks. The appends in flight are waited
+    for by :func:`flush` and :func:`close`, which raise the error of a failed append.
+
+    :param blob_client: The client of the append blob, which is created if it does not exist.
+    :type blob_client: ~azure.storage.blob.aio.BlobClient
+    :param int max_block_size: The largest block appended, up to 4 MiB, which is the default.
+    :param float flush_interval:
+        The longest time a write is buffered, in seconds, or None to only append full blocks
+        and flushed writes. Defaults to 1 second.
+    :param int max_pending_blocks:
+        The largest number of full blocks waiting to be appended, after which the writes
+        wait. Defaults to 4.
+    :keyword bool overwrite: Whether the blob is replaced by an empty append blob. Defaults to False.
+    :keyword str encoding: The encoding of the text written. Defaults to UTF-8.
+    :keyword int timeout:
+        The timeout parameter is expressed in seconds, for each request.
+
+    Any other keyword, like `lease`, `maxsize_condition` or `validate_content`, is passed to
+    each `append_block` call.
+    """
+
+    def __init__(self, *args, **kwargs):
+        # type: (*Any, **Any) -> None
+        super(AppendBlobWriter, self).__init__(*args, **kwargs)
+        self._task = None  # type: Optional[asyncio.Future]
+        self._changed_event = None  # type: Optional[asyncio.Event]
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        await self.close()
+
+    def _notify(self):
+        # Wake up the coroutines waiting for a change, with an event each wait is given
+        event, self._changed_event = self._changed_event, asyncio.Event()
+        event.set()
+
+    async def _wait(self, timeout=None):
+        try:
+            await asyncio.wait_for(self._changed_event.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+
+    async def _open(self):
+        if not self._overwrite:
+            try:
+                return (await self.blob_client.get_blob_properties(timeout=self._timeout)).size
+            except ResourceNotFoundError:
+                pass
+        await self.blob_client.create_append_blob(timeout=self._timeout)
+        return 0
+
+    async def _append(self, block):
+        if self._position is None:
+            self._position = await self._open()
+        started = time.time()
+        try:
+            await self.blob_client.append_block(
+                block, length=len(block), appendpos_condition=self._position, **self._append_options)
+        except HttpResponseError as error:
+            # An append retried after its response was lost finds the blob already grown by the block
+            if getattr(error, 'error_code', None) != StorageErrorCode.append_position_condition_not_met or \
+                    (await self.blob_client.get_blob_properties(timeout=self._timeout)).size != \
+                    self._position + len(block):
+                raise
+        self._position += len(block)
+        self.metrics._record(len(block), time.time() - started)  # pylint: disable=protected-access
+
+    def _start(self):
+        if self._task is None:
+            self._changed_event = asyncio.Event()
+            self._task = asyncio.ensure_future(self._append_blocks())
+
+    async def _append_blocks(self):
+        while True:
+            while not self._blocks:
+                timeout = self._next_timeout()
+                if timeout == 0:
+                    self._seal()
+                elif self._closed:
+                    return
+                else:
+                    await self._wait(timeout)
+            block = self._blocks.popleft()
+            self._in_flight += 1
+            self._notify()
+            try:
+                await self._append(block)
+            except Exception as error:  # pylint: disable=broad-except
+                self._error = error
+                self._blocks.clear()
+                return
+            finally:
+                self._in_flight -= 1
+                self._notify()
+
+    async def write(self, data):
+        # type: (Union[bytes, str]) -> int
+        """Buffer data to append to the blob.
+
+        :param data: The data written. Text is encoded with the encoding of the writer.
+        :type data: bytes or str
+        :returns: The number of bytes or characters written.
+        :rtype: int
+        """
+        self._check_open()
+        self._start()
+        self.metrics.writes += 1
+        remaining = data
+        while remaining:
+            # Wake the task up to time the new buffer, or append the blocks filled
+            started = not self._buffered
+            remaining = self._buffer_data(remaining)
+            if started or self._blocks:
+                self._notify()
+            while len(self._blocks) >= self.max_pending_blocks and self._error is None:
+                await self._wait()
+            self._check_open()
+        return len(data)
+
+    async def writelines(self, lines):
+        # type: (Iterable[Union[bytes, str]]) -> None
+        for line in lines:
+            await self.write(line)
+
+    async def flush(self):
+        # type: () -> None
+        """Append the data buffered, and wait for the appends in flight."""
+        self._check_open()
+        if not self._buffered and not self._blocks and not self._in_flight:
+            return
+        self._start()
+        self._seal()
+        self._notify()
+        while (self._blocks or self._in_flight) and self._error is None:
+            await self._wait()
+        self._check_open()
+
+    async def close(self):
+        # type: () -> None
+        """Flush the writer, and stop its task. The error of a failed append is raised."""
+        if self._closed:
+            return
+        try:
+            await self.flush()
+        finally:
+            self._closed = True
+            if self._task is not None:
+                self._notify()
+                await self._task
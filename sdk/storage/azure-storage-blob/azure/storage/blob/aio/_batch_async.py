@@ -0,0 +1,174 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+
+import asyncio
+from collections import deque
+
+from typing import (  # pylint: disable=unused-import
+    Union, Optional, Any, AsyncIterator, Iterable, TYPE_CHECKING
+)
+
+from azure.core.exceptions import AzureError
+
+from .._batch import (
+    BatchShards, BlobBatchResult, _get_blob_name, transient_batch_error,
+    BlobBatchExecutor as BlobBatchExecutorBase
+)
+
+if TYPE_CHECKING:
+    from .._models import BlobProperties, StandardBlobTier, PremiumPageBlobTier
+
+
+class _AsyncBatchResults(object):  # pylint: disable=too-few-public-methods
+    """The results of a bulk operation, sending the batches as tasks as the results are consumed.
+
+    If the iteration stops before the end, the `close()` coroutine cancels the batches in flight.
+    """
+
+    def __init__(self, executor, operation, blobs):
+        self._executor = executor
+        self._operation = operation
+        self._shards = BatchShards(executor.batch_size, executor.max_retries, executor.retry_backoff)
+        self._blobs = blobs
+        self._source = None
+        self._running = set()
+        self._finished = deque()
+
+    def __aiter__(self):
+        return self
+
+    async def _next_blob(self):
+        if self._source is None:
+            self._source = self._blobs.__aiter__() if hasattr(self._blobs, '__aiter__') else iter(self._blobs)
+        if hasattr(self._source, '__anext__'):
+            return await self._source.__anext__()
+        try:
+            return next(self._source)
+        except StopIteration:
+            raise StopAsyncIteration
+
+    async def _send_batch(self, batch, delay):
+        if delay:
+            await asyncio.sleep(delay)
+        try:
+            parts = []
+            async for part in await self._operation(*[result.blob for result in batch]):
+                parts.append(part)
+            return batch, parts, None
+        except AzureError as error:
+            return batch, None, transient_batch_error(error)
+
+    async def _start_batches(self):
+        while len(self._running) < self._executor.max_concurrency:
+            batch = self._shards.start_batch()
+            while not self._shards.exhausted and len(batch) < self._shards.batch_size:
+                try:
+                    blob = await self._next_blob()
+                except StopAsyncIteration:
+                    self._shards.exhausted = True
+                else:
+                    batch.append(BlobBatchResult(blob, _get_blob_name(blob)))
+            if not batch:
+                return
+            self._running.add(asyncio.ensure_future(self._send_batch(batch, self._shards.delay(batch))))
+
+    async def __anext__(self):
+        while not self._finished:
+            await self._start_batches()
+            if not self._running:
+                raise StopAsyncIteration
+            done, self._running = await asyncio.wait(self._running, return_when=asyncio.FIRST_COMPLETED)
+            try:
+                for task in done:
+                    self._finished.extend(self._shards.complete(*task.result()))
+            except Exception:
+                await self.close()
+                raise
+        return self._finished.popleft()
+
+    async def close(self):
+        """Cancel the batches in flight."""
+        running, self._running = self._running, set()
+        self._shards.exhausted = True
+        for task in running:
+            task.cancel()
+        if running:
+            await asyncio.gather(*running, return_exceptions=True)
+
+
+class BlobBatchExecutor(BlobBatchExecutorBase):
+    """Run bulk operations on any number of blobs of a container, in concurrent batches.
+
+    The blobs are given as an iterable or an async iterable, e.g. straight from `list_blobs`,
+    and sent in batches of up to 256 operations, with up to `max_concurrency` batches in flight.
+    The operations that fail with a transient error, like a server busy sub-response, are sent
+    again in a later batch, and the result of each blob is yielded once it is final.
+
+    :param container_client: The client of the container.
+    :type container_client: ~azure.storage.blob.aio.ContainerClient
+    :param int max_concurrency: The largest number of batch requests in flight. Defaults to 4.
+    :param int batch_size: The number of operations of a batch, up to 256, which is the default.
+    :param int max_retries:
+        The number of times an operation failing with a transient error is sent again.
+        Defaults to 3.
+    :param float retry_backoff:
+        The delay before the first retry, in seconds, doubled for each attempt after it.
+        Defaults to 1.
+    """
+
+    def _run(self, operation, blobs):
+        return _AsyncBatchResults(self, operation, blobs)
+
+    def delete_blobs(self, blobs, **kwargs):
+        # type: (Union[Iterable[Union[str, BlobProperties]], AsyncIterator[BlobProperties]], **Any) -> AsyncIterator[BlobBatchResult]
+        """Marks the specified blobs or snapshots for deletion.
+
+        Takes the keywords of :func:`~azure.storage.blob.BlobBatchExecutor.delete_blobs`.
+
+        :param blobs:
+            The blobs to delete, as an iterable or an async iterable of blob names or BlobProperties.
+        :returns: The result of each blob, as it is final. The results of a batch are in
+            order, while the batches complete in any order.
+        :rtype: AsyncIterator[~azure.storage.blob.BlobBatchResult]
+        :raises ~azure.core.exceptions.HttpResponseError:
+            If a batch request fails as a whole with an error that is not transient,
+            like an authentication failure.
+        """
+        return super(BlobBatchExecutor, self).delete_blobs(blobs, **kwargs)
+
+    def set_standard_blob_tier_blobs(self, standard_blob_tier, blobs, **kwargs):
+        # type: (Union[str, StandardBlobTier], Any, **Any) -> AsyncIterator[BlobBatchResult]
+        """Sets the tier of block blobs.
+
+        :param standard_blob_tier:
+            Indicates the tier to be set on the blobs. Options include 'Hot', 'Cool',
+            'Archive'.
+        :type standard_blob_tier: str or ~azure.storage.blob.StandardBlobTier
+        :param blobs:
+            The blobs, as an iterable or an async iterable of blob names or BlobProperties.
+        :keyword int timeout:
+            The timeout parameter is expressed in seconds, for each batch request.
+        :returns: The result of each blob, as it is final.
+        :rtype: AsyncIterator[~azure.storage.blob.BlobBatchResult]
+        """
+        return super(BlobBatchExecutor, self).set_standard_blob_tier_blobs(standard_blob_tier, blobs, **kwargs)
+
+    def set_premium_page_blob_tier_blobs(self, premium_page_blob_tier, blobs, **kwargs):
+        # type: (Union[str, PremiumPageBlobTier], Any, **Any) -> AsyncIterator[BlobBatchResult]
+        """Sets the tier of page blobs on premium accounts.
+
+        :param premium_page_blob_tier:
+            A page blob tier value to set the blobs to.
+        :type premium_page_blob_tier: ~azure.storage.blob.PremiumPageBlobTier
+        :param blobs:
+            The blobs, as an iterable or an async iterable of blob names or BlobProperties.
+        :keyword int timeout:
+            The timeout parameter is expressed in seconds, for each batch request.
+        :returns: The result of each blob, as it is final.
+        :rtype: AsyncIterator[~azure.storage.blob.BlobBatchResult]
+        """
+        return super(BlobBatchExecutor, self).set_premium_page_blob_tier_blobs(
+            premium_page_blob_tier, blobs, **kwargs)
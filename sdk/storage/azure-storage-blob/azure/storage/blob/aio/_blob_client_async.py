@@ -10,6 +10,8 @@ from typing import (  # pylint: disable=unused-import
     TYPE_CHECKING
 )
 
+from azure.core import MatchConditions
+from azure.core.exceptions import HttpResponseError
 from azure.core.tracing.decorator_async import distributed_trace_async
 
 from .._shared.base_client_async import AsyncStorageAccountHostsMixin
@@ -28,8 +30,10 @@ from ._upload_helpers import (
     upload_page_blob)
 from .._models import BlobType, BlobBlock
 from .._lease import get_access_conditions
+from .._properties_cache import is_conditional
 from ._lease_async import BlobLeaseClient
 from ._download_async import StorageStreamDownloader
+from ._properties_cache_async import invalidates_properties
 
 if TYPE_CHECKING:
     from datetime import datetime
@@ -85,6 +89,10 @@ class BlobClient(AsyncStorageAccountHostsMixin, BlobClientBase):  # pylint: disa
         the exceeded part will be downloaded in chunks (could be parallel). Defaults to 32*1024*1024, or 32MB.
     :keyword int max_chunk_get_size: The maximum chunk size used for downloading a blob. Defaults to 4*1024*1024,
         or 4MB.
+    :keyword ~azure.storage.blob.BlobPropertiesCache properties_cache:
+        A cache of the blob properties, which can be shared by clients. `get_blob_properties` then
+        returns the cached properties, revalidated with a conditional request once they expire,
+        and the writes through this client invalidate them.
 
     .. admonition:: Example:
 
@@ -140,6 +148,7 @@ class BlobClient(AsyncStorageAccountHostsMixin, BlobClientBase):  # pylint: disa
             process_storage_error(error)
 
     @distributed_trace_async
+    @invalidates_properties
     async def upload_blob(
             self, data,  # type: Union[Iterable[AnyStr], IO[AnyStr]]
             blob_type=BlobType.BlockBlob,  # type: Union[str, BlobType]
@@ -168,7 +177,7 @@ class BlobClient(AsyncStorageAccountHostsMixin, BlobClientBase):  # pylint: disa
         :keyword ~azure.storage.blob.ContentSettings content_settings:
             ContentSettings object used to set blob properties. Used to set content type, encoding,
             language, disposition, md5, and cache control.
-        :keyword bool validate_content:
+        :keyword validate_content:
             If true, calculates an MD5 hash for each chunk of the blob. The storage
             service checks the hash of the content that has arrived with the hash
             that was sent. This is primarily valuable for detecting bitflips on
@@ -177,6 +186,10 @@ class BlobClient(AsyncStorageAccountHostsMixin, BlobClientBase):  # pylint: disa
             blob. Also note that if enabled, the memory-efficient upload algorithm
             will not be used because computing the MD5 hash requires buffering
             entire blocks, and doing so defeats the purpose of the memory-efficient algorithm.
+            Set to "crc64" to send a CRC64 hash instead, in the x-ms-content-crc64 header.
+            The CRC64 is computed in Python, at a few MB per second while holding the GIL, which
+            throttles parallel transfers, unless the C extension of the crcmod package is installed.
+        :paramtype validate_content: bool or str
         :keyword lease:
             If specified, upload_blob only succeeds if the
             blob's lease is active and matches this ID.
@@ -215,6 +228,18 @@ class BlobClient(AsyncStorageAccountHostsMixin, BlobClientBase):  # pylint: disa
         :keyword int max_concurrency:
             Maximum number of parallel connections to use when the blob size exceeds
             64MB.
+        :keyword ~azure.storage.blob.TransferTuner autotune:
+            Tune the block size and the number of parallel connections while the blob is
+            uploaded in blocks, between the bounds of the tuner. The max_concurrency given, if any, is
+            the largest number of parallel connections the tuner may use. The settings reached,
+            and the achieved throughput, are available from the tuner's report() afterwards.
+            Only supported for block blobs.
+        :keyword str checkpoint:
+            The path of a local journal file making the upload resumable. The blocks staged are
+            recorded in it, and when an upload of the same data to the same blob is retried with
+            the same checkpoint, the blocks still staged on the service are not uploaded again.
+            The journal is deleted once the upload is complete. Only supported for block blobs,
+            without autotuning or client-side encryption.
         :keyword ~azure.storage.blob.CustomerProvidedEncryptionKey cpk:
             Encrypts the data on the service-side with the given key.
             Use of customer-provided keys must be done over HTTPS.
@@ -271,7 +296,7 @@ class BlobClient(AsyncStorageAccountHostsMixin, BlobClientBase):  # pylint: disa
         :param int length:
             Number of bytes to read from the stream. This is optional, but
             should be supplied for optimal performance.
-        :keyword bool validate_content:
+        :keyword validate_content:
             If true, calculates an MD5 hash for each chunk of the blob. The storage
             service checks the hash of the content that has arrived with the hash
             that was sent. This is primarily valuable for detecting bitflips on
@@ -280,6 +305,11 @@ class BlobClient(AsyncStorageAccountHostsMixin, BlobClientBase):  # pylint: disa
             blob. Also note that if enabled, the memory-efficient upload algorithm
             will not be used because computing the MD5 hash requires buffering
             entire blocks, and doing so defeats the purpose of the memory-efficient algorithm.
+            Set to "crc64" to have the service return a CRC64 hash of each chunk instead,
+            checked as the chunk is received.
+            The CRC64 is computed in Python, at a few MB per second while holding the GIL, which
+            throttles parallel transfers, unless the C extension of the crcmod package is installed.
+        :paramtype validate_content: bool or str
         :keyword lease:
             Required if the blob has an active lease. If specified, download_blob only
             succeeds if the blob's lease is active and matches this ID. Value can be a
@@ -309,6 +339,11 @@ class BlobClient(AsyncStorageAccountHostsMixin, BlobClientBase):  # pylint: disa
             a secure connection must be established to transfer the key.
         :keyword int max_concurrency:
             The number of parallel connections with which to download.
+        :keyword ~azure.storage.blob.TransferTuner autotune:
+            Tune the chunk size and the number of parallel connections while the blob is
+            downloaded in chunks, between the bounds of the tuner. The max_concurrency given, if any, is
+            the largest number of parallel connections the tuner may use. The settings reached,
+            and the achieved throughput, are available from the tuner's report() afterwards.
         :keyword str encoding:
             Encoding to decode the downloaded bytes. Default is None, i.e. no decoding.
         :keyword int timeout:
@@ -327,15 +362,21 @@ class BlobClient(AsyncStorageAccountHostsMixin, BlobClientBase):  # pylint: disa
                 :dedent: 16
                 :caption: Download a blob.
         """
+        cache_properties = self._properties_cache is not None and offset is None and \
+            kwargs.get('cpk') is None and not (self.key_encryption_key or self.key_resolver_function)
+        generation = self._properties_cache.generation if cache_properties else None
         options = self._download_blob_options(
             offset=offset,
             length=length,
             **kwargs)
         downloader = StorageStreamDownloader(**options)
         await downloader._setup()  # pylint: disable=protected-access
+        if cache_properties:
+            self._cache_downloaded_properties(downloader.properties, generation)
         return downloader
 
     @distributed_trace_async
+    @invalidates_properties
     async def delete_blob(self, delete_snapshots=False, **kwargs):
         # type: (bool, Any) -> None
         """Marks the specified blob for deletion.
@@ -397,6 +438,7 @@ class BlobClient(AsyncStorageAccountHostsMixin, BlobClientBase):  # pylint: disa
             process_storage_error(error)
 
     @distributed_trace_async
+    @invalidates_properties
     async def undelete_blob(self, **kwargs):
         # type: (Any) -> None
         """Restores soft-deleted blobs or snapshots.
@@ -468,6 +510,31 @@ class BlobClient(AsyncStorageAccountHostsMixin, BlobClientBase):  # pylint: disa
                 :dedent: 12
                 :caption: Getting the properties for a blob.
         """
+        if self._properties_cache is None or is_conditional(kwargs):
+            return await self._get_blob_properties(**kwargs)
+        key = self._properties_cache_key()
+        cached, fresh = self._properties_cache.get(key)
+        if fresh:
+            return cached
+        generation = self._properties_cache.generation
+        try:
+            if cached is None:
+                blob_props = await self._get_blob_properties(**kwargs)
+            else:
+                blob_props = await self._get_blob_properties(
+                    etag=cached.etag, match_condition=MatchConditions.IfModified, **kwargs)
+        except HttpResponseError as error:
+            if cached is not None and error.status_code == 304:
+                self._properties_cache.revalidated(key)
+                return cached
+            if error.status_code == 404:
+                self._properties_cache.invalidate(key)
+            raise
+        self._properties_cache.put(key, blob_props, fetched=True, generation=generation)
+        return blob_props
+
+    async def _get_blob_properties(self, **kwargs):  # type: ignore
+        # type: (**Any) -> BlobProperties
         access_conditions = get_access_conditions(kwargs.pop('lease', None))
         mod_conditions = get_modify_conditions(kwargs)
         cpk = kwargs.pop('cpk', None)
@@ -493,6 +560,7 @@ class BlobClient(AsyncStorageAccountHostsMixin, BlobClientBase):  # pylint: disa
         return blob_props # type: ignore
 
     @distributed_trace_async
+    @invalidates_properties
     async def set_http_headers(self, content_settings=None, **kwargs):
         # type: (Optional[ContentSettings], Any) -> None
         """Sets system properties on the blob.
@@ -535,6 +603,7 @@ class BlobClient(AsyncStorageAccountHostsMixin, BlobClientBase):  # pylint: disa
             process_storage_error(error)
 
     @distributed_trace_async
+    @invalidates_properties
     async def set_blob_metadata(self, metadata=None, **kwargs):
         # type: (Optional[Dict[str, str]], Any) -> Dict[str, Union[str, datetime]]
         """Sets user-defined metadata for the blob as one or more name-value pairs.
@@ -589,6 +658,7 @@ class BlobClient(AsyncStorageAccountHostsMixin, BlobClientBase):  # pylint: disa
             process_storage_error(error)
 
     @distributed_trace_async
+    @invalidates_properties
     async def create_page_blob(  # type: ignore
             self, size,  # type: int
             content_settings=None,  # type: Optional[ContentSettings]
@@ -667,6 +737,7 @@ class BlobClient(AsyncStorageAccountHostsMixin, BlobClientBase):  # pylint: disa
             process_storage_error(error)
 
     @distributed_trace_async
+    @invalidates_properties
     async def create_append_blob(self, content_settings=None, metadata=None, **kwargs):
         # type: (Optional[ContentSettings], Optional[Dict[str, str]], Any) -> Dict[str, Union[str, datetime]]
         """Creates a new Append Blob.
@@ -796,6 +867,7 @@ class BlobClient(AsyncStorageAccountHostsMixin, BlobClientBase):  # pylint: disa
             process_storage_error(error)
 
     @distributed_trace_async
+    @invalidates_properties
     async def start_copy_from_url(self, source_url, metadata=None, incremental_copy=False, **kwargs):
         # type: (str, Optional[Dict[str, str]], bool, Any) -> Any
         """Copies a blob asynchronously.
@@ -939,6 +1011,7 @@ class BlobClient(AsyncStorageAccountHostsMixin, BlobClientBase):  # pylint: disa
             process_storage_error(error)
 
     @distributed_trace_async
+    @invalidates_properties
     async def abort_copy(self, copy_id, **kwargs):
         # type: (Union[str, Dict[str, Any], BlobProperties], Any) -> None
         """Abort an ongoing copy operation.
@@ -1020,6 +1093,7 @@ class BlobClient(AsyncStorageAccountHostsMixin, BlobClientBase):  # pylint: disa
         return lease
 
     @distributed_trace_async
+    @invalidates_properties
     async def set_standard_blob_tier(self, standard_blob_tier, **kwargs):
         # type: (Union[str, StandardBlobTier], Any) -> None
         """This operation sets the tier on a block blob.
@@ -1073,7 +1147,7 @@ class BlobClient(AsyncStorageAccountHostsMixin, BlobClientBase):  # pylint: disa
              the block_id parameter must be the same size for each block.
         :param data: The blob data.
         :param int length: Size of the block.
-        :keyword bool validate_content:
+        :keyword validate_content:
             If true, calculates an MD5 hash for each chunk of the blob. The storage
             service checks the hash of the content that has arrived with the hash
             that was sent. This is primarily valuable for detecting bitflips on
@@ -1082,6 +1156,10 @@ class BlobClient(AsyncStorageAccountHostsMixin, BlobClientBase):  # pylint: disa
             blob. Also note that if enabled, the memory-efficient upload algorithm
             will not be used because computing the MD5 hash requires buffering
             entire blocks, and doing so defeats the purpose of the memory-efficient algorithm.
+            Set to "crc64" to send a CRC64 hash instead, in the x-ms-content-crc64 header.
+            The CRC64 is computed in Python, at a few MB per second while holding the GIL, which
+            throttles parallel transfers, unless the C extension of the crcmod package is installed.
+        :paramtype validate_content: bool or str
         :keyword lease:
             Required if the blob has an active lease. Value can be a BlobLeaseClient object
             or the lease ID as a string.
@@ -1157,6 +1235,11 @@ class BlobClient(AsyncStorageAccountHostsMixin, BlobClientBase):  # pylint: disa
 
             .. versionadded:: 12.2.0
 
+        :keyword str source_etag:
+            The source ETag value, or the wildcard character (*). Used to check if the source has changed,
+            and act according to the condition specified by the `source_match_condition` parameter.
+        :keyword ~azure.core.MatchConditions source_match_condition:
+            The source match condition to use upon the etag.
         :keyword int timeout:
             The timeout parameter is expressed in seconds.
         :rtype: None
@@ -1205,6 +1288,7 @@ class BlobClient(AsyncStorageAccountHostsMixin, BlobClientBase):  # pylint: disa
         return self._get_block_list_result(blocks)
 
     @distributed_trace_async
+    @invalidates_properties
     async def commit_block_list( # type: ignore
             self, block_list,  # type: List[BlobBlock]
             content_settings=None,  # type: Optional[ContentSettings]
@@ -1283,6 +1367,7 @@ class BlobClient(AsyncStorageAccountHostsMixin, BlobClientBase):  # pylint: disa
             process_storage_error(error)
 
     @distributed_trace_async
+    @invalidates_properties
     async def set_premium_page_blob_tier(self, premium_page_blob_tier, **kwargs):
         # type: (Union[str, PremiumPageBlobTier], **Any) -> None
         """Sets the page blob tiers on the blob. This API is only supported for page blobs on premium accounts.
@@ -1459,6 +1544,7 @@ class BlobClient(AsyncStorageAccountHostsMixin, BlobClientBase):  # pylint: disa
         return get_page_ranges_result(ranges)
 
     @distributed_trace_async
+    @invalidates_properties
     async def set_sequence_number( # type: ignore
             self, sequence_number_action,  # type: Union[str, SequenceNumberAction]
             sequence_number=None,  # type: Optional[str]
@@ -1508,6 +1594,7 @@ class BlobClient(AsyncStorageAccountHostsMixin, BlobClientBase):  # pylint: disa
             process_storage_error(error)
 
     @distributed_trace_async
+    @invalidates_properties
     async def resize_blob(self, size, **kwargs):
         # type: (int, Any) -> Dict[str, Union[str, datetime]]
         """Resizes a page blob to the specified size.
@@ -1555,6 +1642,7 @@ class BlobClient(AsyncStorageAccountHostsMixin, BlobClientBase):  # pylint: disa
             process_storage_error(error)
 
     @distributed_trace_async
+    @invalidates_properties
     async def upload_page( # type: ignore
             self, page,  # type: bytes
             offset,  # type: int
@@ -1580,13 +1668,17 @@ class BlobClient(AsyncStorageAccountHostsMixin, BlobClientBase):  # pylint: disa
             Required if the blob has an active lease. Value can be a BlobLeaseClient object
             or the lease ID as a string.
         :paramtype lease: ~azure.storage.blob.aio.BlobLeaseClient or str
-        :keyword bool validate_content:
+        :keyword validate_content:
             If true, calculates an MD5 hash of the page content. The storage
             service checks the hash of the content that has arrived
             with the hash that was sent. This is primarily valuable for detecting
             bitflips on the wire if using http instead of https, as https (the default),
             will already validate. Note that this MD5 hash is not stored with the
             blob.
+            Set to "crc64" to send a CRC64 hash instead, in the x-ms-content-crc64 header.
+            The CRC64 is computed in Python, at a few MB per second while holding the GIL, which
+            throttles parallel transfers, unless the C extension of the crcmod package is installed.
+        :paramtype validate_content: bool or str
         :keyword int if_sequence_number_lte:
             If the blob's sequence number is less than or equal to
             the specified value, the request proceeds; otherwise it fails.
@@ -1644,6 +1736,7 @@ class BlobClient(AsyncStorageAccountHostsMixin, BlobClientBase):  # pylint: disa
             process_storage_error(error)
 
     @distributed_trace_async
+    @invalidates_properties
     async def upload_pages_from_url(self, source_url,  # type: str
                                     offset,  # type: int
                                     length,  # type: int
@@ -1750,6 +1843,7 @@ class BlobClient(AsyncStorageAccountHostsMixin, BlobClientBase):  # pylint: disa
             process_storage_error(error)
 
     @distributed_trace_async
+    @invalidates_properties
     async def clear_page(self, offset, length, **kwargs):
         # type: (int, int, Any) -> Dict[str, Union[str, datetime]]
         """Clears a range of pages.
@@ -1811,6 +1905,7 @@ class BlobClient(AsyncStorageAccountHostsMixin, BlobClientBase):  # pylint: disa
             process_storage_error(error)
 
     @distributed_trace_async
+    @invalidates_properties
     async def append_block( # type: ignore
             self, data,  # type: Union[AnyStr, Iterable[AnyStr], IO[AnyStr]]
             length=None,  # type: Optional[int]
@@ -1823,13 +1918,17 @@ class BlobClient(AsyncStorageAccountHostsMixin, BlobClientBase):  # pylint: disa
             Content of the block.
         :param int length:
             Size of the block in bytes.
-        :keyword bool validate_content:
+        :keyword validate_content:
             If true, calculates an MD5 hash of the block content. The storage
             service checks the hash of the content that has arrived
             with the hash that was sent. This is primarily valuable for detecting
             bitflips on the wire if using http instead of https, as https (the default),
             will already validate. Note that this MD5 hash is not stored with the
             blob.
+            Set to "crc64" to send a CRC64 hash instead, in the x-ms-content-crc64 header.
+            The CRC64 is computed in Python, at a few MB per second while holding the GIL, which
+            throttles parallel transfers, unless the C extension of the crcmod package is installed.
+        :paramtype validate_content: bool or str
         :keyword int maxsize_condition:
             Optional conditional header. The max length in bytes permitted for
             the append blob. If the Append Block operation would cause the blob
@@ -1894,6 +1993,7 @@ class BlobClient(AsyncStorageAccountHostsMixin, BlobClientBase):  # pylint: disa
             process_storage_error(error)
 
     @distributed_trace_async()
+    @invalidates_properties
     async def append_block_from_url(self, copy_source_url,  # type: str
                                     source_offset=None,  # type: Optional[int]
                                     source_length=None,  # type: Optional[int]
@@ -33,10 +33,14 @@ from .._deserialize import deserialize_container_properties
 from .._serialize import get_modify_conditions, get_container_cpk_scope_info, get_api_version
 from .._container_client import ContainerClient as ContainerClientBase, _get_blob_name
 from .._lease import get_access_conditions
+from .._lean_listing import Projection
+from .._properties_cache import cacheable_listing
 from .._models import ContainerProperties, BlobProperties, BlobType  # pylint: disable=unused-import
 from ._models import BlobPropertiesPaged, BlobPrefix
 from ._lease_async import BlobLeaseClient
 from ._blob_client_async import BlobClient
+from ._parallel_listing_async import AsyncParallelListing
+from ._lean_listing_async import BlobRecordsPaged
 
 if TYPE_CHECKING:
     from azure.core.pipeline.transport import HttpTransport
@@ -90,6 +94,9 @@ class ContainerClient(AsyncStorageAccountHostsMixin, ContainerClientBase):
         the exceeded part will be downloaded in chunks (could be parallel). Defaults to 32*1024*1024, or 32MB.
     :keyword int max_chunk_get_size: The maximum chunk size used for downloading a blob. Defaults to 4*1024*1024,
         or 4MB.
+    :keyword ~azure.storage.blob.BlobPropertiesCache properties_cache:
+        A cache of the blob properties, passed on to the blob clients of the container. The blobs
+        listed with their metadata and copy properties are stored in it.
 
     .. admonition:: Example:
 
@@ -521,6 +528,12 @@ class ContainerClient(AsyncStorageAccountHostsMixin, ContainerClientBase):
         :param list[str] include:
             Specifies one or more additional datasets to include in the response.
             Options include: 'snapshots', 'metadata', 'uncommittedblobs', 'copy', 'deleted'.
+        :keyword list[str] select:
+            The BlobProperties attributes to return, e.g. ['size', 'last_modified']. The blobs
+            are then returned as lightweight BlobRecord items, read straight from the XML of the
+            listing, with only the name, the container and these attributes set. The
+            `content_settings`, `lease` and `copy` attributes are built when first accessed.
+            This is much faster than building the BlobProperties of large listings.
         :keyword int timeout:
             The timeout parameter is expressed in seconds.
         :returns: An iterable (auto-paging) response of BlobProperties.
@@ -540,18 +553,46 @@ class ContainerClient(AsyncStorageAccountHostsMixin, ContainerClientBase):
 
         results_per_page = kwargs.pop('results_per_page', None)
         timeout = kwargs.pop('timeout', None)
+        select = kwargs.pop('select', None)
+        if select is not None:
+            command = functools.partial(
+                self._list_blob_records,
+                include=include,
+                timeout=timeout,
+                **kwargs)
+            return AsyncItemPaged(
+                command,
+                prefix=name_starts_with,
+                results_per_page=results_per_page,
+                projection=Projection(select),
+                page_iterator_class=BlobRecordsPaged
+            )
         command = functools.partial(
             self._client.container.list_blob_flat_segment,
             include=include,
             timeout=timeout,
             **kwargs)
+        properties_cache = self._properties_cache if cacheable_listing(include) else None
         return AsyncItemPaged(
             command,
             prefix=name_starts_with,
             results_per_page=results_per_page,
+            properties_cache=properties_cache,
+            hostname=self.primary_hostname,
             page_iterator_class=BlobPropertiesPaged
         )
 
+    async def _list_blob_records(  # type: ignore
+            self, include=None, timeout=None, prefix=None, marker=None, maxresults=None, **kwargs):
+        # type: (...) -> Tuple[str, AsyncHttpResponse]
+        """List a page of blobs, returning the response without deserializing its blobs."""
+        request = self._list_blob_records_request(
+            include=include, timeout=timeout, prefix=prefix, marker=marker, maxresults=maxresults)
+        response = (await self._pipeline.run(request, stream=False, **kwargs)).http_response
+        if response.status_code != 200:
+            raise StorageErrorException(response, self._client._deserialize)  # pylint: disable=protected-access
+        return response.location_mode, response
+
     @distributed_trace
     def walk_blobs(
             self, name_starts_with=None, # type: Optional[str]
@@ -598,6 +639,65 @@ class ContainerClient(AsyncStorageAccountHostsMixin, ContainerClientBase):
             results_per_page=results_per_page,
             delimiter=delimiter)
 
+    @distributed_trace
+    def list_blobs_parallel(self, name_starts_with=None, include=None, **kwargs):
+        # type: (Optional[str], Optional[Any], **Any) -> AsyncIterator[BlobProperties]
+        """Returns an async iterator listing the blobs under the specified container,
+        listing partitions of the container in parallel.
+
+        The container is partitioned by the virtual directories found under `name_starts_with`
+        with the delimiter, and the blobs of up to `max_concurrency` of them are listed at once.
+        The blobs above the first delimiter are returned as they are found. Alternatively,
+        the partitions can be given as `prefixes`, e.g. "0" to "9" and "a" to "f" for blob
+        names starting with a hexadecimal hash.
+
+        :param str name_starts_with:
+            Filters the results to return only blobs whose names
+            begin with the specified prefix.
+        :param list[str] include:
+            Specifies one or more additional datasets to include in the response.
+            Options include: 'snapshots', 'metadata', 'uncommittedblobs', 'copy', 'deleted'.
+        :keyword str delimiter:
+            The delimiter of the virtual directories partitioning the container. Defaults to "/".
+        :keyword list[str] prefixes:
+            The prefixes of the blob names to list in parallel, instead of the virtual directories.
+            They follow `name_starts_with`, if given. The blobs whose names start with none of them
+            are not listed, and a blob whose name starts with two of them is listed twice.
+        :keyword int max_concurrency:
+            The largest number of partitions listed at once. Defaults to 8.
+        :keyword bool ordered:
+            Whether to return the blobs in name order, like list_blobs. The partitions are then
+            returned one after the other, while the next ones are listed ahead, with a bounded
+            number of pages buffered. Defaults to False, returning the pages of the partitions
+            as they are received.
+        :keyword int results_per_page:
+            The maximum number of blobs to retrieve per call.
+        :keyword int timeout:
+            The timeout parameter is expressed in seconds.
+        :returns: An async iterator of BlobProperties. If the iteration stops before the end,
+            its `close()` coroutine cancels the listings in progress.
+        :rtype: AsyncIterator[~azure.storage.blob.BlobProperties]
+        """
+        if include and not isinstance(include, list):
+            include = [include]
+        delimiter = kwargs.pop('delimiter', '/')
+        prefixes = kwargs.pop('prefixes', None)
+        max_concurrency = kwargs.pop('max_concurrency', 8)
+        ordered = kwargs.pop('ordered', False)
+        results_per_page = kwargs.pop('results_per_page', None)
+        if prefixes is not None and name_starts_with:
+            prefixes = [name_starts_with + prefix for prefix in prefixes]
+
+        def list_pages(prefix):
+            return self.list_blobs(
+                name_starts_with=prefix, include=include, results_per_page=results_per_page, **kwargs).by_page()
+
+        # The virtual directories are discovered when the iteration starts
+        items = self.walk_blobs(
+            name_starts_with=name_starts_with, include=include, delimiter=delimiter,
+            results_per_page=results_per_page, **kwargs)
+        return AsyncParallelListing(items, list_pages, max_concurrency, ordered, prefixes=prefixes)
+
     @distributed_trace_async
     async def upload_blob(
             self, name,  # type: Union[str, BlobProperties]
@@ -631,7 +731,7 @@ class ContainerClient(AsyncStorageAccountHostsMixin, ContainerClientBase):
         :keyword ~azure.storage.blob.ContentSettings content_settings:
             ContentSettings object used to set blob properties. Used to set content type, encoding,
             language, disposition, md5, and cache control.
-        :keyword bool validate_content:
+        :keyword validate_content:
             If true, calculates an MD5 hash for each chunk of the blob. The storage
             service checks the hash of the content that has arrived with the hash
             that was sent. This is primarily valuable for detecting bitflips on
@@ -640,6 +740,10 @@ class ContainerClient(AsyncStorageAccountHostsMixin, ContainerClientBase):
             blob. Also note that if enabled, the memory-efficient upload algorithm
             will not be used, because computing the MD5 hash requires buffering
             entire blocks, and doing so defeats the purpose of the memory-efficient algorithm.
+            Set to "crc64" to send a CRC64 hash instead, in the x-ms-content-crc64 header.
+            The CRC64 is computed in Python, at a few MB per second while holding the GIL, which
+            throttles parallel transfers, unless the C extension of the crcmod package is installed.
+        :paramtype validate_content: bool or str
         :keyword lease:
             Required if the container has an active lease. Value can be a BlobLeaseClient object
             or the lease ID as a string.
@@ -799,7 +903,7 @@ class ContainerClient(AsyncStorageAccountHostsMixin, ContainerClientBase):
         :param int length:
             Number of bytes to read from the stream. This is optional, but
             should be supplied for optimal performance.
-        :keyword bool validate_content:
+        :keyword validate_content:
             If true, calculates an MD5 hash for each chunk of the blob. The storage
             service checks the hash of the content that has arrived with the hash
             that was sent. This is primarily valuable for detecting bitflips on
@@ -808,6 +912,11 @@ class ContainerClient(AsyncStorageAccountHostsMixin, ContainerClientBase):
             blob. Also note that if enabled, the memory-efficient upload algorithm
             will not be used because computing the MD5 hash requires buffering
             entire blocks, and doing so defeats the purpose of the memory-efficient algorithm.
+            Set to "crc64" to have the service return a CRC64 hash of each chunk instead,
+            checked as the chunk is received.
+            The CRC64 is computed in Python, at a few MB per second while holding the GIL, which
+            throttles parallel transfers, unless the C extension of the crcmod package is installed.
+        :paramtype validate_content: bool or str
         :keyword lease:
             Required if the blob has an active lease. If specified, download_blob only
             succeeds if the blob's lease is active and matches this ID. Value can be a
@@ -944,7 +1053,10 @@ class ContainerClient(AsyncStorageAccountHostsMixin, ContainerClientBase):
             req.format_parameters(query_parameters)
             reqs.append(req)
 
-        return await self._batch_send(*reqs, **options)
+        try:
+            return await self._batch_send(*reqs, **options)
+        finally:
+            self._invalidate_properties(blobs)
 
     @distributed_trace
     async def set_standard_blob_tier_blobs(
@@ -1007,7 +1119,10 @@ class ContainerClient(AsyncStorageAccountHostsMixin, ContainerClientBase):
             req.format_parameters(query_parameters)
             reqs.append(req)
 
-        return await self._batch_send(*reqs, **kwargs)
+        try:
+            return await self._batch_send(*reqs, **kwargs)
+        finally:
+            self._invalidate_properties(blobs)
 
     @distributed_trace
     async def set_premium_page_blob_tier_blobs(
@@ -1066,7 +1181,10 @@ class ContainerClient(AsyncStorageAccountHostsMixin, ContainerClientBase):
             req.format_parameters(query_parameters)
             reqs.append(req)
 
-        return await self._batch_send(*reqs, **kwargs)
+        try:
+            return await self._batch_send(*reqs, **kwargs)
+        finally:
+            self._invalidate_properties(blobs)
 
     def get_blob_client(
             self, blob,  # type: Union[BlobProperties, str]
@@ -1105,4 +1223,5 @@ class ContainerClient(AsyncStorageAccountHostsMixin, ContainerClientBase):
             credential=self.credential, api_version=self.api_version, _configuration=self._config,
             _pipeline=_pipeline, _location_mode=self._location_mode, _hosts=self._hosts,
             require_encryption=self.require_encryption, key_encryption_key=self.key_encryption_key,
-            key_resolver_function=self.key_resolver_function, loop=self._loop)
+            key_resolver_function=self.key_resolver_function, properties_cache=self._properties_cache,
+            loop=self._loop)
@@ -6,25 +6,37 @@
 
 import asyncio
 import sys
+import time
+from collections import deque
 from io import BytesIO
 from itertools import islice
 import warnings
 
+import six
+
 from azure.core.exceptions import HttpResponseError
+from .._shared.checksums import content_checksum, range_validation_flags
 from .._shared.encryption import decrypt_blob
 from .._shared.request_handlers import validate_and_format_range_headers
 from .._shared.response_handlers import process_storage_error, parse_length_from_content_range
+from .._shared.tuning import concurrency_limit, start_tuner
 from .._deserialize import get_page_ranges_result
-from .._download import process_range_and_offset, _ChunkDownloader
+from .._download import (
+    process_range_and_offset, empty_chunk, leaves_holes, _ChunkDownloader, _map_file, _open_checkpoint,
+    _writable_view)
 
 
-async def process_content(data, start_offset, end_offset, encryption):
+async def process_content(data, start_offset, end_offset, encryption, validate_content=None):
     if data is None:
         raise ValueError("Response cannot be None.")
     try:
         content = data.response.body()
     except Exception as error:
         raise HttpResponseError(message="Download stream interrupted.", response=data.response, error=error)
+    checksum = content_checksum(validate_content)
+    if checksum is not None:
+        checksum.update(content)
+        checksum.check(data.response.headers, response=data.response)
     if encryption.get('key') is not None or encryption.get('resolver') is not None:
         try:
             return decrypt_blob(
@@ -43,6 +55,20 @@ async def process_content(data, start_offset, end_offset, encryption):
     return content
 
 
+async def copy_content(data, view, validate_content=None):
+    if data is None:
+        raise ValueError("Response cannot be None.")
+    try:
+        content = data.response.body()
+        view[:] = content
+    except Exception as error:
+        raise HttpResponseError(message="Download stream interrupted.", response=data.response, error=error)
+    checksum = content_checksum(validate_content)
+    if checksum is not None:
+        checksum.update(content)
+        checksum.check(data.response.headers, response=data.response)
+
+
 class _AsyncChunkDownloader(_ChunkDownloader):
     def __init__(self, **kwargs):
         super(_AsyncChunkDownloader, self).__init__(**kwargs)
@@ -50,11 +76,16 @@ class _AsyncChunkDownloader(_ChunkDownloader):
         self.progress_lock = asyncio.Lock() if kwargs.get('parallel') else None
 
     async def process_chunk(self, chunk_start):
+        started = time.time()
         chunk_start, chunk_end = self._calculate_range(chunk_start)
+        if self._skip_empty_chunk(chunk_start, chunk_end):
+            await self._update_progress(chunk_end - chunk_start)
+            return
         chunk_data = await self._download_chunk(chunk_start, chunk_end - 1)
         length = chunk_end - chunk_start
         if length > 0:
             await self._write_to_stream(chunk_data, chunk_start)
+            self._record_chunk(length, started)
             await self._update_progress(length)
 
     async def yield_chunk(self, chunk_start):
@@ -83,33 +114,67 @@ class _AsyncChunkDownloader(_ChunkDownloader):
         # No need to download the empty chunk from server if there's no data in the chunk to be downloaded.
         # Do optimize and create empty chunk locally if condition is met.
         if self._do_optimize(download_range[0], download_range[1]):
-            chunk_data = b"\x00" * self.chunk_size
+            chunk_data = empty_chunk(chunk_end - chunk_start + 1)
         else:
-            range_header, range_validation = validate_and_format_range_headers(
-                download_range[0],
-                download_range[1],
-                check_content_md5=self.validate_content
+            response = await self._request_chunk(download_range)
+            chunk_data = await process_content(
+                response, offset[0], offset[1], self.encryption_options, self.validate_content)
+        return chunk_data
+
+    async def _request_chunk(self, download_range):
+        range_header, range_validation = validate_and_format_range_headers(
+            download_range[0],
+            download_range[1],
+            check_content_md5=self.validate_content
+        )
+        range_md5, range_crc64 = range_validation_flags(self.validate_content, range_validation)
+        try:
+            _, response = await self.client.download(
+                range=range_header,
+                range_get_content_md5=range_md5,
+                range_get_content_crc64=range_crc64,
+                validate_content=self.validate_content,
+                data_stream_total=self.total_size,
+                download_stream_current=self.progress_total,
+                **self.request_options
             )
-            try:
-                _, response = await self.client.download(
-                    range=range_header,
-                    range_get_content_md5=range_validation,
-                    validate_content=self.validate_content,
-                    data_stream_total=self.total_size,
-                    download_stream_current=self.progress_total,
-                    **self.request_options
-                )
-            except HttpResponseError as error:
-                process_storage_error(error)
+        except HttpResponseError as error:
+            process_storage_error(error)
 
-            chunk_data = await process_content(response, offset[0], offset[1], self.encryption_options)
+        # This makes sure that if_match is set so that we can validate
+        # that subsequent downloads are to an unmodified blob
+        if self.request_options.get('modified_access_conditions'):
+            self.request_options['modified_access_conditions'].if_match = response.properties.etag
+        return response
 
-            # This makes sure that if_match is set so that we can validate
-            # that subsequent downloads are to an unmodified blob
-            if self.request_options.get('modified_access_conditions'):
-                self.request_options['modified_access_conditions'].if_match = response.properties.etag
 
-        return chunk_data
+class _AsyncBufferChunkDownloader(_AsyncChunkDownloader):
+    """Download each chunk straight into its own slot of a writable buffer."""
+
+    def __init__(self, buffer=None, zero_empty_chunks=True, journal=None, **kwargs):
+        super(_AsyncBufferChunkDownloader, self).__init__(**kwargs)
+        self.buffer = buffer
+        self.zero_empty_chunks = zero_empty_chunks
+        self.journal = journal
+
+    async def process_chunk(self, chunk_start):
+        started = time.time()
+        chunk_start, chunk_end = self._calculate_range(chunk_start)
+        length = chunk_end - chunk_start
+        if length > 0:
+            if self.journal is not None and self.journal.chunks.get(str(chunk_start)) == length:
+                await self._update_progress(length)
+                return
+            slot = self.buffer[chunk_start - self.start_index:chunk_end - self.start_index]
+            if not self._do_optimize(chunk_start, chunk_end - 1):
+                await copy_content(
+                    await self._request_chunk((chunk_start, chunk_end - 1)), slot, self.validate_content)
+            elif self.zero_empty_chunks:
+                slot[:] = empty_chunk(length)
+            self._record_chunk(length, started)
+            await self._update_progress(length)
+            if self.journal is not None:
+                self.journal.record(str(chunk_start), length)
 
 
 class _AsyncChunkIterator(object):
@@ -153,6 +218,68 @@ class _AsyncChunkIterator(object):
         return self._current_content
 
 
+class _AsyncPrefetchChunkIterator(_AsyncChunkIterator):
+    """Async iterator for chunks in blob download stream, downloading the next chunks ahead.
+
+    Up to `window` chunks are downloaded or waiting to be consumed at once. They may
+    complete in any order, but are delivered in order, and the next chunks are only
+    requested as chunks are consumed, so a slow consumer holds at most `window` chunks.
+    """
+
+    def __init__(self, size, content, downloader, window, schedule=asyncio.ensure_future):
+        super(_AsyncPrefetchChunkIterator, self).__init__(size, content, downloader)
+        self._window = window
+        self._schedule = schedule
+        self._pending = deque()
+
+    def _prefetch(self):
+        while len(self._pending) < self._window:
+            try:
+                chunk = next(self._iter_chunks)
+            except StopIteration:
+                return
+            self._pending.append(self._schedule(self._iter_downloader.yield_chunk(chunk)))
+
+    async def __anext__(self):
+        """Iterate through responses."""
+        if self._complete:
+            raise StopAsyncIteration("Download complete")
+        if not self._iter_downloader:
+            self._complete = True
+            return self._current_content
+
+        if not self._iter_chunks:
+            # The next chunks are downloaded while the content of the first request is consumed
+            self._iter_chunks = self._iter_downloader.get_chunk_offsets()
+            self._prefetch()
+            return self._current_content
+        if not self._pending:
+            self._complete = True
+            raise StopAsyncIteration("Download complete")
+
+        try:
+            self._current_content = await self._pending[0]
+        except BaseException:
+            await self.close()
+            raise
+        self._pending.popleft()
+        self._prefetch()
+        return self._current_content
+
+    async def close(self):
+        """Cancel the downloads of the chunks not consumed yet.
+
+        To be called when the iteration stops before the end of the download.
+        """
+        self._complete = True
+        pending = list(self._pending)
+        self._pending.clear()
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+
+
 class StorageStreamDownloader(object):  # pylint: disable=too-many-instance-attributes
     """A streaming object to download from Azure Storage.
 
@@ -180,6 +307,8 @@ class StorageStreamDownloader(object):  # pylint: disable=too-many-instance-attr
             name=None,
             container=None,
             encoding=None,
+            tuner=None,
+            executor=None,
             **kwargs
     ):
         self.name = name
@@ -192,6 +321,8 @@ class StorageStreamDownloader(object):  # pylint: disable=too-many-instance-attr
         self._start_range = start_range
         self._end_range = end_range
         self._max_concurrency = max_concurrency
+        self._tuner = tuner
+        self._executor = executor
         self._encoding = encoding
         self._validate_content = validate_content
         self._encryption_options = encryption_options or {}
@@ -250,7 +381,8 @@ class StorageStreamDownloader(object):  # pylint: disable=too-many-instance-attr
                 self._response,
                 self._initial_offset[0],
                 self._initial_offset[1],
-                self._encryption_options
+                self._encryption_options,
+                self._validate_content
             )
 
     async def _initial_request(self):
@@ -260,11 +392,13 @@ class StorageStreamDownloader(object):  # pylint: disable=too-many-instance-attr
             start_range_required=False,
             end_range_required=False,
             check_content_md5=self._validate_content)
+        range_md5, range_crc64 = range_validation_flags(self._validate_content, range_validation)
 
         try:
             location_mode, response = await self._clients.blob.download(
                 range=range_header,
-                range_get_content_md5=range_validation,
+                range_get_content_md5=range_md5,
+                range_get_content_crc64=range_crc64,
                 validate_content=self._validate_content,
                 data_stream_total=None,
                 download_stream_current=0,
@@ -324,36 +458,62 @@ class StorageStreamDownloader(object):  # pylint: disable=too-many-instance-attr
             self._download_complete = True
         return response
 
+    def _iter_chunk_downloader(self):
+        if self.size == 0 or self._download_complete:
+            return None
+        data_end = self._file_size
+        if self._end_range is not None:
+            # Use the length unless it is over the end of the file
+            data_end = min(self._file_size, self._end_range + 1)
+        return _AsyncChunkDownloader(
+            client=self._clients.blob,
+            non_empty_ranges=self._non_empty_ranges,
+            total_size=self.size,
+            chunk_size=self._config.max_chunk_get_size,
+            current_progress=self._first_get_size,
+            start_range=self._initial_range[1] + 1,  # Start where the first download ended
+            end_range=data_end,
+            stream=None,
+            parallel=False,
+            validate_content=self._validate_content,
+            encryption_options=self._encryption_options,
+            use_location=self._location_mode,
+            **self._request_options)
+
     def chunks(self):
         """Iterate over chunks in the download stream.
 
         :rtype: Iterable[bytes]
         """
-        if self.size == 0 or self._download_complete:
-            iter_downloader = None
-        else:
-            data_end = self._file_size
-            if self._end_range is not None:
-                # Use the length unless it is over the end of the file
-                data_end = min(self._file_size, self._end_range + 1)
-            iter_downloader = _AsyncChunkDownloader(
-                client=self._clients.blob,
-                non_empty_ranges=self._non_empty_ranges,
-                total_size=self.size,
-                chunk_size=self._config.max_chunk_get_size,
-                current_progress=self._first_get_size,
-                start_range=self._initial_range[1] + 1,  # Start where the first download ended
-                end_range=data_end,
-                stream=None,
-                parallel=False,
-                validate_content=self._validate_content,
-                encryption_options=self._encryption_options,
-                use_location=self._location_mode,
-                **self._request_options)
         return _AsyncChunkIterator(
             size=self.size,
             content=self._current_content,
-            downloader=iter_downloader)
+            downloader=self._iter_chunk_downloader())
+
+    def iter_chunks(self, window=None):
+        """Iterate over chunks in the download stream, downloading the next chunks ahead.
+
+        The chunks are delivered in order, while up to `window` chunks are downloaded in
+        parallel or waiting to be consumed. The next chunks are only requested as chunks are
+        consumed, so the memory used is bounded by the window, even for a slow consumer.
+        If the iteration stops before the end of the download, the `close()` coroutine of the
+        iterator cancels the downloads in progress.
+
+        :param int window:
+            The number of chunks downloaded ahead. Defaults to the max_concurrency
+            of the download.
+        :rtype: AsyncIterator[bytes]
+        """
+        window = concurrency_limit(self._tuner, self._max_concurrency) if window is None else window
+        if window < 1:
+            raise ValueError("window must be greater than 0.")
+        schedule = self._executor.submit if self._executor is not None else asyncio.ensure_future
+        return _AsyncPrefetchChunkIterator(
+            size=self.size,
+            content=self._current_content,
+            downloader=self._iter_chunk_downloader(),
+            window=window,
+            schedule=schedule)
 
     async def readall(self):
         """Download the contents of this blob.
@@ -409,12 +569,14 @@ class StorageStreamDownloader(object):  # pylint: disable=too-many-instance-attr
         :param stream:
             The stream to download to. This can be an open file-handle,
             or any writable stream. The stream must be seekable if the download
-            uses more than one parallel connection.
+            uses more than one parallel connection. When a page blob is downloaded
+            to the end of a file, its empty pages are skipped over rather than written,
+            leaving them as holes of a sparse file.
         :returns: The number of bytes read.
         :rtype: int
         """
         # the stream must be seekable if parallel download is required
-        parallel = self._max_concurrency > 1
+        parallel = self._is_parallel()
         if parallel:
             error_message = "Target stream handle must be seekable."
             if sys.version_info >= (3,) and not stream.seekable():
@@ -448,27 +610,133 @@ class StorageStreamDownloader(object):  # pylint: disable=too-many-instance-attr
             validate_content=self._validate_content,
             encryption_options=self._encryption_options,
             use_location=self._location_mode,
+            tuner=self._tuner,
+            sparse=self._is_sparse_target(stream),
             **self._request_options)
+        await self._process_chunks(downloader)
+        downloader.finish_stream()
+        return self.size
+
+    def _is_sparse_target(self, stream):
+        encrypted = self._encryption_options.get('key') is not None or \
+            self._encryption_options.get('resolver') is not None
+        return self._non_empty_ranges is not None and not encrypted and leaves_holes(stream)
+
+    def _is_parallel(self):
+        return concurrency_limit(self._tuner, self._max_concurrency) > 1
 
+    async def _process_chunks(self, downloader):
+        start_tuner(self._tuner, self._config.max_chunk_get_size, self._max_concurrency)
+        max_concurrency = self._tuner.concurrency if self._tuner else self._max_concurrency
+        # A shared executor bounds the requests in flight across transfers
+        schedule = self._executor.submit if self._executor is not None else asyncio.ensure_future
         dl_tasks = downloader.get_chunk_offsets()
         running_futures = [
-            asyncio.ensure_future(downloader.process_chunk(d))
-            for d in islice(dl_tasks, 0, self._max_concurrency)
+            schedule(downloader.process_chunk(d))
+            for d in islice(dl_tasks, 0, max_concurrency)
         ]
         while running_futures:
             # Wait for some download to finish before adding a new one
-            _done, running_futures = await asyncio.wait(
+            done, running_futures = await asyncio.wait(
                 running_futures, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                task.result()
+            # An autotuned download adjusts the number of chunks in flight as it goes
+            in_flight = self._tuner.concurrency if self._tuner else len(running_futures) + 1
             try:
-                next_chunk = next(dl_tasks)
+                while len(running_futures) < in_flight:
+                    running_futures.add(schedule(downloader.process_chunk(next(dl_tasks))))
             except StopIteration:
                 break
-            else:
-                running_futures.add(asyncio.ensure_future(downloader.process_chunk(next_chunk)))
 
         if running_futures:
             # Wait for the remaining downloads to finish
-            await asyncio.wait(running_futures)
+            done, _running = await asyncio.wait(running_futures)
+            for task in done:
+                task.result()
+
+    async def download_into(self, target, checkpoint=None):
+        """Download the contents of this blob straight into a buffer or a file.
+
+        Unlike readinto, each chunk is written into its own slot of the target as it
+        is received, so parallel connections never wait on each other.
+        Client-side encryption is not supported.
+
+        :param target:
+            A writable bytes-like object (e.g. a bytearray, or a memoryview over one) of
+            at least `size` bytes, or the path of a file. The file is created, or truncated,
+            with the size of the download and is written through a memory map.
+        :type target: bytearray or memoryview or str
+        :param str checkpoint:
+            The path of a local journal file making a download into a file resumable. The
+            chunks written are recorded in it, and when the download of the same range of
+            the same version (ETag) of the blob into the same file is retried with the same
+            checkpoint, these chunks are not downloaded again. The journal is deleted once
+            the download is complete.
+        :returns: The number of bytes read.
+        :rtype: int
+        """
+        if self._encryption_options.get('key') is not None or self._encryption_options.get('resolver') is not None:
+            raise ValueError("download_into does not support client-side encryption, use readinto instead.")
+        if isinstance(target, six.string_types):
+            journal, mode = None, "wb+"
+            if checkpoint is not None:
+                journal, mode = _open_checkpoint(checkpoint, target, self._checkpoint_header())
+            try:
+                with open(target, mode) as stream, _map_file(stream, self.size) as view:
+                    if view is None:
+                        size = await self.readinto(stream)
+                    else:
+                        # A new file was just extended with zeros, empty pages can be left as holes
+                        size = await self._download_into_view(
+                            view, zero_empty_chunks=mode != "wb+", journal=journal)
+                if journal is not None:
+                    journal.remove()
+                return size
+            finally:
+                if journal is not None:
+                    journal.close()
+        if checkpoint is not None:
+            raise ValueError("A checkpoint is only supported when downloading into a file.")
+        return await self._download_into_view(_writable_view(target, self.size), zero_empty_chunks=True)
+
+    def _checkpoint_header(self):
+        return {
+            'blob': '/'.join([self.container, self.name]),
+            'etag': self.properties.etag,
+            'offset': self._start_range or 0,
+            'size': self.size
+        }
+
+    async def _download_into_view(self, view, zero_empty_chunks, journal=None):
+        content_length = len(self._current_content)
+        view[:content_length] = self._current_content
+        if self._download_complete:
+            return self.size
+
+        data_end = self._file_size
+        if self._end_range is not None:
+            # Use the length unless it is over the end of the file
+            data_end = min(self._file_size, self._end_range + 1)
+
+        downloader = _AsyncBufferChunkDownloader(
+            buffer=view[content_length:self.size],
+            zero_empty_chunks=zero_empty_chunks,
+            journal=journal,
+            client=self._clients.blob,
+            non_empty_ranges=self._non_empty_ranges,
+            total_size=self.size,
+            chunk_size=self._config.max_chunk_get_size,
+            current_progress=self._first_get_size,
+            start_range=self._initial_range[1] + 1,  # start where the first download ended
+            end_range=data_end,
+            parallel=self._is_parallel(),
+            validate_content=self._validate_content,
+            encryption_options=self._encryption_options,
+            use_location=self._location_mode,
+            tuner=self._tuner,
+            **self._request_options)
+        await self._process_chunks(downloader)
         return self.size
 
     async def download_to_stream(self, stream, max_concurrency=1):
@@ -0,0 +1,157 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+
+import asyncio
+import time
+
+from typing import (  # pylint: disable=unused-import
+    Optional, Any, Dict, Union, TypeVar, TYPE_CHECKING
+)
+
+from .._download import empty_chunk
+from .._incremental_sync import PageBlobSync as PageBlobSyncBase
+
+if TYPE_CHECKING:
+    from .._incremental_sync import PageBlobSyncReport
+    from .._models import BlobProperties
+    BlobClient = TypeVar("BlobClient")
+
+
+class PageBlobSync(PageBlobSyncBase):
+    """Bring a copy of a page blob, like a managed disk, up to date with only the pages changed.
+
+    The copy, a local image or another page blob, must hold the content of a previous snapshot of
+    the source blob. The page ranges changed and cleared since that snapshot are listed with a
+    single diff request, the adjacent ranges are coalesced into writes of up to 4 MiB, and up to
+    `max_concurrency` writes are run concurrently. The source should be a snapshot, or a blob not
+    written to during the sync.
+
+    :param source_client:
+        The client of the source page blob, or of a snapshot of it.
+    :type source_client: ~azure.storage.blob.aio.BlobClient
+    :param int max_concurrency: The largest number of writes in flight. Defaults to 8.
+    :param int max_write_size:
+        The largest number of bytes of a write, up to 4 MiB, which is the default.
+    """
+
+    async def _get_diff(self, previous_snapshot, previous_snapshot_url, timeout):
+        if previous_snapshot_url is not None:
+            return await self.source_client.get_page_range_diff_for_managed_disk(
+                previous_snapshot_url, timeout=timeout)
+        return await self.source_client.get_page_ranges(previous_snapshot_diff=previous_snapshot, timeout=timeout)
+
+    async def _run(self, write, writes, clear, clears):
+        operations = self._operations(write, writes, clear, clears)
+
+        async def worker():
+            try:
+                while operations:
+                    operation, (offset, length) = operations.popleft()
+                    await operation(offset, length)
+            except BaseException:
+                # Stop the other workers once their operation in flight is done
+                operations.clear()
+                raise
+
+        results = await asyncio.gather(
+            *[worker() for _ in range(self.max_concurrency)], return_exceptions=True)
+        for result in results:
+            if isinstance(result, BaseException):
+                raise result
+
+    async def sync_to_file(self, path, previous_snapshot=None, **kwargs):
+        # type: (str, Optional[Union[str, Dict[str, Any], BlobProperties]], **Any) -> PageBlobSyncReport
+        """Update a local image holding the content of a previous snapshot of the source blob.
+
+        The changed pages are downloaded and written in place, the cleared pages are zeroed,
+        and the file is resized to the size of the source blob.
+
+        :param str path: The path of the local image.
+        :param previous_snapshot:
+            The previous snapshot, as a snapshot ID string, or the dict or BlobProperties
+            returned by `create_snapshot` or `get_blob_properties`.
+        :type previous_snapshot: str or dict(str, Any) or ~azure.storage.blob.BlobProperties
+        :keyword str previous_snapshot_url:
+            The URL of a previous snapshot of a managed disk, instead of previous_snapshot.
+        :keyword int timeout:
+            The timeout parameter is expressed in seconds, for each request.
+        :returns: The report of the sync.
+        :rtype: ~azure.storage.blob.PageBlobSyncReport
+        """
+        started = time.time()
+        previous_snapshot_url, timeout = self._sync_options(previous_snapshot, kwargs)
+        size = (await self.source_client.get_blob_properties(timeout=timeout)).size
+        report, writes, clears = self._plan(
+            size, *(await self._get_diff(previous_snapshot, previous_snapshot_url, timeout)))
+        with open(path, 'r+b') as image:
+            image.truncate(report.size)
+
+            def write(offset, data):
+                image.seek(offset)
+                image.write(data)
+
+            async def download(offset, length):
+                downloader = await self.source_client.download_blob(offset=offset, length=length, timeout=timeout)
+                write(offset, await downloader.readall())
+
+            async def clear(offset, length):
+                for start in range(offset, offset + length, self.max_write_size):
+                    write(start, empty_chunk(min(self.max_write_size, offset + length - start)))
+
+            await self._run(download, writes, clear, clears)
+        report.elapsed = time.time() - started
+        return report
+
+    async def sync_to_blob(self, target_client, previous_snapshot=None, **kwargs):
+        # type: (BlobClient, Optional[Union[str, Dict[str, Any], BlobProperties]], **Any) -> PageBlobSyncReport
+        """Update a page blob holding the content of a previous snapshot of the source blob.
+
+        The changed pages are copied by the service with `upload_pages_from_url`, the cleared
+        pages are cleared with `clear_page`, and the target is resized to the size of the source.
+
+        :param target_client: The client of the target page blob.
+        :type target_client: ~azure.storage.blob.aio.BlobClient
+        :param previous_snapshot:
+            The previous snapshot, as a snapshot ID string, or the dict or BlobProperties
+            returned by `create_snapshot` or `get_blob_properties`.
+        :type previous_snapshot: str or dict(str, Any) or ~azure.storage.blob.BlobProperties
+        :keyword str previous_snapshot_url:
+            The URL of a previous snapshot of a managed disk, instead of previous_snapshot.
+        :keyword str source_url:
+            The URL the service reads the changed pages from, authorized with a SAS or public
+            access. Defaults to the URL of the source client, which includes its SAS token, if any.
+        :keyword bool copy_from_url:
+            Whether the service copies the changed pages from the source URL. If False, they
+            are downloaded and uploaded with `upload_page` instead, e.g. when the source cannot
+            be given a SAS. Defaults to True.
+        :keyword int timeout:
+            The timeout parameter is expressed in seconds, for each request.
+        :returns: The report of the sync.
+        :rtype: ~azure.storage.blob.PageBlobSyncReport
+        """
+        started = time.time()
+        previous_snapshot_url, timeout = self._sync_options(previous_snapshot, kwargs)
+        source_url = kwargs.pop('source_url', None) or self.source_client.url
+        copy_from_url = kwargs.pop('copy_from_url', True)
+        size = (await self.source_client.get_blob_properties(timeout=timeout)).size
+        report, writes, clears = self._plan(
+            size, *(await self._get_diff(previous_snapshot, previous_snapshot_url, timeout)))
+        if (await target_client.get_blob_properties(timeout=timeout)).size != report.size:
+            await target_client.resize_blob(report.size, timeout=timeout)
+
+        async def copy(offset, length):
+            if copy_from_url:
+                await target_client.upload_pages_from_url(source_url, offset, length, offset, timeout=timeout)
+            else:
+                downloader = await self.source_client.download_blob(offset=offset, length=length, timeout=timeout)
+                await target_client.upload_page(await downloader.readall(), offset, length, timeout=timeout)
+
+        async def clear(offset, length):
+            await target_client.clear_page(offset, length, timeout=timeout)
+
+        await self._run(copy, writes, clear, clears)
+        report.elapsed = time.time() - started
+        return report
@@ -0,0 +1,37 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+
+from .._shared.response_handlers import process_storage_error
+from .._generated.models import StorageErrorException
+from .._lean_listing import Projection, extract_records
+from ._models import BlobPropertiesPaged
+
+
+class BlobRecordsPaged(BlobPropertiesPaged):
+    """An async Iterable of BlobRecords, parsed from the XML of the listing.
+
+    The command returns the location mode and the HTTP response of a page, rather than the
+    generated models of its blobs.
+
+    :param callable command: Function to retrieve the next page of items.
+    :param projection: The XML elements to read for the fields selected.
+    """
+    def __init__(self, command, projection=None, **kwargs):
+        super(BlobRecordsPaged, self).__init__(command, **kwargs)
+        self._projection = projection or Projection([])
+
+    async def _get_next_cb(self, continuation_token):
+        try:
+            return await self._command(
+                prefix=self.prefix,
+                marker=continuation_token or None,
+                maxresults=self.results_per_page,
+                use_location=self.location_mode)
+        except StorageErrorException as error:
+            process_storage_error(error)
+
+    async def _extract_data_cb(self, get_next_return):
+        return extract_records(self, get_next_return)
@@ -17,6 +17,7 @@ from .._generated.models import (
     LeaseAccessConditions)
 from .._serialize import get_modify_conditions
 from .._lease import BlobLeaseClient as LeaseClientBase
+from ._properties_cache_async import invalidates_properties
 
 if TYPE_CHECKING:
     from datetime import datetime
@@ -62,6 +63,7 @@ class BlobLeaseClient(LeaseClientBase):
         await self.release()
 
     @distributed_trace_async
+    @invalidates_properties
     async def acquire(self, lease_duration=-1, **kwargs):
         # type: (int, Any) -> None
         """Requests a new lease.
@@ -111,6 +113,7 @@ class BlobLeaseClient(LeaseClientBase):
         self.etag = kwargs.get('etag')  # type: str
 
     @distributed_trace_async
+    @invalidates_properties
     async def renew(self, **kwargs):
         # type: (Any) -> None
         """Renews the lease.
@@ -157,6 +160,7 @@ class BlobLeaseClient(LeaseClientBase):
         self.last_modified = response.get('last_modified')   # type: datetime
 
     @distributed_trace_async
+    @invalidates_properties
     async def release(self, **kwargs):
         # type: (Any) -> None
         """Release the lease.
@@ -201,6 +205,7 @@ class BlobLeaseClient(LeaseClientBase):
         self.last_modified = response.get('last_modified')   # type: datetime
 
     @distributed_trace_async
+    @invalidates_properties
     async def change(self, proposed_lease_id, **kwargs):
         # type: (str, Any) -> None
         """Change the lease ID of an active lease.
@@ -245,6 +250,7 @@ class BlobLeaseClient(LeaseClientBase):
         self.last_modified = response.get('last_modified')   # type: datetime
 
     @distributed_trace_async
+    @invalidates_properties
     async def break_lease(self, lease_break_period=None, **kwargs):
         # type: (Optional[int], Any) -> int
         """Break the lease, if the container or blob has an active lease.
@@ -0,0 +1,139 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+
+import asyncio
+
+from .._parallel_listing import MAX_BUFFERED_PAGES, ParallelListingBase, _PartitionDone
+
+
+class AsyncParallelListing(ParallelListingBase):
+    """List the blobs of the partitions as tasks, as an async iterator.
+
+    A task returns the partitions in order, or in the order their pages are received, through
+    a bounded queue. If the iteration stops before the end, the `close()` coroutine cancels
+    the listings in progress.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super(AsyncParallelListing, self).__init__(*args, **kwargs)
+        self._output = None
+        self._runner = None
+        self._tasks = set()
+        self._page = iter(())
+        self._done = False
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        if self._runner is None and not self._done:
+            self._output = asyncio.Queue(MAX_BUFFERED_PAGES * self.max_concurrency)
+            self._runner = asyncio.ensure_future(self._run())
+        while True:
+            try:
+                return next(self._page)
+            except StopIteration:
+                pass
+            if self._done:
+                raise StopAsyncIteration
+            item = await self._output.get()
+            if isinstance(item, _PartitionDone):
+                await self.close()
+                if item.error is not None:
+                    raise item.error
+                raise StopAsyncIteration
+            self._page = iter(item)
+
+    async def close(self):
+        """Cancel the listings in progress."""
+        self._done = True
+        self._page = iter(())
+        tasks = [task for task in self._tasks | set([self._runner]) if task is not None and not task.done()]
+        self._tasks = set()
+        for task in tasks:
+            task.cancel()
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    def _start(self, coro):
+        task = asyncio.ensure_future(coro)
+        self._tasks.add(task)
+        return task
+
+    async def _list_partition(self, prefix, output):
+        async for page in self.list_pages(prefix):
+            blobs = []
+            async for blob in page:
+                blobs.append(blob)
+            await output.put(blobs)
+
+    async def _list_partition_into(self, prefix, output):
+        error = None
+        try:
+            await self._list_partition(prefix, output)
+        except asyncio.CancelledError:  # pylint: disable=try-except-raise
+            raise
+        except Exception as exc:  # pylint: disable=broad-except
+            error = exc
+        await output.put(_PartitionDone(error))
+
+    async def _ordered(self):
+        outputs = {}
+        started = 0
+        for index, (_, blob) in enumerate(self.partitions):
+            # Keep listing the next prefixes while the current one is consumed
+            while started < len(self.partitions) and started < index + self.max_concurrency:
+                prefix, started_blob = self.partitions[started]
+                if started_blob is None:
+                    outputs[started] = asyncio.Queue(MAX_BUFFERED_PAGES)
+                    self._start(self._list_partition_into(prefix, outputs[started]))
+                started += 1
+            if blob is not None:
+                await self._output.put([blob])
+                continue
+            output = outputs.pop(index)
+            while True:
+                item = await output.get()
+                if isinstance(item, _PartitionDone):
+                    if item.error is not None:
+                        raise item.error
+                    break
+                await self._output.put(item)
+
+    async def _unordered(self):
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def list_partition(prefix):
+            async with semaphore:
+                await self._list_partition(prefix, self._output)
+
+        tasks = [self._start(list_partition(prefix)) for prefix, blob in self.partitions if blob is None]
+        blobs = [blob for _, blob in self.partitions if blob is not None]
+        if blobs:
+            await self._output.put(blobs)
+        if tasks:
+            await asyncio.gather(*tasks)
+
+    async def _run(self):
+        error = None
+        try:
+            items = []
+            if self.prefixes is None:
+                if hasattr(self.items, '__aiter__'):
+                    async for item in self.items:
+                        items.append(item)
+                else:
+                    items = list(self.items)
+            self._set_partitions(items)
+            if self.ordered:
+                await self._ordered()
+            else:
+                await self._unordered()
+        except asyncio.CancelledError:  # pylint: disable=try-except-raise
+            raise
+        except Exception as exc:  # pylint: disable=broad-except
+            error = exc
+        await self._output.put(_PartitionDone(error))
@@ -0,0 +1,21 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+
+import functools
+
+from typing import Callable  # pylint: disable=unused-import
+
+
+def invalidates_properties(func):
+    # type: (Callable) -> Callable
+    """Invalidate the cached properties of the blob of a client once the decorated write has run."""
+    @functools.wraps(func)
+    async def wrapper(self, *args, **kwargs):
+        try:
+            return await func(self, *args, **kwargs)
+        finally:
+            self._invalidate_properties()  # pylint: disable=protected-access
+    return wrapper
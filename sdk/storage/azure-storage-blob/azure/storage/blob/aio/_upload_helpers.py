@@ -27,6 +27,7 @@ from .._generated.models import (
     AppendPositionAccessConditions,
     ModifiedAccessConditions,
 )
+from .._checkpoint import CheckpointedBlockService, staged_blocks
 from .._upload_helpers import _convert_mod_error, _any_conditions
 
 if TYPE_CHECKING:
@@ -34,6 +35,17 @@ if TYPE_CHECKING:
     BlobLeaseClient = TypeVar("BlobLeaseClient")
 
 
+class AsyncCheckpointedBlockService(CheckpointedBlockService):
+    """Stage blocks with the wrapped async block blob operations, unless they are already staged."""
+
+    async def stage_block(self, block_id, content_length, body, **kwargs):
+        if self._journal.chunks.get(block_id) == content_length:
+            return None
+        response = await self._service.stage_block(block_id, content_length, body, **kwargs)
+        self._journal.record(block_id, content_length)
+        return response
+
+
 async def upload_block_blob(  # pylint: disable=too-many-locals
         client=None,
         data=None,
@@ -45,6 +57,9 @@ async def upload_block_blob(  # pylint: disable=too-many-locals
         max_concurrency=None,
         blob_settings=None,
         encryption_options=None,
+        tuner=None,
+        journal=None,
+        executor=None,
         **kwargs):
     try:
         if not overwrite and not _any_conditions(**kwargs):
@@ -78,6 +93,20 @@ async def upload_block_blob(  # pylint: disable=too-many-locals
                 tier=tier.value if tier else None,
                 **kwargs)
 
+        if journal is not None:
+            # Keep the blocks recorded in the journal that are still staged
+            try:
+                staged = staged_blocks(await client.get_block_list(
+                    list_type='uncommitted',
+                    lease_access_conditions=kwargs.get('lease_access_conditions')))
+            except StorageErrorException as error:
+                if error.response.status_code != 404:
+                    raise
+                staged = {}
+            journal.chunks = {k: v for k, v in journal.chunks.items() if staged.get(k) == v}
+            journal.start()
+            client = AsyncCheckpointedBlockService(client, journal)
+
         use_original_upload_path = blob_settings.use_byte_buffer or \
             validate_content or encryption_options.get('required') or \
             blob_settings.max_block_size < blob_settings.min_large_block_upload_threshold or \
@@ -96,7 +125,9 @@ async def upload_block_blob(  # pylint: disable=too-many-locals
                 total_size=length,
                 chunk_size=blob_settings.max_block_size,
                 max_concurrency=max_concurrency,
+                executor=executor,
                 stream=stream,
+                tuner=tuner,
                 validate_content=validate_content,
                 encryption_options=encryption_options,
                 **kwargs
@@ -108,14 +139,16 @@ async def upload_block_blob(  # pylint: disable=too-many-locals
                 total_size=length,
                 chunk_size=blob_settings.max_block_size,
                 max_concurrency=max_concurrency,
+                executor=executor,
                 stream=stream,
+                tuner=tuner,
                 validate_content=validate_content,
                 **kwargs
             )
 
         block_lookup = BlockLookupList(committed=[], uncommitted=[], latest=[])
         block_lookup.latest = block_ids
-        return await client.commit_block_list(
+        response = await client.commit_block_list(
             block_lookup,
             blob_http_headers=blob_headers,
             cls=return_response_headers,
@@ -123,6 +156,9 @@ async def upload_block_blob(  # pylint: disable=too-many-locals
             headers=headers,
             tier=tier.value if tier else None,
             **kwargs)
+        if journal is not None:
+            journal.remove()
+        return response
     except StorageErrorException as error:
         try:
             process_storage_error(error)
@@ -130,6 +166,9 @@ async def upload_block_blob(  # pylint: disable=too-many-locals
             if not overwrite:
                 _convert_mod_error(mod_error)
             raise
+    finally:
+        if journal is not None:
+            journal.close()
 
 
 async def upload_page_blob(
@@ -142,6 +181,7 @@ async def upload_page_blob(
         max_concurrency=None,
         blob_settings=None,
         encryption_options=None,
+        executor=None,
         **kwargs):
     try:
         if not overwrite and not _any_conditions(**kwargs):
@@ -178,6 +218,7 @@ async def upload_page_blob(
             chunk_size=blob_settings.max_page_size,
             stream=stream,
             max_concurrency=max_concurrency,
+            executor=executor,
             validate_content=validate_content,
             encryption_options=encryption_options,
             **kwargs)
@@ -201,6 +242,7 @@ async def upload_append_blob(  # pylint: disable=unused-argument
         max_concurrency=None,
         blob_settings=None,
         encryption_options=None,
+        executor=None,
         **kwargs):
     try:
         if length == 0:
@@ -223,6 +265,7 @@ async def upload_append_blob(  # pylint: disable=unused-argument
                 chunk_size=blob_settings.max_block_size,
                 stream=stream,
                 max_concurrency=max_concurrency,
+                executor=executor,
                 validate_content=validate_content,
                 append_position_access_conditions=append_conditions,
                 **kwargs)
@@ -249,6 +292,7 @@ async def upload_append_blob(  # pylint: disable=unused-argument
                 chunk_size=blob_settings.max_block_size,
                 stream=stream,
                 max_concurrency=max_concurrency,
+                executor=executor,
                 validate_content=validate_content,
                 append_position_access_conditions=append_conditions,
                 **kwargs)
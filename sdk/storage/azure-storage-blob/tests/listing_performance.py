@@ -0,0 +1,71 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+"""Compare the deserialization of a listing page into BlobProperties and into BlobRecords.
+
+Run with "python tests/listing_performance.py". The number of blobs of the page and the
+number of rounds can be given as arguments.
+"""
+import sys
+import timeit
+
+from msrest.pipeline.universal import RawDeserializer
+
+from azure.storage.blob import BlobProperties
+from azure.storage.blob._generated import AzureBlobStorage
+from azure.storage.blob._lean_listing import Projection, SELECTABLE_FIELDS, parse_blob_records
+
+_BLOB = u"""<Blob><Name>folder/blob{index:06}</Name><Properties>
+<Creation-Time>Mon, 02 Mar 2020 10:15:00 GMT</Creation-Time>
+<Last-Modified>Tue, 03 Mar 2020 11:16:00 GMT</Last-Modified>
+<Etag>0x8D7BF{index:06}</Etag><Content-Length>{index}</Content-Length>
+<Content-Type>application/octet-stream</Content-Type><Content-Encoding /><Content-Language />
+<Content-MD5>1B2M2Y8AsgTpgAmY7PhCfg==</Content-MD5><Cache-Control /><Content-Disposition />
+<BlobType>BlockBlob</BlobType><AccessTier>Hot</AccessTier><AccessTierInferred>true</AccessTierInferred>
+<LeaseStatus>unlocked</LeaseStatus><LeaseState>available</LeaseState>
+<ServerEncrypted>true</ServerEncrypted></Properties></Blob>"""
+
+
+def listing(count):
+    return (u'﻿<?xml version="1.0" encoding="utf-8"?>'
+            u'<EnumerationResults ServiceEndpoint="https://account.blob.core.windows.net/" ContainerName="container">'
+            u'<MaxResults>{}</MaxResults><Blobs>{}</Blobs><NextMarker /></EnumerationResults>').format(
+                count, u''.join(_BLOB.format(index=index) for index in range(count))).encode('utf-8')
+
+
+def deserialize_models(deserialize, body):
+    response = deserialize(
+        'ListBlobsFlatSegmentResponse', RawDeserializer.deserialize_from_text(body, 'application/xml'))
+    blobs = []
+    for item in response.segment.blob_items:
+        blob = BlobProperties._from_generated(item)  # pylint: disable=protected-access
+        blob.container = response.container_name
+        blobs.append(blob)
+    return blobs
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    rounds = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    body = listing(count)
+    deserialize = AzureBlobStorage("https://account.blob.core.windows.net/container")._deserialize  # pylint: disable=protected-access
+    all_fields = Projection(SELECTABLE_FIELDS)
+    inventory = Projection(['size', 'last_modified', 'blob_tier'])
+
+    cases = [
+        ('BlobProperties', lambda: deserialize_models(deserialize, body)),
+        ('BlobRecord, all fields', lambda: parse_blob_records(body, all_fields)),
+        ('BlobRecord, all fields read', lambda: [
+            (record.content_settings, record.lease, record.copy) for record in parse_blob_records(body, all_fields)[1]]),
+        ('BlobRecord, 3 fields', lambda: parse_blob_records(body, inventory)),
+    ]
+    print("{} blobs, best of {} rounds".format(count, rounds))
+    for name, case in cases:
+        seconds = min(timeit.repeat(case, number=1, repeat=rounds))
+        print("{:<30} {:8.1f} ms {:10.0f} blobs/s".format(name, seconds * 1000, count / seconds))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,117 @@
+# coding: utf-8
+
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+
+import time
+
+from azure.core.exceptions import HttpResponseError, ResourceNotFoundError
+from azure.storage.blob import AppendBlobWriter
+from azure.storage.blob._shared.models import StorageErrorCode
+
+from _shared.testcase import StorageTestCase, GlobalStorageAccountPreparer
+
+# ------------------------------------------------------------------------------
+
+
+class _Properties(object):
+    def __init__(self, size):
+        self.size = size
+
+
+class _AppendBlob(object):
+    # an append blob in memory, checking the append position of each block
+    def __init__(self, data=None):
+        self.data = data
+        self.blocks = []
+        self.lost_responses = set()
+
+    def get_blob_properties(self, **kwargs):
+        if self.data is None:
+            raise ResourceNotFoundError("The specified blob does not exist.")
+        return _Properties(len(self.data))
+
+    def create_append_blob(self, **kwargs):
+        self.data = b""
+
+    def append_block(self, data, length=None, appendpos_condition=None, **kwargs):
+        assert len(data) == length
+        if appendpos_condition != len(self.data):
+            error = HttpResponseError("The append position condition specified was not met.")
+            error.error_code = StorageErrorCode.append_position_condition_not_met
+            raise error
+        self.data += data
+        self.blocks.append(length)
+        if len(self.blocks) in self.lost_responses:
+            # the response was lost, and the retry of the append failed on its position
+            self.append_block(data, length, appendpos_condition)
+
+
+class StorageAppendBlobWriterTest(StorageTestCase):
+
+    # these are white box tests that are designed to make sure small writes are grouped into
+    # blocks appended in order at their position, on the size and time thresholds
+    @GlobalStorageAccountPreparer()
+    def test_group_commit(self, resource_group, location, storage_account, storage_account_key):
+        blob = _AppendBlob()
+        blob.lost_responses.add(2)
+        records = [u"record {}\n".format(i) for i in range(500)]
+
+        with AppendBlobWriter(blob, max_block_size=1024, flush_interval=None, max_pending_blocks=1) as writer:
+            for record in records:
+                writer.write(record)
+            # a write larger than a block is split across blocks
+            self.assertEqual(writer.write(b"x" * 3000), 3000)
+
+        expected = u"".join(records).encode("utf-8") + b"x" * 3000
+        self.assertEqual(blob.data, expected)
+        self.assertEqual(blob.blocks[:-1], [1024] * (len(expected) // 1024))
+        self.assertEqual(writer.metrics.appends, len(blob.blocks))
+        self.assertEqual(writer.metrics.writes, 501)
+        self.assertEqual(writer.metrics.bytes_appended, len(expected))
+        self.assertGreaterEqual(writer.metrics.max_latency, writer.metrics.average_latency)
+        self.assertTrue(writer.closed)
+        with self.assertRaises(ValueError):
+            writer.write(b"closed")
+
+    @GlobalStorageAccountPreparer()
+    def test_flush_interval(self, resource_group, location, storage_account, storage_account_key):
+        blob = _AppendBlob(b"existing\n")
+        writer = AppendBlobWriter(blob, flush_interval=0.05)
+        writer.write(b"first\n")
+        writer.write(b"second\n")
+        deadline = time.time() + 5
+        while not blob.blocks and time.time() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(blob.data, b"existing\nfirst\nsecond\n")
+
+        writer.write(b"third\n")
+        writer.flush()
+        self.assertEqual(blob.blocks, [13, 6])
+        writer.close()
+
+        # the blob is replaced on overwrite
+        with AppendBlobWriter(blob, overwrite=True) as writer:
+            writer.writelines([b"a\n", b"b\n"])
+        self.assertEqual(blob.data, b"a\nb\n")
+
+    @GlobalStorageAccountPreparer()
+    def test_append_error(self, resource_group, location, storage_account, storage_account_key):
+        blob = _AppendBlob(b"")
+        writer = AppendBlobWriter(blob, max_block_size=4, flush_interval=None)
+        writer.write(b"1234")
+        writer.flush()
+
+        # another writer appended to the blob
+        blob.data += b"56"
+        writer.write(b"abcd")
+        with self.assertRaises(HttpResponseError):
+            writer.flush()
+        with self.assertRaises(HttpResponseError):
+            writer.write(b"efgh")
+        with self.assertRaises(HttpResponseError):
+            writer.close()
+        self.assertEqual(blob.data, b"123456")
@@ -0,0 +1,70 @@
+# coding: utf-8
+
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+
+import asyncio
+
+from azure.core.exceptions import HttpResponseError
+from azure.storage.blob.aio import AppendBlobWriter
+
+from _shared.testcase import GlobalStorageAccountPreparer
+from _shared.asynctestcase import AsyncStorageTestCase
+from test_append_writer import _AppendBlob
+
+# ------------------------------------------------------------------------------
+
+
+class _AsyncAppendBlob(object):
+    # the coroutines of the methods of an append blob in memory
+    def __init__(self, blob):
+        self.blob = blob
+
+    def __getattr__(self, name):
+        method = getattr(self.blob, name)
+
+        async def call(*args, **kwargs):
+            await asyncio.sleep(0)
+            return method(*args, **kwargs)
+        return call
+
+
+class StorageAppendBlobWriterAsyncTest(AsyncStorageTestCase):
+
+    # this is a white box test that's designed to make sure small writes are grouped into
+    # blocks appended in order at their position, on the size and time thresholds
+    @GlobalStorageAccountPreparer()
+    @AsyncStorageTestCase.await_prepared_test
+    async def test_group_commit(self, resource_group, location, storage_account, storage_account_key):
+        blob = _AppendBlob()
+        blob.lost_responses.add(2)
+        records = [u"record {}\n".format(i) for i in range(500)]
+
+        async with AppendBlobWriter(
+                _AsyncAppendBlob(blob), max_block_size=1024, flush_interval=None, max_pending_blocks=1) as writer:
+            for record in records:
+                await writer.write(record)
+
+        expected = u"".join(records).encode("utf-8")
+        self.assertEqual(blob.data, expected)
+        self.assertEqual(blob.blocks[:-1], [1024] * (len(expected) // 1024))
+        self.assertEqual(writer.metrics.appends, len(blob.blocks))
+
+        # the buffer is appended after the flush interval
+        writer = AppendBlobWriter(_AsyncAppendBlob(blob), flush_interval=0.05)
+        await writer.write(b"timed\n")
+        for _ in range(500):
+            if blob.data.endswith(b"timed\n"):
+                break
+            await asyncio.sleep(0.01)
+        self.assertTrue(blob.data.endswith(b"timed\n"))
+
+        # another writer appended to the blob
+        blob.data += b"other\n"
+        await writer.write(b"lost\n")
+        with self.assertRaises(HttpResponseError):
+            await writer.close()
+        self.assertTrue(blob.data.endswith(b"timed\nother\n"))
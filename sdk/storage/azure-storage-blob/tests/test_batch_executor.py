@@ -0,0 +1,112 @@
+# coding: utf-8
+
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+
+import time
+from threading import Lock
+
+from azure.core.exceptions import ClientAuthenticationError, ServiceResponseError
+from azure.storage.blob import BlobBatchExecutor
+
+from _shared.testcase import StorageTestCase, GlobalStorageAccountPreparer
+
+# ------------------------------------------------------------------------------
+
+
+class _Part(object):
+    def __init__(self, status_code, error_code=None):
+        self.status_code = status_code
+        self.headers = {'x-ms-error-code': error_code} if error_code else {}
+
+
+class _BlobProperties(object):
+    def __init__(self, name):
+        self.name = name
+
+
+class _ContainerClient(object):
+    # answer the batches with the status given for each attempt on a blob, 202 by default
+    def __init__(self, statuses=None, batch_failures=0):
+        self.statuses = statuses or {}
+        self.batch_failures = batch_failures
+        self.batches = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = Lock()
+
+    def delete_blobs(self, *blobs, **kwargs):
+        assert kwargs == {'raise_on_any_failure': False, 'delete_snapshots': 'include'}
+        assert len(blobs) <= 256
+        names = [getattr(blob, 'name', blob) for blob in blobs]
+        with self._lock:
+            self.batches.append(names)
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        time.sleep(0.005)
+        with self._lock:
+            self.in_flight -= 1
+            if self.batch_failures:
+                self.batch_failures -= 1
+                raise ServiceResponseError("Connection reset.")
+            parts = []
+            for name in names:
+                attempts = self.statuses.get(name, [])
+                parts.append(_Part(*attempts.pop(0)) if attempts else _Part(202))
+        return iter(parts)
+
+
+class StorageBatchExecutorTest(StorageTestCase):
+
+    # these are white box tests that are designed to make sure the blobs are sharded into
+    # concurrent batches, and that only the transient failures are retried
+    @GlobalStorageAccountPreparer()
+    def test_delete_blobs_sharded(self, resource_group, location, storage_account, storage_account_key):
+        names = ['blob{}'.format(index) for index in range(1000)]
+        container = _ContainerClient(statuses={
+            'blob3': [(503, 'ServerBusy'), (500, 'InternalError')],
+            'blob600': [(404, 'BlobNotFound')],
+            'blob700': [(503, 'ServerBusy')] * 5,
+        })
+        executor = BlobBatchExecutor(container, max_concurrency=3, max_retries=2, retry_backoff=0.001)
+
+        # the blobs are pulled from any iterable, like the pages of list_blobs
+        blobs = (_BlobProperties(name) if index % 2 else name for index, name in enumerate(names))
+        results = {result.name: result for result in executor.delete_blobs(blobs, delete_snapshots='include')}
+
+        self.assertEqual(sorted(results), sorted(names))
+        # the retries are sent with the blobs of the next batches
+        self.assertEqual(sum(len(batch) for batch in container.batches), 1000 + 2 + 2)
+        self.assertTrue(all(len(batch) <= 256 for batch in container.batches))
+        self.assertGreaterEqual(len(container.batches), 4)
+        self.assertLessEqual(container.max_in_flight, 3)
+        self.assertGreater(container.max_in_flight, 1)
+
+        self.assertTrue(results['blob3'].succeeded)
+        self.assertEqual(results['blob3'].attempts, 3)
+        self.assertEqual((results['blob600'].status_code, results['blob600'].error_code), (404, 'BlobNotFound'))
+        self.assertEqual(results['blob600'].attempts, 1)
+        self.assertEqual((results['blob700'].status_code, results['blob700'].attempts), (503, 3))
+        self.assertEqual(sum(1 for result in results.values() if result.succeeded), 998)
+
+    @GlobalStorageAccountPreparer()
+    def test_delete_blobs_batch_failures(self, resource_group, location, storage_account, storage_account_key):
+        # a batch failing as a whole with a transient error is sent again
+        container = _ContainerClient(batch_failures=1)
+        executor = BlobBatchExecutor(container, max_concurrency=1, retry_backoff=0)
+        results = list(executor.delete_blobs(['blob{}'.format(index) for index in range(10)], delete_snapshots='include'))
+        self.assertEqual(len(container.batches), 2)
+        self.assertTrue(all(result.succeeded and result.attempts == 2 for result in results))
+
+        # and the errors that are not transient are raised
+        def delete_blobs(*blobs, **kwargs):
+            raise ClientAuthenticationError("Server failed to authenticate the request.")
+        container.delete_blobs = delete_blobs
+        with self.assertRaises(ClientAuthenticationError):
+            list(executor.delete_blobs(['blob'], delete_snapshots='include'))
+
+        with self.assertRaises(ValueError):
+            BlobBatchExecutor(container, batch_size=257)
@@ -0,0 +1,107 @@
+# coding: utf-8
+
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+import asyncio
+
+from azure.storage.blob.aio import BlobBatchExecutor
+
+from _shared.testcase import GlobalStorageAccountPreparer
+from _shared.asynctestcase import AsyncStorageTestCase
+
+# ------------------------------------------------------------------------------
+
+
+class _Part(object):
+    def __init__(self, status_code):
+        self.status_code = status_code
+        self.headers = {}
+
+
+class _Parts(object):
+    # the async iterator of the parts of a batch response
+    def __init__(self, parts):
+        self._parts = iter(parts)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        try:
+            return next(self._parts)
+        except StopIteration:
+            raise StopAsyncIteration
+
+
+class _BlobPages(object):
+    # the async iterator of list_blobs
+    def __init__(self, names):
+        self._names = iter(names)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        await asyncio.sleep(0)
+        try:
+            return next(self._names)
+        except StopIteration:
+            raise StopAsyncIteration
+
+
+class _ContainerClient(object):
+    def __init__(self):
+        self.batches = []
+        self.busy = set(['blob5', 'blob250'])
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def set_standard_blob_tier_blobs(self, tier, *blobs, **kwargs):
+        self.batches.append(blobs)
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(0.01)
+        finally:
+            self.in_flight -= 1
+        parts = []
+        for blob in blobs:
+            if blob in self.busy:
+                self.busy.remove(blob)
+                parts.append(_Part(503))
+            else:
+                parts.append(_Part(200))
+        return _Parts(parts)
+
+
+class StorageBatchExecutorAsyncTest(AsyncStorageTestCase):
+
+    # this is a white box test that's designed to make sure the batches are sent concurrently,
+    # and the transient failures retried
+    @GlobalStorageAccountPreparer()
+    @AsyncStorageTestCase.await_prepared_test
+    async def test_set_tier_blobs_sharded(self, resource_group, location, storage_account, storage_account_key):
+        container = _ContainerClient()
+        executor = BlobBatchExecutor(container, max_concurrency=2, batch_size=100, retry_backoff=0)
+
+        names = ['blob{}'.format(index) for index in range(500)]
+        results = []
+        async for result in executor.set_standard_blob_tier_blobs('Cool', _BlobPages(names)):
+            results.append(result)
+
+        self.assertEqual(sorted(result.name for result in results), sorted(names))
+        self.assertTrue(all(result.succeeded for result in results))
+        self.assertEqual(sum(len(batch) for batch in container.batches), 502)
+        self.assertEqual(container.max_in_flight, 2)
+
+        # the batches in flight are cancelled when the iteration is closed
+        container = _ContainerClient()
+        executor = BlobBatchExecutor(container, max_concurrency=2, batch_size=10)
+        results = executor.set_standard_blob_tier_blobs('Cool', names)
+        await results.__anext__()
+        await results.close()
+        self.assertEqual(container.in_flight, 0)
+        self.assertLessEqual(len(container.batches), 4)
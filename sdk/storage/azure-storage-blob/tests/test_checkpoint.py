@@ -0,0 +1,181 @@
+# coding: utf-8
+
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+
+import os
+import re
+import shutil
+import tempfile
+from io import BytesIO
+
+from azure.storage.blob._checkpoint import TransferJournal
+from azure.storage.blob._download import StorageStreamDownloader
+from azure.storage.blob._upload_helpers import upload_block_blob
+
+from _shared.testcase import StorageTestCase, GlobalStorageAccountPreparer
+
+# ------------------------------------------------------------------------------
+
+
+class _Settings(object):
+    max_single_put_size = 1024
+    max_block_size = 1024
+    min_large_block_upload_threshold = 1024 + 1
+    use_byte_buffer = False
+
+
+class _Block(object):
+    def __init__(self, name, size):
+        self.name = name
+        self.size = size
+
+
+class _BlockList(object):
+    def __init__(self, blocks):
+        self.uncommitted_blocks = [_Block(name, len(data)) for name, data in blocks.items()]
+
+
+class _BlockService(object):
+    # stage blocks in memory, failing after a number of blocks to simulate an interrupted upload
+    def __init__(self, fail_after=None):
+        self.staged = {}
+        self.requests = 0
+        self.fail_after = fail_after
+        self.committed = None
+
+    def get_block_list(self, list_type=None, **kwargs):
+        assert list_type == 'uncommitted'
+        return _BlockList(self.staged)
+
+    def stage_block(self, block_id, length, block_data, **kwargs):
+        if self.fail_after is not None and self.requests >= self.fail_after:
+            raise IOError("Connection lost.")
+        self.requests += 1
+        self.staged[block_id] = block_data
+
+    def commit_block_list(self, block_lookup, **kwargs):
+        self.committed = b"".join(self.staged[block_id] for block_id in block_lookup.latest)
+        return {}
+
+
+class _Response(list):
+    def __init__(self, data, start, end, total):
+        super(_Response, self).__init__([data])
+        self.response = self
+        self.headers = {}
+        self.properties = _Properties(start, end, total)
+
+
+class _Properties(object):
+    def __init__(self, start, end, total):
+        self.content_range = 'bytes {}-{}/{}'.format(start, end, total)
+        self.etag = '"etag"'
+        self.blob_type = 'BlockBlob'
+        self.size = end - start + 1
+
+
+class _Config(object):
+    max_single_get_size = 1024
+    max_chunk_get_size = 1024
+
+
+class StorageCheckpointTest(StorageTestCase):
+
+    def setUp(self):
+        super(StorageCheckpointTest, self).setUp()
+        self.temp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+        return super(StorageCheckpointTest, self).tearDown()
+
+    def _upload(self, service, data, checkpoint):
+        journal = TransferJournal.load(checkpoint, {'blob': 'blob', 'size': len(data)})
+        return upload_block_blob(
+            client=service,
+            stream=BytesIO(data),
+            length=len(data),
+            overwrite=True,
+            headers={},
+            max_concurrency=1,
+            blob_settings=_Settings(),
+            encryption_options={},
+            journal=journal)
+
+    # this is a white box test that's designed to make sure an interrupted upload
+    # only stages the blocks missing when it is resumed
+    @GlobalStorageAccountPreparer()
+    def test_resume_block_upload(self, resource_group, location, storage_account, storage_account_key):
+        data = os.urandom(10 * 1024 + 1)
+        checkpoint = os.path.join(self.temp_dir, 'upload.journal')
+        service = _BlockService(fail_after=4)
+
+        with self.assertRaises(IOError):
+            self._upload(service, data, checkpoint)
+        self.assertTrue(os.path.exists(checkpoint))
+
+        # blocks recorded but no longer staged are uploaded again
+        service.staged.pop(sorted(service.staged)[0])
+        service.fail_after = None
+        service.requests = 0
+        self._upload(service, data, checkpoint)
+
+        # assert data is consistent
+        self.assertEqual(service.committed, data)
+        self.assertEqual(service.requests, 11 - 3)
+        self.assertFalse(os.path.exists(checkpoint))
+
+        # a journal describing another transfer is ignored
+        TransferJournal.load(checkpoint, {'blob': 'other', 'size': len(data)}).start()
+        service.requests = 0
+        self._upload(service, data, checkpoint)
+        self.assertEqual(service.requests, 11)
+
+    # this is a white box test that's designed to make sure an interrupted download
+    # into a file only requests the chunks missing when it is resumed
+    @GlobalStorageAccountPreparer()
+    def test_resume_download_into_file(self, resource_group, location, storage_account, storage_account_key):
+        data = os.urandom(10 * 1024 + 1)
+        checkpoint = os.path.join(self.temp_dir, 'download.journal')
+        path = os.path.join(self.temp_dir, 'blob')
+        requests = []
+        fail_after = [5]
+
+        def download(range=None, **kwargs):
+            start, end = [int(i) for i in re.match(r'bytes=(\d+)-(\d+)', range).groups()]
+            end = min(end, len(data) - 1)
+            requests.append(start)
+            if fail_after[0] is not None and len(requests) > fail_after[0]:
+                raise IOError("Connection lost.")
+            return None, _Response(data[start:end + 1], start, end, len(data))
+
+        class _Clients(object):
+            class blob(object):
+                pass
+        _Clients.blob.download = staticmethod(download)
+
+        def downloader():
+            return StorageStreamDownloader(
+                clients=_Clients, config=_Config(), name='blob', container='container', encryption_options={})
+
+        with self.assertRaises(IOError):
+            downloader().download_into(path, checkpoint=checkpoint)
+        self.assertTrue(os.path.exists(checkpoint))
+
+        del requests[:]
+        fail_after[0] = None
+        self.assertEqual(downloader().download_into(path, checkpoint=checkpoint), len(data))
+
+        # assert data is consistent
+        with open(path, 'rb') as downloaded:
+            self.assertEqual(downloaded.read(), data)
+        self.assertEqual(len(requests), 11 - 4)
+        self.assertFalse(os.path.exists(checkpoint))
+
+        # a checkpoint is only supported for files
+        with self.assertRaises(ValueError):
+            downloader().download_into(bytearray(len(data)), checkpoint=checkpoint)
@@ -0,0 +1,134 @@
+# coding: utf-8
+
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+
+import base64
+import hashlib
+import os
+import struct
+from io import BytesIO
+
+from azure.core.exceptions import AzureError, HttpResponseError
+from azure.core.pipeline import PipelineContext, PipelineRequest, PipelineResponse
+from azure.core.pipeline.transport import HttpRequest
+from azure.storage.blob._download import copy_content, process_content
+from azure.storage.blob._shared.checksums import (
+    ContentChecksum, compute_checksum, compute_crc64, _crc64_tables, _crc64_update, _CRC64_MASK, _CRC64_TABLES,
+    _NATIVE_CRC64)
+from azure.storage.blob._shared.policies import StorageContentValidation
+
+from _shared.testcase import StorageTestCase, GlobalStorageAccountPreparer
+
+# ------------------------------------------------------------------------------
+
+
+class _Response(object):
+    def __init__(self, headers, body=None):
+        self.headers = headers
+        self._body = body
+
+    def body(self):
+        if self._body is None:
+            raise AssertionError("The body of a streamed response should not be read.")
+        return self._body
+
+
+class _StreamedContent(object):
+    # the pieces of a streamed download, as returned by the generated operation
+    def __init__(self, pieces, headers):
+        self.pieces = pieces
+        self.response = _Response(headers)
+
+    def __iter__(self):
+        return iter(self.pieces)
+
+
+class StorageContentValidationTest(StorageTestCase):
+
+    def _encoded_crc64(self, data):
+        return base64.b64encode(struct.pack('<Q', compute_crc64(data))).decode('utf-8')
+
+    @GlobalStorageAccountPreparer()
+    def test_crc64(self, resource_group, location, storage_account, storage_account_key):
+        # the tables are checked with the CRC-64/XZ polynomial, which has a published check value
+        tables = _crc64_tables(0xC96C5795D7870F42)
+        self.assertEqual(_crc64_update(_CRC64_MASK, b"123456789", tables) ^ _CRC64_MASK, 0x995DC9BBDF1939FA)
+
+        data = os.urandom(64 * 1024 + 3)
+        crc = compute_crc64(data)
+        self.assertEqual(compute_crc64(b""), 0)
+        self.assertEqual(compute_crc64(data[1001:], compute_crc64(data[:1001])), crc)
+        self.assertEqual(compute_crc64(memoryview(bytearray(data))), crc)
+        self.assertNotEqual(compute_crc64(data[:-1] + b"\x00"), crc)
+
+        # the C extension of crcmod, when installed, computes the CRC64 of the Python implementation
+        self.assertEqual(_crc64_update(_CRC64_MASK, data, _CRC64_TABLES) ^ _CRC64_MASK, crc)
+        if _NATIVE_CRC64 is not None:
+            self.assertEqual(_NATIVE_CRC64(data), crc)
+
+    @GlobalStorageAccountPreparer()
+    def test_compute_checksum_of_stream(self, resource_group, location, storage_account, storage_account_key):
+        data = os.urandom(200 * 1024)
+        stream = BytesIO(data)
+        stream.seek(100)
+
+        checksum = compute_checksum(stream, 'md5')
+
+        self.assertEqual(checksum.digest(), hashlib.md5(data[100:]).digest())
+        self.assertEqual(stream.tell(), 100)
+        self.assertEqual(compute_checksum(stream, 'crc64').encoded(), self._encoded_crc64(data[100:]))
+        with self.assertRaises(ValueError):
+            ContentChecksum('sha1')
+
+    @GlobalStorageAccountPreparer()
+    def test_policy_sends_crc64(self, resource_group, location, storage_account, storage_account_key):
+        data = os.urandom(1024)
+        request = HttpRequest("PUT", "https://account.blob.core.windows.net/container/blob")
+        request.set_bytes_body(data)
+        pipeline_request = PipelineRequest(request, PipelineContext(None, validate_content='crc64'))
+        policy = StorageContentValidation()
+
+        policy.on_request(pipeline_request)
+
+        self.assertEqual(request.headers['x-ms-content-crc64'], self._encoded_crc64(data))
+        self.assertNotIn('Content-MD5', request.headers)
+
+        # assert the checksum echoed by the service is compared with the one sent
+        response = _Response({'x-ms-content-crc64': self._encoded_crc64(b"other")})
+        with self.assertRaises(AzureError):
+            policy.on_response(pipeline_request, PipelineResponse(request, response, pipeline_request.context))
+
+    @GlobalStorageAccountPreparer()
+    def test_streamed_download_checked_once(self, resource_group, location, storage_account, storage_account_key):
+        data = os.urandom(10 * 1024)
+        pieces = [data[i:i + 1000] for i in range(0, len(data), 1000)]
+        md5 = base64.b64encode(hashlib.md5(data).digest()).decode('utf-8')
+
+        # the policy leaves the streamed responses to the downloaders
+        request = HttpRequest("GET", "https://account.blob.core.windows.net/container/blob")
+        pipeline_request = PipelineRequest(request, PipelineContext(None, validate_content=True, stream=True))
+        policy = StorageContentValidation()
+        policy.on_request(pipeline_request)
+        policy.on_response(
+            pipeline_request,
+            PipelineResponse(request, _Response({'Content-MD5': md5}), pipeline_request.context))
+
+        # the downloaders hash the pieces as they are consumed
+        content = process_content(_StreamedContent(pieces, {'Content-MD5': md5}), 0, 0, {}, True)
+        self.assertEqual(content, data)
+        view = memoryview(bytearray(len(data)))
+        copy_content(_StreamedContent(pieces, {'x-ms-content-crc64': self._encoded_crc64(data)}), view, 'crc64')
+        self.assertEqual(view.tobytes(), data)
+
+        corrupted = pieces[:-1] + [b"\x00" * len(pieces[-1])]
+        with self.assertRaises(AzureError) as context:
+            process_content(_StreamedContent(corrupted, {'Content-MD5': md5}), 0, 0, {}, True)
+        self.assertNotIsInstance(context.exception, HttpResponseError)
+        self.assertIn("MD5 mismatch", str(context.exception))
+        with self.assertRaises(AzureError):
+            copy_content(
+                _StreamedContent(corrupted, {'x-ms-content-crc64': self._encoded_crc64(data)}), view, 'crc64')
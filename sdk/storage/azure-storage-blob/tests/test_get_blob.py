@@ -144,6 +144,42 @@ class StorageGetBlobTest(StorageTestCase):
         # Assert
         self.assertEqual(self.byte_data, content)
 
+    @pytest.mark.live_test_only
+    @GlobalStorageAccountPreparer()
+    def test_get_blob_into_buffer(self, resource_group, location, storage_account, storage_account_key):
+        # parallel tests introduce random order of requests, can only run live
+
+        self._setup(storage_account, storage_account_key)
+        blob = self.bsc.get_blob_client(self.container_name, self.byte_blob)
+        buffer = bytearray(len(self.byte_data) + 10)
+
+        # Act
+        read_bytes = blob.download_blob(max_concurrency=2).download_into(buffer)
+
+        # Assert
+        self.assertEqual(len(self.byte_data), read_bytes)
+        self.assertEqual(self.byte_data, buffer[:read_bytes])
+        with self.assertRaises(ValueError):
+            blob.download_blob().download_into(bytearray(10))
+
+    @pytest.mark.live_test_only
+    @GlobalStorageAccountPreparer()
+    def test_get_blob_into_file(self, resource_group, location, storage_account, storage_account_key):
+        # parallel tests introduce random order of requests, can only run live
+
+        self._setup(storage_account, storage_account_key)
+        blob = self.bsc.get_blob_client(self.container_name, self.byte_blob)
+        FILE_PATH = 'get_blob_into_file.temp.{}.dat'.format(str(uuid.uuid4()))
+
+        # Act
+        read_bytes = blob.download_blob(max_concurrency=2).download_into(FILE_PATH)
+
+        # Assert
+        self.assertEqual(len(self.byte_data), read_bytes)
+        with open(FILE_PATH, 'rb') as stream:
+            self.assertEqual(self.byte_data, stream.read())
+        self._teardown(FILE_PATH)
+
     @pytest.mark.live_test_only
     @GlobalStorageAccountPreparer()
     def test_ranged_get_blob_to_bytes_with_single_byte(self, resource_group, location, storage_account, storage_account_key):
@@ -167,6 +167,44 @@ class StorageGetBlobTestAsync(AsyncStorageTestCase):
         # Assert
         self.assertEqual(self.byte_data, content)
 
+    @pytest.mark.live_test_only
+    @GlobalStorageAccountPreparer()
+    @AsyncStorageTestCase.await_prepared_test
+    async def test_get_blob_into_buffer_async(self, resource_group, location, storage_account, storage_account_key):
+        # parallel tests introduce random order of requests, can only run live
+
+        # Arrange
+        await self._setup(storage_account, storage_account_key)
+        blob = self.bsc.get_blob_client(self.container_name, self.byte_blob)
+        buffer = bytearray(len(self.byte_data))
+
+        # Act
+        read_bytes = await (await blob.download_blob(max_concurrency=2)).download_into(buffer)
+
+        # Assert
+        self.assertEqual(len(self.byte_data), read_bytes)
+        self.assertEqual(self.byte_data, buffer)
+
+    @pytest.mark.live_test_only
+    @GlobalStorageAccountPreparer()
+    @AsyncStorageTestCase.await_prepared_test
+    async def test_get_blob_into_file_async(self, resource_group, location, storage_account, storage_account_key):
+        # parallel tests introduce random order of requests, can only run live
+
+        # Arrange
+        await self._setup(storage_account, storage_account_key)
+        blob = self.bsc.get_blob_client(self.container_name, self.byte_blob)
+        FILE_PATH = 'get_blob_into_file_async.temp.{}.dat'.format(str(uuid.uuid4()))
+
+        # Act
+        read_bytes = await (await blob.download_blob(max_concurrency=2)).download_into(FILE_PATH)
+
+        # Assert
+        self.assertEqual(len(self.byte_data), read_bytes)
+        with open(FILE_PATH, 'rb') as stream:
+            self.assertEqual(self.byte_data, stream.read())
+        self._teardown(FILE_PATH)
+
     @pytest.mark.live_test_only
     @GlobalStorageAccountPreparer()
     @AsyncStorageTestCase.await_prepared_test
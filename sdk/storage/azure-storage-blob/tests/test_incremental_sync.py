@@ -0,0 +1,186 @@
+# coding: utf-8
+
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+
+import os
+import shutil
+import tempfile
+
+from azure.storage.blob import PageBlobSync
+from azure.storage.blob._incremental_sync import coalesce_page_ranges
+
+from _shared.testcase import StorageTestCase, GlobalStorageAccountPreparer
+
+# ------------------------------------------------------------------------------
+PAGE = 512
+
+
+class _Properties(object):
+    def __init__(self, size):
+        self.size = size
+
+
+class _Downloader(object):
+    def __init__(self, data):
+        self.data = data
+
+    def readall(self):
+        return self.data
+
+
+class _PageBlob(object):
+    # a page blob in memory, recording the writes made to it
+    def __init__(self, data, url='https://account.blob.core.windows.net/disks/disk.vhd'):
+        self.data = bytearray(data)
+        self.url = url
+        self.requests = []
+
+    def get_blob_properties(self, **kwargs):
+        return _Properties(len(self.data))
+
+    def download_blob(self, offset=None, length=None, **kwargs):
+        self.requests.append(('download', offset, length))
+        return _Downloader(bytes(self.data[offset:offset + length]))
+
+    def resize_blob(self, size, **kwargs):
+        self.requests.append(('resize', size))
+        self.data = self.data[:size] + bytearray(max(size - len(self.data), 0))
+
+    def upload_page(self, page, offset, length, **kwargs):
+        assert len(page) == length <= 4 * 1024 * 1024
+        self.requests.append(('upload_page', offset, length))
+        self.data[offset:offset + length] = page
+
+    def upload_pages_from_url(self, source_url, offset, length, source_offset, **kwargs):
+        assert length <= 4 * 1024 * 1024
+        self.requests.append(('upload_pages_from_url', offset, length))
+        source = _SOURCES[source_url]
+        self.data[offset:offset + length] = source.data[source_offset:source_offset + length]
+
+    def clear_page(self, offset, length, **kwargs):
+        self.requests.append(('clear_page', offset, length))
+        self.data[offset:offset + length] = bytearray(length)
+
+
+_SOURCES = {}
+
+
+class _SourceBlob(_PageBlob):
+    # the current content of a page blob, and the diff with its previous snapshot
+    def __init__(self, previous, changed, cleared, size=None):
+        data = bytearray(previous)
+        if size is not None:
+            data = data[:size] + bytearray(max(size - len(data), 0))
+        for start, end in changed:
+            data[start:end + 1] = os.urandom(end - start + 1)
+        for start, end in cleared:
+            data[start:end + 1] = bytearray(end - start + 1)
+        super(_SourceBlob, self).__init__(data)
+        self.diff = (
+            [{'start': start, 'end': end} for start, end in changed],
+            [{'start': start, 'end': end} for start, end in cleared])
+        _SOURCES[self.url] = self
+
+    def get_page_ranges(self, previous_snapshot_diff=None, **kwargs):
+        assert previous_snapshot_diff == '2020-03-01T00:00:00.0000000Z'
+        return self.diff
+
+    def get_page_range_diff_for_managed_disk(self, previous_snapshot_url, **kwargs):
+        assert previous_snapshot_url.endswith('?snapshot=2020-03-01T00:00:00.0000000Z')
+        return self.diff
+
+
+class StorageIncrementalSyncTest(StorageTestCase):
+
+    def setUp(self):
+        super(StorageIncrementalSyncTest, self).setUp()
+        self.temp_dir = tempfile.mkdtemp()
+        self.previous = os.urandom(64 * PAGE)
+        # adjacent ranges, merged then split into writes of up to 8 pages, and cleared pages
+        self.changed = [(0, 3 * PAGE - 1), (3 * PAGE, 12 * PAGE - 1), (20 * PAGE, 21 * PAGE - 1)]
+        self.cleared = [(30 * PAGE, 31 * PAGE - 1), (31 * PAGE, 40 * PAGE - 1)]
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+        return super(StorageIncrementalSyncTest, self).tearDown()
+
+    # these are white box tests that are designed to make sure only the pages changed
+    # since the previous snapshot are transferred, in coalesced writes
+    @GlobalStorageAccountPreparer()
+    def test_coalesce_page_ranges(self, resource_group, location, storage_account, storage_account_key):
+        ranges = [{'start': 4 * PAGE, 'end': 5 * PAGE - 1}, {'start': 0, 'end': PAGE - 1},
+                  {'start': PAGE, 'end': 3 * PAGE - 1}, {'start': 2 * PAGE, 'end': 3 * PAGE - 1}]
+        self.assertEqual(coalesce_page_ranges(ranges), [(0, 3 * PAGE), (4 * PAGE, PAGE)])
+        self.assertEqual(coalesce_page_ranges(ranges, 2 * PAGE), [(0, 2 * PAGE), (2 * PAGE, PAGE), (4 * PAGE, PAGE)])
+        self.assertEqual(coalesce_page_ranges([]), [])
+
+    @GlobalStorageAccountPreparer()
+    def test_sync_to_file(self, resource_group, location, storage_account, storage_account_key):
+        source = _SourceBlob(self.previous, self.changed, self.cleared)
+        path = os.path.join(self.temp_dir, 'disk.vhd')
+        with open(path, 'wb') as image:
+            image.write(self.previous)
+
+        report = PageBlobSync(source, max_concurrency=3, max_write_size=8 * PAGE).sync_to_file(
+            path, '2020-03-01T00:00:00.0000000Z')
+
+        with open(path, 'rb') as image:
+            self.assertEqual(image.read(), bytes(source.data))
+        self.assertEqual(sorted(source.requests), [
+            ('download', 0, 8 * PAGE), ('download', 8 * PAGE, 4 * PAGE), ('download', 20 * PAGE, PAGE)])
+        self.assertEqual((report.writes, report.clears), (3, 1))
+        self.assertEqual((report.changed_bytes, report.cleared_bytes), (13 * PAGE, 10 * PAGE))
+        self.assertEqual(report.bytes_saved, 51 * PAGE)
+
+        # a snapshot must be given
+        with self.assertRaises(ValueError):
+            PageBlobSync(source).sync_to_file(path)
+
+    @GlobalStorageAccountPreparer()
+    def test_sync_to_blob(self, resource_group, location, storage_account, storage_account_key):
+        # the source grew, so the target is resized
+        source = _SourceBlob(self.previous, self.changed + [(64 * PAGE, 72 * PAGE - 1)], self.cleared, size=72 * PAGE)
+        target = _PageBlob(self.previous, url='https://backup.blob.core.windows.net/disks/disk.vhd')
+
+        report = PageBlobSync(source, max_write_size=8 * PAGE).sync_to_blob(
+            target, previous_snapshot_url=source.url + '?snapshot=2020-03-01T00:00:00.0000000Z')
+
+        self.assertEqual(target.data, source.data)
+        self.assertEqual(target.requests[0], ('resize', 72 * PAGE))
+        self.assertEqual(sorted(target.requests[1:]), [
+            ('clear_page', 30 * PAGE, 10 * PAGE),
+            ('upload_pages_from_url', 0, 8 * PAGE),
+            ('upload_pages_from_url', 8 * PAGE, 4 * PAGE),
+            ('upload_pages_from_url', 20 * PAGE, PAGE),
+            ('upload_pages_from_url', 64 * PAGE, 8 * PAGE)])
+        self.assertEqual(report.bytes_saved, 51 * PAGE)
+
+        # the pages are downloaded and uploaded without copy_from_url
+        target = _PageBlob(self.previous + bytes(bytearray(8 * PAGE)))
+        PageBlobSync(source).sync_to_blob(target, '2020-03-01T00:00:00.0000000Z', copy_from_url=False)
+        self.assertEqual(target.data, source.data)
+        self.assertEqual(sorted(request[0] for request in target.requests), ['clear_page'] + ['upload_page'] * 3)
+
+    @GlobalStorageAccountPreparer()
+    def test_sync_error(self, resource_group, location, storage_account, storage_account_key):
+        source = _SourceBlob(self.previous, self.changed, self.cleared)
+        target = _PageBlob(self.previous)
+
+        def clear_page(offset, length, **kwargs):
+            raise IOError("Connection lost.")
+        target.clear_page = clear_page
+
+        with self.assertRaises(IOError):
+            PageBlobSync(source, max_concurrency=2).sync_to_blob(target, '2020-03-01T00:00:00.0000000Z')
+
+        # an IndexError of an operation is raised, as any other error
+        def upload_pages_from_url(*args, **kwargs):
+            raise IndexError("list index out of range")
+        target = _PageBlob(self.previous)
+        target.upload_pages_from_url = upload_pages_from_url
+        with self.assertRaises(IndexError):
+            PageBlobSync(source, max_concurrency=2).sync_to_blob(target, '2020-03-01T00:00:00.0000000Z')
@@ -0,0 +1,84 @@
+# coding: utf-8
+
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+
+import os
+import shutil
+import tempfile
+
+from azure.storage.blob.aio import PageBlobSync
+
+from _shared.testcase import GlobalStorageAccountPreparer
+from _shared.asynctestcase import AsyncStorageTestCase
+from test_incremental_sync import PAGE, _PageBlob, _SourceBlob
+
+# ------------------------------------------------------------------------------
+
+
+class _AsyncDownloader(object):
+    def __init__(self, downloader):
+        self.downloader = downloader
+
+    async def readall(self):
+        return self.downloader.readall()
+
+
+class _AsyncBlob(object):
+    # the coroutines of the methods of a blob in memory
+    def __init__(self, blob):
+        self.blob = blob
+        self.url = blob.url
+
+    def __getattr__(self, name):
+        method = getattr(self.blob, name)
+
+        async def call(*args, **kwargs):
+            result = method(*args, **kwargs)
+            return _AsyncDownloader(result) if name == 'download_blob' else result
+        return call
+
+
+class StorageIncrementalSyncAsyncTest(AsyncStorageTestCase):
+
+    def setUp(self):
+        super(StorageIncrementalSyncAsyncTest, self).setUp()
+        self.temp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+        return super(StorageIncrementalSyncAsyncTest, self).tearDown()
+
+    # this is a white box test that's designed to make sure only the pages changed
+    # since the previous snapshot are transferred, in coalesced writes
+    @GlobalStorageAccountPreparer()
+    @AsyncStorageTestCase.await_prepared_test
+    async def test_sync(self, resource_group, location, storage_account, storage_account_key):
+        previous = os.urandom(64 * PAGE)
+        source = _SourceBlob(previous, [(0, 3 * PAGE - 1), (3 * PAGE, 12 * PAGE - 1)], [(30 * PAGE, 40 * PAGE - 1)])
+        sync = PageBlobSync(_AsyncBlob(source), max_concurrency=2, max_write_size=8 * PAGE)
+
+        path = os.path.join(self.temp_dir, 'disk.vhd')
+        with open(path, 'wb') as image:
+            image.write(previous)
+        report = await sync.sync_to_file(path, '2020-03-01T00:00:00.0000000Z')
+        with open(path, 'rb') as image:
+            self.assertEqual(image.read(), bytes(source.data))
+        self.assertEqual((report.writes, report.clears, report.bytes_saved), (2, 1, 52 * PAGE))
+
+        target = _PageBlob(previous, url='https://backup.blob.core.windows.net/disks/disk.vhd')
+        await sync.sync_to_blob(_AsyncBlob(target), '2020-03-01T00:00:00.0000000Z')
+        self.assertEqual(target.data, source.data)
+        self.assertEqual(sorted(target.requests), [
+            ('clear_page', 30 * PAGE, 10 * PAGE),
+            ('upload_pages_from_url', 0, 8 * PAGE),
+            ('upload_pages_from_url', 8 * PAGE, 4 * PAGE)])
+
+        def clear_page(offset, length, **kwargs):
+            raise IOError("Connection lost.")
+        target.clear_page = clear_page
+        with self.assertRaises(IOError):
+            await sync.sync_to_blob(_AsyncBlob(target), '2020-03-01T00:00:00.0000000Z')
@@ -0,0 +1,93 @@
+# coding: utf-8
+
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+import asyncio
+import random
+
+from azure.storage.blob.aio._download_async import _AsyncPrefetchChunkIterator
+
+from _shared.testcase import GlobalStorageAccountPreparer
+from _shared.asynctestcase import AsyncStorageTestCase
+
+# ------------------------------------------------------------------------------
+
+
+class _ChunkDownloader(object):
+    # download chunks named after their offset, completing in a random order
+    def __init__(self, count, fail_at=None):
+        self.count = count
+        self.fail_at = fail_at
+        self.requested = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.cancelled = 0
+
+    def get_chunk_offsets(self):
+        for index in range(1, self.count + 1):
+            yield index
+
+    async def yield_chunk(self, chunk_start):
+        self.requested += 1
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(random.random() / 100)
+            if chunk_start == self.fail_at:
+                raise IOError("Connection lost.")
+            return str(chunk_start).encode('utf-8')
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        finally:
+            self.in_flight -= 1
+
+
+class StorageIterChunksAsyncTest(AsyncStorageTestCase):
+
+    # this is a white box test that's designed to make sure the chunks are delivered in
+    # order, with a bounded number of chunks downloaded ahead
+    @GlobalStorageAccountPreparer()
+    @AsyncStorageTestCase.await_prepared_test
+    async def test_iter_chunks_prefetch_window(self, resource_group, location, storage_account, storage_account_key):
+        downloader = _ChunkDownloader(20)
+        chunks = _AsyncPrefetchChunkIterator(size=21, content=b"0", downloader=downloader, window=4)
+
+        received = []
+        async for chunk in chunks:
+            received.append(chunk)
+            # a slow consumer does not get more chunks requested
+            self.assertLessEqual(downloader.requested, len(received) + 4)
+            await asyncio.sleep(0.001)
+
+        self.assertEqual(received, [str(index).encode('utf-8') for index in range(21)])
+        self.assertLessEqual(downloader.max_in_flight, 4)
+        self.assertGreater(downloader.max_in_flight, 1)
+
+    @GlobalStorageAccountPreparer()
+    @AsyncStorageTestCase.await_prepared_test
+    async def test_iter_chunks_cancels_pending(self, resource_group, location, storage_account, storage_account_key):
+        downloader = _ChunkDownloader(20)
+        chunks = _AsyncPrefetchChunkIterator(size=21, content=b"0", downloader=downloader, window=4)
+        async for chunk in chunks:
+            if chunk == b"2":
+                break
+        await chunks.close()
+
+        self.assertEqual(downloader.in_flight, 0)
+        self.assertLessEqual(downloader.requested, 6)
+        with self.assertRaises(StopAsyncIteration):
+            await chunks.__anext__()
+
+        # a failed chunk is raised in order, and the chunks after it are cancelled
+        downloader = _ChunkDownloader(20, fail_at=3)
+        chunks = _AsyncPrefetchChunkIterator(size=21, content=b"0", downloader=downloader, window=4)
+        received = []
+        with self.assertRaises(IOError):
+            async for chunk in chunks:
+                received.append(chunk)
+        self.assertEqual(received, [b"0", b"1", b"2"])
+        self.assertEqual(downloader.in_flight, 0)
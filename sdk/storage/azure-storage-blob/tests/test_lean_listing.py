@@ -0,0 +1,128 @@
+# coding: utf-8
+
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+
+from requests.structures import CaseInsensitiveDict
+
+from azure.core.pipeline.transport import HttpResponse, HttpTransport
+from azure.storage.blob import BlobRecord, ContainerClient
+
+from _shared.testcase import StorageTestCase, GlobalStorageAccountPreparer
+
+# ------------------------------------------------------------------------------
+
+_BLOB = u"""<Blob><Name>{name}</Name>{deleted}<Properties>
+<Creation-Time>Mon, 02 Mar 2020 10:15:{second:02} GMT</Creation-Time>
+<Last-Modified>Tue, 03 Mar 2020 11:16:{second:02} GMT</Last-Modified>
+<Etag>0x8D7BF{second:02}</Etag><Content-Length>{size}</Content-Length>
+<Content-Type>text/plain</Content-Type><Content-Encoding /><Content-Language />
+<Content-MD5>1B2M2Y8AsgTpgAmY7PhCfg==</Content-MD5><Cache-Control />
+<BlobType>BlockBlob</BlobType><AccessTier>Hot</AccessTier><AccessTierInferred>true</AccessTierInferred>
+<LeaseStatus>unlocked</LeaseStatus><LeaseState>available</LeaseState>
+{copy}<ServerEncrypted>true</ServerEncrypted></Properties>{metadata}</Blob>"""
+
+_COPY = (u"<CopyId>copy-id</CopyId><CopySource>https://account.blob.core.windows.net/source</CopySource>"
+         u"<CopyStatus>success</CopyStatus><CopyProgress>10/10</CopyProgress>"
+         u"<CopyCompletionTime>Wed, 04 Mar 2020 12:00:00 GMT</CopyCompletionTime>")
+
+
+def _listing(names, marker=None, next_marker=None):
+    blobs = u''.join(_BLOB.format(
+        name=name, second=index % 60, size=index * 512,
+        deleted=u'<Deleted>true</Deleted>' if index % 3 == 0 else u'',
+        copy=_COPY if index % 2 == 0 else u'',
+        metadata=u'<Metadata><key>value{}</key></Metadata>'.format(index) if index % 2 else u'')
+                     for index, name in enumerate(names))
+    return (u'﻿<?xml version="1.0" encoding="utf-8"?>'
+            u'<EnumerationResults ServiceEndpoint="https://account.blob.core.windows.net/" ContainerName="container">'
+            u'{marker}<MaxResults>{results}</MaxResults><Blobs>{blobs}</Blobs>{next_marker}</EnumerationResults>').format(
+                marker=u'<Marker>{}</Marker>'.format(marker) if marker else u'<Marker />',
+                results=len(names), blobs=blobs,
+                next_marker=u'<NextMarker>{}</NextMarker>'.format(next_marker) if next_marker else u'<NextMarker />'
+            ).encode('utf-8')
+
+
+class _Response(HttpResponse):
+    def __init__(self, request, body):
+        super(_Response, self).__init__(request, None)
+        self.status_code = 200
+        self.reason = 'OK'
+        self.headers = CaseInsensitiveDict({'Content-Type': 'application/xml', 'x-ms-request-id': 'id'})
+        self.content_type = 'application/xml'
+        self._body = body
+
+    def body(self):
+        return self._body
+
+
+class _ListingTransport(HttpTransport):
+    # list the blobs of the pages from memory, the marker of a page being its index
+    def __init__(self, pages):
+        self.pages = pages
+        self.requests = []
+
+    def __exit__(self, *args):
+        pass
+
+    def open(self):
+        pass
+
+    def close(self):
+        pass
+
+    def send(self, request, **kwargs):
+        self.requests.append(request)
+        marker = request.query.get('marker')
+        index = int(marker) if marker else 0
+        next_marker = str(index + 1) if index + 1 < len(self.pages) else None
+        return _Response(request, _listing(self.pages[index], marker, next_marker))
+
+
+class StorageLeanListingTest(StorageTestCase):
+
+    # this is a white box test that's designed to make sure the records read from the XML
+    # have the values of the BlobProperties deserialized from the generated models
+    @GlobalStorageAccountPreparer()
+    def test_list_blobs_select(self, resource_group, location, storage_account, storage_account_key):
+        pages = [['blob{:02}'.format(index) for index in range(start, start + 5)] for start in (0, 5, 10)]
+        transport = _ListingTransport(pages)
+        client = ContainerClient(
+            "https://account.blob.core.windows.net", "container", credential=storage_account_key,
+            transport=transport)
+
+        fields = ['deleted', 'snapshot', 'metadata', 'creation_time', 'last_modified', 'etag', 'size',
+                  'blob_type', 'server_encrypted', 'blob_tier', 'blob_tier_inferred', 'content_settings',
+                  'lease', 'copy']
+        blobs = list(client.list_blobs(include=['metadata', 'copy', 'deleted']))
+        records = list(client.list_blobs(include=['metadata', 'copy', 'deleted'], select=fields))
+
+        self.assertEqual(len(records), 15)
+        self.assertEqual(len(transport.requests), 6)
+        # the requests of the records are the requests of the generated operation
+        for generated, request in zip(transport.requests[:3], transport.requests[3:]):
+            self.assertEqual(request.url, generated.url)
+            self.assertEqual(request.headers['Accept'], generated.headers['Accept'])
+        for blob, record in zip(blobs, records):
+            self.assertIsInstance(record, BlobRecord)
+            self.assertEqual(record.name, blob.name)
+            self.assertEqual(record.container, 'container')
+            for field in fields:
+                self.assertEqual(record[field], blob[field], field)
+            self.assertEqual(record.metadata, blob.metadata)
+
+        # the fields not selected are not read
+        record = next(iter(client.list_blobs(select=['size'])))
+        self.assertEqual(record.name, 'blob00')
+        self.assertEqual(record.size, 0)
+        self.assertIsNone(record.last_modified)
+        self.assertIsNone(record.content_settings)
+        self.assertIsNone(record.get('etag'))
+        with self.assertRaises(AttributeError):
+            record.unknown
+
+        with self.assertRaises(ValueError):
+            client.list_blobs(select=['size', 'unknown'])
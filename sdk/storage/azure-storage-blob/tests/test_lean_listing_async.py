@@ -0,0 +1,86 @@
+# coding: utf-8
+
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+from requests.structures import CaseInsensitiveDict
+
+from azure.core.pipeline.transport import AsyncHttpResponse, AsyncHttpTransport
+from azure.storage.blob import BlobRecord
+from azure.storage.blob.aio import ContainerClient
+
+from _shared.testcase import GlobalStorageAccountPreparer
+from _shared.asynctestcase import AsyncStorageTestCase
+from test_lean_listing import _listing
+
+# ------------------------------------------------------------------------------
+
+
+class _Response(AsyncHttpResponse):
+    def __init__(self, request, body):
+        super(_Response, self).__init__(request, None)
+        self.status_code = 200
+        self.reason = 'OK'
+        self.headers = CaseInsensitiveDict({'Content-Type': 'application/xml', 'x-ms-request-id': 'id'})
+        self.content_type = 'application/xml'
+        self._body = body
+
+    def body(self):
+        return self._body
+
+    async def load_body(self):
+        pass
+
+
+class _ListingTransport(AsyncHttpTransport):
+    # list the blobs of the pages from memory, the marker of a page being its index
+    def __init__(self, pages):
+        self.pages = pages
+        self.requests = []
+
+    async def __aexit__(self, *args):
+        pass
+
+    async def open(self):
+        pass
+
+    async def close(self):
+        pass
+
+    async def send(self, request, **kwargs):
+        self.requests.append(request)
+        marker = request.query.get('marker')
+        index = int(marker) if marker else 0
+        next_marker = str(index + 1) if index + 1 < len(self.pages) else None
+        return _Response(request, _listing(self.pages[index], marker, next_marker))
+
+
+class StorageLeanListingAsyncTest(AsyncStorageTestCase):
+
+    # this is a white box test that's designed to make sure the records read from the XML
+    # have the values of the BlobProperties deserialized from the generated models
+    @GlobalStorageAccountPreparer()
+    @AsyncStorageTestCase.await_prepared_test
+    async def test_list_blobs_select(self, resource_group, location, storage_account, storage_account_key):
+        pages = [['blob{:02}'.format(index) for index in range(start, start + 5)] for start in (0, 5)]
+        transport = _ListingTransport(pages)
+        client = ContainerClient(
+            "https://account.blob.core.windows.net", "container", credential=storage_account_key,
+            transport=transport)
+
+        fields = ['deleted', 'metadata', 'last_modified', 'etag', 'size', 'blob_type', 'content_settings', 'copy']
+        blobs, records = [], []
+        async for blob in client.list_blobs(include=['metadata', 'copy', 'deleted']):
+            blobs.append(blob)
+        async for record in client.list_blobs(include=['metadata', 'copy', 'deleted'], select=fields):
+            records.append(record)
+
+        self.assertEqual(len(records), 10)
+        self.assertEqual(transport.requests[2].url, transport.requests[0].url)
+        for blob, record in zip(blobs, records):
+            self.assertIsInstance(record, BlobRecord)
+            self.assertEqual(record.name, blob.name)
+            for field in fields:
+                self.assertEqual(record[field], blob[field], field)
@@ -1417,10 +1417,10 @@ class StoragePageBlobTestAsync(AsyncStorageTestCase):
         ranges = await blob.get_page_ranges()
         page_ranges, cleared = list(ranges)
         self.assertEqual(len(page_ranges), 2)
-        self.assertEqual(page_ranges[0]['start'], 0)
-        self.assertEqual(page_ranges[0]['end'], 4095)
+        self.assertEqual(page_ranges[0]['start'], 512)
+        self.assertEqual(page_ranges[0]['end'], 1023)
         self.assertEqual(page_ranges[1]['start'], 8192)
-        self.assertEqual(page_ranges[1]['end'], 12287)
+        self.assertEqual(page_ranges[1]['end'], 8703)
         self.assertEqual(props.etag, create_resp.get('etag'))
         self.assertEqual(props.last_modified, create_resp.get('last_modified'))
         self._teardown(FILE_PATH)
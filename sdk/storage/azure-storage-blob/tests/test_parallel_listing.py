@@ -0,0 +1,125 @@
+# coding: utf-8
+
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+
+import random
+import time
+from threading import Lock
+
+from azure.storage.blob import BlobProperties, ContainerClient
+
+from _shared.testcase import StorageTestCase, GlobalStorageAccountPreparer
+
+# ------------------------------------------------------------------------------
+
+
+class _Prefix(object):
+    def __init__(self, name):
+        self.name = name
+
+
+class _Container(object):
+    # list blobs from memory, in pages of 10, sleeping a random time for each page
+    def __init__(self, names):
+        self.names = sorted(names)
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.listed = []
+        self._lock = Lock()
+
+    def walk_blobs(self, name_starts_with=None, delimiter='/', **kwargs):
+        prefix = name_starts_with or ''
+        items, prefixes = [], set()
+        for name in self.names:
+            if name.startswith(prefix):
+                directory, found, _ = name[len(prefix):].partition(delimiter)
+                if found:
+                    prefixes.add(prefix + directory + delimiter)
+                else:
+                    items.append(BlobProperties(name=name))
+        # the service returns the prefixes before the blobs of a page
+        return [_Prefix(name) for name in sorted(prefixes)] + items
+
+    def list_pages(self, name_starts_with=None, **kwargs):
+        names = [name for name in self.names if name.startswith(name_starts_with)]
+        with self._lock:
+            self.listed.append(name_starts_with)
+        for start in range(0, len(names), 10):
+            with self._lock:
+                self.in_flight += 1
+                self.max_in_flight = max(self.max_in_flight, self.in_flight)
+            time.sleep(random.random() / 500)
+            with self._lock:
+                self.in_flight -= 1
+            yield iter([BlobProperties(name=name) for name in names[start:start + 10]])
+
+
+class _ItemPaged(object):
+    def __init__(self, pages):
+        self._pages = pages
+
+    def by_page(self):
+        return self._pages
+
+
+class StorageParallelListingTest(StorageTestCase):
+
+    def _container_client(self, container):
+        client = ContainerClient("https://account.blob.core.windows.net", "container")
+        client.walk_blobs = container.walk_blobs
+        client.list_blobs = lambda **kwargs: _ItemPaged(container.list_pages(**kwargs))
+        return client
+
+    # these are white box tests that are designed to make sure the virtual directories are
+    # listed in parallel, returning each blob once, in name order if requested
+    @GlobalStorageAccountPreparer()
+    def test_list_blobs_parallel(self, resource_group, location, storage_account, storage_account_key):
+        names = ['top{}'.format(index) for index in range(3)] + ['{}/blob{:02}'.format(directory, index)
+                 for directory in ['a', 'b', 'b-', 'c', 'd', 'e'] for index in range(25)]
+        names += ['a/nested/blob', 'b.blob']
+        container = _Container(names)
+        client = self._container_client(container)
+
+        listed = [blob.name for blob in client.list_blobs_parallel(max_concurrency=3)]
+        self.assertEqual(sorted(listed), sorted(names))
+        self.assertLessEqual(container.max_in_flight, 3)
+        self.assertGreater(container.max_in_flight, 1)
+
+        listed = [blob.name for blob in client.list_blobs_parallel(max_concurrency=3, ordered=True)]
+        self.assertEqual(listed, sorted(names))
+
+        # the prefixes given replace the virtual directories
+        container.listed = []
+        listed = [blob.name for blob in client.list_blobs_parallel(prefixes=['c', 'a'], ordered=True)]
+        self.assertEqual(listed, sorted(name for name in names if name[0] in 'ac'))
+        self.assertEqual(sorted(container.listed), ['a', 'c'])
+
+        # and follow the name prefix
+        container.listed = []
+        listed = [blob.name for blob in client.list_blobs_parallel(
+            name_starts_with='b', prefixes=['/', '-/'], ordered=True)]
+        self.assertEqual(listed, sorted(name for name in names if name.startswith(('b/', 'b-/'))))
+        self.assertEqual(sorted(container.listed), ['b-/', 'b/'])
+
+    @GlobalStorageAccountPreparer()
+    def test_list_blobs_parallel_stops(self, resource_group, location, storage_account, storage_account_key):
+        names = ['{}/blob{:03}'.format(directory, index) for directory in 'abcdefgh' for index in range(100)]
+        container = _Container(names)
+        client = self._container_client(container)
+
+        blobs = client.list_blobs_parallel(max_concurrency=2, ordered=True)
+        self.assertEqual(next(blobs).name, 'a/blob000')
+        blobs.close()
+        self.assertEqual(container.in_flight, 0)
+        self.assertLessEqual(len(container.listed), 2)
+
+        # the errors of the listings are raised
+        def list_pages(**kwargs):
+            raise IOError("Connection lost.")
+        client.list_blobs = list_pages
+        with self.assertRaises(IOError):
+            list(client.list_blobs_parallel())
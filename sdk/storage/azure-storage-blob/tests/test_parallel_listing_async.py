@@ -0,0 +1,107 @@
+# coding: utf-8
+
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+import asyncio
+import random
+
+from azure.storage.blob import BlobProperties
+from azure.storage.blob.aio import ContainerClient
+
+from _shared.testcase import GlobalStorageAccountPreparer
+from _shared.asynctestcase import AsyncStorageTestCase
+
+# ------------------------------------------------------------------------------
+
+
+class _Prefix(object):
+    def __init__(self, name):
+        self.name = name
+
+
+class _AsyncIterator(object):
+    def __init__(self, items, delay=0):
+        self._items = iter(items)
+        self._delay = delay
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        await asyncio.sleep(self._delay)
+        try:
+            return next(self._items)
+        except StopIteration:
+            raise StopAsyncIteration
+
+
+class _Container(object):
+    # list blobs from memory, in pages of 10, sleeping a random time for each page
+    def __init__(self, names):
+        self.names = sorted(names)
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    def walk_blobs(self, name_starts_with=None, delimiter='/', **kwargs):
+        prefixes = sorted(set(name.split(delimiter)[0] + delimiter for name in self.names if delimiter in name))
+        items = [_Prefix(name) for name in prefixes]
+        items += [BlobProperties(name=name) for name in self.names if delimiter not in name]
+        return _AsyncIterator(items)
+
+    def list_blobs(self, name_starts_with=None, **kwargs):
+        container = self
+        names = [name for name in self.names if name.startswith(name_starts_with)]
+
+        class _Pages(_AsyncIterator):
+            async def __anext__(self):
+                container.in_flight += 1
+                container.max_in_flight = max(container.max_in_flight, container.in_flight)
+                try:
+                    await asyncio.sleep(random.random() / 500)
+                    page = await super(_Pages, self).__anext__()
+                finally:
+                    container.in_flight -= 1
+                return _AsyncIterator([BlobProperties(name=name) for name in page])
+
+        class _ItemPaged(object):
+            def by_page(self):
+                return _Pages([names[start:start + 10] for start in range(0, len(names), 10)])
+        return _ItemPaged()
+
+
+class StorageParallelListingAsyncTest(AsyncStorageTestCase):
+
+    # this is a white box test that's designed to make sure the virtual directories are
+    # listed as concurrent tasks, returning each blob once, in name order if requested
+    @GlobalStorageAccountPreparer()
+    @AsyncStorageTestCase.await_prepared_test
+    async def test_list_blobs_parallel(self, resource_group, location, storage_account, storage_account_key):
+        names = ['top0', 'top1'] + ['{}/blob{:02}'.format(directory, index)
+                                    for directory in 'abcdef' for index in range(25)]
+        container = _Container(names)
+        client = ContainerClient("https://account.blob.core.windows.net", "container")
+        client.walk_blobs = container.walk_blobs
+        client.list_blobs = container.list_blobs
+
+        listed = []
+        async for blob in client.list_blobs_parallel(max_concurrency=3):
+            listed.append(blob.name)
+        self.assertEqual(sorted(listed), sorted(names))
+        self.assertLessEqual(container.max_in_flight, 3)
+        self.assertGreater(container.max_in_flight, 1)
+
+        listed = []
+        async for blob in client.list_blobs_parallel(max_concurrency=3, ordered=True):
+            listed.append(blob.name)
+        self.assertEqual(listed, sorted(names))
+
+        # the listings in progress are cancelled when the iteration is closed
+        blobs = client.list_blobs_parallel(max_concurrency=3, ordered=True)
+        self.assertEqual((await blobs.__anext__()).name, 'a/blob00')
+        await blobs.close()
+        self.assertEqual(container.in_flight, 0)
+        with self.assertRaises(StopAsyncIteration):
+            await blobs.__anext__()
@@ -0,0 +1,189 @@
+# coding: utf-8
+
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+
+from requests.structures import CaseInsensitiveDict
+
+from azure.core import MatchConditions
+from azure.core.pipeline.transport import HttpResponse, HttpTransport
+from azure.storage.blob import BlobClient, BlobLeaseClient, BlobPropertiesCache, ContainerClient
+
+from _shared.testcase import StorageTestCase, GlobalStorageAccountPreparer
+from test_lean_listing import _listing
+
+# ------------------------------------------------------------------------------
+
+
+# The status of the lease operations other than renew, release and change
+_STATUS = {'acquire': 201, 'break': 202}
+
+
+class _Response(HttpResponse):
+    def __init__(self, request, status_code, headers=None, body=b''):
+        super(_Response, self).__init__(request, None)
+        self.status_code = status_code
+        self.reason = 'OK'
+        self.headers = CaseInsensitiveDict(headers or {})
+        self.content_type = self.headers.get('Content-Type')
+        self._body = body
+
+    def body(self):
+        return self._body
+
+    def stream_download(self, pipeline):
+        return _Stream([self._body])
+
+
+class _Stream(list):
+    pass
+
+
+class _BlobTransport(HttpTransport):
+    # serve the properties of blobs from memory, answering 304 when the etag given is current
+    def __init__(self):
+        self.etags = {}
+        self.requests = []
+
+    def __exit__(self, *args):
+        pass
+
+    def open(self):
+        pass
+
+    def close(self):
+        pass
+
+    def send(self, request, **kwargs):
+        self.requests.append(request)
+        if request.query.get('comp') == 'list':
+            return _Response(request, 200, {'Content-Type': 'application/xml'}, _listing(['blob00', 'blob01', 'blob02']))
+        name = request.url.split('?')[0].rsplit('/', 1)[-1]
+        if request.method == 'PUT':
+            self.etags[name] = '"etag{}"'.format(len(self.requests))
+            status = _STATUS.get(request.headers.get('x-ms-lease-action'), 200)
+            return _Response(request, status, {'ETag': self.etags[name]})
+        etag = self.etags.setdefault(name, '"etag0"')
+        if request.headers.get('If-None-Match') == etag:
+            return _Response(request, 304, {'ETag': etag})
+        headers = {
+            'ETag': etag,
+            'Last-Modified': 'Tue, 03 Mar 2020 11:16:00 GMT',
+            'Content-Length': '512',
+            'x-ms-blob-type': 'BlockBlob',
+            'x-ms-meta-key': 'value'}
+        if request.method == 'GET':
+            headers['Content-Range'] = 'bytes 0-511/512'
+            return _Response(request, 206, headers, b'x' * 512)
+        return _Response(request, 200, headers)
+
+
+class StoragePropertiesCacheTest(StorageTestCase):
+
+    def _blob_client(self, transport, cache, key, blob_name='blob'):
+        return BlobClient(
+            "https://account.blob.core.windows.net", "container", blob_name, credential=key,
+            transport=transport, properties_cache=cache)
+
+    # these are white box tests that are designed to make sure the cached properties are returned,
+    # revalidated once expired, and invalidated by the writes
+    @GlobalStorageAccountPreparer()
+    def test_get_blob_properties_cached(self, resource_group, location, storage_account, storage_account_key):
+        transport = _BlobTransport()
+        cache = BlobPropertiesCache(ttl=60)
+        blob = self._blob_client(transport, cache, storage_account_key)
+
+        first = blob.get_blob_properties()
+        second = blob.get_blob_properties()
+        self.assertEqual(len(transport.requests), 1)
+        self.assertEqual(second.etag, first.etag)
+        self.assertEqual(second.metadata, {'key': 'value'})
+        self.assertEqual((cache.hits, cache.misses, cache.revalidations), (1, 1, 0))
+
+        # the copies returned do not change the cached properties
+        second.metadata['key'] = 'changed'
+        self.assertEqual(blob.get_blob_properties().metadata, {'key': 'value'})
+
+        # the writes invalidate the properties
+        blob.set_blob_metadata({'key': 'new'})
+        properties = blob.get_blob_properties()
+        self.assertEqual(properties.etag, transport.etags['blob'])
+        self.assertEqual(cache.misses, 2)
+
+        # the requests with conditions bypass the cache
+        requests = len(transport.requests)
+        blob.get_blob_properties(etag=properties.etag, match_condition=MatchConditions.IfNotModified)
+        self.assertEqual(len(transport.requests), requests + 1)
+
+        # the writes through the lease clients of the blob invalidate its properties
+        blob.get_blob_properties()
+        self.assertEqual(len(cache), 1)
+        lease = BlobLeaseClient(blob)
+        lease.acquire()
+        self.assertEqual(len(cache), 0)
+        blob.get_blob_properties()
+        lease.break_lease()
+        self.assertEqual(len(cache), 0)
+
+    @GlobalStorageAccountPreparer()
+    def test_get_blob_properties_revalidated(self, resource_group, location, storage_account, storage_account_key):
+        transport = _BlobTransport()
+        cache = BlobPropertiesCache(ttl=0)
+        blob = self._blob_client(transport, cache, storage_account_key)
+
+        etag = blob.get_blob_properties().etag
+        self.assertEqual(blob.get_blob_properties().etag, etag)
+        self.assertEqual(transport.requests[-1].headers['If-None-Match'], etag)
+        self.assertEqual((cache.hits, cache.misses, cache.revalidations), (0, 1, 1))
+
+        # a write by another client is seen by the revalidation
+        self._blob_client(transport, None, storage_account_key).set_blob_metadata({'key': 'new'})
+        self.assertEqual(blob.get_blob_properties().etag, transport.etags['blob'])
+        self.assertEqual((cache.hits, cache.misses, cache.revalidations), (0, 2, 1))
+
+    @GlobalStorageAccountPreparer()
+    def test_properties_cache_shared(self, resource_group, location, storage_account, storage_account_key):
+        transport = _BlobTransport()
+        cache = BlobPropertiesCache(max_size=2, ttl=60)
+        container = ContainerClient(
+            "https://account.blob.core.windows.net", "container", credential=storage_account_key,
+            transport=transport, properties_cache=cache)
+
+        # the blobs listed with their metadata and copy properties are cached, but the deleted blobs
+        list(container.list_blobs(include=['metadata']))
+        self.assertEqual(len(cache), 0)
+        listed = list(container.list_blobs(include=['metadata', 'copy', 'deleted']))
+        self.assertTrue(listed[0].deleted)
+        self.assertEqual(len(cache), 2)
+        requests = len(transport.requests)
+        properties = container.get_blob_client('blob01').get_blob_properties()
+        self.assertEqual(len(transport.requests), requests)
+        self.assertEqual(properties.etag, listed[1].etag)
+
+        # the least recently used blobs are evicted
+        container.get_blob_client('blob03').get_blob_properties()
+        self.assertEqual(len(cache), 2)
+        self.assertEqual(cache.evictions, 1)
+        container.get_blob_client('blob01').get_blob_properties()
+        container.get_blob_client('blob02').get_blob_properties()
+        self.assertEqual((cache.hits, cache.misses), (2, 2))
+
+        # the blobs downloaded are cached
+        cache.clear()
+        blob = container.get_blob_client('blob04')
+        self.assertEqual(blob.download_blob().readall(), b'x' * 512)
+        requests = len(transport.requests)
+        properties = blob.get_blob_properties()
+        self.assertEqual(len(transport.requests), requests)
+        self.assertEqual(properties.size, 512)
+        self.assertIsNone(properties.content_range)
+
+        # the batches invalidate the blobs
+        cache.clear()
+        container.get_blob_client('blob00').get_blob_properties()
+        self.assertEqual(len(cache), 1)
+        container._invalidate_properties(['blob00'])
+        self.assertEqual(len(cache), 0)
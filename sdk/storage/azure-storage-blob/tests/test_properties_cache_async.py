@@ -0,0 +1,97 @@
+# coding: utf-8
+
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+from requests.structures import CaseInsensitiveDict
+
+from azure.core.pipeline.transport import AsyncHttpResponse, AsyncHttpTransport
+from azure.storage.blob import BlobPropertiesCache
+from azure.storage.blob.aio import BlobClient, BlobLeaseClient
+
+from _shared.testcase import GlobalStorageAccountPreparer
+from _shared.asynctestcase import AsyncStorageTestCase
+
+# ------------------------------------------------------------------------------
+
+
+# The status of the lease operations other than renew, release and change
+_STATUS = {'acquire': 201, 'break': 202}
+
+
+class _Response(AsyncHttpResponse):
+    def __init__(self, request, status_code, headers):
+        super(_Response, self).__init__(request, None)
+        self.status_code = status_code
+        self.reason = 'OK'
+        self.headers = CaseInsensitiveDict(headers)
+        self.content_type = None
+
+    def body(self):
+        return b''
+
+    async def load_body(self):
+        pass
+
+
+class _BlobTransport(AsyncHttpTransport):
+    # serve the properties of a blob from memory, answering 304 when the etag given is current
+    def __init__(self):
+        self.etag = '"etag0"'
+        self.requests = []
+
+    async def __aexit__(self, *args):
+        pass
+
+    async def open(self):
+        pass
+
+    async def close(self):
+        pass
+
+    async def send(self, request, **kwargs):
+        self.requests.append(request)
+        if request.method == 'PUT':
+            self.etag = '"etag{}"'.format(len(self.requests))
+            status = _STATUS.get(request.headers.get('x-ms-lease-action'), 200)
+            return _Response(request, status, {'ETag': self.etag})
+        if request.headers.get('If-None-Match') == self.etag:
+            return _Response(request, 304, {'ETag': self.etag})
+        return _Response(request, 200, {
+            'ETag': self.etag,
+            'Last-Modified': 'Tue, 03 Mar 2020 11:16:00 GMT',
+            'Content-Length': '512',
+            'x-ms-blob-type': 'BlockBlob'})
+
+
+class StoragePropertiesCacheAsyncTest(AsyncStorageTestCase):
+
+    # this is a white box test that's designed to make sure the cached properties are revalidated
+    # once expired, and invalidated by the writes
+    @GlobalStorageAccountPreparer()
+    @AsyncStorageTestCase.await_prepared_test
+    async def test_get_blob_properties_cached(self, resource_group, location, storage_account, storage_account_key):
+        transport = _BlobTransport()
+        cache = BlobPropertiesCache(ttl=0)
+        blob = BlobClient(
+            "https://account.blob.core.windows.net", "container", "blob", credential=storage_account_key,
+            transport=transport, properties_cache=cache)
+
+        etag = (await blob.get_blob_properties()).etag
+        self.assertEqual((await blob.get_blob_properties()).etag, etag)
+        self.assertEqual(transport.requests[-1].headers['If-None-Match'], etag)
+        self.assertEqual((cache.hits, cache.misses, cache.revalidations), (0, 1, 1))
+
+        await blob.set_blob_metadata({'key': 'new'})
+        self.assertEqual(len(cache), 0)
+        self.assertEqual((await blob.get_blob_properties()).etag, transport.etag)
+        self.assertEqual(cache.misses, 2)
+
+        lease = BlobLeaseClient(blob)
+        await lease.acquire()
+        self.assertEqual(len(cache), 0)
+        await blob.get_blob_properties()
+        await lease.break_lease()
+        self.assertEqual(len(cache), 0)
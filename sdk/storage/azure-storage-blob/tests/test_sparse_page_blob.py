@@ -0,0 +1,206 @@
+# coding: utf-8
+
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+
+import os
+import random
+import re
+import shutil
+import tempfile
+from io import BytesIO
+
+from azure.storage.blob._download import PageRangeIndex, StorageStreamDownloader
+from azure.storage.blob._shared.uploads import PageBlobChunkUploader, non_empty_page_runs, upload_data_chunks
+
+from _shared.testcase import StorageTestCase, GlobalStorageAccountPreparer
+
+# ------------------------------------------------------------------------------
+PAGE_SIZE = 512
+
+
+class _PageService(object):
+    # record the pages uploaded
+    def __init__(self):
+        self.pages = []
+
+    def upload_pages(self, body, content_length=None, range=None, **kwargs):
+        start, end = [int(i) for i in re.match(r'bytes=(\d+)-(\d+)', range).groups()]
+        assert len(body) == content_length == end - start + 1
+        self.pages.append((start, bytes(body)))
+        return {'etag': '"etag"', 'last_modified': None}
+
+
+class _Range(object):
+    def __init__(self, start, end):
+        self.start = start
+        self.end = end
+
+
+class _PageList(object):
+    def __init__(self, ranges):
+        self.page_range = [_Range(start, end) for start, end in ranges]
+        self.clear_range = None
+
+
+class _Response(list):
+    def __init__(self, data, start, end, total):
+        super(_Response, self).__init__([data])
+        self.response = self
+        self.headers = {}
+        self.properties = _Properties(start, end, total)
+
+
+class _Properties(object):
+    def __init__(self, start, end, total):
+        self.content_range = 'bytes {}-{}/{}'.format(start, end, total)
+        self.etag = '"etag"'
+        self.blob_type = 'PageBlob'
+        self.size = end - start + 1
+
+
+class _Config(object):
+    max_single_get_size = 1024
+    max_chunk_get_size = 1024
+
+
+class StorageSparsePageBlobTest(StorageTestCase):
+
+    def setUp(self):
+        super(StorageSparsePageBlobTest, self).setUp()
+        self.temp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+        return super(StorageSparsePageBlobTest, self).tearDown()
+
+    def _sparse_data(self, size, ranges):
+        data = bytearray(size)
+        for start, end in ranges:
+            data[start:end + 1] = os.urandom(end - start + 1)
+        return bytes(data)
+
+    def _downloader(self, data, ranges, requests, **kwargs):
+        def download(range=None, **kwargs):
+            start, end = [int(i) for i in re.match(r'bytes=(\d+)-(\d+)', range).groups()]
+            end = min(end, len(data) - 1)
+            requests.append(start)
+            return None, _Response(data[start:end + 1], start, end, len(data))
+
+        class _Clients(object):
+            class blob(object):
+                pass
+
+            class page_blob(object):
+                pass
+        _Clients.blob.download = staticmethod(download)
+        _Clients.page_blob.get_page_ranges = staticmethod(lambda: _PageList(ranges))
+
+        return StorageStreamDownloader(
+            clients=_Clients, config=_Config(), name='blob', container='container', encryption_options={}, **kwargs)
+
+    # these are white box tests that are designed to make sure the empty pages of a page blob
+    # are neither downloaded nor written to a file, and are not uploaded
+    @GlobalStorageAccountPreparer()
+    def test_page_range_index(self, resource_group, location, storage_account, storage_account_key):
+        random.seed(0)
+        ranges = []
+        start = 0
+        for _ in range(200):
+            start += random.randint(1, 8) * PAGE_SIZE
+            end = start + random.randint(1, 4) * PAGE_SIZE - 1
+            ranges.append({'start': start, 'end': end})
+            start = end + 1
+        index = PageRangeIndex(list(reversed(ranges)))
+        self.assertEqual(len(index), 200)
+
+        for _ in range(1000):
+            first = random.randint(0, start + 1024)
+            last = first + random.randint(0, 4096)
+            expected = any(r['start'] <= last and first <= r['end'] for r in ranges)
+            self.assertEqual(index.overlaps(first, last), expected, (first, last))
+        self.assertFalse(PageRangeIndex([]).overlaps(0, 1024))
+
+    @GlobalStorageAccountPreparer()
+    def test_upload_skips_empty_pages(self, resource_group, location, storage_account, storage_account_key):
+        chunk_size = 256 * 1024
+        # two pages far apart, two pages separated by less than the gap merged, and a whole empty chunk
+        data = self._sparse_data(
+            4 * chunk_size, [(512, 1023), (200 * 1024, 200 * 1024 + 3), (300 * 1024, 300 * 1024 + 1),
+                             (320 * 1024, 321 * 1024 - 1), (3 * chunk_size, 4 * chunk_size - 1)])
+        self.assertEqual(non_empty_page_runs(b"\x00" * chunk_size), [])
+        self.assertEqual(non_empty_page_runs(memoryview(data)[:chunk_size]), [(512, 1024), (200 * 1024, 200 * 1024 + 512)])
+
+        service = _PageService()
+        upload_data_chunks(
+            service=service,
+            uploader_class=PageBlobChunkUploader,
+            total_size=len(data),
+            chunk_size=chunk_size,
+            max_concurrency=1,
+            stream=BytesIO(data))
+
+        self.assertEqual([start for start, _ in service.pages], [512, 200 * 1024, 300 * 1024, 3 * chunk_size])
+        self.assertEqual(len(service.pages[2][1]), 21 * 1024)
+        uploaded = bytearray(len(data))
+        for start, body in service.pages:
+            uploaded[start:start + len(body)] = body
+        self.assertEqual(bytes(uploaded), data)
+
+    @GlobalStorageAccountPreparer()
+    def test_download_sparse_file(self, resource_group, location, storage_account, storage_account_key):
+        size = 64 * 1024
+        ranges = [(2048, 3071), (40 * 1024, 41 * 1024 - 1)]
+        data = self._sparse_data(size, ranges)
+
+        for max_concurrency in (1, 3):
+            requests = []
+            path = os.path.join(self.temp_dir, 'blob{}'.format(max_concurrency))
+            with open(path, 'wb') as stream:
+                downloaded = self._downloader(data, ranges, requests, max_concurrency=max_concurrency)
+                self.assertEqual(downloaded.readinto(stream), size)
+                self.assertEqual(stream.tell(), size)
+
+            # only the first and non-empty chunks were requested, and the empty chunks left as holes
+            self.assertEqual(sorted(requests), [0, 2048, 40 * 1024])
+            self.assertEqual(os.path.getsize(path), size)
+            with open(path, 'rb') as downloaded_file:
+                self.assertEqual(downloaded_file.read(), data)
+
+        # the empty chunks are still written to the other streams
+        stream = BytesIO()
+        self._downloader(data, ranges, []).readinto(stream)
+        self.assertEqual(stream.getvalue(), data)
+
+        # the empty chunks are written over the existing content of a file
+        path = os.path.join(self.temp_dir, 'existing')
+        with open(path, 'wb') as existing:
+            existing.write(b'x' * size)
+        with open(path, 'r+b') as stream:
+            self._downloader(data, ranges, []).readinto(stream)
+        with open(path, 'rb') as downloaded_file:
+            self.assertEqual(downloaded_file.read(), data)
+
+        # the empty chunks are written to a file opened for appending, whose writes ignore the seeks
+        path = os.path.join(self.temp_dir, 'appended')
+        with open(path, 'wb') as existing:
+            existing.write(b'x' * 100)
+        with open(path, 'ab') as stream:
+            self._downloader(data, ranges, []).readinto(stream)
+        if os.name != 'nt':
+            with os.fdopen(os.open(path, os.O_WRONLY | os.O_APPEND), 'wb') as stream:
+                self._downloader(data, ranges, []).readinto(stream)
+        else:
+            with open(path, 'ab') as stream:
+                self._downloader(data, ranges, []).readinto(stream)
+        with open(path, 'rb') as downloaded_file:
+            self.assertEqual(downloaded_file.read(), b'x' * 100 + data + data)
+
+        # the last chunks left as holes still extend the file
+        path = os.path.join(self.temp_dir, 'trailing')
+        with open(path, 'wb') as stream:
+            self._downloader(data[:4096] + b"\x00" * (size - 4096), ranges[:1], []).readinto(stream)
+        self.assertEqual(os.path.getsize(path), size)
@@ -0,0 +1,256 @@
+# coding: utf-8
+
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+
+import os
+import shutil
+import tempfile
+import time
+from threading import Lock
+
+from azure.core import MatchConditions
+from azure.core.exceptions import ResourceModifiedError
+from azure.storage.blob import BlobTransferManager, ContentSettings
+from azure.storage.blob._transfer_manager import copy_block_ranges
+from azure.storage.blob._shared.uploads import BlockBlobChunkUploader, upload_data_chunks
+
+from _shared.testcase import StorageTestCase, GlobalStorageAccountPreparer
+
+# ------------------------------------------------------------------------------
+
+
+class _BlobProperties(object):
+    def __init__(self, name, size):
+        self.name = name
+        self.size = size
+
+
+class _ContainerClient(object):
+    # keep blobs in memory, staging the blocks of uploads on the executor given
+    def __init__(self):
+        self.key_encryption_key = None
+        self.blobs = {}
+        self.failures = set()
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = Lock()
+
+    def _request(self):
+        with self._lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        time.sleep(0.001)
+        with self._lock:
+            self.in_flight -= 1
+
+    def upload_blob(self, name, data, length=None, max_concurrency=1, executor=None, **kwargs):
+        if name in self.failures:
+            self.failures.remove(name)
+            raise IOError("Connection lost.")
+        container = self
+        staged = {}
+
+        class _BlockBlobService(object):
+            def stage_block(self, block_id, length, block_data, **kwargs):
+                container._request()
+                staged[block_id] = block_data
+
+        block_ids = upload_data_chunks(
+            service=_BlockBlobService(),
+            uploader_class=BlockBlobChunkUploader,
+            total_size=length,
+            chunk_size=1024,
+            max_concurrency=max_concurrency,
+            stream=data,
+            executor=executor)
+        self.blobs[name] = b"".join(staged[block_id] for block_id in block_ids)
+
+    def list_blobs(self, name_starts_with=None, **kwargs):
+        return [_BlobProperties(name, len(data)) for name, data in sorted(self.blobs.items())
+                if name.startswith(name_starts_with or "")]
+
+    def download_blob(self, name, **kwargs):
+        data = self.blobs[name]
+
+        class _Downloader(object):
+            def download_into(self, path):
+                with open(path, "wb") as stream:
+                    stream.write(data)
+        return _Downloader()
+
+
+_SOURCES = {}
+_ETAGS = {}
+
+
+class _SourceBlob(object):
+    # a blob of a source container, the service reads the blocks copied from it by its URL
+    def __init__(self, name, data, metadata=None):
+        self.name = name
+        self.size = len(data)
+        self.content_settings = ContentSettings(content_type="application/octet-stream")
+        self.metadata = metadata or {}
+        self.url = "https://source.blob.core.windows.net/container/" + name
+        self.etag = '"source"'
+        _SOURCES[self.url] = data
+        _ETAGS[self.url] = self.etag
+
+
+class _SourceContainerClient(object):
+    def __init__(self, blobs):
+        self.blobs = blobs
+
+    def get_blob_client(self, name):
+        return [blob for blob in self.blobs if blob.name == name][0]
+
+    def list_blobs(self, name_starts_with=None, include=None, **kwargs):
+        assert include == ['metadata']
+        return [blob for blob in self.blobs if blob.name.startswith(name_starts_with or "")]
+
+
+class _CopyTargetContainerClient(_ContainerClient):
+    # stage the blocks copied from the source URLs, without any data going through the client
+    def __init__(self):
+        super(_CopyTargetContainerClient, self).__init__()
+        self.properties = {}
+        self.staged = []
+
+    def get_blob_client(self, name):
+        container = self
+        blocks = {}
+
+        class _BlobClient(object):
+            def stage_block_from_url(self, block_id, source_url, source_offset=None, source_length=None, **kwargs):
+                container._request()
+                if source_url in container.failures:
+                    container.failures.remove(source_url)
+                    raise IOError("Connection lost.")
+                assert source_url.endswith("?sv=sas")
+                if kwargs.get('source_match_condition') != MatchConditions.IfNotModified or \
+                        kwargs.get('source_etag') != _ETAGS[source_url[:-len("?sv=sas")]]:
+                    raise ResourceModifiedError("The source was modified.")
+                data = _SOURCES[source_url[:-len("?sv=sas")]]
+                blocks[block_id] = data[source_offset:source_offset + source_length]
+                container.staged.append((name, source_length))
+
+            def commit_block_list(self, block_list, content_settings=None, metadata=None, **kwargs):
+                if kwargs.get('etag') == '*' and name in container.blobs:
+                    raise ValueError("The blob already exists.")
+                assert len(set(len(block_id) for block_id in block_list)) <= 1
+                container.blobs[name] = b"".join(blocks[block_id] for block_id in block_list)
+                container.properties[name] = (content_settings.content_type, metadata)
+                return {'etag': '"etag"'}
+        return _BlobClient()
+
+
+class StorageBlobTransferManagerTest(StorageTestCase):
+
+    def setUp(self):
+        super(StorageBlobTransferManagerTest, self).setUp()
+        self.temp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+        return super(StorageBlobTransferManagerTest, self).tearDown()
+
+    def _create_tree(self, root):
+        files = {}
+        for name in ("a.bin", "dir/b.bin", "dir/sub/c.bin", "other/d.bin"):
+            path = os.path.join(root, *name.split("/"))
+            if not os.path.isdir(os.path.dirname(path)):
+                os.makedirs(os.path.dirname(path))
+            files[name] = os.urandom(10 * 1024 + len(name))
+            with open(path, "wb") as local_file:
+                local_file.write(files[name])
+        return files
+
+    # this is a white box test that's designed to make sure the blocks of all the files
+    # share a single bounded pool, and that failed files are transferred again
+    @GlobalStorageAccountPreparer()
+    def test_upload_and_download_directory(self, resource_group, location, storage_account, storage_account_key):
+        files = self._create_tree(os.path.join(self.temp_dir, "source"))
+        container = _ContainerClient()
+        container.failures.add("backup/dir/b.bin")
+        progress = []
+
+        with BlobTransferManager(container, max_concurrency=3, progress_hook=progress.append) as manager:
+            report = manager.upload_directory(os.path.join(self.temp_dir, "source"), prefix="backup/")
+
+            # assert data is consistent
+            self.assertEqual(container.blobs, {"backup/" + name: data for name, data in files.items()})
+            self.assertLessEqual(container.max_in_flight, 3)
+            self.assertEqual(len(report.succeeded), 4)
+            self.assertEqual(report.failed, [])
+            self.assertEqual(report.bytes_transferred, sum(len(data) for data in files.values()))
+            self.assertEqual(sorted(transfer.name for transfer in progress), sorted(container.blobs))
+            self.assertEqual(
+                [transfer.attempts for transfer in report.succeeded if transfer.name == "backup/dir/b.bin"], [2])
+
+            container.blobs["backup/../escaped.bin"] = b"data"
+            report = manager.download_directory(os.path.join(self.temp_dir, "destination"), prefix="backup/")
+
+        self.assertEqual(len(report.succeeded), 4)
+        self.assertEqual([transfer.name for transfer in report.failed], ["backup/../escaped.bin"])
+        self.assertIsInstance(report.failed[0].error, ValueError)
+        self.assertEqual(report.failed[0].attempts, 1)
+        for name, data in files.items():
+            with open(os.path.join(self.temp_dir, "destination", *name.split("/")), "rb") as local_file:
+                self.assertEqual(local_file.read(), data)
+        self.assertFalse(os.path.exists(os.path.join(self.temp_dir, "escaped.bin")))
+
+    # this is a white box test that's designed to make sure the blobs are copied by the service,
+    # block by block on the shared pool, and that the failed blobs are copied again
+    @GlobalStorageAccountPreparer()
+    def test_copy_blobs(self, resource_group, location, storage_account, storage_account_key):
+        self.assertEqual(copy_block_ranges(0), [])
+        self.assertEqual(copy_block_ranges(2500, 1024), [
+            ("0000000000000000", 0, 1024), ("0000000000001024", 1024, 1024), ("0000000000002048", 2048, 452)])
+        # the blocks are grown to keep within the blocks of a block blob
+        self.assertEqual(len(copy_block_ranges(200000 * 1024, 1024)), 50000)
+
+        blobs = [_SourceBlob("logs/a.log", os.urandom(5000), {"kind": "log"}),
+                 _SourceBlob("logs/empty.log", b""),
+                 _SourceBlob("logs/sub/b.log", os.urandom(2048)),
+                 _SourceBlob("other/c.log", os.urandom(100))]
+        target = _CopyTargetContainerClient()
+        target.failures.add(blobs[2].url + "?sv=sas")
+        progress = []
+
+        with BlobTransferManager(target, max_concurrency=3, progress_hook=progress.append) as manager:
+            report = manager.copy_blobs(
+                _SourceContainerClient(blobs), prefix="logs/", destination_prefix="archive/",
+                source_sas="?sv=sas", block_size=1024)
+
+            # assert data is consistent
+            self.assertEqual(target.blobs, {
+                "archive/a.log": _SOURCES[blobs[0].url],
+                "archive/empty.log": b"",
+                "archive/sub/b.log": _SOURCES[blobs[2].url]})
+            self.assertEqual(target.properties["archive/a.log"], ("application/octet-stream", {"kind": "log"}))
+            self.assertEqual(sorted(length for name, length in target.staged if name == "archive/a.log"),
+                             [904, 1024, 1024, 1024, 1024])
+            self.assertLessEqual(target.max_in_flight, 3)
+            self.assertEqual(len(report.succeeded), 3)
+            self.assertEqual(report.bytes_transferred, 7048)
+            self.assertEqual(len(progress), 3)
+            self.assertEqual(
+                [transfer.attempts for transfer in report.succeeded if transfer.name == "archive/sub/b.log"], [2])
+
+            # the existing blobs are kept
+            report = manager.copy_blobs(
+                _SourceContainerClient(blobs), prefix="other/", source_sas="sv=sas", overwrite=False)
+            self.assertEqual([transfer.name for transfer in report.succeeded], ["other/c.log"])
+            report = manager.copy_blobs(
+                _SourceContainerClient(blobs), prefix="other/", source_sas="sv=sas", overwrite=False)
+            self.assertIsInstance(report.failed[0].error, ValueError)
+
+            # a source modified during the copy fails it, without committing the block list
+            source = _SourceBlob("logs/changed.log", os.urandom(3000))
+            _ETAGS[source.url] = '"modified"'
+            with self.assertRaises(ResourceModifiedError):
+                manager.copy_blob(source.url + "?sv=sas", "changed.log", source_properties=source, block_size=1024)
+            self.assertNotIn("changed.log", target.blobs)
@@ -0,0 +1,65 @@
+# coding: utf-8
+
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+
+import os
+
+from azure.core.exceptions import ResourceModifiedError
+from azure.storage.blob.aio import BlobTransferManager
+
+from _shared.testcase import GlobalStorageAccountPreparer
+from _shared.asynctestcase import AsyncStorageTestCase
+from test_transfer_manager import _ETAGS, _SOURCES, _CopyTargetContainerClient, _SourceBlob, _SourceContainerClient
+
+# ------------------------------------------------------------------------------
+
+
+class _AsyncBlobClient(object):
+    # the coroutines of the methods of a blob client in memory
+    def __init__(self, blob_client):
+        self.blob_client = blob_client
+
+    def __getattr__(self, name):
+        method = getattr(self.blob_client, name)
+
+        async def call(*args, **kwargs):
+            return method(*args, **kwargs)
+        return call
+
+
+class _AsyncCopyTargetContainerClient(_CopyTargetContainerClient):
+    def get_blob_client(self, name):
+        return _AsyncBlobClient(super(_AsyncCopyTargetContainerClient, self).get_blob_client(name))
+
+
+class StorageBlobTransferManagerAsyncTest(AsyncStorageTestCase):
+
+    # this is a white box test that's designed to make sure the blobs are copied by the service,
+    # block by block on the shared pool, and that the failed blobs are copied again
+    @GlobalStorageAccountPreparer()
+    @AsyncStorageTestCase.await_prepared_test
+    async def test_copy_blobs(self, resource_group, location, storage_account, storage_account_key):
+        blobs = [_SourceBlob("logs/a.log", os.urandom(5000), {"kind": "log"}),
+                 _SourceBlob("logs/sub/b.log", os.urandom(2048))]
+        target = _AsyncCopyTargetContainerClient()
+        target.failures.add(blobs[1].url + "?sv=sas")
+
+        async with BlobTransferManager(target, max_concurrency=3) as manager:
+            report = await manager.copy_blobs(_SourceContainerClient(blobs), source_sas="sv=sas", block_size=1024)
+
+            source = _SourceBlob("changed.log", os.urandom(3000))
+            _ETAGS[source.url] = '"modified"'
+            with self.assertRaises(ResourceModifiedError):
+                await manager.copy_blob(
+                    source.url + "?sv=sas", "changed.log", source_properties=source, block_size=1024)
+
+        # assert data is consistent
+        self.assertEqual(target.blobs, {blob.name: _SOURCES[blob.url] for blob in blobs})
+        self.assertEqual(target.properties["logs/a.log"], ("application/octet-stream", {"kind": "log"}))
+        self.assertEqual(len([name for name, _ in target.staged if name == "logs/a.log"]), 5)
+        self.assertEqual([transfer.attempts for transfer in report.succeeded], [1, 2])
+        self.assertEqual(report.failed, [])
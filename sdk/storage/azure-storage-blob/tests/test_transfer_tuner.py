@@ -0,0 +1,128 @@
+# coding: utf-8
+
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+
+import os
+import time
+from io import BytesIO
+from threading import Lock
+
+from azure.storage.blob import TransferTuner
+from azure.storage.blob._shared.uploads import BlockBlobChunkUploader, upload_data_chunks
+
+from _shared.testcase import StorageTestCase, GlobalStorageAccountPreparer
+
+# ------------------------------------------------------------------------------
+
+
+class StorageTransferTunerTest(StorageTestCase):
+
+    # this is a white box test that's designed to make sure the tuner climbs, reverts
+    # and backs off as the measured throughput changes
+    @GlobalStorageAccountPreparer()
+    def test_tuner_adjusts_settings(self, resource_group, location, storage_account, storage_account_key):
+        tuner = TransferTuner(min_chunk_size=1024, max_chunk_size=8 * 1024, max_concurrency=4)
+        tuner.start(chunk_size=100, concurrency=10)
+
+        # settings are clamped to the bounds of the tuner
+        self.assertEqual(tuner.chunk_size, 1024)
+        self.assertEqual(tuner.concurrency, 4)
+        tuner.concurrency = 1
+
+        # the chunk size grows while throughput improves
+        tuner._adjust(10)
+        tuner._adjust(20)
+        self.assertEqual((tuner.chunk_size, tuner.concurrency), (4 * 1024, 1))
+
+        # no gain: revert, then grow the concurrency
+        tuner._adjust(20)
+        self.assertEqual((tuner.chunk_size, tuner.concurrency), (2 * 1024, 2))
+        tuner._adjust(30)
+        self.assertEqual((tuner.chunk_size, tuner.concurrency), (2 * 1024, 4))
+
+        # converged after two changes without gain
+        tuner._adjust(30)
+        tuner._adjust(30)
+        self.assertEqual((tuner.chunk_size, tuner.concurrency), (2 * 1024, 2))
+        tuner._adjust(30)
+        self.assertEqual((tuner.chunk_size, tuner.concurrency), (2 * 1024, 2))
+
+        # throughput collapsed: back off
+        tuner._adjust(10)
+        self.assertEqual((tuner.chunk_size, tuner.concurrency), (1024, 1))
+
+        # a new transfer starts from the settings reached
+        tuner.start(chunk_size=4 * 1024 * 1024, concurrency=1)
+        self.assertEqual((tuner.chunk_size, tuner.concurrency), (1024, 1))
+
+        # the limit of a transfer bounds the concurrency
+        tuner.start(chunk_size=1024, concurrency=1, limit=2)
+        tuner._knob = 1
+        tuner._adjust(40)
+        tuner._adjust(80)
+        self.assertEqual(tuner.concurrency, 2)
+
+    @GlobalStorageAccountPreparer()
+    def test_autotuned_upload_data_chunks(self, resource_group, location, storage_account, storage_account_key):
+        data = os.urandom(1024 * 1024 + 1)
+        staged = {}
+
+        class _BlockService(object):
+            def stage_block(self, block_id, length, block_data, **kwargs):
+                assert len(block_data) == length
+                staged[block_id] = block_data
+
+        tuner = TransferTuner(min_chunk_size=1024, max_chunk_size=64 * 1024, max_concurrency=4)
+        block_ids = upload_data_chunks(
+            service=_BlockService(),
+            uploader_class=BlockBlobChunkUploader,
+            total_size=len(data),
+            chunk_size=1024,
+            max_concurrency=None,
+            stream=BytesIO(data),
+            tuner=tuner)
+
+        # assert data is consistent
+        self.assertEqual(b"".join(staged[block_id] for block_id in block_ids), data)
+        report = tuner.report()
+        self.assertEqual(report.bytes_transferred, len(data))
+        self.assertEqual(report.chunks, len(block_ids))
+        self.assertTrue(report.history)
+
+    # this is a white box test that's designed to make sure the max_concurrency of the caller
+    # bounds the requests in flight of an autotuned transfer
+    @GlobalStorageAccountPreparer()
+    def test_autotuned_upload_max_concurrency(self, resource_group, location, storage_account, storage_account_key):
+        data = os.urandom(64 * 1024)
+        staged = {}
+        lock = Lock()
+        in_flight = [0, 0]
+
+        class _BlockService(object):
+            def stage_block(self, block_id, length, block_data, **kwargs):
+                with lock:
+                    in_flight[0] += 1
+                    in_flight[1] = max(in_flight)
+                time.sleep(0.001)
+                staged[block_id] = block_data
+                with lock:
+                    in_flight[0] -= 1
+
+        tuner = TransferTuner(min_chunk_size=1024, max_chunk_size=1024, max_concurrency=8)
+        block_ids = upload_data_chunks(
+            service=_BlockService(),
+            uploader_class=BlockBlobChunkUploader,
+            total_size=len(data),
+            chunk_size=1024,
+            max_concurrency=1,
+            stream=BytesIO(data),
+            tuner=tuner)
+
+        # assert data is consistent, with a single request in flight
+        self.assertEqual(b"".join(staged[block_id] for block_id in block_ids), data)
+        self.assertEqual(in_flight[1], 1)
+        self.assertEqual(tuner.report().max_concurrency, 1)
@@ -9,16 +9,33 @@
 import pytest
 
 import os
+import tempfile
 from devtools_testutils import ResourceGroupPreparer, StorageAccountPreparer
-from azure.storage.blob._shared.uploads import SubStream
+from azure.storage.blob._shared.uploads import (
+    _CHUNK_BUFFER_POOL, SubStream, IterStreamer, MemoryViewStream, PooledChunkStream, BlockBlobChunkUploader,
+    upload_data_chunks, upload_substream_blocks)
 from threading import Lock
-from io import (BytesIO, SEEK_SET)
+from io import (BytesIO, RawIOBase, SEEK_SET)
 
 from _shared.testcase import StorageTestCase, GlobalStorageAccountPreparer
 
 # ------------------------------------------------------------------------------
 
 
+class _ShortReadStream(RawIOBase):
+    # simulate a pipe or a socket, returning at most 1000 bytes per read
+    def __init__(self, data):
+        self._wrapped_stream = BytesIO(data)
+
+    def readable(self):
+        return True
+
+    def readinto(self, b):
+        data = self._wrapped_stream.read(min(len(b), 1000))
+        b[:len(data)] = data
+        return len(data)
+
+
 class StorageBlobUploadChunkingTest(StorageTestCase):
 
     # this is a white box test that's designed to make sure _Substream behaves properly
@@ -112,3 +129,91 @@ class StorageBlobUploadChunkingTest(StorageTestCase):
         finally:
             wrapped_stream.close()
             substream.close()
+
+    # this is a white box test that's designed to make sure chunks are assembled properly
+    # from streams returning less data than requested
+    @GlobalStorageAccountPreparer()
+    def test_get_chunk_streams_with_short_reads(self, resource_group, location, storage_account, storage_account_key):
+        data = os.urandom(100 * 1024 + 10)
+        chunk_size = 4 * 1024
+        generator = (data[i: i + 999] for i in range(0, len(data), 999))
+
+        for stream in (BytesIO(data), _ShortReadStream(data), IterStreamer(generator)):
+            uploader = BlockBlobChunkUploader(
+                service=None, total_size=None, chunk_size=chunk_size, stream=stream, parallel=False)
+            chunks = list(uploader.get_chunk_streams())
+
+            # assert data is consistent, the chunks of the short reads being streams over pooled buffers
+            self.assertEqual([index for index, _ in chunks], list(range(0, len(data), chunk_size)))
+            if isinstance(stream, _ShortReadStream):
+                self.assertTrue(all(isinstance(chunk, PooledChunkStream) for _, chunk in chunks))
+            self.assertEqual(b"".join(chunk if isinstance(chunk, bytes) else chunk.read() for _, chunk in chunks), data)
+
+        # the total size should limit the data read
+        uploader = BlockBlobChunkUploader(
+            service=None, total_size=10000, chunk_size=chunk_size, stream=_ShortReadStream(data), parallel=False)
+        chunks = list(uploader.get_chunk_streams())
+        self.assertEqual(b"".join(chunk.read() for _, chunk in chunks), data[:10000])
+
+    # this is a white box test that's designed to make sure the chunks assembled in pooled buffers
+    # are staged without copy, and their buffers reused once staged
+    @GlobalStorageAccountPreparer()
+    def test_upload_chunks_from_pooled_buffers(self, resource_group, location, storage_account, storage_account_key):
+        data = os.urandom(100 * 1024 + 10)
+        chunk_size = 4 * 1024
+        staged = {}
+        streams = []
+        buffers = []
+
+        class _BlockService(object):
+            def stage_block(self, block_id, length, block_stream, **kwargs):
+                assert isinstance(block_stream, PooledChunkStream) and not block_stream.closed
+                streams.append(block_stream)
+                buffers.append(block_stream.getbuffer().obj)
+                staged[block_id] = block_stream.read(length)
+
+        block_ids = upload_data_chunks(
+            service=_BlockService(),
+            uploader_class=BlockBlobChunkUploader,
+            total_size=None,
+            chunk_size=chunk_size,
+            max_concurrency=1,
+            stream=_ShortReadStream(data))
+
+        # assert data is consistent, the buffers going back to the pool once staged
+        self.assertEqual(len(block_ids), 26)
+        self.assertEqual(b"".join(staged[block_id] for block_id in block_ids), data)
+        self.assertTrue(all(stream.closed for stream in streams))
+        pooled = [id(buffer) for buffer in _CHUNK_BUFFER_POOL._buffers]
+        self.assertTrue(all(id(buffer) in pooled for buffer in buffers))
+
+    # this is a white box test that's designed to make sure blocks of local files are
+    # memory-mapped, and read without going through _Substream
+    @GlobalStorageAccountPreparer()
+    def test_substream_blocks_from_mapped_file(self, resource_group, location, storage_account, storage_account_key):
+        data = os.urandom(1024 * 1024 + 1)
+        staged = {}
+
+        class _BlockService(object):
+            def stage_block(self, block_id, length, block_stream, **kwargs):
+                assert isinstance(block_stream, MemoryViewStream)
+                block_data = block_stream.read(length // 2)
+                block_stream.seek(len(block_data), SEEK_SET)
+                staged[block_id] = block_data + block_stream.read()
+
+        with tempfile.TemporaryFile() as temp_file:
+            temp_file.write(data)
+            temp_file.seek(0)
+            for max_concurrency in (1, 3):
+                staged.clear()
+                block_ids = upload_substream_blocks(
+                    service=_BlockService(),
+                    uploader_class=BlockBlobChunkUploader,
+                    total_size=len(data),
+                    chunk_size=100 * 1024,
+                    max_concurrency=max_concurrency,
+                    stream=temp_file)
+
+                # assert data is consistent
+                self.assertEqual(len(block_ids), 11)
+                self.assertEqual(b"".join(staged[block_id] for block_id in block_ids), data)
@@ -10,6 +10,14 @@ from ._data_lake_directory_client import DataLakeDirectoryClient
 from ._file_system_client import FileSystemClient
 from ._data_lake_service_client import DataLakeServiceClient
 from ._data_lake_lease import DataLakeLeaseClient
+from ._transfer_manager import DataLakeTransferManager
+from ._file_writer import DataLakeFileWriter, DataLakeFileWriterMetrics
+from ._access_control_recursive import (
+    DataLakeAccessControlManager,
+    AccessControlChangeCounters,
+    AccessControlChangeFailure,
+    AccessControlChangeResult,
+)
 from ._models import (
     LocationMode,
     ResourceTypes,
@@ -33,6 +41,7 @@ from ._shared_access_signature import generate_account_sas, generate_file_system
 
 from ._shared.policies import ExponentialRetry, LinearRetry
 from ._shared.models import StorageErrorCode
+from ._shared.transfers import DirectoryTransferReport, FileTransfer
 from ._version import VERSION
 
 __version__ = VERSION
@@ -43,6 +52,15 @@ __all__ = [
     'DataLakeFileClient',
     'DataLakeDirectoryClient',
     'DataLakeLeaseClient',
+    'DataLakeTransferManager',
+    'DirectoryTransferReport',
+    'FileTransfer',
+    'DataLakeFileWriter',
+    'DataLakeFileWriterMetrics',
+    'DataLakeAccessControlManager',
+    'AccessControlChangeCounters',
+    'AccessControlChangeFailure',
+    'AccessControlChangeResult',
     'ExponentialRetry',
     'LinearRetry',
     'LocationMode',
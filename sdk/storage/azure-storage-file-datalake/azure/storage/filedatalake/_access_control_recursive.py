@@ -0,0 +1,367 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from typing import (  # pylint: disable=unused-import
+    Optional, Any, Callable, Dict, List, Tuple, TypeVar, TYPE_CHECKING
+)
+
+from azure.core import MatchConditions
+from azure.core.exceptions import AzureError, ResourceModifiedError
+from azure.core.tracing.common import with_current_context
+
+from ._models import PathProperties
+
+if TYPE_CHECKING:
+    FileSystemClient = TypeVar("FileSystemClient")
+
+# The modes of a recursive change: replace the ACL, merge entries into it, or remove entries from it
+SET_MODE = 'set'
+MODIFY_MODE = 'modify'
+REMOVE_MODE = 'remove'
+# The number of times the ACL of a path is read and changed again, when it changed in between
+_MAX_CONFLICT_RETRIES = 3
+
+
+class AccessControlChangeCounters(object):
+    """The progress of a recursive access control change.
+
+    :ivar int directories_successful: The number of directories changed.
+    :ivar int files_successful: The number of files changed.
+    :ivar int failure_count: The number of paths that failed to change.
+    :ivar float started: The time the change was started, as seconds since the epoch.
+    """
+
+    def __init__(self):
+        self.directories_successful = 0
+        self.files_successful = 0
+        self.failure_count = 0
+        self.started = time.time()
+        self._lock = threading.Lock()
+
+    def _add(self, counter, count=1):
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + count)
+
+    @property
+    def elapsed(self):
+        # type: () -> float
+        """The time since the change was started, in seconds."""
+        return time.time() - self.started
+
+    @property
+    def rate(self):
+        # type: () -> float
+        """The number of paths changed or failed per second."""
+        elapsed = self.elapsed
+        count = self.directories_successful + self.files_successful + self.failure_count
+        return count / elapsed if elapsed else 0.0
+
+    def __repr__(self):
+        return "AccessControlChangeCounters(directories_successful={}, files_successful={}, failure_count={})".format(
+            self.directories_successful, self.files_successful, self.failure_count)
+
+
+class AccessControlChangeFailure(object):
+    """A path whose access control failed to change.
+
+    :ivar str name: The name of the path.
+    :ivar bool is_directory: Whether the path is a directory.
+    :ivar str error_message: The message of the error.
+    """
+
+    def __init__(self, name, is_directory, error_message):
+        # type: (str, bool, str) -> None
+        self.name = name
+        self.is_directory = is_directory
+        self.error_message = error_message
+
+    def __repr__(self):
+        return "AccessControlChangeFailure(name={!r}, is_directory={}, error_message={!r})".format(
+            self.name, self.is_directory, self.error_message)
+
+
+class AccessControlChangeResult(object):
+    """The result of a recursive access control change.
+
+    :ivar counters: The number of paths changed and failed.
+    :vartype counters: ~azure.storage.filedatalake.AccessControlChangeCounters
+    :ivar list(~azure.storage.filedatalake.AccessControlChangeFailure) failures:
+        The paths that failed to change.
+    :ivar str continuation:
+        The continuation token to pass to resume the change from the first path not yet
+        changed, or None once all the paths are changed.
+    """
+
+    def __init__(self):
+        self.counters = AccessControlChangeCounters()
+        self.failures = []  # type: List[AccessControlChangeFailure]
+        self.continuation = None  # type: Optional[str]
+        self._lock = threading.Lock()
+
+    def _add_failure(self, path, error):
+        self.counters._add('failure_count')  # pylint: disable=protected-access
+        with self._lock:
+            self.failures.append(AccessControlChangeFailure(path.name, bool(path.is_directory), str(error)))
+
+    def __repr__(self):
+        return "AccessControlChangeResult(counters={!r}, failures={}, continuation={!r})".format(
+            self.counters, len(self.failures), self.continuation)
+
+
+def _entry_key(entry):
+    # type: (str) -> Tuple[bool, str, str]
+    # An entry is "[default:]type:[id]:permissions" or, to remove, "[default:]type:[id]"
+    parts = entry.strip().split(':')
+    default = parts[0] == 'default'
+    if default:
+        parts = parts[1:]
+    return default, parts[0], parts[1] if len(parts) > 1 else ''
+
+
+def _parse_acl(acl, remove=False):
+    # type: (str, bool) -> OrderedDict
+    entries = OrderedDict()
+    for entry in acl.split(','):
+        if not entry.strip():
+            continue
+        key = _entry_key(entry)
+        if not remove and len(entry.split(':')) < 3 + key[0]:
+            raise ValueError("The access control entry {!r} has no permissions.".format(entry))
+        entries[key] = entry.strip()
+    return entries
+
+
+def _file_entries(entries):
+    # Files have no default ACL, and the service rejects default entries set on them
+    return OrderedDict((key, entry) for key, entry in entries.items() if not key[0])
+
+
+def _format_acl(entries):
+    return ','.join(entries.values())
+
+
+class _AccessControlChange(object):
+    """The change applied to the ACL of each path: the new ACL from the current one."""
+
+    def __init__(self, mode, acl):
+        if mode not in (SET_MODE, MODIFY_MODE, REMOVE_MODE):
+            raise ValueError("Unknown access control change mode {!r}.".format(mode))
+        self.mode = mode
+        self.entries = _parse_acl(acl, remove=mode == REMOVE_MODE)
+        self.file_entries = _file_entries(self.entries)
+
+    @property
+    def needs_current(self):
+        return self.mode != SET_MODE
+
+    def applies_to(self, is_directory):
+        # type: (bool) -> bool
+        return bool(self.entries if is_directory else self.file_entries)
+
+    def new_acl(self, is_directory, current=None):
+        # type: (bool, Optional[str]) -> Optional[str]
+        """The ACL to set, or None if it would be the current one."""
+        entries = self.entries if is_directory else self.file_entries
+        if self.mode == SET_MODE:
+            return _format_acl(entries)
+        current_entries = _parse_acl(current or '')
+        if self.mode == MODIFY_MODE:
+            changed = current_entries.copy()
+            changed.update(entries)
+        else:
+            changed = OrderedDict((k, e) for k, e in current_entries.items() if k not in entries)
+        if changed == current_entries:
+            return None
+        return _format_acl(changed)
+
+
+def _directory(name):
+    # type: (Optional[str]) -> PathProperties
+    directory = PathProperties()
+    directory.name = name or '/'
+    directory.is_directory = True
+    return directory
+
+
+class DataLakeAccessControlManager(object):
+    """Set, update or remove the access control lists of a directory tree.
+
+    The paths under the directory are listed a page at a time, and the ACL of the paths of
+    a page is changed by up to `max_concurrency` requests in flight, while the next page is
+    listed. The changes are tracked by page: the continuation token of a result resumes the
+    change after the last page completed, so an interrupted change can be started again
+    from where it stopped. The paths that failed to change are reported in the result
+    rather than stopping the change.
+
+    Updating or removing entries reads the ACL of each path and sets it back only if it
+    changed, on the condition that the path was not changed in between.
+
+    :param file_system_client: The client of the file system.
+    :type file_system_client: ~azure.storage.filedatalake.FileSystemClient
+    :param int max_concurrency: The largest number of requests in flight. Defaults to 8.
+    :param int batch_size:
+        The number of paths listed per page, up to 5000, the default. It is the number of
+        paths changed again when a change is resumed.
+    :param callable progress_hook:
+        A callback called with the :class:`~azure.storage.filedatalake.AccessControlChangeResult`
+        of the change after each page, whose continuation token can be saved to resume it.
+    """
+
+    def __init__(
+            self, file_system_client,  # type: FileSystemClient
+            max_concurrency=8,  # type: int
+            batch_size=None,  # type: Optional[int]
+            progress_hook=None  # type: Optional[Callable[[AccessControlChangeResult], None]]
+        ):
+        # type: (...) -> None
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be greater than 0.")
+        self.file_system_client = file_system_client
+        self.max_concurrency = max_concurrency
+        self.batch_size = batch_size
+        self.progress_hook = progress_hook
+
+    def set_access_control_recursive(self, acl, path=None, **kwargs):
+        # type: (str, Optional[str], **Any) -> AccessControlChangeResult
+        """Set the access control list of a directory and of all the paths under it.
+
+        The default entries of the ACL are not set on the files.
+
+        :param str acl:
+            The ACL, a comma-separated list of access control entries in the format
+            "[scope:][type]:[id]:[permissions]".
+        :param str path: The directory, e.g. "data/2020". Defaults to the root directory.
+        :keyword str continuation_token:
+            The continuation token of the result of a change stopped before its end, to resume it.
+        :keyword int max_batches:
+            The largest number of pages of paths to change, after which the change stops
+            and returns a continuation token. By default, all the paths are changed.
+        :keyword int timeout:
+            The timeout parameter is expressed in seconds, for each request.
+        :returns: The number of paths changed, the failures and the continuation token.
+        :rtype: ~azure.storage.filedatalake.AccessControlChangeResult
+        """
+        return self._change(_AccessControlChange(SET_MODE, acl), path, **kwargs)
+
+    def update_access_control_recursive(self, acl, path=None, **kwargs):
+        # type: (str, Optional[str], **Any) -> AccessControlChangeResult
+        """Add or replace entries of the access control lists of a directory and of all the paths under it.
+
+        An entry replaces the entry of the same scope, type and id, and the other entries are kept.
+        The default entries are not added to the files.
+
+        :param str acl:
+            The entries to add or replace, a comma-separated list of access control entries
+            in the format "[scope:][type]:[id]:[permissions]".
+        :param str path: The directory, e.g. "data/2020". Defaults to the root directory.
+        :keyword str continuation_token:
+            The continuation token of the result of a change stopped before its end, to resume it.
+        :keyword int max_batches:
+            The largest number of pages of paths to change, after which the change stops
+            and returns a continuation token. By default, all the paths are changed.
+        :keyword int timeout:
+            The timeout parameter is expressed in seconds, for each request.
+        :returns: The number of paths changed, the failures and the continuation token.
+        :rtype: ~azure.storage.filedatalake.AccessControlChangeResult
+        """
+        return self._change(_AccessControlChange(MODIFY_MODE, acl), path, **kwargs)
+
+    def remove_access_control_recursive(self, acl, path=None, **kwargs):
+        # type: (str, Optional[str], **Any) -> AccessControlChangeResult
+        """Remove entries from the access control lists of a directory and of all the paths under it.
+
+        :param str acl:
+            The entries to remove, a comma-separated list of access control entries without
+            permissions, in the format "[scope:][type]:[id]", e.g. "user:<id>,default:user:<id>".
+        :param str path: The directory, e.g. "data/2020". Defaults to the root directory.
+        :keyword str continuation_token:
+            The continuation token of the result of a change stopped before its end, to resume it.
+        :keyword int max_batches:
+            The largest number of pages of paths to change, after which the change stops
+            and returns a continuation token. By default, all the paths are changed.
+        :keyword int timeout:
+            The timeout parameter is expressed in seconds, for each request.
+        :returns: The number of paths changed, the failures and the continuation token.
+        :rtype: ~azure.storage.filedatalake.AccessControlChangeResult
+        """
+        return self._change(_AccessControlChange(REMOVE_MODE, acl), path, **kwargs)
+
+    def _path_client(self, path):
+        # type: (PathProperties) -> Any
+        if path.is_directory:
+            return self.file_system_client.get_directory_client(path.name)
+        return self.file_system_client.get_file_client(path.name)
+
+    def _change_path(self, change, path, result, **kwargs):
+        client = self._path_client(path)
+        try:
+            for attempt in range(_MAX_CONFLICT_RETRIES + 1):
+                if not change.applies_to(path.is_directory):
+                    break
+                conditions = {}
+                if change.needs_current:
+                    current = client.get_access_control(**kwargs)
+                    acl = change.new_acl(path.is_directory, current.get('acl'))
+                    conditions = {'etag': current['etag'], 'match_condition': MatchConditions.IfNotModified}
+                else:
+                    acl = change.new_acl(path.is_directory)
+                if acl is not None:
+                    try:
+                        client.set_access_control(acl=acl, **dict(kwargs, **conditions))
+                    except ResourceModifiedError:
+                        if attempt == _MAX_CONFLICT_RETRIES:
+                            raise
+                        continue
+                break
+        except AzureError as error:
+            result._add_failure(path, error)  # pylint: disable=protected-access
+            return
+        result.counters._add('directories_successful' if path.is_directory else 'files_successful')  # pylint: disable=protected-access
+
+    def _change(self, change, path, **kwargs):
+        # type: (_AccessControlChange, Optional[str], **Any) -> AccessControlChangeResult
+        continuation_token = kwargs.pop('continuation_token', None)
+        max_batches = kwargs.pop('max_batches', None)
+        path = path.strip('/') if path else None
+        result = AccessControlChangeResult()
+        result.continuation = continuation_token
+
+        def finish(futures, token):
+            for future in futures:
+                future.result()
+            result.continuation = token
+            if self.progress_hook:
+                self.progress_hook(result)
+
+        with ThreadPoolExecutor(self.max_concurrency) as executor:
+            if not continuation_token:
+                # The listing does not include the directory itself
+                self._change_path(change, _directory(path), result, **kwargs)
+            paths = self.file_system_client.get_paths(
+                path=path, recursive=True, max_results=self.batch_size, timeout=kwargs.get('timeout'))
+            pages = paths.by_page(continuation_token=continuation_token)
+            pending = None  # type: Optional[Tuple[List[Any], Optional[str]]]
+            batches = 0
+            for page in pages:
+                # The next page is listed while the paths of the previous one are changed
+                page = list(page)
+                if pending:
+                    finish(*pending)
+                futures = [
+                    executor.submit(with_current_context(self._change_path), change, item, result, **kwargs)
+                    for item in page]
+                pending = (futures, pages.continuation_token)
+                batches += 1
+                if max_batches and batches >= max_batches:
+                    break
+            if pending:
+                finish(*pending)
+        return result
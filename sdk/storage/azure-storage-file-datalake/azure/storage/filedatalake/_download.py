@@ -51,3 +51,23 @@ class StorageStreamDownloader(object):
         :rtype: int
         """
         return self._downloader.readinto(stream)
+
+    def download_into(self, target, checkpoint=None):
+        """Download the contents of this file straight into a buffer or a file.
+
+        Each chunk is written into its own slot of the target as it is received,
+        so parallel connections never wait on each other.
+
+        :param target:
+            A writable bytes-like object (e.g. a bytearray, or a memoryview over one) of
+            at least `size` bytes, or the path of a file. The file is created, or truncated,
+            with the size of the download and is written through a memory map.
+        :type target: bytearray or memoryview or str
+        :param str checkpoint:
+            The path of a local journal file making a download into a file resumable.
+            When the download of the same version of the file is retried with the same
+            checkpoint, the chunks already written are not downloaded again.
+        :returns: The number of bytes read.
+        :rtype: int
+        """
+        return self._downloader.download_into(target, checkpoint=checkpoint)
@@ -0,0 +1,332 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import six
+
+from typing import (  # pylint: disable=unused-import
+    Optional, Any, Dict, Iterable, List, Union, TypeVar, TYPE_CHECKING
+)
+
+from azure.core.exceptions import ResourceNotFoundError
+from azure.core.tracing.common import with_current_context
+
+from ._shared.uploads import MemoryViewStream
+
+if TYPE_CHECKING:
+    DataLakeFileClient = TypeVar("DataLakeFileClient")
+
+# The largest data of an Append Data request
+MAX_APPEND_SIZE = 100 * 1024 * 1024
+_DEFAULT_CHUNK_SIZE = 8 * 1024 * 1024
+
+
+class DataLakeFileWriterMetrics(object):
+    """The appends and flushes made by a :class:`DataLakeFileWriter`.
+
+    :ivar int writes: The number of writes to the writer.
+    :ivar int appends: The number of chunks appended to the file.
+    :ivar int bytes_appended: The number of bytes appended to the file.
+    :ivar int flushes: The number of flushes committing the data appended.
+    :ivar float max_latency: The longest time taken by an append, in seconds.
+    :ivar float total_latency: The time taken by all the appends, in seconds.
+    :ivar float started: The time the writer was created, as seconds since the epoch.
+    """
+
+    def __init__(self):
+        self.writes = 0
+        self.appends = 0
+        self.bytes_appended = 0
+        self.flushes = 0
+        self.max_latency = 0.0
+        self.total_latency = 0.0
+        self.started = time.time()
+
+    @property
+    def average_latency(self):
+        # type: () -> float
+        """The average time taken by an append, in seconds."""
+        return self.total_latency / self.appends if self.appends else 0.0
+
+    @property
+    def throughput(self):
+        # type: () -> float
+        """The number of bytes appended per second since the writer was created."""
+        elapsed = time.time() - self.started
+        return self.bytes_appended / elapsed if elapsed else 0.0
+
+    def _record(self, size, latency):
+        self.appends += 1
+        self.bytes_appended += size
+        self.max_latency = max(self.max_latency, latency)
+        self.total_latency += latency
+
+    def __repr__(self):
+        return "DataLakeFileWriterMetrics(writes={}, appends={}, bytes_appended={}, flushes={})".format(
+            self.writes, self.appends, self.bytes_appended, self.flushes)
+
+
+class DataLakeFileWriter(object):  # pylint: disable=too-many-instance-attributes
+    """A file-like writer appending to a file with many appends in flight.
+
+    The writes are copied into chunks of `chunk_size` bytes, from a pool of `max_buffers`
+    buffers, and each full chunk is appended at its offset while the next is filled, with up
+    to `max_concurrency` appends in flight on a pool of threads. The chunks are sent from the
+    buffers without copy, and a buffer is reused once its append completes: the writes wait
+    for a free buffer, so the memory used is bounded by `max_buffers` times `chunk_size`.
+
+    The data appended is committed by :func:`flush` and :func:`close`, which wait for the appends
+    in flight and raise the error of a failed append. With `flush_size`, the data appended is also
+    committed as the writes go, every `flush_size` bytes, up to the first chunk still in flight.
+    A single writer should write to a file at a time.
+
+    :param file_client: The client of the file, which is created if it does not exist.
+    :type file_client: ~azure.storage.filedatalake.DataLakeFileClient
+    :param int chunk_size: The size of the chunks appended, up to 100 MiB. Defaults to 8 MiB.
+    :param int max_concurrency: The largest number of appends in flight. Defaults to 4.
+    :param int max_buffers:
+        The number of chunk buffers, at least 1. Defaults to one more than `max_concurrency`,
+        to fill a chunk while the others are appended.
+    :param int flush_size:
+        The number of bytes appended between the commits made while writing, or None to
+        only commit on :func:`flush` and :func:`close`, the default.
+    :keyword bool overwrite:
+        Whether the file is replaced by an empty file. Otherwise the writes are appended to the
+        file, if it exists. Defaults to False.
+    :keyword ~azure.storage.filedatalake.ContentSettings content_settings:
+        The ContentSettings of the file, set by each commit.
+    :keyword lease:
+        Required if the file has an active lease. Value can be a DataLakeLeaseClient object
+        or the lease ID as a string.
+    :paramtype lease: ~azure.storage.filedatalake.DataLakeLeaseClient or str
+    :keyword bool validate_content:
+        If true, calculates an MD5 hash of each chunk, checked by the service.
+    :keyword str encoding: The encoding of the text written. Defaults to UTF-8.
+    :keyword int timeout:
+        The timeout parameter is expressed in seconds, for each request.
+    """
+
+    def __init__(
+            self, file_client,  # type: DataLakeFileClient
+            chunk_size=_DEFAULT_CHUNK_SIZE,  # type: int
+            max_concurrency=4,  # type: int
+            max_buffers=None,  # type: Optional[int]
+            flush_size=None,  # type: Optional[int]
+            **kwargs  # type: Any
+        ):
+        # type: (...) -> None
+        if not 0 < chunk_size <= MAX_APPEND_SIZE:
+            raise ValueError("chunk_size must be greater than 0 and up to {}.".format(MAX_APPEND_SIZE))
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be greater than 0.")
+        if max_buffers is not None and max_buffers < 1:
+            raise ValueError("max_buffers must be greater than 0.")
+        self.file_client = file_client
+        self.chunk_size = chunk_size
+        self.max_concurrency = max_concurrency
+        self.max_buffers = max_buffers or max_concurrency + 1
+        self.flush_size = flush_size
+        self.metrics = DataLakeFileWriterMetrics()
+        self._overwrite = kwargs.pop('overwrite', False)
+        self._encoding = kwargs.pop('encoding', 'UTF-8')
+        self._content_settings = kwargs.pop('content_settings', None)
+        self._timeout = kwargs.get('timeout')
+        self._append_options = kwargs
+        self._flush_options = {k: v for k, v in kwargs.items() if k in ('lease', 'timeout')}
+        self._buffers = []  # type: List[bytearray]
+        self._allocated = 0
+        self._current = None  # type: Optional[bytearray]
+        self._filled = 0
+        # The offset of the next chunk, the end of the data appended without gap, and the data committed
+        self._position = None  # type: Optional[int]
+        self._appended = 0
+        self._committed = 0
+        self._completed = {}  # type: Dict[int, int]
+        self._in_flight = 0
+        self._error = None  # type: Optional[BaseException]
+        self._closed = False
+        self._changed = threading.Condition()
+        self._executor = None  # type: Optional[ThreadPoolExecutor]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    @property
+    def closed(self):
+        # type: () -> bool
+        return self._closed
+
+    @staticmethod
+    def writable():
+        # type: () -> bool
+        return True
+
+    def tell(self):
+        # type: () -> int
+        """The offset in the file of the next byte written."""
+        return (self._position or 0) + self._filled
+
+    def _check_open(self):
+        if self._closed:
+            raise ValueError("I/O operation on closed file.")
+        if self._error is not None:
+            raise self._error  # pylint: disable=raising-bad-type
+
+    def _encode(self, data):
+        if isinstance(data, six.text_type):
+            data = data.encode(self._encoding)
+        return memoryview(data)
+
+    def _take_buffer(self):
+        # A free buffer, or a new one while fewer than max_buffers are allocated, else None
+        if self._buffers:
+            return self._buffers.pop()
+        if self._allocated < self.max_buffers:
+            self._allocated += 1
+            return bytearray(self.chunk_size)
+        return None
+
+    def _complete(self, buffer, offset, length, error=None):
+        # Return the buffer of an append, and advance the end of the data appended without gap
+        self._in_flight -= 1
+        self._buffers.append(buffer)
+        if error is not None:
+            self._error = self._error or error
+            return
+        self._completed[offset] = offset + length
+        while self._appended in self._completed:
+            self._appended = self._completed.pop(self._appended)
+
+    def _open(self):
+        if not self._overwrite:
+            try:
+                return self.file_client.get_file_properties(timeout=self._timeout).size
+            except ResourceNotFoundError:
+                pass
+        self.file_client.create_file(content_settings=self._content_settings, **self._flush_options)
+        return 0
+
+    def _start(self):
+        if self._position is None:
+            self._position = self._appended = self._committed = self._open()
+            self._executor = ThreadPoolExecutor(self.max_concurrency)
+
+    def _append(self, buffer, offset, length):
+        started = time.time()
+        error = None
+        stream = MemoryViewStream(memoryview(buffer)[:length])
+        try:
+            self.file_client.append_data(stream, offset, length=length, **self._append_options)
+        except BaseException as exception:  # pylint: disable=broad-except
+            error = exception
+        finally:
+            stream.close()
+        with self._changed:
+            if error is None:
+                self.metrics._record(length, time.time() - started)  # pylint: disable=protected-access
+            self._complete(buffer, offset, length, error)
+            self._changed.notify_all()
+
+    def _send(self):
+        # Append the chunk filled, from its buffer
+        buffer, length = self._current, self._filled
+        self._current, self._filled = None, 0
+        with self._changed:
+            offset = self._position
+            self._position += length
+            self._in_flight += 1
+        self._executor.submit(with_current_context(self._append), buffer, offset, length)
+
+    def _commit(self, position, **kwargs):
+        self.file_client.flush_data(
+            position, content_settings=self._content_settings, **dict(self._flush_options, **kwargs))
+        self._committed = position
+        self.metrics.flushes += 1
+
+    def write(self, data):
+        # type: (Union[bytes, bytearray, memoryview, str]) -> int
+        """Copy data into the chunks to append to the file.
+
+        :param data: The data written. Text is encoded with the encoding of the writer.
+        :type data: bytes or str
+        :returns: The number of bytes or characters written.
+        :rtype: int
+        """
+        self._check_open()
+        self._start()
+        self.metrics.writes += 1
+        view = self._encode(data)
+        written = 0
+        while written < len(view):
+            if self._current is None:
+                with self._changed:
+                    while self._error is None:
+                        self._current = self._take_buffer()
+                        if self._current is not None:
+                            break
+                        self._changed.wait()
+                self._check_open()
+            count = min(self.chunk_size - self._filled, len(view) - written)
+            self._current[self._filled:self._filled + count] = view[written:written + count]
+            self._filled += count
+            written += count
+            if self._filled == self.chunk_size:
+                self._send()
+        view.release()
+        # The data appended without gap is committed, keeping the data appended beyond it
+        if self.flush_size and self._appended - self._committed >= self.flush_size:
+            self._commit(self._appended, retain_uncommitted_data=True)
+        return len(data)
+
+    def writelines(self, lines):
+        # type: (Iterable[Union[bytes, str]]) -> None
+        for line in lines:
+            self.write(line)
+
+    def _drain(self):
+        if self._filled:
+            self._send()
+        with self._changed:
+            while self._in_flight:
+                self._changed.wait()
+        self._check_open()
+
+    def flush(self):
+        # type: () -> None
+        """Append the data buffered, wait for the appends in flight, and commit the data appended."""
+        self._check_open()
+        if self._position is None:
+            return
+        self._drain()
+        if self._position > self._committed:
+            self._commit(self._position)
+
+    def close(self):
+        # type: () -> None
+        """Commit the data written, and close the file. The error of a failed append is raised.
+
+        The file is committed once more with `close` set, even if there is no data to commit,
+        raising the file change notification of a closed file stream.
+        """
+        if self._closed:
+            return
+        try:
+            self._check_open()
+            self._start()
+            self._drain()
+            self._commit(self._position, close=True)
+        finally:
+            self._closed = True
+            if self._executor is not None:
+                self._executor.shutdown(wait=True)
+            self._buffers = []
+            self._current = None
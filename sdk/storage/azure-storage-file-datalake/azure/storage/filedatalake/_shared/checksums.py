@@ -0,0 +1,210 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+
+import hashlib
+import struct
+from io import SEEK_SET
+
+import six
+
+from azure.core.exceptions import AzureError
+
+from . import encode_base64
+
+MD5 = 'md5'
+CRC64 = 'crc64'
+
+# The polynomial of the CRC64 computed by the storage service, in reversed bit order
+_CRC64_POLYNOMIAL = 0x9A6C9329AC4BC9B5
+_CRC64_MASK = 0xFFFFFFFFFFFFFFFF
+_CRC64_WORDS_PER_SLICE = 8192
+_READ_BUFFER_SIZE = 64 * 1024
+
+
+def _crc64_tables(polynomial):
+    """The lookup tables of the CRC64, to process the data 8 bytes at a time (slicing-by-8).
+
+    The table k gives the CRC of a byte followed by k zero bytes.
+    """
+    table = []
+    for byte in range(256):
+        crc = byte
+        for _ in range(8):
+            crc = (crc >> 1) ^ polynomial if crc & 1 else crc >> 1
+        table.append(crc)
+    tables = [table]
+    for _ in range(7):
+        tables.append([(crc >> 8) ^ table[crc & 0xFF] for crc in tables[-1]])
+    return tables
+
+
+def _crc64_update(crc, data, tables):
+    t0, t1, t2, t3, t4, t5, t6, t7 = tables
+    view = memoryview(data)
+    length = len(view)
+    position = 0
+    # The 64 bits words are unpacked by slices, instead of a byte at a time
+    while length - position >= 8:
+        count = min((length - position) // 8, _CRC64_WORDS_PER_SLICE)
+        for word in struct.unpack_from('<{}Q'.format(count), view, position):
+            crc ^= word
+            crc = t7[crc & 0xFF] ^ t6[(crc >> 8) & 0xFF] ^ t5[(crc >> 16) & 0xFF] ^ t4[(crc >> 24) & 0xFF] ^ \
+                t3[(crc >> 32) & 0xFF] ^ t2[(crc >> 40) & 0xFF] ^ t1[(crc >> 48) & 0xFF] ^ t0[crc >> 56]
+        position += count * 8
+    for byte in bytearray(view[position:]):
+        crc = (crc >> 8) ^ t0[(crc ^ byte) & 0xFF]
+    return crc
+
+
+_CRC64_TABLES = _crc64_tables(_CRC64_POLYNOMIAL)
+
+
+def _native_crc64():
+    """The CRC64 function of the C extension of crcmod, if it is installed, or None.
+
+    The Python implementation computes a few MB per second while holding the GIL,
+    the C extension well over a hundred. The pure Python fallback of crcmod is slower
+    than the slicing-by-8 above, so it is not used.
+    """
+    try:
+        from crcmod import mkCrcFun  # pylint: disable=import-error
+        from crcmod.crcmod import _usingExtension  # pylint: disable=import-error
+    except ImportError:
+        return None
+    if not _usingExtension:
+        return None
+    # crcmod takes the polynomial in normal bit order, with its x^64 term
+    polynomial = int('{:064b}'.format(_CRC64_POLYNOMIAL)[::-1], 2) | (1 << 64)
+    return mkCrcFun(polynomial, initCrc=0, rev=True, xorOut=_CRC64_MASK)
+
+
+_NATIVE_CRC64 = _native_crc64()
+
+
+def compute_crc64(data, crc=0):
+    """The CRC64 of the storage service (x-ms-content-crc64) of bytes-like data.
+
+    It is computed by the C extension of crcmod when it is installed, and in Python otherwise.
+
+    :param data: The data, as a bytes-like object.
+    :param int crc: The CRC64 of the data before, to compute the CRC64 of data in pieces.
+    :rtype: int
+    """
+    if _NATIVE_CRC64 is not None:
+        return _NATIVE_CRC64(data, crc)
+    return _crc64_update(crc ^ _CRC64_MASK, data, _CRC64_TABLES) ^ _CRC64_MASK
+
+
+def checksum_algorithm(validate_content):
+    """The checksum algorithm of a `validate_content` option: MD5 for True, or CRC64 for 'crc64'."""
+    if not validate_content:
+        return None
+    if isinstance(validate_content, six.string_types):
+        if validate_content.lower() in (MD5, CRC64):
+            return validate_content.lower()
+        raise ValueError("Unsupported content validation: {!r}.".format(validate_content))
+    return MD5
+
+
+class ContentChecksum(object):
+    """A checksum of content, updated with the pieces of the content as they are read or written.
+
+    :param str algorithm: 'md5', for the Content-MD5 header, or 'crc64' for x-ms-content-crc64.
+    """
+
+    header_names = {MD5: 'Content-MD5', CRC64: 'x-ms-content-crc64'}
+
+    def __init__(self, algorithm=MD5):
+        if algorithm not in self.header_names:
+            raise ValueError("Unsupported checksum algorithm: {!r}.".format(algorithm))
+        self.algorithm = algorithm
+        self.header_name = self.header_names[algorithm]
+        self._md5 = hashlib.md5() if algorithm == MD5 else None
+        self._crc64 = 0
+
+    def update(self, data):
+        if self._md5 is not None:
+            self._md5.update(data)
+        else:
+            self._crc64 = compute_crc64(data, self._crc64)
+
+    def digest(self):
+        if self._md5 is not None:
+            return self._md5.digest()
+        return struct.pack('<Q', self._crc64)
+
+    def encoded(self):
+        return encode_base64(self.digest())
+
+    def check(self, headers, response=None):
+        """Compare the checksum with the one of the response headers, if it has any.
+
+        :raises ~azure.core.exceptions.AzureError: If the checksums do not match.
+        """
+        expected = headers.get(self.header_name)
+        if not expected:
+            return
+        computed = self.encoded()
+        if expected != computed:
+            raise AzureError(
+                '{0} mismatch. Expected value is \'{1}\', computed value is \'{2}\'.'.format(
+                    'MD5' if self.algorithm == MD5 else 'CRC64', expected, computed),
+                response=response
+            )
+
+
+def compute_checksum(data, algorithm=MD5):
+    """The checksum of bytes-like data, or of the rest of a seekable stream.
+
+    Bytes-like data is hashed in place, and streams through a single reused buffer.
+    The position of a stream is restored.
+
+    :rtype: ContentChecksum
+    """
+    checksum = ContentChecksum(algorithm)
+    if isinstance(data, (bytes, bytearray, memoryview)):
+        checksum.update(data)
+    elif hasattr(data, 'read'):
+        pos = 0
+        try:
+            pos = data.tell()
+        except:  # pylint: disable=bare-except
+            pass
+        readinto = getattr(data, 'readinto', None)
+        if readinto is not None:
+            buffer = bytearray(_READ_BUFFER_SIZE)
+            view = memoryview(buffer)
+            while True:
+                count = readinto(buffer)
+                if not count:
+                    break
+                checksum.update(view[:count])
+        else:
+            for chunk in iter(lambda: data.read(_READ_BUFFER_SIZE), b""):
+                checksum.update(chunk)
+        try:
+            data.seek(pos, SEEK_SET)
+        except (AttributeError, IOError):
+            raise ValueError("Data should be bytes or a seekable file-like object.")
+    else:
+        raise ValueError("Data should be bytes or a seekable file-like object.")
+    return checksum
+
+
+def range_validation_flags(validate_content, range_validation):
+    """The flags of a download asking the service for the MD5 or the CRC64 of the range.
+
+    :returns: The range_get_content_md5 and range_get_content_crc64 flags.
+    :rtype: tuple(bool, bool)
+    """
+    if checksum_algorithm(validate_content) == CRC64:
+        return None, range_validation
+    return range_validation, None
+
+def content_checksum(validate_content):
+    """A new checksum for the content validation of a transfer, or None if it is not validated."""
+    algorithm = checksum_algorithm(validate_content)
+    return ContentChecksum(algorithm) if algorithm else None
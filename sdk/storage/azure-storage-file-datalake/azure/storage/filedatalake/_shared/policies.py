@@ -5,7 +5,6 @@
 # --------------------------------------------------------------------------
 
 import base64
-import hashlib
 import re
 import random
 from time import time
@@ -39,6 +38,7 @@ from azure.core.pipeline.policies import (
 )
 from azure.core.exceptions import AzureError, ServiceRequestError, ServiceResponseError
 
+from .checksums import MD5, checksum_algorithm, compute_checksum
 from .models import LocationMode
 
 try:
@@ -322,45 +322,29 @@ class StorageContentValidation(SansIOHTTPPolicy):
 
     @staticmethod
     def get_content_md5(data):
-        md5 = hashlib.md5()
-        if isinstance(data, bytes):
-            md5.update(data)
-        elif hasattr(data, 'read'):
-            pos = 0
-            try:
-                pos = data.tell()
-            except:  # pylint: disable=bare-except
-                pass
-            for chunk in iter(lambda: data.read(4096), b""):
-                md5.update(chunk)
-            try:
-                data.seek(pos, SEEK_SET)
-            except (AttributeError, IOError):
-                raise ValueError("Data should be bytes or a seekable file-like object.")
-        else:
-            raise ValueError("Data should be bytes or a seekable file-like object.")
-
-        return md5.digest()
+        return compute_checksum(data, MD5).digest()
 
     def on_request(self, request):
         # type: (PipelineRequest, Any) -> None
         validate_content = request.context.options.pop('validate_content', False)
-        if validate_content and request.http_request.method != 'GET':
-            computed_md5 = encode_base64(StorageContentValidation.get_content_md5(request.http_request.data))
-            request.http_request.headers[self.header_name] = computed_md5
-            request.context['validate_content_md5'] = computed_md5
-        request.context['validate_content'] = validate_content
+        algorithm = checksum_algorithm(validate_content)
+        if algorithm and request.http_request.method != 'GET':
+            checksum = compute_checksum(request.http_request.data, algorithm)
+            request.http_request.headers[checksum.header_name] = checksum.encoded()
+            request.context['validate_content_checksum'] = checksum
+        request.context['validate_content'] = algorithm
 
     def on_response(self, request, response):
-        if response.context.get('validate_content', False) and response.http_response.headers.get('content-md5'):
-            computed_md5 = request.context.get('validate_content_md5') or \
-                encode_base64(StorageContentValidation.get_content_md5(response.http_response.body()))
-            if response.http_response.headers['content-md5'] != computed_md5:
-                raise AzureError(
-                    'MD5 mismatch. Expected value is \'{0}\', computed value is \'{1}\'.'.format(
-                        response.http_response.headers['content-md5'], computed_md5),
-                    response=response.http_response
-                )
+        algorithm = response.context.get('validate_content')
+        if not algorithm:
+            return
+        checksum = request.context.get('validate_content_checksum')
+        if checksum is None:
+            if response.context.options.get('stream', False):
+                # Streamed downloads are checked by the downloaders, as the body is consumed
+                return
+            checksum = compute_checksum(response.http_response.body(), algorithm)
+        checksum.check(response.http_response.headers, response=response.http_response)
 
 
 class StorageRetryPolicy(HTTPPolicy):
@@ -0,0 +1,189 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+
+import errno
+import os
+import threading
+import time
+from concurrent import futures
+
+from azure.core.exceptions import AzureError, HttpResponseError
+from azure.core.tracing.common import with_current_context
+
+_MB = 1024 * 1024
+_RETRY_BACKOFF = 1.0
+
+
+class FileTransfer(object):
+    """The transfer of a single file, part of a directory transfer.
+
+    :ivar str name: The name of the blob, or the path of the file, in the service.
+    :ivar str path: The path of the local file.
+    :ivar int size: The size of the file, in bytes.
+    :ivar int attempts: The number of attempts made.
+    :ivar float elapsed: The duration of the last attempt, in seconds.
+    :ivar Exception error: The error of the last attempt, or None if the transfer succeeded.
+    """
+
+    def __init__(self, name, path, size=None):
+        self.name = name
+        self.path = path
+        self.size = size
+        self.attempts = 0
+        self.elapsed = 0.0
+        self.error = None
+
+    def __repr__(self):
+        return "FileTransfer(name={}, size={}, attempts={}, error={!r})".format(
+            self.name, self.size, self.attempts, self.error)
+
+
+class DirectoryTransferReport(object):
+    """Summary of a directory transfer.
+
+    :ivar list succeeded: The :class:`FileTransfer` of the files transferred.
+    :ivar list failed: The :class:`FileTransfer` of the files that could not be transferred.
+    :ivar int bytes_transferred: The number of bytes of the files transferred.
+    :ivar float elapsed: The duration of the transfer, in seconds.
+    :ivar float throughput: The achieved throughput, in MB/s.
+    """
+
+    def __init__(self, succeeded, failed, elapsed):
+        self.succeeded = succeeded
+        self.failed = failed
+        self.bytes_transferred = sum(transfer.size or 0 for transfer in succeeded)
+        self.elapsed = elapsed
+        self.throughput = self.bytes_transferred / elapsed / _MB if elapsed else 0.0
+
+    def __repr__(self):
+        return "DirectoryTransferReport(succeeded={}, failed={}, bytes_transferred={}, throughput={:.2f} MB/s)".format(
+            len(self.succeeded), len(self.failed), self.bytes_transferred, self.throughput)
+
+
+def is_retryable(error):
+    """Whether a failed file transfer may succeed if started over.
+
+    Requests are already retried by the pipeline: this covers the errors left, like connections
+    dropped while streaming, but not the errors of the request itself (4xx status codes).
+    """
+    if isinstance(error, HttpResponseError) and error.status_code is not None:
+        return error.status_code >= 500 or error.status_code in (408, 429)
+    return isinstance(error, (AzureError, EnvironmentError))
+
+
+def walk_local_files(source, prefix=""):
+    """Yield a :class:`FileTransfer` for each file under a local directory.
+
+    The names are the paths relative to the directory, with '/' separators, after the prefix.
+    """
+    for root, dirs, files in os.walk(source):
+        dirs.sort()
+        relative = os.path.relpath(root, source)
+        parts = [] if relative == os.curdir else relative.split(os.sep)
+        for file_name in sorted(files):
+            path = os.path.join(root, file_name)
+            yield FileTransfer(prefix + "/".join(parts + [file_name]), path, os.path.getsize(path))
+
+
+def local_path(destination, name):
+    """The local path of a file downloaded into a directory, creating its parent directories.
+
+    :raises ValueError: If the name would escape the directory.
+    """
+    parts = [part for part in name.split("/") if part]
+    if not parts or any(part in (os.curdir, os.pardir) for part in parts):
+        raise ValueError("Cannot download {!r} into a local directory.".format(name))
+    path = os.path.join(destination, *parts)
+    try:
+        os.makedirs(os.path.dirname(path))
+    except OSError as error:
+        if error.errno != errno.EEXIST:
+            raise
+    return path
+
+
+class TransferManagerBase(object):
+    """Run the transfers of many files, with bounded pools of threads.
+
+    Up to `max_file_concurrency` files are in progress at once, each started by a thread of
+    its own, while the chunks of all of them are scheduled on a single pool of
+    `max_concurrency` threads, instead of a pool per file.
+    """
+
+    def __init__(self, max_concurrency=8, max_file_concurrency=8, max_retries=2, progress_hook=None):
+        if max_concurrency < 1 or max_file_concurrency < 1:
+            raise ValueError("max_concurrency and max_file_concurrency must be greater than 0.")
+        self._max_concurrency = max_concurrency
+        self._max_file_concurrency = max_file_concurrency
+        self._max_retries = max_retries
+        self._progress_hook = progress_hook
+        self._executor = futures.ThreadPoolExecutor(max_concurrency) if max_concurrency > 1 else None
+        self._file_executor = futures.ThreadPoolExecutor(max_file_concurrency) if max_file_concurrency > 1 else None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def close(self):
+        """Stop the threads of the pools, once the transfers in progress are complete."""
+        for executor in (self._file_executor, self._executor):
+            if executor is not None:
+                executor.shutdown()
+
+    def _transfer_options(self):
+        # The keywords given to the client operations, to run their chunks on the shared pool
+        if self._executor is None:
+            return {'max_concurrency': 1}
+        return {'max_concurrency': self._max_concurrency, 'executor': self._executor}
+
+    def _transfer(self, transfer, transfer_file):
+        while True:
+            transfer.attempts += 1
+            transfer.error = None
+            started = time.time()
+            try:
+                transfer_file(transfer)
+            except Exception as error:  # pylint: disable=broad-except
+                transfer.error = error
+            transfer.elapsed = time.time() - started
+            if transfer.error is None or transfer.attempts > self._max_retries or not is_retryable(transfer.error):
+                break
+            time.sleep(_RETRY_BACKOFF * 2 ** (transfer.attempts - 1))
+        if self._progress_hook:
+            self._progress_hook(transfer)
+        return transfer
+
+    def _run(self, items, transfer_file, describe=None):
+        """Transfer files, and report on them.
+
+        :param items: The files to transfer, as an iterable.
+        :param transfer_file: A callable transferring a single file.
+        :param describe:
+            A callable returning the :class:`FileTransfer` of an item, or None to skip it.
+            By default, the items are :class:`FileTransfer`.
+        :rtype: DirectoryTransferReport
+        """
+        started = time.time()
+        transfers = (describe(item) for item in items) if describe else items
+        transfers = (transfer for transfer in transfers if transfer is not None)
+        if self._file_executor is None:
+            done = [self._transfer(transfer, transfer_file) for transfer in transfers]
+        else:
+            # Only list the files as they can be started
+            slots = threading.BoundedSemaphore(self._max_file_concurrency)
+            running = []
+            for transfer in transfers:
+                slots.acquire()
+                future = self._file_executor.submit(with_current_context(self._transfer), transfer, transfer_file)
+                future.add_done_callback(lambda _: slots.release())
+                running.append(future)
+            done = [future.result() for future in running]
+        return DirectoryTransferReport(
+            succeeded=[transfer for transfer in done if transfer.error is None],
+            failed=[transfer for transfer in done if transfer.error is not None],
+            elapsed=time.time() - started)
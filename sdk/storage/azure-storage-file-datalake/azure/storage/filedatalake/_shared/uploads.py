@@ -5,11 +5,15 @@
 # --------------------------------------------------------------------------
 # pylint: disable=no-self-use
 
+import mmap
+import os
+import stat
+import time
 from concurrent import futures
-from io import (BytesIO, IOBase, SEEK_CUR, SEEK_END, SEEK_SET, UnsupportedOperation)
+from contextlib import contextmanager
+from io import (BytesIO, IOBase, TextIOBase, SEEK_CUR, SEEK_END, SEEK_SET, UnsupportedOperation)
 from threading import Lock
 from itertools import islice
-from math import ceil
 
 import six
 
@@ -19,24 +23,190 @@ from . import encode_base64, url_quote
 from .request_handlers import get_length
 from .response_handlers import return_response_headers
 from .encryption import get_blob_encryptor_and_padder
+from .tuning import start_tuner
 
 
 _LARGE_BLOB_UPLOAD_MAX_READ_BUFFER_SIZE = 4 * 1024 * 1024
 _ERROR_VALUE_SHOULD_BE_SEEKABLE_STREAM = "{0} should be a seekable file-like/io.IOBase type stream object."
+_CHUNK_BUFFER_POOL_MAX_SIZE = 128 * 1024 * 1024
+_PAGE_SIZE = 512
+_ZERO_BLOCK = b"\x00" * (64 * 1024)
 
 
-def _parallel_uploads(executor, uploader, pending, running):
+class _BufferPool(object):
+    """Reusable bytearrays, shared by all the uploads of the process.
+
+    :param int max_size: Total size of the buffers kept for reuse, in bytes.
+    """
+
+    def __init__(self, max_size):
+        self._max_size = max_size
+        self._size = 0
+        self._buffers = []
+        self._lock = Lock()
+
+    def acquire(self, size):
+        with self._lock:
+            for i, buffer in enumerate(self._buffers):
+                if len(buffer) >= size:
+                    self._size -= len(buffer)
+                    return self._buffers.pop(i)
+        return bytearray(size)
+
+    def release(self, buffer):
+        with self._lock:
+            if self._size + len(buffer) <= self._max_size:
+                self._size += len(buffer)
+                self._buffers.append(buffer)
+
+
+_CHUNK_BUFFER_POOL = _BufferPool(_CHUNK_BUFFER_POOL_MAX_SIZE)
+
+
+def non_empty_page_runs(data, page_size=_PAGE_SIZE, min_gap=len(_ZERO_BLOCK)):
+    """Find the runs of pages of a chunk holding any non-zero byte.
+
+    The chunk is compared with a block of zeros a slice at a time, which runs at memory
+    speed, and only the blocks that are not empty are compared a page at a time. The runs
+    separated by less than min_gap empty bytes are merged, rather than uploaded separately.
+
+    :returns: The (start, end) offsets of the runs, end excluded.
+    :rtype: list[tuple[int, int]]
+    """
+    if isinstance(data, memoryview):
+        data = data.tobytes()
+    runs = []
+    size = len(data)
+    zero_page = _ZERO_BLOCK[:page_size]
+    block_size = len(_ZERO_BLOCK) - len(_ZERO_BLOCK) % page_size
+    for block_start in range(0, size, block_size):
+        block_end = min(block_start + block_size, size)
+        if data[block_start:block_end] == _ZERO_BLOCK[:block_end - block_start]:
+            continue
+        if data.find(zero_page, block_start, block_end) == -1:
+            # Not even page_size consecutive zeros, so no empty page in the block
+            pages = [(block_start, block_end)]
+        else:
+            pages = [(start, min(start + page_size, block_end)) for start in range(block_start, block_end, page_size)]
+        for page_start, page_end in pages:
+            if data[page_start:page_end] == _ZERO_BLOCK[:page_end - page_start]:
+                continue
+            if runs and page_start - runs[-1][1] < min_gap:
+                runs[-1] = (runs[-1][0], page_end)
+            else:
+                runs.append((page_start, page_end))
+    return runs
+
+
+def _read_bytes(stream, size):
+    data = stream.read(size)
+    if not isinstance(data, six.binary_type):
+        raise TypeError("Blob data should be of type bytes.")
+    return data
+
+
+def read_chunk(stream, size):
+    """Read up to size bytes from a stream, stopping early only at the end of the stream.
+
+    If the first read returns the whole chunk, it is returned as is. Otherwise (pipes, sockets,
+    generators...) the chunk is assembled in a pooled buffer, with readinto if the stream
+    supports it, and returned as a PooledChunkStream. Closing it gives the buffer back.
+    """
+    data = _read_bytes(stream, size)
+    if not data or len(data) >= size:
+        return data
+
+    buffer = _CHUNK_BUFFER_POOL.acquire(size)
+    view = memoryview(buffer)
+    count = len(data)
+    view[:count] = data
+    readinto = getattr(stream, 'readinto', None)
+    while count < size:
+        try:
+            read = readinto(view[count:size]) if readinto else None
+        except UnsupportedOperation:
+            readinto = None
+            read = None
+        if read is None:
+            data = _read_bytes(stream, size - count)
+            read = len(data)
+            view[count:count + read] = data
+        if not read:
+            break
+        count += read
+    return PooledChunkStream(buffer, count)
+
+
+def chunk_buffer(chunk_data):
+    """The bytes-like data of a chunk, read from the buffer of a PooledChunkStream."""
+    if isinstance(chunk_data, PooledChunkStream):
+        return chunk_data.getbuffer()
+    return chunk_data
+
+
+def chunk_range(data, start, end):
+    """Slice the data of a chunk, as a stream over the slice if the data is a memoryview."""
+    if isinstance(data, memoryview):
+        return MemoryViewStream(data[start:end])
+    return data[start:end]
+
+
+def _mmap_stream(stream):
+    if isinstance(stream, TextIOBase):
+        return None, None
+    try:
+        fileno = stream.fileno()
+        if not stat.S_ISREG(os.fstat(fileno).st_mode):
+            return None, None
+        mapped = mmap.mmap(fileno, 0, access=mmap.ACCESS_READ)
+    except (AttributeError, UnsupportedOperation, EnvironmentError, ValueError):
+        # Not a file, an empty file, or a file that cannot be mapped
+        return None, None
+    try:
+        return mapped, memoryview(mapped)
+    except TypeError:
+        # Python 2.7 mmap does not support memoryview
+        mapped.close()
+        return None, None
+
+
+@contextmanager
+def map_stream(stream):
+    """Memory-map a regular file opened in binary mode, for read-only access.
+
+    Yields a memoryview of the file data from the current position of the stream, or
+    None if the stream cannot be mapped (pipes, sockets, in-memory streams...).
+    """
+    mapped, view = _mmap_stream(stream)
+    if mapped is None:
+        yield None
+        return
+    data_view = view[stream.tell():]
+    try:
+        yield data_view
+    finally:
+        data_view.release()
+        view.release()
+        try:
+            mapped.close()
+        except BufferError:
+            # Some block streams are still referenced (failed upload), let the GC unmap the file
+            pass
+
+
+def _parallel_uploads(executor, uploader, pending, running, tuner=None):
     range_ids = []
     while True:
         # Wait for some download to finish before adding a new one
         done, running = futures.wait(running, return_when=futures.FIRST_COMPLETED)
         range_ids.extend([chunk.result() for chunk in done])
+        # An autotuned upload adjusts the number of uploads in flight as it goes
+        in_flight = tuner.concurrency if tuner else len(running) + 1
         try:
-            next_chunk = next(pending)
+            while len(running) < in_flight:
+                running.add(executor.submit(with_current_context(uploader), next(pending)))
         except StopIteration:
             break
-        else:
-            running.add(executor.submit(with_current_context(uploader), next_chunk))
 
     # Wait for the remaining uploads to finish
     done, _running = futures.wait(running)
@@ -53,6 +223,8 @@ def upload_data_chunks(
         stream=None,
         validate_content=None,
         encryption_options=None,
+        tuner=None,
+        executor=None,
         **kwargs):
 
     if encryption_options:
@@ -63,7 +235,8 @@ def upload_data_chunks(
         kwargs['encryptor'] = encryptor
         kwargs['padder'] = padder
 
-    parallel = max_concurrency > 1
+    max_workers = start_tuner(tuner, chunk_size, max_concurrency)
+    parallel = max_workers > 1
     if parallel and 'modified_access_conditions' in kwargs:
         # Access conditions do not work with parallelism
         kwargs['modified_access_conditions'] = None
@@ -75,19 +248,22 @@ def upload_data_chunks(
         stream=stream,
         parallel=parallel,
         validate_content=validate_content,
+        tuner=tuner,
         **kwargs)
     if parallel:
-        executor = futures.ThreadPoolExecutor(max_concurrency)
+        # A shared executor bounds the requests in flight across transfers
+        executor = executor or futures.ThreadPoolExecutor(max_workers)
         upload_tasks = uploader.get_chunk_streams()
         running_futures = [
             executor.submit(with_current_context(uploader.process_chunk), u)
-            for u in islice(upload_tasks, 0, max_concurrency)
+            for u in islice(upload_tasks, 0, tuner.concurrency if tuner else max_concurrency)
         ]
-        range_ids = _parallel_uploads(executor, uploader.process_chunk, upload_tasks, running_futures)
+        range_ids = _parallel_uploads(executor, uploader.process_chunk, upload_tasks, running_futures, tuner)
     else:
         range_ids = [uploader.process_chunk(result) for result in uploader.get_chunk_streams()]
     if any(range_ids):
-        return [r[1] for r in sorted(range_ids, key=lambda r: r[0])]
+        # The chunks left empty have no range ID
+        return [r[1] for r in sorted((r for r in range_ids if r), key=lambda r: r[0])]
     return uploader.response_headers
 
 
@@ -98,39 +274,49 @@ def upload_substream_blocks(
         chunk_size=None,
         max_concurrency=None,
         stream=None,
+        tuner=None,
+        executor=None,
         **kwargs):
-    parallel = max_concurrency > 1
+    max_workers = start_tuner(tuner, chunk_size, max_concurrency)
+    parallel = max_workers > 1
     if parallel and 'modified_access_conditions' in kwargs:
         # Access conditions do not work with parallelism
         kwargs['modified_access_conditions'] = None
-    uploader = uploader_class(
-        service=service,
-        total_size=total_size,
-        chunk_size=chunk_size,
-        stream=stream,
-        parallel=parallel,
-        **kwargs)
-
-    if parallel:
-        executor = futures.ThreadPoolExecutor(max_concurrency)
-        upload_tasks = uploader.get_substream_blocks()
-        running_futures = [
-            executor.submit(with_current_context(uploader.process_substream_block), u)
-            for u in islice(upload_tasks, 0, max_concurrency)
-        ]
-        range_ids = _parallel_uploads(executor, uploader.process_substream_block, upload_tasks, running_futures)
-    else:
-        range_ids = [uploader.process_substream_block(b) for b in uploader.get_substream_blocks()]
+    with map_stream(stream) as stream_view:
+        uploader = uploader_class(
+            service=service,
+            total_size=total_size,
+            chunk_size=chunk_size,
+            stream=stream,
+            parallel=parallel,
+            stream_view=stream_view,
+            tuner=tuner,
+            **kwargs)
+
+        if parallel:
+            executor = executor or futures.ThreadPoolExecutor(max_workers)
+            upload_tasks = uploader.get_substream_blocks()
+            running_futures = [
+                executor.submit(with_current_context(uploader.process_substream_block), u)
+                for u in islice(upload_tasks, 0, tuner.concurrency if tuner else max_concurrency)
+            ]
+            range_ids = _parallel_uploads(
+                executor, uploader.process_substream_block, upload_tasks, running_futures, tuner)
+        else:
+            range_ids = [uploader.process_substream_block(b) for b in uploader.get_substream_blocks()]
     return sorted(range_ids)
 
 
 class _ChunkUploader(object):  # pylint: disable=too-many-instance-attributes
 
-    def __init__(self, service, total_size, chunk_size, stream, parallel, encryptor=None, padder=None, **kwargs):
+    def __init__(self, service, total_size, chunk_size, stream, parallel, encryptor=None, padder=None,
+                 stream_view=None, tuner=None, **kwargs):
         self.service = service
         self.total_size = total_size
         self.chunk_size = chunk_size
+        self.tuner = tuner
         self.stream = stream
+        self.stream_view = stream_view
         self.parallel = parallel
 
         # Stream management
@@ -152,43 +338,54 @@ class _ChunkUploader(object):  # pylint: disable=too-many-instance-attributes
     def get_chunk_streams(self):
         index = 0
         while True:
-            data = b""
-            read_size = self.chunk_size
+            chunk_size = self._next_chunk_size()
+            read_size = chunk_size
+            if self.total_size:
+                read_size = min(chunk_size, self.total_size - index)
 
             # Buffer until we either reach the end of the stream or get a whole chunk.
-            while True:
-                if self.total_size:
-                    read_size = min(self.chunk_size - len(data), self.total_size - (index + len(data)))
-                temp = self.stream.read(read_size)
-                if not isinstance(temp, six.binary_type):
-                    raise TypeError("Blob data should be of type bytes.")
-                data += temp or b""
-
-                # We have read an empty string and so are at the end
-                # of the buffer or we have read a full chunk.
-                if temp == b"" or len(data) == self.chunk_size:
-                    break
-
-            if len(data) == self.chunk_size:
-                if self.padder:
-                    data = self.padder.update(data)
-                if self.encryptor:
-                    data = self.encryptor.update(data)
+            data = read_chunk(self.stream, read_size)
+            is_last_chunk = len(data) != chunk_size
+            if self.padder or self.encryptor:
+                data = self._encrypt_chunk(data, is_last_chunk)
+
+            if data:
                 yield index, data
-            else:
-                if self.padder:
-                    data = self.padder.update(data) + self.padder.finalize()
-                if self.encryptor:
-                    data = self.encryptor.update(data) + self.encryptor.finalize()
-                if data:
-                    yield index, data
+            if is_last_chunk:
                 break
             index += len(data)
 
+    def _encrypt_chunk(self, chunk, is_last_chunk):
+        data = chunk_buffer(chunk)
+        if self.padder:
+            data = self.padder.update(data)
+            if is_last_chunk:
+                data += self.padder.finalize()
+        if self.encryptor:
+            data = self.encryptor.update(data)
+            if is_last_chunk:
+                data += self.encryptor.finalize()
+        if isinstance(chunk, PooledChunkStream):
+            chunk.close()
+        return data
+
+    def _next_chunk_size(self):
+        if self.tuner is not None:
+            return self.tuner.chunk_size
+        return self.chunk_size
+
+    def _record_chunk(self, length, started):
+        if self.tuner is not None:
+            self.tuner.record(length, time.time() - started)
+
     def process_chunk(self, chunk_data):
         chunk_bytes = chunk_data[1]
         chunk_offset = chunk_data[0]
-        return self._upload_chunk_with_progress(chunk_offset, chunk_bytes)
+        try:
+            return self._upload_chunk_with_progress(chunk_offset, chunk_bytes)
+        finally:
+            if isinstance(chunk_bytes, PooledChunkStream):
+                chunk_bytes.close()
 
     def _update_progress(self, length):
         if self.progress_lock is not None:
@@ -201,7 +398,9 @@ class _ChunkUploader(object):  # pylint: disable=too-many-instance-attributes
         raise NotImplementedError("Must be implemented by child class.")
 
     def _upload_chunk_with_progress(self, chunk_offset, chunk_data):
+        started = time.time()
         range_id = self._upload_chunk(chunk_offset, chunk_data)
+        self._record_chunk(len(chunk_data), started)
         self._update_progress(len(chunk_data))
         return range_id
 
@@ -215,13 +414,22 @@ class _ChunkUploader(object):  # pylint: disable=too-many-instance-attributes
             if blob_length is None:
                 raise ValueError("Unable to determine content length of upload data.")
 
-        blocks = int(ceil(blob_length / (self.chunk_size * 1.0)))
-        last_block_size = self.chunk_size if blob_length % self.chunk_size == 0 else blob_length % self.chunk_size
+        # Memory-mapped files are sliced without copy nor lock
+        stream_view = self.stream_view
+        if stream_view is not None and len(stream_view) < blob_length:
+            stream_view = None
 
-        for i in range(blocks):
-            index = i * self.chunk_size
-            length = last_block_size if i == blocks - 1 else self.chunk_size
-            yield ('BlockId{}'.format("%05d" % i), SubStream(self.stream, index, length, lock))
+        index = 0
+        block_index = 0
+        while index < blob_length:
+            length = min(self._next_chunk_size(), blob_length - index)
+            if stream_view is not None:
+                block_stream = MemoryViewStream(stream_view[index:index + length])
+            else:
+                block_stream = SubStream(self.stream, index, length, lock)
+            yield ('BlockId{}'.format("%05d" % block_index), block_stream)
+            index += length
+            block_index += 1
 
     def process_substream_block(self, block_data):
         return self._upload_substream_block_with_progress(block_data[0], block_data[1])
@@ -230,8 +438,11 @@ class _ChunkUploader(object):  # pylint: disable=too-many-instance-attributes
         raise NotImplementedError("Must be implemented by child class.")
 
     def _upload_substream_block_with_progress(self, block_id, block_stream):
+        length = len(block_stream)
+        started = time.time()
         range_id = self._upload_substream_block(block_id, block_stream)
-        self._update_progress(len(block_stream))
+        self._record_chunk(length, started)
+        self._update_progress(length)
         return range_id
 
     def set_response_properties(self, resp):
@@ -278,19 +489,18 @@ class BlockBlobChunkUploader(_ChunkUploader):
 class PageBlobChunkUploader(_ChunkUploader):  # pylint: disable=abstract-method
 
     def _is_chunk_empty(self, chunk_data):
-        # read until non-zero byte is encountered
-        # if reached the end without returning, then chunk_data is all 0's
-        return not any(bytearray(chunk_data))
+        return not non_empty_page_runs(chunk_buffer(chunk_data))
 
     def _upload_chunk(self, chunk_offset, chunk_data):
         # avoid uploading the empty pages
-        if not self._is_chunk_empty(chunk_data):
-            chunk_end = chunk_offset + len(chunk_data) - 1
-            content_range = "bytes={0}-{1}".format(chunk_offset, chunk_end)
+        data = chunk_buffer(chunk_data)
+        for run_start, run_end in non_empty_page_runs(data):
+            run_data = chunk_range(data, run_start, run_end)
+            content_range = "bytes={0}-{1}".format(chunk_offset + run_start, chunk_offset + run_end - 1)
             computed_md5 = None
             self.response_headers = self.service.upload_pages(
-                chunk_data,
-                content_length=len(chunk_data),
+                run_data,
+                content_length=len(run_data),
                 transactional_content_md5=computed_md5,
                 range=content_range,
                 cls=return_response_headers,
@@ -353,18 +563,29 @@ class DataLakeFileChunkUploader(_ChunkUploader):  # pylint: disable=abstract-met
 
 class FileChunkUploader(_ChunkUploader):  # pylint: disable=abstract-method
 
+    def __init__(self, *args, **kwargs):
+        self.sparse = kwargs.pop('sparse', False)
+        super(FileChunkUploader, self).__init__(*args, **kwargs)
+
     def _upload_chunk(self, chunk_offset, chunk_data):
-        length = len(chunk_data)
-        chunk_end = chunk_offset + length - 1
-        response = self.service.upload_range(
-            chunk_data,
-            chunk_offset,
-            length,
-            data_stream_total=self.total_size,
-            upload_stream_current=self.progress_total,
-            **self.request_options
-        )
-        return 'bytes={0}-{1}'.format(chunk_offset, chunk_end), response
+        # The file is created filled with zeros, so when sparse only the runs holding data are
+        # uploaded, and the empty ranges are left without storage
+        data = chunk_buffer(chunk_data)
+        runs = non_empty_page_runs(data) if self.sparse else [(0, len(data))]
+        response = None
+        for run_start, run_end in runs:
+            run_data = chunk_range(data, run_start, run_end)
+            response = self.service.upload_range(
+                run_data,
+                chunk_offset + run_start,
+                len(run_data),
+                data_stream_total=self.total_size,
+                upload_stream_current=self.progress_total,
+                **self.request_options
+            )
+        if response is None:
+            return None
+        return 'bytes={0}-{1}'.format(chunk_offset, chunk_offset + len(chunk_data) - 1), response
 
 
 class SubStream(IOBase):
@@ -518,6 +739,86 @@ class SubStream(IOBase):
         return False
 
 
+class MemoryViewStream(IOBase):
+    """Read-only, seekable stream over a bytes-like object, without copy.
+
+    Closing the stream releases the view.
+    """
+
+    def __init__(self, view):
+        self._view = memoryview(view)
+        self._length = len(self._view)
+        self._position = 0
+        super(MemoryViewStream, self).__init__()
+
+    def __len__(self):
+        return self._length
+
+    def close(self):
+        if not self.closed:  # pylint: disable=using-constant-test
+            self._view.release()
+        IOBase.close(self)
+
+    def getbuffer(self):
+        """The view of the data, valid until the stream is closed."""
+        return self._view
+
+    def read(self, size=None):
+        if self.closed:  # pylint: disable=using-constant-test
+            raise ValueError("Stream is closed.")
+        end = self._length if size is None or size < 0 else min(self._position + size, self._length)
+        data = self._view[self._position:end].tobytes()
+        self._position += len(data)
+        return data
+
+    def readable(self):
+        return True
+
+    def readinto(self, b):
+        if self.closed:  # pylint: disable=using-constant-test
+            raise ValueError("Stream is closed.")
+        count = min(len(b), self._length - self._position)
+        memoryview(b)[:count] = self._view[self._position:self._position + count]
+        self._position += count
+        return count
+
+    def seek(self, offset, whence=0):
+        if whence == SEEK_SET:
+            pos = offset
+        elif whence == SEEK_CUR:
+            pos = self._position + offset
+        elif whence == SEEK_END:
+            pos = self._length + offset
+        else:
+            raise ValueError("Invalid argument for the 'whence' parameter.")
+        self._position = max(0, min(pos, self._length))
+        return self._position
+
+    def seekable(self):
+        return True
+
+    def tell(self):
+        return self._position
+
+
+class PooledChunkStream(MemoryViewStream):
+    """A chunk assembled in a buffer of the pool, given back to the pool when the stream is closed.
+
+    The chunk is uploaded from the buffer, without copy: close the stream only once its
+    upload is done.
+    """
+
+    def __init__(self, buffer, length):
+        super(PooledChunkStream, self).__init__(memoryview(buffer)[:length])
+        self._buffer = buffer
+
+    def close(self):
+        if not self.closed:  # pylint: disable=using-constant-test
+            super(PooledChunkStream, self).close()
+            _CHUNK_BUFFER_POOL.release(self._buffer)
+            self._buffer = None
+
+
 class IterStreamer(object):
     """
     File-like streaming iterator.
@@ -548,19 +849,18 @@ class IterStreamer(object):
         raise UnsupportedOperation("Data generator is unseekable.")
 
     def read(self, size):
-        data = self.leftover
+        chunks = [self.leftover]
         count = len(self.leftover)
         try:
             while count < size:
                 chunk = self.next()
                 if isinstance(chunk, six.text_type):
                     chunk = chunk.encode(self.encoding)
-                data += chunk
+                chunks.append(chunk)
                 count += len(chunk)
         except StopIteration:
             pass
 
-        if count > size:
-            self.leftover = data[size:]
-
+        data = b"".join(chunks)
+        self.leftover = data[size:]
         return data[:size]
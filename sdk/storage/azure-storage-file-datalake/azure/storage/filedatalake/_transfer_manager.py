@@ -0,0 +1,112 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+
+from typing import (  # pylint: disable=unused-import
+    Optional, Any, Callable, TypeVar, TYPE_CHECKING
+)
+
+from ._shared.transfers import FileTransfer, TransferManagerBase, local_path, walk_local_files
+
+if TYPE_CHECKING:
+    from ._shared.transfers import DirectoryTransferReport
+    FileSystemClient = TypeVar("FileSystemClient")
+
+
+class DataLakeTransferManager(TransferManagerBase):
+    """Upload and download directory trees to and from a file system.
+
+    Up to `max_file_concurrency` files are transferred in parallel, and the chunks of large
+    files are scheduled on a single pool of `max_concurrency` threads, shared by all the
+    files instead of a pool per file. A file whose transfer fails with an error that the
+    pipeline does not retry, like a connection dropped while streaming, is transferred again.
+
+    :param file_system_client: The client of the file system.
+    :type file_system_client: ~azure.storage.filedatalake.FileSystemClient
+    :param int max_concurrency:
+        The largest number of chunk requests in flight, across all the files.
+        Defaults to 8.
+    :param int max_file_concurrency: The largest number of files in progress. Defaults to 8.
+    :param int max_retries:
+        The number of times the transfer of a file is started over after an error.
+        Defaults to 2.
+    :param callable progress_hook:
+        A callback called with the :class:`~azure.storage.filedatalake.FileTransfer` of each file,
+        once it is transferred or failed.
+    """
+
+    def __init__(
+            self, file_system_client,  # type: FileSystemClient
+            max_concurrency=8,  # type: int
+            max_file_concurrency=8,  # type: int
+            max_retries=2,  # type: int
+            progress_hook=None  # type: Optional[Callable[[FileTransfer], None]]
+        ):
+        # type: (...) -> None
+        super(DataLakeTransferManager, self).__init__(
+            max_concurrency=max_concurrency,
+            max_file_concurrency=max_file_concurrency,
+            max_retries=max_retries,
+            progress_hook=progress_hook)
+        self.file_system_client = file_system_client
+
+    def upload_directory(self, source, path=None, **kwargs):
+        # type: (str, Optional[str], **Any) -> DirectoryTransferReport
+        """Upload the files under a local directory to files of the file system.
+
+        The directories of the files are created by the service as the files are created.
+
+        :param str source: The path of the local directory.
+        :param str path:
+            The directory to upload into, e.g. "backups/2020". By default, the files
+            are uploaded to the root of the file system.
+        :keyword bool overwrite: Whether the files to upload should overwrite the current data.
+        :keyword ~azure.storage.filedatalake.ContentSettings content_settings:
+            The ContentSettings of the files.
+        :keyword int timeout:
+            The timeout parameter is expressed in seconds.
+        :returns: The report of the transfer, listing the files transferred and failed.
+        :rtype: ~azure.storage.filedatalake.DirectoryTransferReport
+        """
+        kwargs.update(self._transfer_options())
+        prefix = path.strip("/") + "/" if path and path.strip("/") else ""
+
+        def upload(transfer):
+            with open(transfer.path, "rb") as data:
+                self.file_system_client.get_file_client(transfer.name).upload_data(
+                    data, length=transfer.size, **kwargs)
+
+        return self._run(walk_local_files(source, prefix), upload)
+
+    def download_directory(self, destination, path=None, **kwargs):
+        # type: (str, Optional[str], **Any) -> DirectoryTransferReport
+        """Download the files under a directory of the file system into a local directory.
+
+        :param str destination: The path of the local directory.
+        :param str path:
+            The directory to download, e.g. "backups/2020". A file is downloaded to its
+            path relative to the directory, under the local directory. By default, the
+            whole file system is downloaded.
+        :keyword int timeout:
+            The timeout parameter is expressed in seconds.
+        :returns: The report of the transfer, listing the files transferred and failed.
+        :rtype: ~azure.storage.filedatalake.DirectoryTransferReport
+        """
+        timeout = kwargs.get('timeout')
+        kwargs.update(self._transfer_options())
+        prefix = path.strip("/") + "/" if path and path.strip("/") else ""
+
+        def describe(path_properties):
+            if path_properties.is_directory:
+                return None
+            return FileTransfer(path_properties.name, None, path_properties.content_length)
+
+        def download(transfer):
+            transfer.path = local_path(destination, transfer.name[len(prefix):])
+            downloader = self.file_system_client.get_file_client(transfer.name).download_file(**kwargs)
+            downloader.download_into(transfer.path)
+
+        paths = self.file_system_client.get_paths(path=prefix.rstrip("/") or None, recursive=True, timeout=timeout)
+        return self._run(paths, download, describe)
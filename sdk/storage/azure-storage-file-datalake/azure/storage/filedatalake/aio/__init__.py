@@ -11,6 +11,9 @@ from ._data_lake_directory_client_async import DataLakeDirectoryClient
 from ._file_system_client_async import FileSystemClient
 from ._data_lake_service_client_async import DataLakeServiceClient
 from ._data_lake_lease_async import DataLakeLeaseClient
+from ._transfer_manager_async import DataLakeTransferManager
+from ._file_writer_async import DataLakeFileWriter
+from ._access_control_recursive_async import DataLakeAccessControlManager
 
 __all__ = [
     'DataLakeServiceClient',
@@ -18,6 +21,9 @@ __all__ = [
     'DataLakeDirectoryClient',
     'DataLakeFileClient',
     'DataLakeLeaseClient',
+    'DataLakeTransferManager',
+    'DataLakeFileWriter',
+    'DataLakeAccessControlManager',
     'ExponentialRetry',
     'LinearRetry',
     'StorageStreamDownloader'
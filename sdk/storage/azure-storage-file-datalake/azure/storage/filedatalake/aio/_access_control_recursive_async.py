@@ -0,0 +1,193 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+
+import asyncio
+
+from typing import (  # pylint: disable=unused-import
+    Optional, Any, List, Tuple, TYPE_CHECKING
+)
+
+from azure.core import MatchConditions
+from azure.core.exceptions import AzureError, ResourceModifiedError
+
+from .._access_control_recursive import (
+    DataLakeAccessControlManager as DataLakeAccessControlManagerBase,
+    AccessControlChangeResult,
+    _AccessControlChange,
+    _directory,
+    _MAX_CONFLICT_RETRIES,
+    SET_MODE,
+    MODIFY_MODE,
+    REMOVE_MODE
+)
+
+if TYPE_CHECKING:
+    from .._models import PathProperties
+
+
+class DataLakeAccessControlManager(DataLakeAccessControlManagerBase):
+    """Set, update or remove the access control lists of a directory tree.
+
+    The paths under the directory are listed a page at a time, and the ACL of the paths of
+    a page is changed by up to `max_concurrency` requests in flight, as tasks, while the next
+    page is listed. The changes are tracked by page: the continuation token of a result resumes
+    the change after the last page completed, so an interrupted change can be started again
+    from where it stopped. The paths that failed to change are reported in the result
+    rather than stopping the change.
+
+    Updating or removing entries reads the ACL of each path and sets it back only if it
+    changed, on the condition that the path was not changed in between.
+
+    :param file_system_client: The client of the file system.
+    :type file_system_client: ~azure.storage.filedatalake.aio.FileSystemClient
+    :param int max_concurrency: The largest number of requests in flight. Defaults to 8.
+    :param int batch_size:
+        The number of paths listed per page, up to 5000, the default. It is the number of
+        paths changed again when a change is resumed.
+    :param callable progress_hook:
+        A callback called with the :class:`~azure.storage.filedatalake.AccessControlChangeResult`
+        of the change after each page, whose continuation token can be saved to resume it.
+    """
+
+    async def set_access_control_recursive(self, acl, path=None, **kwargs):  # pylint: disable=invalid-overridden-method
+        # type: (str, Optional[str], **Any) -> AccessControlChangeResult
+        """Set the access control list of a directory and of all the paths under it.
+
+        The default entries of the ACL are not set on the files.
+
+        :param str acl:
+            The ACL, a comma-separated list of access control entries in the format
+            "[scope:][type]:[id]:[permissions]".
+        :param str path: The directory, e.g. "data/2020". Defaults to the root directory.
+        :keyword str continuation_token:
+            The continuation token of the result of a change stopped before its end, to resume it.
+        :keyword int max_batches:
+            The largest number of pages of paths to change, after which the change stops
+            and returns a continuation token. By default, all the paths are changed.
+        :keyword int timeout:
+            The timeout parameter is expressed in seconds, for each request.
+        :returns: The number of paths changed, the failures and the continuation token.
+        :rtype: ~azure.storage.filedatalake.AccessControlChangeResult
+        """
+        return await self._change(_AccessControlChange(SET_MODE, acl), path, **kwargs)
+
+    async def update_access_control_recursive(self, acl, path=None, **kwargs):  # pylint: disable=invalid-overridden-method
+        # type: (str, Optional[str], **Any) -> AccessControlChangeResult
+        """Add or replace entries of the access control lists of a directory and of all the paths under it.
+
+        An entry replaces the entry of the same scope, type and id, and the other entries are kept.
+        The default entries are not added to the files.
+
+        :param str acl:
+            The entries to add or replace, a comma-separated list of access control entries
+            in the format "[scope:][type]:[id]:[permissions]".
+        :param str path: The directory, e.g. "data/2020". Defaults to the root directory.
+        :keyword str continuation_token:
+            The continuation token of the result of a change stopped before its end, to resume it.
+        :keyword int max_batches:
+            The largest number of pages of paths to change, after which the change stops
+            and returns a continuation token. By default, all the paths are changed.
+        :keyword int timeout:
+            The timeout parameter is expressed in seconds, for each request.
+        :returns: The number of paths changed, the failures and the continuation token.
+        :rtype: ~azure.storage.filedatalake.AccessControlChangeResult
+        """
+        return await self._change(_AccessControlChange(MODIFY_MODE, acl), path, **kwargs)
+
+    async def remove_access_control_recursive(self, acl, path=None, **kwargs):  # pylint: disable=invalid-overridden-method
+        # type: (str, Optional[str], **Any) -> AccessControlChangeResult
+        """Remove entries from the access control lists of a directory and of all the paths under it.
+
+        :param str acl:
+            The entries to remove, a comma-separated list of access control entries without
+            permissions, in the format "[scope:][type]:[id]", e.g. "user:<id>,default:user:<id>".
+        :param str path: The directory, e.g. "data/2020". Defaults to the root directory.
+        :keyword str continuation_token:
+            The continuation token of the result of a change stopped before its end, to resume it.
+        :keyword int max_batches:
+            The largest number of pages of paths to change, after which the change stops
+            and returns a continuation token. By default, all the paths are changed.
+        :keyword int timeout:
+            The timeout parameter is expressed in seconds, for each request.
+        :returns: The number of paths changed, the failures and the continuation token.
+        :rtype: ~azure.storage.filedatalake.AccessControlChangeResult
+        """
+        return await self._change(_AccessControlChange(REMOVE_MODE, acl), path, **kwargs)
+
+    async def _change_path(self, change, path, result, **kwargs):  # pylint: disable=invalid-overridden-method
+        # type: (_AccessControlChange, PathProperties, AccessControlChangeResult, **Any) -> None
+        client = self._path_client(path)
+        try:
+            for attempt in range(_MAX_CONFLICT_RETRIES + 1):
+                if not change.applies_to(path.is_directory):
+                    break
+                conditions = {}
+                if change.needs_current:
+                    current = await client.get_access_control(**kwargs)
+                    acl = change.new_acl(path.is_directory, current.get('acl'))
+                    conditions = {'etag': current['etag'], 'match_condition': MatchConditions.IfNotModified}
+                else:
+                    acl = change.new_acl(path.is_directory)
+                if acl is not None:
+                    try:
+                        await client.set_access_control(acl=acl, **dict(kwargs, **conditions))
+                    except ResourceModifiedError:
+                        if attempt == _MAX_CONFLICT_RETRIES:
+                            raise
+                        continue
+                break
+        except AzureError as error:
+            result._add_failure(path, error)  # pylint: disable=protected-access
+            return
+        result.counters._add('directories_successful' if path.is_directory else 'files_successful')  # pylint: disable=protected-access
+
+    async def _change(self, change, path, **kwargs):  # pylint: disable=invalid-overridden-method
+        # type: (_AccessControlChange, Optional[str], **Any) -> AccessControlChangeResult
+        continuation_token = kwargs.pop('continuation_token', None)
+        max_batches = kwargs.pop('max_batches', None)
+        path = path.strip('/') if path else None
+        result = AccessControlChangeResult()
+        result.continuation = continuation_token
+        window = asyncio.Semaphore(self.max_concurrency)
+
+        async def change_path(item):
+            async with window:
+                await self._change_path(change, item, result, **kwargs)
+
+        async def finish(tasks, token):
+            await asyncio.gather(*tasks)
+            result.continuation = token
+            if self.progress_hook:
+                self.progress_hook(result)
+
+        if not continuation_token:
+            # The listing does not include the directory itself
+            await self._change_path(change, _directory(path), result, **kwargs)
+        paths = self.file_system_client.get_paths(
+            path=path, recursive=True, max_results=self.batch_size, timeout=kwargs.get('timeout'))
+        pages = paths.by_page(continuation_token=continuation_token)
+        pending = None  # type: Optional[Tuple[List[Any], Optional[str]]]
+        batches = 0
+        try:
+            async for page in pages:
+                # The next page is listed while the paths of the previous one are changed
+                page = [item async for item in page]
+                if pending:
+                    await finish(*pending)
+                tasks = [asyncio.ensure_future(change_path(item)) for item in page]
+                pending = (tasks, pages.continuation_token)
+                batches += 1
+                if max_batches and batches >= max_batches:
+                    break
+            if pending:
+                await finish(*pending)
+                pending = None
+        finally:
+            if pending:
+                for task in pending[0]:
+                    task.cancel()
+                await asyncio.gather(*pending[0], return_exceptions=True)
+        return result
@@ -32,6 +32,20 @@ class StorageStreamDownloader(object):
     def chunks(self):
         return self._downloader.chunks()
 
+    def iter_chunks(self, window=None):
+        """Iterate over chunks in the download stream, downloading the next chunks ahead.
+
+        The chunks are delivered in order, while up to `window` chunks are downloaded in
+        parallel or waiting to be consumed. If the iteration stops before the end of the
+        download, the `close()` coroutine of the iterator cancels the downloads in progress.
+
+        :param int window:
+            The number of chunks downloaded ahead. Defaults to the max_concurrency
+            of the download.
+        :rtype: AsyncIterator[bytes]
+        """
+        return self._downloader.iter_chunks(window=window)
+
     async def readall(self):
         """Download the contents of this file.
 
@@ -51,3 +65,23 @@ class StorageStreamDownloader(object):
         :rtype: int
         """
         return await self._downloader.readinto(stream)
+
+    async def download_into(self, target, checkpoint=None):
+        """Download the contents of this file straight into a buffer or a file.
+
+        Each chunk is written into its own slot of the target as it is received,
+        so parallel connections never wait on each other.
+
+        :param target:
+            A writable bytes-like object (e.g. a bytearray, or a memoryview over one) of
+            at least `size` bytes, or the path of a file. The file is created, or truncated,
+            with the size of the download and is written through a memory map.
+        :type target: bytearray or memoryview or str
+        :param str checkpoint:
+            The path of a local journal file making a download into a file resumable.
+            When the download of the same version of the file is retried with the same
+            checkpoint, the chunks already written are not downloaded again.
+        :returns: The number of bytes read.
+        :rtype: int
+        """
+        return await self._downloader.download_into(target, checkpoint=checkpoint)
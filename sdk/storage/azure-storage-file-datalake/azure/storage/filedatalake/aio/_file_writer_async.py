@@ -0,0 +1,202 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+
+import asyncio
+import time
+
+from typing import (  # pylint: disable=unused-import
+    Optional, Any, Iterable, Set, Union, TYPE_CHECKING
+)
+
+from azure.core.exceptions import ResourceNotFoundError
+
+from .._file_writer import DataLakeFileWriter as DataLakeFileWriterBase
+from .._shared.uploads import MemoryViewStream
+
+
+class DataLakeFileWriter(DataLakeFileWriterBase):
+    """A file-like writer appending to a file with many appends in flight.
+
+    The writes are copied into chunks of `chunk_size` bytes, from a pool of `max_buffers`
+    buffers, and each full chunk is appended at its offset while the next is filled, with up
+    to `max_concurrency` appends in flight as tasks. The chunks are sent from the buffers
+    without copy, and a buffer is reused once its append completes: the writes wait for a
+    free buffer, so the memory used is bounded by `max_buffers` times `chunk_size`.
+
+    The data appended is committed by :func:`flush` and :func:`close`, which wait for the appends
+    in flight and raise the error of a failed append. With `flush_size`, the data appended is also
+    committed as the writes go, every `flush_size` bytes, up to the first chunk still in flight.
+    A single writer should write to a file at a time.
+
+    :param file_client: The client of the file, which is created if it does not exist.
+    :type file_client: ~azure.storage.filedatalake.aio.DataLakeFileClient
+    :param int chunk_size: The size of the chunks appended, up to 100 MiB. Defaults to 8 MiB.
+    :param int max_concurrency: The largest number of appends in flight. Defaults to 4.
+    :param int max_buffers:
+        The number of chunk buffers, at least 1. Defaults to one more than `max_concurrency`,
+        to fill a chunk while the others are appended.
+    :param int flush_size:
+        The number of bytes appended between the commits made while writing, or None to
+        only commit on :func:`flush` and :func:`close`, the default.
+    :keyword bool overwrite:
+        Whether the file is replaced by an empty file. Otherwise the writes are appended to the
+        file, if it exists. Defaults to False.
+    :keyword ~azure.storage.filedatalake.ContentSettings content_settings:
+        The ContentSettings of the file, set by each commit.
+    :keyword lease:
+        Required if the file has an active lease. Value can be a DataLakeLeaseClient object
+        or the lease ID as a string.
+    :paramtype lease: ~azure.storage.filedatalake.aio.DataLakeLeaseClient or str
+    :keyword bool validate_content:
+        If true, calculates an MD5 hash of each chunk, checked by the service.
+    :keyword str encoding: The encoding of the text written. Defaults to UTF-8.
+    :keyword int timeout:
+        The timeout parameter is expressed in seconds, for each request.
+    """
+
+    def __init__(self, *args, **kwargs):
+        # type: (*Any, **Any) -> None
+        super(DataLakeFileWriter, self).__init__(*args, **kwargs)
+        self._tasks = set()  # type: Set[asyncio.Future]
+        self._window = None  # type: Optional[asyncio.Semaphore]
+        self._changed_event = None  # type: Optional[asyncio.Event]
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        await self.close()
+
+    def _notify(self):
+        # Wake up the coroutines waiting for a change, with an event each wait is given
+        event, self._changed_event = self._changed_event, asyncio.Event()
+        event.set()
+
+    async def _wait(self):
+        await self._changed_event.wait()
+
+    async def _open(self):  # pylint: disable=invalid-overridden-method
+        if not self._overwrite:
+            try:
+                return (await self.file_client.get_file_properties(timeout=self._timeout)).size
+            except ResourceNotFoundError:
+                pass
+        await self.file_client.create_file(content_settings=self._content_settings, **self._flush_options)
+        return 0
+
+    async def _start(self):  # pylint: disable=invalid-overridden-method
+        if self._position is None:
+            self._changed_event = asyncio.Event()
+            self._window = asyncio.Semaphore(self.max_concurrency)
+            self._position = self._appended = self._committed = await self._open()
+
+    async def _append(self, buffer, offset, length):  # pylint: disable=invalid-overridden-method
+        error = None
+        async with self._window:
+            started = time.time()
+            stream = MemoryViewStream(memoryview(buffer)[:length])
+            try:
+                await self.file_client.append_data(stream, offset, length=length, **self._append_options)
+            except Exception as exception:  # pylint: disable=broad-except
+                error = exception
+            finally:
+                stream.close()
+        if error is None:
+            self.metrics._record(length, time.time() - started)  # pylint: disable=protected-access
+        self._complete(buffer, offset, length, error)
+        self._notify()
+
+    def _send(self):
+        # Append the chunk filled, from its buffer
+        buffer, length = self._current, self._filled
+        self._current, self._filled = None, 0
+        offset = self._position
+        self._position += length
+        self._in_flight += 1
+        task = asyncio.ensure_future(self._append(buffer, offset, length))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _commit(self, position, **kwargs):  # pylint: disable=invalid-overridden-method
+        await self.file_client.flush_data(
+            position, content_settings=self._content_settings, **dict(self._flush_options, **kwargs))
+        self._committed = position
+        self.metrics.flushes += 1
+
+    async def write(self, data):  # pylint: disable=invalid-overridden-method
+        # type: (Union[bytes, bytearray, memoryview, str]) -> int
+        """Copy data into the chunks to append to the file.
+
+        :param data: The data written. Text is encoded with the encoding of the writer.
+        :type data: bytes or str
+        :returns: The number of bytes or characters written.
+        :rtype: int
+        """
+        self._check_open()
+        await self._start()
+        self.metrics.writes += 1
+        view = self._encode(data)
+        written = 0
+        while written < len(view):
+            while self._current is None and self._error is None:
+                self._current = self._take_buffer()
+                if self._current is None:
+                    await self._wait()
+            self._check_open()
+            count = min(self.chunk_size - self._filled, len(view) - written)
+            self._current[self._filled:self._filled + count] = view[written:written + count]
+            self._filled += count
+            written += count
+            if self._filled == self.chunk_size:
+                self._send()
+        view.release()
+        # The data appended without gap is committed, keeping the data appended beyond it
+        if self.flush_size and self._appended - self._committed >= self.flush_size:
+            await self._commit(self._appended, retain_uncommitted_data=True)
+        return len(data)
+
+    async def writelines(self, lines):  # pylint: disable=invalid-overridden-method
+        # type: (Iterable[Union[bytes, str]]) -> None
+        for line in lines:
+            await self.write(line)
+
+    async def _drain(self):  # pylint: disable=invalid-overridden-method
+        if self._filled:
+            self._send()
+        while self._in_flight:
+            await self._wait()
+        self._check_open()
+
+    async def flush(self):  # pylint: disable=invalid-overridden-method
+        # type: () -> None
+        """Append the data buffered, wait for the appends in flight, and commit the data appended."""
+        self._check_open()
+        if self._position is None:
+            return
+        await self._drain()
+        if self._position > self._committed:
+            await self._commit(self._position)
+
+    async def close(self):  # pylint: disable=invalid-overridden-method
+        # type: () -> None
+        """Commit the data written, and close the file. The error of a failed append is raised.
+
+        The file is committed once more with `close` set, even if there is no data to commit,
+        raising the file change notification of a closed file stream.
+        """
+        if self._closed:
+            return
+        try:
+            self._check_open()
+            await self._start()
+            await self._drain()
+            await self._commit(self._position, close=True)
+        finally:
+            self._closed = True
+            if self._tasks:
+                await asyncio.gather(*self._tasks, return_exceptions=True)
+            self._buffers = []
+            self._current = None
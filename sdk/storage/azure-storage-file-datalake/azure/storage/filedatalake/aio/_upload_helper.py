@@ -32,6 +32,7 @@ async def upload_datalake_file(  # pylint: disable=unused-argument
         overwrite=None,
         validate_content=None,
         max_concurrency=None,
+        executor=None,
         **kwargs):
     try:
         if length == 0:
@@ -70,6 +71,7 @@ async def upload_datalake_file(  # pylint: disable=unused-argument
             chunk_size=100 * 1024 * 1024,
             stream=stream,
             max_concurrency=max_concurrency,
+            executor=executor,
             validate_content=validate_content,
             **kwargs)
 
@@ -0,0 +1,207 @@
+# coding: utf-8
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+import time
+import unittest
+from threading import Lock
+
+from azure.core import MatchConditions
+from azure.core.exceptions import HttpResponseError, ResourceModifiedError
+from azure.storage.filedatalake import DataLakeAccessControlManager, PathProperties
+
+from testcase import StorageTestCase
+
+# ------------------------------------------------------------------------------
+BASE_ACL = 'user::rwx,group::r-x,other::---'
+# ------------------------------------------------------------------------------
+
+
+class _Pages(object):
+    def __init__(self, names, max_results, continuation_token):
+        self._names = names
+        self._max_results = max_results or 5000
+        self.continuation_token = continuation_token or 0
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        if self.continuation_token is None:
+            raise StopIteration
+        start = int(self.continuation_token)
+        page = self._names[start:start + self._max_results]
+        end = start + len(page)
+        self.continuation_token = str(end) if end < len(self._names) else None
+        return iter(page)
+
+    next = __next__
+
+
+class _Paged(object):
+    def __init__(self, names, max_results):
+        self._names = names
+        self._max_results = max_results
+
+    def by_page(self, continuation_token=None):
+        return _Pages(self._names, self._max_results, continuation_token)
+
+
+class _PathClient(object):
+    def __init__(self, file_system, name):
+        self._file_system = file_system
+        self.name = name
+
+    def get_access_control(self, **kwargs):
+        return self._file_system.request('get', self.name)
+
+    def set_access_control(self, acl=None, etag=None, match_condition=None, **kwargs):
+        return self._file_system.request('set', self.name, acl, etag)
+
+
+class _FileSystemClient(object):
+    # keep the ACLs of a tree in memory, with an etag per path
+    def __init__(self, directories, files):
+        self.paths = {}
+        for name in directories:
+            self.paths[name] = [True, BASE_ACL, 0]
+        for name in files:
+            self.paths[name] = [False, BASE_ACL, 0]
+        self.failing = set()
+        self.conflicts = set()
+        self.requests = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = Lock()
+
+    def request(self, operation, name, acl=None, etag=None):
+        with self._lock:
+            self.requests.append((operation, name))
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        time.sleep(0.001)
+        with self._lock:
+            self.in_flight -= 1
+            if name in self.failing:
+                raise HttpResponseError("This request is not authorized to perform this operation.")
+            path = self.paths[name]
+            if operation == 'get':
+                if name in self.conflicts:
+                    # another writer changes the path between the read and the write
+                    self.conflicts.discard(name)
+                    path[2] += 1
+                    return {'acl': path[1], 'etag': str(path[2] - 1)}
+                return {'acl': path[1], 'etag': str(path[2])}
+            if etag is not None and etag != str(path[2]):
+                raise ResourceModifiedError("The condition specified using HTTP conditional header(s) is not met.")
+            path[1] = acl
+            path[2] += 1
+            return {'etag': str(path[2])}
+
+    def _properties(self, name):
+        properties = PathProperties()
+        properties.name = name
+        properties.is_directory = self.paths[name][0]
+        return properties
+
+    def get_paths(self, path=None, recursive=True, max_results=None, **kwargs):
+        names = sorted(name for name in self.paths if path is None or name.startswith(path + '/'))
+        return _Paged([self._properties(name) for name in names], max_results)
+
+    def get_directory_client(self, directory):
+        return _PathClient(self, directory)
+
+    def get_file_client(self, file_path):
+        return _PathClient(self, file_path)
+
+
+def _tree():
+    directories = ['data'] + ['data/{}'.format(i) for i in range(5)]
+    files = ['data/{}/file{}'.format(i, j) for i in range(5) for j in range(20)]
+    return _FileSystemClient(directories, files)
+
+
+class AccessControlRecursiveTest(StorageTestCase):
+
+    # this is a white box test that's designed to make sure the paths are changed within the
+    # window, the default entries kept off the files, and a change resumed from its token
+    def test_set_access_control_recursive(self):
+        file_system = _tree()
+        progress = []
+        manager = DataLakeAccessControlManager(
+            file_system, max_concurrency=4, batch_size=30,
+            progress_hook=lambda result: progress.append(result.continuation))
+
+        acl = BASE_ACL + ',default:user::rwx'
+        result = manager.set_access_control_recursive(acl, path='data')
+
+        self.assertEqual((result.counters.directories_successful, result.counters.files_successful), (6, 100))
+        self.assertEqual(result.counters.failure_count, 0)
+        self.assertIsNone(result.continuation)
+        self.assertEqual(progress, ['30', '60', '90', None])
+        self.assertLessEqual(file_system.max_in_flight, 4)
+        self.assertEqual(file_system.paths['data/0'][1], acl)
+        self.assertEqual(file_system.paths['data/0/file0'][1], BASE_ACL)
+        # the ACL is set without reading it first
+        self.assertTrue(all(operation == 'set' for operation, _ in file_system.requests))
+
+    def test_resume_with_continuation_token(self):
+        file_system = _tree()
+        manager = DataLakeAccessControlManager(file_system, batch_size=30)
+        acl = 'user::rwx,group::rwx,other::r--'
+
+        result = manager.set_access_control_recursive(acl, path='data', max_batches=2)
+        self.assertEqual(result.continuation, '60')
+        self.assertEqual(result.counters.directories_successful + result.counters.files_successful, 61)
+
+        file_system.requests = []
+        result = manager.set_access_control_recursive(
+            acl, path='data', continuation_token=result.continuation)
+        self.assertIsNone(result.continuation)
+        # the directory itself is not changed again, and nor are the paths of the completed pages
+        self.assertEqual(len(file_system.requests), 45)
+        self.assertTrue(all(path[1] == acl for path in file_system.paths.values()))
+
+    def test_update_and_remove_access_control_recursive(self):
+        file_system = _tree()
+        manager = DataLakeAccessControlManager(file_system, max_concurrency=4)
+        file_system.conflicts.add('data/1/file3')
+
+        result = manager.update_access_control_recursive('user:alice:r-x,group::rwx,default:user:alice:r-x', path='data')
+        self.assertEqual(result.counters.failure_count, 0)
+        self.assertEqual(file_system.paths['data/1'][1],
+                         'user::rwx,group::rwx,other::---,user:alice:r-x,default:user:alice:r-x')
+        self.assertEqual(file_system.paths['data/1/file3'][1], 'user::rwx,group::rwx,other::---,user:alice:r-x')
+
+        # the paths whose ACL does not change are not written
+        file_system.requests = []
+        manager.update_access_control_recursive('group::rwx', path='data')
+        self.assertTrue(all(operation == 'get' for operation, _ in file_system.requests))
+
+        result = manager.remove_access_control_recursive('user:alice,default:user:alice', path='data')
+        self.assertEqual(result.counters.files_successful, 100)
+        self.assertTrue(all(path[1] == 'user::rwx,group::rwx,other::---' for path in file_system.paths.values()))
+
+    def test_failures_are_reported(self):
+        file_system = _tree()
+        file_system.failing.update(['data/2', 'data/2/file7'])
+        manager = DataLakeAccessControlManager(file_system)
+
+        result = manager.set_access_control_recursive(BASE_ACL, path='data')
+
+        self.assertEqual(result.counters.failure_count, 2)
+        self.assertEqual((result.counters.directories_successful, result.counters.files_successful), (5, 99))
+        self.assertEqual(sorted((f.name, f.is_directory) for f in result.failures),
+                         [('data/2', True), ('data/2/file7', False)])
+        self.assertIsNone(result.continuation)
+
+    def test_acl_without_permissions(self):
+        manager = DataLakeAccessControlManager(_tree())
+        with self.assertRaises(ValueError):
+            manager.set_access_control_recursive('user:alice', path='data')
+
+# ------------------------------------------------------------------------------
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,136 @@
+# coding: utf-8
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+import asyncio
+import unittest
+
+from azure.storage.filedatalake.aio import DataLakeAccessControlManager
+
+from testcase import StorageTestCase
+from test_access_control_recursive import BASE_ACL, _tree
+
+# ------------------------------------------------------------------------------
+
+
+class _AsyncPages(object):
+    def __init__(self, pages):
+        self._pages = pages
+
+    @property
+    def continuation_token(self):
+        return self._pages.continuation_token
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        try:
+            return _AsyncPage(next(self._pages))
+        except StopIteration:
+            raise StopAsyncIteration
+
+
+class _AsyncPage(object):
+    def __init__(self, items):
+        self._items = items
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        try:
+            return next(self._items)
+        except StopIteration:
+            raise StopAsyncIteration
+
+
+class _AsyncPaged(object):
+    def __init__(self, paged):
+        self._paged = paged
+
+    def by_page(self, continuation_token=None):
+        return _AsyncPages(self._paged.by_page(continuation_token))
+
+
+class _AsyncPathClient(object):
+    def __init__(self, file_system, client):
+        self._file_system = file_system
+        self._client = client
+
+    async def _request(self, operation, **kwargs):
+        self._file_system.in_flight += 1
+        self._file_system.max_in_flight = max(self._file_system.max_in_flight, self._file_system.in_flight)
+        await asyncio.sleep(0.001)
+        self._file_system.in_flight -= 1
+        return getattr(self._client, operation)(**kwargs)
+
+    async def get_access_control(self, **kwargs):
+        return await self._request('get_access_control', **kwargs)
+
+    async def set_access_control(self, **kwargs):
+        return await self._request('set_access_control', **kwargs)
+
+
+class _AsyncFileSystemClient(object):
+    # the in-memory tree of the sync tests, behind coroutines
+    def __init__(self, file_system):
+        self.file_system = file_system
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    def get_paths(self, **kwargs):
+        return _AsyncPaged(self.file_system.get_paths(**kwargs))
+
+    def get_directory_client(self, directory):
+        return _AsyncPathClient(self, self.file_system.get_directory_client(directory))
+
+    def get_file_client(self, file_path):
+        return _AsyncPathClient(self, self.file_system.get_file_client(file_path))
+
+
+class AccessControlRecursiveAsyncTest(StorageTestCase):
+
+    async def _test_set_access_control_recursive(self):
+        file_system = _AsyncFileSystemClient(_tree())
+        manager = DataLakeAccessControlManager(file_system, max_concurrency=4, batch_size=30)
+        acl = 'user::rwx,group::rwx,other::r--'
+
+        result = await manager.set_access_control_recursive(acl, path='data', max_batches=2)
+        self.assertEqual(result.continuation, '60')
+        result = await manager.set_access_control_recursive(
+            acl, path='data', continuation_token=result.continuation)
+
+        self.assertIsNone(result.continuation)
+        self.assertEqual(result.counters.directories_successful + result.counters.files_successful, 45)
+        self.assertLessEqual(file_system.max_in_flight, 4)
+        self.assertTrue(all(path[1] == acl for path in file_system.file_system.paths.values()))
+
+    def test_set_access_control_recursive_async(self):
+        loop = asyncio.get_event_loop()
+        loop.run_until_complete(self._test_set_access_control_recursive())
+
+    async def _test_update_and_remove_access_control_recursive(self):
+        file_system = _AsyncFileSystemClient(_tree())
+        file_system.file_system.failing.add('data/3/file1')
+        manager = DataLakeAccessControlManager(file_system, max_concurrency=4)
+
+        result = await manager.update_access_control_recursive('user:alice:r-x,default:user:alice:r-x', path='data')
+        self.assertEqual(result.counters.failure_count, 1)
+        self.assertEqual(result.failures[0].name, 'data/3/file1')
+        self.assertEqual(file_system.file_system.paths['data/3/file0'][1], BASE_ACL + ',user:alice:r-x')
+
+        file_system.file_system.failing.clear()
+        result = await manager.remove_access_control_recursive('user:alice,default:user:alice', path='data')
+        self.assertEqual(result.counters.failure_count, 0)
+        self.assertTrue(all(path[1] == BASE_ACL for path in file_system.file_system.paths.values()))
+
+    def test_update_and_remove_access_control_recursive_async(self):
+        loop = asyncio.get_event_loop()
+        loop.run_until_complete(self._test_update_and_remove_access_control_recursive())
+
+# ------------------------------------------------------------------------------
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,134 @@
+# coding: utf-8
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+import os
+import time
+import unittest
+from threading import Lock
+
+from azure.core.exceptions import HttpResponseError, ResourceNotFoundError
+from azure.storage.filedatalake import DataLakeFileWriter
+
+from testcase import StorageTestCase
+
+# ------------------------------------------------------------------------------
+
+
+class _Properties(object):
+    def __init__(self, size):
+        self.size = size
+
+
+class _DataLakeFile(object):
+    # a file in memory, checking that each flush commits data appended without gap
+    def __init__(self, data=None):
+        self.data = data
+        self.uncommitted = {}
+        self.flushes = []
+        self.failing_offsets = set()
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = Lock()
+
+    def get_file_properties(self, **kwargs):
+        if self.data is None:
+            raise ResourceNotFoundError("The specified path does not exist.")
+        return _Properties(len(self.data))
+
+    def create_file(self, **kwargs):
+        self.data = b""
+
+    def append_data(self, data, offset, length=None, **kwargs):
+        with self._lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        time.sleep(0.002)
+        body = data.read()
+        with self._lock:
+            self.in_flight -= 1
+            if offset in self.failing_offsets:
+                raise HttpResponseError("The uploaded data is not contiguous or the position query parameter value "
+                                        "is not equal to the length of the file after appending the uploaded data.")
+            assert len(body) == length
+            self.uncommitted[offset] = body
+
+    def flush_data(self, offset, retain_uncommitted_data=False, close=False, **kwargs):
+        with self._lock:
+            while len(self.data) < offset:
+                self.data += self.uncommitted.pop(len(self.data))
+            assert len(self.data) == offset
+            if not retain_uncommitted_data:
+                self.uncommitted = {}
+            self.flushes.append((offset, retain_uncommitted_data, close))
+
+
+class DataLakeFileWriterTest(StorageTestCase):
+
+    # this is a white box test that's designed to make sure the appends are kept in flight within
+    # the buffers, at their offsets, and committed once the data before them is appended
+    def test_parallel_appends(self):
+        data = os.urandom(100 * 1024 + 17)
+        file_client = _DataLakeFile()
+
+        with DataLakeFileWriter(file_client, chunk_size=1024, max_concurrency=4, max_buffers=6) as writer:
+            for start in range(0, len(data), 700):
+                writer.write(data[start:start + 700])
+            self.assertEqual(writer.tell(), len(data))
+
+        self.assertEqual(file_client.data, data)
+        self.assertLessEqual(file_client.max_in_flight, 4)
+        self.assertEqual(file_client.flushes, [(len(data), False, True)])
+        self.assertEqual(writer.metrics.appends, 101)
+        self.assertEqual(writer.metrics.bytes_appended, len(data))
+        # the memory used is bounded by the buffers
+        self.assertLessEqual(writer._allocated, 6)
+
+    def test_flush_size_commits_while_writing(self):
+        data = os.urandom(64 * 1024)
+        file_client = _DataLakeFile()
+
+        writer = DataLakeFileWriter(file_client, chunk_size=1024, flush_size=16 * 1024)
+        for start in range(0, len(data), 4096):
+            writer.write(data[start:start + 4096])
+        writer.flush()
+        self.assertEqual(file_client.data, data)
+        writer.write(b"tail")
+        writer.close()
+
+        self.assertEqual(file_client.data, data + b"tail")
+        intermediate = [flush for flush in file_client.flushes if flush[1]]
+        self.assertGreater(len(intermediate), 0)
+        self.assertTrue(all(offset >= 16 * 1024 for offset, _, _ in intermediate))
+        self.assertEqual(file_client.flushes[-2:], [(len(data), False, False), (len(data) + 4, False, True)])
+
+    def test_append_to_existing_file(self):
+        file_client = _DataLakeFile(b"header;")
+        with DataLakeFileWriter(file_client, chunk_size=4) as writer:
+            writer.write(u"r\xe9cord;")
+        self.assertEqual(file_client.data, u"header;r\xe9cord;".encode('UTF-8'))
+
+        with DataLakeFileWriter(file_client, overwrite=True) as writer:
+            pass
+        self.assertEqual(file_client.data, b"")
+
+    def test_append_error(self):
+        file_client = _DataLakeFile()
+        file_client.failing_offsets.add(2048)
+        writer = DataLakeFileWriter(file_client, chunk_size=1024, max_concurrency=2)
+
+        with self.assertRaises(HttpResponseError):
+            for _ in range(64):
+                writer.write(b"x" * 512)
+        with self.assertRaises(HttpResponseError):
+            writer.close()
+        self.assertTrue(writer.closed)
+        self.assertEqual(file_client.flushes, [])
+        with self.assertRaises(ValueError):
+            writer.write(b"x")
+
+# ------------------------------------------------------------------------------
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,82 @@
+# coding: utf-8
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+import asyncio
+import os
+import unittest
+
+from azure.core.exceptions import HttpResponseError
+from azure.storage.filedatalake.aio import DataLakeFileWriter
+
+from testcase import StorageTestCase
+from test_file_writer import _DataLakeFile
+
+# ------------------------------------------------------------------------------
+
+
+class _AsyncDataLakeFile(object):
+    # the in-memory file of the sync tests, behind coroutines
+    def __init__(self, data=None):
+        self.file = _DataLakeFile(data)
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def get_file_properties(self, **kwargs):
+        return self.file.get_file_properties(**kwargs)
+
+    async def create_file(self, **kwargs):
+        return self.file.create_file(**kwargs)
+
+    async def append_data(self, data, offset, **kwargs):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(0.002)
+        self.in_flight -= 1
+        return self.file.append_data(data, offset, **kwargs)
+
+    async def flush_data(self, offset, **kwargs):
+        return self.file.flush_data(offset, **kwargs)
+
+
+class DataLakeFileWriterAsyncTest(StorageTestCase):
+
+    async def _test_parallel_appends(self):
+        data = os.urandom(100 * 1024 + 17)
+        file_client = _AsyncDataLakeFile()
+
+        async with DataLakeFileWriter(file_client, chunk_size=1024, max_concurrency=4, flush_size=32 * 1024) as writer:
+            for start in range(0, len(data), 700):
+                await writer.write(data[start:start + 700])
+
+        self.assertEqual(file_client.file.data, data)
+        self.assertLessEqual(file_client.max_in_flight, 4)
+        self.assertEqual(file_client.file.flushes[-1], (len(data), False, True))
+        self.assertGreater(len(file_client.file.flushes), 1)
+        self.assertLessEqual(writer._allocated, 5)
+
+    def test_parallel_appends_async(self):
+        loop = asyncio.get_event_loop()
+        loop.run_until_complete(self._test_parallel_appends())
+
+    async def _test_append_error(self):
+        file_client = _AsyncDataLakeFile()
+        file_client.file.failing_offsets.add(1024)
+        writer = DataLakeFileWriter(file_client, chunk_size=1024, max_concurrency=2)
+
+        with self.assertRaises(HttpResponseError):
+            for _ in range(64):
+                await writer.write(b"x" * 512)
+        with self.assertRaises(HttpResponseError):
+            await writer.close()
+        self.assertEqual(file_client.file.flushes, [])
+
+    def test_append_error_async(self):
+        loop = asyncio.get_event_loop()
+        loop.run_until_complete(self._test_append_error())
+
+# ------------------------------------------------------------------------------
+if __name__ == '__main__':
+    unittest.main()
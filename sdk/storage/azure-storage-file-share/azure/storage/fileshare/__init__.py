@@ -10,8 +10,10 @@ from ._directory_client import ShareDirectoryClient
 from ._share_client import ShareClient
 from ._share_service_client import ShareServiceClient
 from ._lease import ShareLeaseClient
+from ._transfer_manager import ShareTransferManager
 from ._shared_access_signature import generate_account_sas, generate_share_sas, generate_file_sas
 from ._shared.policies import ExponentialRetry, LinearRetry
+from ._shared.transfers import DirectoryTransferReport, FileTransfer
 from ._shared.models import (
     LocationMode,
     ResourceTypes,
@@ -43,6 +45,9 @@ __all__ = [
     'ShareClient',
     'ShareServiceClient',
     'ShareLeaseClient',
+    'ShareTransferManager',
+    'DirectoryTransferReport',
+    'FileTransfer',
     'ExponentialRetry',
     'LinearRetry',
     'LocationMode',
@@ -7,7 +7,7 @@
 import functools
 import time
 from typing import (  # pylint: disable=unused-import
-    Optional, Union, Any, Dict, TYPE_CHECKING
+    Optional, Union, Any, Dict, Iterator, TYPE_CHECKING
 )
 
 try:
@@ -32,11 +32,12 @@ from ._parser import _get_file_permission, _datetime_to_str
 from ._deserialize import deserialize_directory_properties
 from ._serialize import get_api_version
 from ._file_client import ShareFileClient
+from ._directory_walker import DirectoryWalker
 from ._models import DirectoryPropertiesPaged, HandlesPaged, NTFSAttributes  # pylint: disable=unused-import
 
 if TYPE_CHECKING:
     from datetime import datetime
-    from ._models import ShareProperties, DirectoryProperties, ContentSettings
+    from ._models import ShareProperties, DirectoryProperties, ContentSettings, FileProperties
     from ._generated.models import HandleItem
 
 
@@ -352,6 +353,37 @@ class ShareDirectoryClient(StorageAccountHostsMixin):
             command, prefix=name_starts_with, results_per_page=results_per_page,
             page_iterator_class=DirectoryPropertiesPaged)
 
+    @distributed_trace
+    def walk_directories_and_files(self, **kwargs):
+        # type: (Any) -> Iterator[Union[Dict[str, Any], FileProperties]]
+        """Returns a generator to list the directories and files of the directory tree,
+        listing the subdirectories concurrently.
+
+        The subdirectories are listed as they are found, up to `max_concurrency` listings
+        at a time, and the directories and files are returned as their pages are received,
+        with their path from this directory as name, e.g. "logs/2020/app.log". The order of
+        the items is not defined.
+
+        :keyword int max_concurrency:
+            The largest number of requests in flight. Defaults to 8.
+        :keyword bool include_properties:
+            Whether to fetch the properties of each file, with up to `max_concurrency` requests
+            in flight shared with the listings, and return them instead of the listed items.
+            Defaults to False.
+        :keyword int results_per_page:
+            The maximum number of directories and files to retrieve per listing call.
+        :keyword int timeout:
+            The timeout parameter is expressed in seconds, for each request.
+        :returns:
+            An iterator of the dict-like DirectoryProperties and FileProperties listed, or
+            the FileProperties of the files with `include_properties`.
+        :rtype: Iterator[dict(str, Any) or ~azure.storage.fileshare.FileProperties]
+        """
+        max_concurrency = kwargs.pop('max_concurrency', 8)
+        include_properties = kwargs.pop('include_properties', False)
+        properties_options = {'timeout': kwargs.get('timeout')}
+        return iter(DirectoryWalker(self, max_concurrency, include_properties, kwargs, properties_options))
+
     @distributed_trace
     def list_handles(self, recursive=False, **kwargs):
         # type: (bool, Any) -> ItemPaged
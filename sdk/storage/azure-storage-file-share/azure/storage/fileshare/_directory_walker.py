@@ -0,0 +1,160 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from typing import (  # pylint: disable=unused-import
+    Any, Dict, Iterator, List, Optional, Tuple, Union, TypeVar, TYPE_CHECKING
+)
+
+from six.moves import queue
+
+from azure.core.tracing.common import with_current_context
+
+if TYPE_CHECKING:
+    from ._models import FileProperties
+    ShareDirectoryClient = TypeVar("ShareDirectoryClient")
+
+# The pages of directory listings received ahead of the consumer, for each task
+MAX_BUFFERED_PAGES = 2
+_POLL_INTERVAL = 0.1
+
+
+class _TaskDone(object):  # pylint: disable=too-few-public-methods
+    def __init__(self, error=None):
+        self.error = error
+
+
+class DirectoryWalkerBase(object):
+    """The walk of a directory tree, listing up to `max_concurrency` directories at once.
+
+    The directories found are listed in turn, and with `include_properties` the properties of
+    the files found are fetched, sharing the same bound. The fetches are started before the
+    listings of the directories found, so the files waiting for their properties are at most
+    the pages in flight.
+
+    :param directory_client: The client of the directory at the root of the walk.
+    :param int max_concurrency: The largest number of requests in flight.
+    :param bool include_properties: Whether to return the properties of each file.
+    :param dict list_options: The keywords of each listing.
+    :param dict properties_options: The keywords of each fetch of the properties of a file.
+    """
+
+    def __init__(self, directory_client, max_concurrency, include_properties, list_options, properties_options):
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be greater than 0.")
+        self.directory_client = directory_client
+        self.max_concurrency = max_concurrency
+        self.include_properties = include_properties
+        self.list_options = list_options
+        self.properties_options = properties_options
+        self._directories = deque([""])  # type: deque
+        self._files = deque()  # type: deque
+        self._running = 0
+
+    def _directory_client(self, path):
+        return self.directory_client.get_subdirectory_client(path) if path else self.directory_client
+
+    def _next_task(self):
+        # type: () -> Optional[Tuple[bool, str]]
+        # The next file to fetch the properties of, else the next directory to list, within the bound
+        if self._running >= self.max_concurrency:
+            return None
+        if self._files:
+            self._running += 1
+            return False, self._files.popleft()
+        if self._directories:
+            self._running += 1
+            return True, self._directories.popleft()
+        return None
+
+    def _discover(self, directory, entries):
+        # type: (Optional[str], List[Any]) -> List[Union[Dict[str, Any], FileProperties]]
+        # Name the entries of a page by their path from the root, and queue the walk of them
+        if directory is None:
+            # The properties of a file, already named
+            return entries
+        items = []
+        for entry in entries:
+            entry['name'] = directory + "/" + entry['name'] if directory else entry['name']
+            if entry['is_directory']:
+                self._directories.append(entry['name'])
+            elif self.include_properties:
+                self._files.append(entry['name'])
+                continue
+            items.append(entry)
+        return items
+
+
+class DirectoryWalker(DirectoryWalkerBase):
+    """Walk a directory tree on a pool of threads.
+
+    The listings put their pages in a bounded queue, and stop when the iteration is closed.
+    """
+
+    def __init__(self, *args, **kwargs):
+        # type: (*Any, **Any) -> None
+        super(DirectoryWalker, self).__init__(*args, **kwargs)
+        self._closed = threading.Event()
+        self._output = queue.Queue(MAX_BUFFERED_PAGES * self.max_concurrency)
+
+    def _put(self, item):
+        # Wait for room in the buffer, unless the walk was closed by the consumer
+        while not self._closed.is_set():
+            try:
+                self._output.put(item, timeout=_POLL_INTERVAL)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def _list_directory(self, path):
+        error = None
+        try:
+            pages = self._directory_client(path).list_directories_and_files(**self.list_options).by_page()
+            for page in pages:
+                if self._closed.is_set() or not self._put((path, list(page))):
+                    return
+        except Exception as exc:  # pylint: disable=broad-except
+            error = exc
+        self._put(_TaskDone(error))
+
+    def _get_properties(self, path):
+        error = None
+        try:
+            properties = self.directory_client.get_file_client(path).get_file_properties(**self.properties_options)
+            properties.name = path
+            self._put((None, [properties]))
+        except Exception as exc:  # pylint: disable=broad-except
+            error = exc
+        self._put(_TaskDone(error))
+
+    def __iter__(self):
+        # type: () -> Iterator[Union[Dict[str, Any], FileProperties]]
+        executor = ThreadPoolExecutor(self.max_concurrency)
+        try:
+            while True:
+                task = self._next_task()
+                while task is not None:
+                    is_directory, path = task
+                    work = self._list_directory if is_directory else self._get_properties
+                    executor.submit(with_current_context(work), path)
+                    task = self._next_task()
+                if not self._running:
+                    return
+                item = self._output.get()
+                if isinstance(item, _TaskDone):
+                    self._running -= 1
+                    if item.error is not None:
+                        raise item.error
+                    continue
+                for entry in self._discover(*item):
+                    yield entry
+        finally:
+            self._closed.set()
+            executor.shutdown(wait=True)
@@ -4,13 +4,22 @@
 # license information.
 # --------------------------------------------------------------------------
 
+import os
+import stat
 import sys
 import threading
 import warnings
-from io import BytesIO
+from bisect import bisect_right
+from io import BytesIO, SEEK_CUR, UnsupportedOperation
+
+try:
+    from fcntl import fcntl, F_GETFL
+except ImportError:  # Windows
+    fcntl = None
 
 from azure.core.exceptions import HttpResponseError
 from azure.core.tracing.common import with_current_context
+from ._shared.checksums import content_checksum
 from ._shared.encryption import decrypt_blob
 from ._shared.request_handlers import validate_and_format_range_headers
 from ._shared.response_handlers import process_storage_error, parse_length_from_content_range
@@ -39,13 +48,21 @@ def process_range_and_offset(start_range, end_range, length, encryption):
     return (start_range, end_range), (start_offset, end_offset)
 
 
-def process_content(data, start_offset, end_offset, encryption):
+def process_content(data, start_offset, end_offset, encryption, validate_content=None):
     if data is None:
         raise ValueError("Response cannot be None.")
+    checksum = content_checksum(validate_content)
     try:
-        content = b"".join(list(data))
+        pieces = []
+        for piece in data:
+            if checksum is not None:
+                checksum.update(piece)
+            pieces.append(piece)
+        content = b"".join(pieces)
     except Exception as error:
         raise HttpResponseError(message="Download stream interrupted.", response=data.response, error=error)
+    if checksum is not None:
+        checksum.check(data.response.headers, response=data.response)
     if content and encryption.get("key") is not None or encryption.get("resolver") is not None:
         try:
             return decrypt_blob(
@@ -62,6 +79,59 @@ def process_content(data, start_offset, end_offset, encryption):
     return content
 
 
+class RangeIndex(object):
+    """The sorted ranges of a file holding data, searched by bisection.
+
+    :param list[dict[str, int]] ranges: The ranges returned by `get_ranges`, with inclusive 'start' and 'end' offsets.
+    """
+
+    def __init__(self, ranges):
+        ranges = sorted((file_range['start'], file_range['end']) for file_range in ranges)
+        self.starts = [start for start, _ in ranges]
+        self.ends = [end for _, end in ranges]
+
+    def __len__(self):
+        return len(self.starts)
+
+    def overlaps(self, start, end):
+        """Whether any range overlaps the range of bytes from start to end, both inclusive."""
+        # The last range starting at or before end is the only one which may reach start,
+        # as the ranges do not overlap each other
+        index = bisect_right(self.starts, end) - 1
+        return index >= 0 and self.ends[index] >= start
+
+
+_EMPTY_CHUNK = [b""]
+
+
+def empty_chunk(length):
+    """Return a chunk of zeros, shared by the downloads until another length is asked for."""
+    chunk = _EMPTY_CHUNK[0]
+    if len(chunk) != length:
+        chunk = _EMPTY_CHUNK[0] = b"\x00" * length
+    return chunk
+
+
+def leaves_holes(stream):
+    """Whether the empty chunks of a download into a stream can be skipped rather than written.
+
+    This is the case when the stream is a regular file written past its end, where the file
+    system fills any gap with zeros, without allocating them on the disk if it supports sparse files.
+    It is not the case for a file opened for appending, whose writes all go to its end, ignoring
+    the seeks over the empty chunks.
+    """
+    if 'a' in str(getattr(stream, 'mode', '')):
+        return False
+    try:
+        fileno = stream.fileno()
+        if fcntl is not None and fcntl(fileno, F_GETFL) & os.O_APPEND:
+            return False
+        status = os.fstat(fileno)
+        return stat.S_ISREG(status.st_mode) and status.st_size <= stream.tell()
+    except (AttributeError, UnsupportedOperation, EnvironmentError, ValueError):
+        return False
+
+
 class _ChunkDownloader(object):  # pylint: disable=too-many-instance-attributes
     def __init__(
         self,
@@ -75,9 +145,12 @@ class _ChunkDownloader(object):  # pylint: disable=too-many-instance-attributes
         parallel=None,
         validate_content=None,
         encryption_options=None,
+        non_empty_ranges=None,
+        sparse=False,
         **kwargs
     ):
         self.client = client
+        self.ranges = RangeIndex(non_empty_ranges) if non_empty_ranges is not None else None
 
         # Information on the download range/chunk size
         self.chunk_size = chunk_size
@@ -93,6 +166,8 @@ class _ChunkDownloader(object):  # pylint: disable=too-many-instance-attributes
         # For a parallel download, the stream is always seekable, so we note down the current position
         # in order to seek to the right place when out-of-order chunks come in
         self.stream_start = stream.tell() if parallel else None
+        # With a sparse stream, the empty chunks are skipped over rather than written
+        self.sparse = sparse and self.ranges is not None
 
         # Download progress so far
         self.progress_total = current_progress
@@ -119,6 +194,9 @@ class _ChunkDownloader(object):  # pylint: disable=too-many-instance-attributes
 
     def process_chunk(self, chunk_start):
         chunk_start, chunk_end = self._calculate_range(chunk_start)
+        if self._skip_empty_chunk(chunk_start, chunk_end):
+            self._update_progress(chunk_end - chunk_start)
+            return
         chunk_data = self._download_chunk(chunk_start, chunk_end - 1)
         length = chunk_end - chunk_start
         if length > 0:
@@ -144,7 +222,29 @@ class _ChunkDownloader(object):  # pylint: disable=too-many-instance-attributes
         else:
             self.stream.write(chunk_data)
 
+    def _is_empty(self, chunk_start, chunk_end):
+        # Without the ranges of the file, assume there is data everywhere
+        return self.ranges is not None and not self.ranges.overlaps(chunk_start, chunk_end)
+
+    def _skip_empty_chunk(self, chunk_start, chunk_end):
+        if not self.sparse or chunk_end <= chunk_start or not self._is_empty(chunk_start, chunk_end - 1):
+            return False
+        if not self.stream_lock:
+            # The parallel writes seek to their own position, the sequential ones follow on
+            self.stream.seek(chunk_end - chunk_start, SEEK_CUR)
+        return True
+
+    def finish_stream(self):
+        """Extend a sparse stream over the empty chunks skipped at its end, and seek to its end."""
+        if self.sparse:
+            if self.stream_start is not None:
+                self.stream.seek(self.stream_start + (self.end_index - self.start_index))
+            self.stream.truncate()
+
     def _download_chunk(self, chunk_start, chunk_end):
+        # The empty chunks are not downloaded, but made of zeros locally
+        if self._is_empty(chunk_start, chunk_end):
+            return empty_chunk(chunk_end - chunk_start + 1)
         download_range, offset = process_range_and_offset(
             chunk_start, chunk_end, chunk_end, self.encryption_options
         )
@@ -164,7 +264,8 @@ class _ChunkDownloader(object):  # pylint: disable=too-many-instance-attributes
         except HttpResponseError as error:
             process_storage_error(error)
 
-        chunk_data = process_content(response, offset[0], offset[1], self.encryption_options)
+        chunk_data = process_content(
+            response, offset[0], offset[1], self.encryption_options, self.validate_content)
         return chunk_data
 
 
@@ -235,6 +336,8 @@ class StorageStreamDownloader(object):  # pylint: disable=too-many-instance-attr
         path=None,
         share=None,
         encoding=None,
+        executor=None,
+        sparse=False,
         **kwargs
     ):
         self.name = name
@@ -248,6 +351,8 @@ class StorageStreamDownloader(object):  # pylint: disable=too-many-instance-attr
         self._start_range = start_range
         self._end_range = end_range
         self._max_concurrency = max_concurrency
+        self._executor = executor
+        self._sparse = sparse
         self._encoding = encoding
         self._validate_content = validate_content
         self._encryption_options = encryption_options or {}
@@ -256,6 +361,7 @@ class StorageStreamDownloader(object):  # pylint: disable=too-many-instance-attr
         self._download_complete = False
         self._current_content = None
         self._file_size = None
+        self._non_empty_ranges = None
         self._response = None
 
         # The service only provides transactional MD5s for chunks under 4MB.
@@ -303,7 +409,8 @@ class StorageStreamDownloader(object):  # pylint: disable=too-many-instance-attr
                 self._response,
                 self._initial_offset[0],
                 self._initial_offset[1],
-                self._encryption_options
+                self._encryption_options,
+                self._validate_content
             )
 
     def __len__(self):
@@ -368,8 +475,25 @@ class StorageStreamDownloader(object):  # pylint: disable=too-many-instance-attr
         # If file size is large, download the rest of the file in chunks.
         if response.properties.size == self.size:
             self._download_complete = True
+        elif self._sparse:
+            self._non_empty_ranges = self._get_ranges()
         return response
 
+    def _get_ranges(self):
+        # The ranges holding data in the rest of the download, for its empty chunks to be skipped
+        data_end = self._file_size
+        if self._end_range is not None:
+            data_end = min(self._file_size, self._end_range + 1)
+        try:
+            ranges = self._client.get_range_list(
+                range='bytes={0}-{1}'.format(self._initial_range[1] + 1, data_end - 1),
+                lease_access_conditions=self._request_options.get('lease_access_conditions'),
+                timeout=self._request_options.get('timeout'))
+        except HttpResponseError:
+            # A heavily fragmented file may fail to list its ranges, it is then downloaded in full
+            return None
+        return [{'start': file_range.start, 'end': file_range.end} for file_range in ranges]
+
     def chunks(self):
         if self.size == 0 or self._download_complete:
             iter_downloader = None
@@ -389,6 +513,7 @@ class StorageStreamDownloader(object):  # pylint: disable=too-many-instance-attr
                 parallel=False,
                 validate_content=self._validate_content,
                 encryption_options=self._encryption_options,
+                non_empty_ranges=self._non_empty_ranges,
                 use_location=self._location_mode,
                 **self._request_options
             )
@@ -451,7 +576,9 @@ class StorageStreamDownloader(object):  # pylint: disable=too-many-instance-attr
         :param stream:
             The stream to download to. This can be an open file-handle,
             or any writable stream. The stream must be seekable if the download
-            uses more than one parallel connection.
+            uses more than one parallel connection. When a download with `sparse`
+            is written to the end of a file, its empty ranges are skipped over rather
+            than written, leaving them as holes of a sparse file.
         :returns: The number of bytes read.
         :rtype: int
         """
@@ -488,12 +615,15 @@ class StorageStreamDownloader(object):  # pylint: disable=too-many-instance-attr
             parallel=parallel,
             validate_content=self._validate_content,
             encryption_options=self._encryption_options,
+            non_empty_ranges=self._non_empty_ranges,
+            sparse=self._non_empty_ranges is not None and leaves_holes(stream),
             use_location=self._location_mode,
             **self._request_options
         )
         if parallel:
             import concurrent.futures
-            executor = concurrent.futures.ThreadPoolExecutor(self._max_concurrency)
+            # A shared executor bounds the requests in flight across transfers
+            executor = self._executor or concurrent.futures.ThreadPoolExecutor(self._max_concurrency)
             list(executor.map(
                     with_current_context(downloader.process_chunk),
                     downloader.get_chunk_offsets()
@@ -501,6 +631,7 @@ class StorageStreamDownloader(object):  # pylint: disable=too-many-instance-attr
         else:
             for chunk in downloader.get_chunk_offsets():
                 downloader.process_chunk(chunk)
+        downloader.finish_stream()
         return self.size
 
     def download_to_stream(self, stream, max_concurrency=1):
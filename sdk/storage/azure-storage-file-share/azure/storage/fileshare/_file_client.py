@@ -58,6 +58,8 @@ def _upload_file_helper(
         file_last_write_time="now",
         file_permission=None,
         file_permission_key=None,
+        executor=None,
+        sparse=False,
         **kwargs):
     try:
         if size is None or size < 0:
@@ -84,10 +86,15 @@ def _upload_file_helper(
             chunk_size=file_settings.max_range_size,
             stream=stream,
             max_concurrency=max_concurrency,
+            executor=executor,
+            sparse=sparse,
             validate_content=validate_content,
             timeout=timeout,
             **kwargs
         )
+        if not responses:
+            # The data was all zeros, as the file created
+            return response
         return sorted(responses, key=lambda r: r.get('last_modified'))[-1]
     except StorageErrorException as error:
         process_storage_error(error)
@@ -412,6 +419,9 @@ class ShareFileClient(StorageAccountHostsMixin):
         # type: (...) -> Dict[str, Any]
         """Uploads a new file.
 
+        The file is created at its full length, filled with zeros, and the ranges of the data
+        made only of zeros are not uploaded, leaving them empty, without storage.
+
         :param Any data:
             Content of the file.
         :param int length:
@@ -453,6 +463,9 @@ class ShareFileClient(StorageAccountHostsMixin):
             file.
         :keyword int max_concurrency:
             Maximum number of parallel connections to use.
+        :keyword bool sparse:
+            If true, the ranges of the data made only of zeros are not uploaded, and stay
+            empty in the file created. Defaults to False.
         :keyword lease:
             Required if the file has an active lease. Value can be a ShareLeaseClient object
             or the lease ID as a string.
@@ -697,6 +710,11 @@ class ShareFileClient(StorageAccountHostsMixin):
             file. Also note that if enabled, the memory-efficient upload algorithm
             will not be used, because computing the MD5 hash requires buffering
             entire blocks, and doing so defeats the purpose of the memory-efficient algorithm.
+        :keyword bool sparse:
+            If true, and the file is larger than a single get, the ranges of the file holding
+            data are listed with a single request, and the chunks between them are not
+            downloaded. When such a download is written to the end of a local file, the
+            empty chunks are skipped over, leaving them as holes of a sparse file.
         :keyword lease:
             Required if the file has an active lease. Value can be a ShareLeaseClient object
             or the lease ID as a string.
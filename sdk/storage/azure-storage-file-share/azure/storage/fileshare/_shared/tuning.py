@@ -0,0 +1,218 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+
+import time
+from threading import Lock
+
+_MB = 1024 * 1024
+
+
+class TransferReport(object):
+    """Summary of a transfer driven by a :class:`TransferTuner`.
+
+    :ivar int chunk_size: The chunk size used at the end of the transfer, in bytes.
+    :ivar int max_concurrency: The number of requests in flight at the end of the transfer.
+    :ivar int bytes_transferred: The number of bytes transferred in chunks.
+    :ivar int chunks: The number of chunks transferred.
+    :ivar float elapsed: The duration of the chunked part of the transfer, in seconds.
+    :ivar float throughput: The achieved throughput, in MB/s.
+    :ivar float average_latency: The average time taken by a chunk request, in seconds.
+    :ivar list history:
+        The settings tried and their throughput, as (chunk_size, max_concurrency, MB/s) tuples.
+    """
+
+    def __init__(self, chunk_size, max_concurrency, bytes_transferred, chunks, elapsed, average_latency, history):
+        self.chunk_size = chunk_size
+        self.max_concurrency = max_concurrency
+        self.bytes_transferred = bytes_transferred
+        self.chunks = chunks
+        self.elapsed = elapsed
+        self.throughput = bytes_transferred / elapsed / _MB if elapsed else 0.0
+        self.average_latency = average_latency
+        self.history = history
+
+    def __repr__(self):
+        return "TransferReport(chunk_size={}, max_concurrency={}, bytes_transferred={}, throughput={:.2f} MB/s)".format(
+            self.chunk_size, self.max_concurrency, self.bytes_transferred, self.throughput)
+
+
+class TransferTuner(object):  # pylint: disable=too-many-instance-attributes
+    """Tune the chunk size and the concurrency of blob transfers while they run.
+
+    Pass an instance as the `autotune` keyword of upload_blob or download_blob. Chunks
+    are grouped in windows of as many chunks as there are requests in flight. After
+    each window, the throughput is compared with the best seen so far: the chunk size,
+    then the concurrency, are doubled as long as throughput improves; a change that
+    does not pay off is reverted. If throughput later drops under half of the best,
+    both are backed off and tuning starts over.
+
+    The settings reached are kept, so reusing a tuner for the next transfers starts
+    them where the previous one ended. Only the chunked part of a transfer is tuned:
+    data sent or received in a single request is not reported.
+
+    :param int min_chunk_size: The smallest chunk size to use, in bytes. Defaults to 1 MiB.
+    :param int max_chunk_size:
+        The largest chunk size to use, in bytes. Defaults to 32 MiB. For uploads this
+        must not exceed the maximum block size of the service.
+    :param int max_concurrency:
+        The largest number of requests in flight. Defaults to 16. The `max_concurrency` given
+        to a transfer lowers it for that transfer.
+    :param float threshold:
+        The relative throughput gain required to keep a change. Defaults to 0.05 (5%).
+    """
+
+    def __init__(self, min_chunk_size=1 * _MB, max_chunk_size=32 * _MB, max_concurrency=16, threshold=0.05):
+        if not 0 < min_chunk_size <= max_chunk_size:
+            raise ValueError("min_chunk_size must be positive, and not greater than max_chunk_size.")
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be greater than 0.")
+        self.min_chunk_size = min_chunk_size
+        self.max_chunk_size = max_chunk_size
+        self.max_concurrency = max_concurrency
+        self.threshold = threshold
+
+        # Current settings, read by the transfers
+        self.chunk_size = None
+        self.concurrency = None
+        self._concurrency_limit = max_concurrency
+
+        self._lock = Lock()
+        self._best = None
+        self._best_settings = None
+        self._knob = 0
+        self._misses = 0
+        self._reset_stats()
+
+    def _reset_stats(self):
+        self._started = time.time()
+        self._finished = self._started
+        self._history = []
+        self._bytes = 0
+        self._chunks = 0
+        self._latency = 0.0
+        self._window_started = self._started
+        self._window_bytes = 0
+        self._window_chunks = 0
+
+    def start(self, chunk_size, concurrency, limit=None):
+        """Start measuring a transfer.
+
+        The given settings are used unless the tuner already ran a transfer.
+
+        :param int chunk_size: The configured chunk size of the transfer.
+        :param int concurrency: The configured concurrency of the transfer.
+        :param int limit:
+            The largest concurrency of the transfer, below the max_concurrency of the tuner.
+            Defaults to the max_concurrency of the tuner.
+        """
+        with self._lock:
+            self._concurrency_limit = self.max_concurrency if limit is None else \
+                min(max(limit, 1), self.max_concurrency)
+            if self.chunk_size is None:
+                self.chunk_size = min(max(chunk_size, self.min_chunk_size), self.max_chunk_size)
+                self.concurrency = max(concurrency, 1)
+            self.concurrency = min(self.concurrency, self._concurrency_limit)
+            self._reset_stats()
+
+    def record(self, length, elapsed):
+        """Record a chunk transferred, and adjust the settings at the end of a window.
+
+        :param int length: The size of the chunk, in bytes.
+        :param float elapsed: The time taken by the chunk request, in seconds.
+        """
+        now = time.time()
+        with self._lock:
+            self._finished = now
+            self._bytes += length
+            self._chunks += 1
+            self._latency += elapsed
+            self._window_bytes += length
+            self._window_chunks += 1
+            if self._window_chunks < max(self.concurrency, 2):
+                return
+            throughput = self._window_bytes / max(now - self._window_started, 1e-6) / _MB
+            self._history.append((self.chunk_size, self.concurrency, throughput))
+            self._adjust(throughput)
+            self._window_started = now
+            self._window_bytes = 0
+            self._window_chunks = 0
+
+    def _adjust(self, throughput):
+        if self._best is None or throughput >= self._best * (1 + self.threshold):
+            self._best = throughput
+            self._best_settings = (self.chunk_size, self.concurrency)
+            self._misses = 0
+            if not self._grow():
+                self._knob = 1 - self._knob
+                self._grow()
+        elif throughput < self._best / 2:
+            # Congestion: back off and start tuning over
+            self.chunk_size = max(self.chunk_size // 2, self.min_chunk_size)
+            self.concurrency = max(self.concurrency // 2, 1)
+            self._best = None
+            self._knob = 0
+            self._misses = 0
+        elif self._misses < 2:
+            # No gain: revert, and try growing the other knob
+            self.chunk_size, self.concurrency = self._best_settings
+            self._misses += 1
+            self._knob = 1 - self._knob
+            if self._misses < 2:
+                self._grow()
+
+    def _grow(self):
+        if self._knob == 0 and self.chunk_size < self.max_chunk_size:
+            self.chunk_size = min(self.chunk_size * 2, self.max_chunk_size)
+            return True
+        if self._knob == 1 and self.concurrency < self._concurrency_limit:
+            self.concurrency = min(self.concurrency * 2, self._concurrency_limit)
+            return True
+        return False
+
+    def report(self):
+        """Report on the last transfer.
+
+        :rtype: ~azure.storage.blob.TransferReport
+        """
+        with self._lock:
+            return TransferReport(
+                chunk_size=self.chunk_size,
+                max_concurrency=self.concurrency,
+                bytes_transferred=self._bytes,
+                chunks=self._chunks,
+                elapsed=self._finished - self._started,
+                average_latency=self._latency / self._chunks if self._chunks else 0.0,
+                history=list(self._history))
+
+
+def concurrency_limit(tuner, max_concurrency):
+    """The largest number of requests a transfer may have in flight.
+
+    The max_concurrency given by the caller is an upper limit for the tuner. If it is None,
+    the tuner chooses the concurrency, up to its own max_concurrency.
+
+    :rtype: int
+    """
+    if tuner is None:
+        return max_concurrency
+    if max_concurrency is None:
+        return tuner.max_concurrency
+    return min(max(max_concurrency, 1), tuner.max_concurrency)
+
+
+def start_tuner(tuner, chunk_size, max_concurrency):
+    """Start a transfer with an optional tuner.
+
+    :param int max_concurrency:
+        The concurrency set by the caller, which the tuner cannot exceed. With a tuner, None
+        lets the tuner choose it, starting from a single request in flight.
+    :returns: The largest number of requests the transfer may have in flight.
+    :rtype: int
+    """
+    limit = concurrency_limit(tuner, max_concurrency)
+    if tuner is not None:
+        tuner.start(chunk_size, limit if max_concurrency is not None else 1, limit)
+    return limit
@@ -0,0 +1,235 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+
+from typing import (  # pylint: disable=unused-import
+    Optional, Any, Callable, Dict, List, Tuple, TypeVar, TYPE_CHECKING
+)
+
+from azure.core.exceptions import ResourceExistsError
+from azure.core.tracing.common import with_current_context
+
+from ._file_client import ShareFileClient
+from ._shared.transfers import FileTransfer, TransferManagerBase, local_path, walk_local_files
+
+if TYPE_CHECKING:
+    from ._shared.transfers import DirectoryTransferReport
+    ShareDirectoryClient = TypeVar("ShareDirectoryClient")
+
+# The largest range written by a Put Range From URL
+_COPY_RANGE_SIZE = 4 * 1024 * 1024
+
+
+def copy_ranges(ranges, range_size=_COPY_RANGE_SIZE):
+    # type: (List[Dict[str, int]], int) -> List[Tuple[int, int]]
+    """Split the ranges of a file holding data into the ranges of a server-side copy.
+
+    :param list[dict[str, int]] ranges:
+        The ranges returned by `get_ranges`, with inclusive 'start' and 'end' offsets.
+    :returns: The (offset, length) of the ranges to copy, of up to `range_size` bytes each.
+    :rtype: list[tuple[int, int]]
+    """
+    return [(offset, min(range_size, file_range['end'] + 1 - offset))
+            for file_range in ranges
+            for offset in range(file_range['start'], file_range['end'] + 1, range_size)]
+
+
+class ShareTransferManager(TransferManagerBase):
+    """Upload and download directory trees to and from a directory of a share, or copy files into it.
+
+    Up to `max_file_concurrency` files are transferred in parallel, and the ranges of large
+    files are scheduled on a single pool of `max_concurrency` threads, shared by all the
+    files instead of a pool per file. A file whose transfer fails with an error that the
+    pipeline does not retry, like a connection dropped while streaming, is transferred again.
+    The copies are made by the service, range by range, and no data goes through the client.
+
+    :param directory_client: The client of the directory.
+    :type directory_client: ~azure.storage.fileshare.ShareDirectoryClient
+    :param int max_concurrency:
+        The largest number of range requests in flight, across all the files.
+        Defaults to 8.
+    :param int max_file_concurrency: The largest number of files in progress. Defaults to 8.
+    :param int max_retries:
+        The number of times the transfer of a file is started over after an error.
+        Defaults to 2.
+    :param callable progress_hook:
+        A callback called with the :class:`~azure.storage.fileshare.FileTransfer` of each file,
+        once it is transferred or failed.
+    """
+
+    def __init__(
+            self, directory_client,  # type: ShareDirectoryClient
+            max_concurrency=8,  # type: int
+            max_file_concurrency=8,  # type: int
+            max_retries=2,  # type: int
+            progress_hook=None  # type: Optional[Callable[[FileTransfer], None]]
+        ):
+        # type: (...) -> None
+        super(ShareTransferManager, self).__init__(
+            max_concurrency=max_concurrency,
+            max_file_concurrency=max_file_concurrency,
+            max_retries=max_retries,
+            progress_hook=progress_hook)
+        self.directory_client = directory_client
+
+    def _create_directory(self, directory, timeout):
+        try:
+            self.directory_client.get_subdirectory_client(directory).create_directory(timeout=timeout)
+        except ResourceExistsError:
+            pass
+
+    def upload_directory(self, source, **kwargs):
+        # type: (str, **Any) -> DirectoryTransferReport
+        """Upload the files under a local directory, creating the subdirectories needed.
+
+        :param str source: The path of the local directory.
+        :keyword ~azure.storage.fileshare.ContentSettings content_settings:
+            The ContentSettings of the files.
+        :keyword bool sparse:
+            If true, the ranges of the files made only of zeros are not uploaded, and stay
+            empty in the files created.
+        :keyword int timeout:
+            The timeout parameter is expressed in seconds.
+        :returns: The report of the transfer, listing the files transferred and failed.
+        :rtype: ~azure.storage.fileshare.DirectoryTransferReport
+        """
+        timeout = kwargs.get('timeout')
+        kwargs.update(self._transfer_options())
+        created = set([""])
+
+        def describe(transfer):
+            # The subdirectories are created in order, before the files in them are started
+            parts = transfer.name.split("/")[:-1]
+            for depth in range(1, len(parts) + 1):
+                directory = "/".join(parts[:depth])
+                if directory not in created:
+                    self._create_directory(directory, timeout)
+                    created.add(directory)
+            return transfer
+
+        def upload(transfer):
+            with open(transfer.path, "rb") as data:
+                self.directory_client.get_file_client(transfer.name).upload_file(
+                    data, length=transfer.size, **kwargs)
+
+        return self._run(walk_local_files(source), upload, describe)
+
+    def download_directory(self, destination, **kwargs):
+        # type: (str, **Any) -> DirectoryTransferReport
+        """Download the files of the directory and its subdirectories into a local directory.
+
+        :param str destination: The path of the local directory.
+        :keyword bool sparse:
+            If true, the empty ranges of the files are not downloaded, and are left as
+            holes of sparse local files.
+        :keyword int timeout:
+            The timeout parameter is expressed in seconds.
+        :returns: The report of the transfer, listing the files transferred and failed.
+        :rtype: ~azure.storage.fileshare.DirectoryTransferReport
+        """
+        timeout = kwargs.get('timeout')
+        kwargs.update(self._transfer_options())
+
+        def list_files():
+            directories = [""]
+            while directories:
+                directory = directories.pop(0)
+                client = self.directory_client.get_subdirectory_client(directory) if directory \
+                    else self.directory_client
+                for item in client.list_directories_and_files(timeout=timeout):
+                    name = directory + "/" + item['name'] if directory else item['name']
+                    if item['is_directory']:
+                        directories.append(name)
+                    else:
+                        yield FileTransfer(name, None, item['size'])
+
+        def download(transfer):
+            transfer.path = local_path(destination, transfer.name)
+            downloader = self.directory_client.get_file_client(transfer.name).download_file(**kwargs)
+            with open(transfer.path, "wb") as stream:
+                downloader.readinto(stream)
+
+        return self._run(list_files(), download)
+
+    def _copy(self, target_client, source_client, source_url, **kwargs):
+        # type: (ShareFileClient, ShareFileClient, str, **Any) -> Dict[str, Any]
+        timeout = kwargs.get('timeout')
+        source = source_client.get_file_properties(timeout=timeout)
+        ranges = copy_ranges(source_client.get_ranges(timeout=timeout), kwargs.pop('range_size', _COPY_RANGE_SIZE))
+        responses = [target_client.create_file(
+            source.size, content_settings=source.content_settings, metadata=source.metadata, **kwargs)]
+
+        def write(file_range):
+            offset, length = file_range
+            return target_client.upload_range_from_url(source_url, offset, length, offset, timeout=timeout)
+
+        if self._executor is None:
+            responses.extend(write(file_range) for file_range in ranges)
+        else:
+            futures = [self._executor.submit(with_current_context(write), file_range) for file_range in ranges]
+            responses.extend(future.result() for future in futures)
+        return sorted(responses, key=lambda r: r.get('last_modified'))[-1]
+
+    def copy_file(self, source_url, name, **kwargs):
+        # type: (str, str, **Any) -> Dict[str, Any]
+        """Copy a file, from any share or account, to a file of the directory.
+
+        The target is created at the size of the source, with its content settings and
+        metadata, and the ranges of the source holding data are copied by the service with
+        concurrent `upload_range_from_url` calls, on the shared pool. The empty ranges of
+        the source are not copied, and stay empty in the target.
+
+        :param str source_url:
+            The URL of the source file, authorized with a SAS or public access.
+        :param str name: The path of the target file, from the directory.
+        :keyword int range_size: The size of the ranges copied, up to 4 MiB. Defaults to 4 MiB.
+        :keyword int timeout:
+            The timeout parameter is expressed in seconds, for each request.
+        :returns: File-updated property dict (Etag and last modified).
+        :rtype: dict[str, Any]
+        """
+        return self._copy(
+            self.directory_client.get_file_client(name), ShareFileClient.from_file_url(source_url), source_url,
+            **kwargs)
+
+    def copy_directory(self, source_directory_client, **kwargs):
+        # type: (ShareDirectoryClient, **Any) -> DirectoryTransferReport
+        """Copy a directory tree, from any share or account, into the directory.
+
+        The source is walked with :func:`~azure.storage.fileshare.ShareDirectoryClient.walk_directories_and_files`,
+        its subdirectories are created, and its files copied by the service with :func:`copy_file`,
+        up to `max_file_concurrency` at once, while the ranges of all of them share the pool
+        of `max_concurrency` requests.
+
+        :param source_directory_client: The client of the source directory.
+        :type source_directory_client: ~azure.storage.fileshare.ShareDirectoryClient
+        :keyword str source_sas:
+            A SAS token authorizing the service to read the source files, if the source
+            directory client is not authorized with one.
+        :keyword int range_size: The size of the ranges copied, up to 4 MiB. Defaults to 4 MiB.
+        :keyword int timeout:
+            The timeout parameter is expressed in seconds, for each request.
+        :returns: The report of the copy, listing the files copied and failed.
+        :rtype: ~azure.storage.fileshare.DirectoryTransferReport
+        """
+        timeout = kwargs.get('timeout')
+        source_sas = (kwargs.pop('source_sas', None) or "").lstrip("?")
+
+        def list_files():
+            # A directory is listed before its entries, so it is created before them
+            for item in source_directory_client.walk_directories_and_files(timeout=timeout):
+                if item['is_directory']:
+                    self._create_directory(item['name'], timeout)
+                else:
+                    yield FileTransfer(item['name'], None, item['size'])
+
+        def copy(transfer):
+            source_client = source_directory_client.get_file_client(transfer.name)
+            source_url = source_client.url
+            if source_sas:
+                source_url += ("&" if "?" in source_url else "?") + source_sas
+            self._copy(self.directory_client.get_file_client(transfer.name), source_client, source_url, **kwargs)
+
+        return self._run(list_files(), copy)
@@ -9,6 +9,7 @@ from ._directory_client_async import ShareDirectoryClient
 from ._share_client_async import ShareClient
 from ._share_service_client_async import ShareServiceClient
 from ._lease_async import ShareLeaseClient
+from ._transfer_manager_async import ShareTransferManager
 
 
 __all__ = [
@@ -17,4 +18,5 @@ __all__ = [
     'ShareClient',
     'ShareServiceClient',
     'ShareLeaseClient',
+    'ShareTransferManager',
 ]
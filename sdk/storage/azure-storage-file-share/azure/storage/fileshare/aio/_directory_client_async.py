@@ -7,7 +7,7 @@
 import functools
 import time
 from typing import ( # pylint: disable=unused-import
-    Optional, Union, Any, Dict, TYPE_CHECKING
+    Optional, Union, Any, Dict, AsyncIterator, TYPE_CHECKING
 )
 
 from azure.core.async_paging import AsyncItemPaged
@@ -28,11 +28,12 @@ from .._deserialize import deserialize_directory_properties
 from .._serialize import get_api_version
 from .._directory_client import ShareDirectoryClient as ShareDirectoryClientBase
 from ._file_client_async import ShareFileClient
+from ._directory_walker_async import AsyncDirectoryWalker
 from ._models import DirectoryPropertiesPaged, HandlesPaged
 
 if TYPE_CHECKING:
     from datetime import datetime
-    from .._models import ShareProperties, DirectoryProperties, ContentSettings, NTFSAttributes
+    from .._models import ShareProperties, DirectoryProperties, ContentSettings, NTFSAttributes, FileProperties
     from .._generated.models import HandleItem
 
 
@@ -239,6 +240,38 @@ class ShareDirectoryClient(AsyncStorageAccountHostsMixin, ShareDirectoryClientBa
             command, prefix=name_starts_with, results_per_page=results_per_page,
             page_iterator_class=DirectoryPropertiesPaged)
 
+    @distributed_trace
+    def walk_directories_and_files(self, **kwargs):
+        # type: (Any) -> AsyncIterator[Union[Dict[str, Any], FileProperties]]
+        """Returns an async iterator to list the directories and files of the directory tree,
+        listing the subdirectories concurrently.
+
+        The subdirectories are listed as they are found, up to `max_concurrency` listings
+        at a time, and the directories and files are returned as their pages are received,
+        with their path from this directory as name, e.g. "logs/2020/app.log". The order of
+        the items is not defined.
+
+        :keyword int max_concurrency:
+            The largest number of requests in flight. Defaults to 8.
+        :keyword bool include_properties:
+            Whether to fetch the properties of each file, with up to `max_concurrency` requests
+            in flight shared with the listings, and return them instead of the listed items.
+            Defaults to False.
+        :keyword int results_per_page:
+            The maximum number of directories and files to retrieve per listing call.
+        :keyword int timeout:
+            The timeout parameter is expressed in seconds, for each request.
+        :returns:
+            An async iterator of the dict-like DirectoryProperties and FileProperties listed, or
+            the FileProperties of the files with `include_properties`. If the iteration stops
+            before the end, awaiting its `close()` cancels the listings in progress.
+        :rtype: AsyncIterator[dict(str, Any) or ~azure.storage.fileshare.FileProperties]
+        """
+        max_concurrency = kwargs.pop('max_concurrency', 8)
+        include_properties = kwargs.pop('include_properties', False)
+        properties_options = {'timeout': kwargs.get('timeout')}
+        return AsyncDirectoryWalker(self, max_concurrency, include_properties, kwargs, properties_options)
+
     @distributed_trace
     def list_handles(self, recursive=False, **kwargs):
         # type: (bool, Any) -> AsyncItemPaged
@@ -0,0 +1,98 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+
+import asyncio
+
+from .._directory_walker import MAX_BUFFERED_PAGES, DirectoryWalkerBase, _TaskDone
+
+
+class AsyncDirectoryWalker(DirectoryWalkerBase):
+    """Walk a directory tree as tasks, as an async iterator.
+
+    The listings put their pages in a bounded queue. If the iteration stops before the end,
+    the `close()` coroutine cancels the listings in progress.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super(AsyncDirectoryWalker, self).__init__(*args, **kwargs)
+        self._output = None
+        self._tasks = set()
+        self._items = iter(())
+        self._done = False
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        if self._output is None:
+            self._output = asyncio.Queue(MAX_BUFFERED_PAGES * self.max_concurrency)
+        while True:
+            try:
+                return next(self._items)
+            except StopIteration:
+                pass
+            if self._done:
+                raise StopAsyncIteration
+            task = self._next_task()
+            while task is not None:
+                is_directory, path = task
+                self._start(self._list_directory(path) if is_directory else self._get_properties(path))
+                task = self._next_task()
+            if not self._running:
+                self._done = True
+                raise StopAsyncIteration
+            item = await self._output.get()
+            if isinstance(item, _TaskDone):
+                self._running -= 1
+                if item.error is not None:
+                    await self.close()
+                    raise item.error
+                continue
+            self._items = iter(self._discover(*item))
+
+    async def close(self):
+        """Cancel the listings in progress."""
+        self._done = True
+        self._items = iter(())
+        tasks = [task for task in self._tasks if not task.done()]
+        self._tasks = set()
+        for task in tasks:
+            task.cancel()
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    def _start(self, coro):
+        task = asyncio.ensure_future(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _list_directory(self, path):
+        error = None
+        try:
+            pages = self._directory_client(path).list_directories_and_files(**self.list_options).by_page()
+            async for page in pages:
+                entries = []
+                async for entry in page:
+                    entries.append(entry)
+                await self._output.put((path, entries))
+        except asyncio.CancelledError:  # pylint: disable=try-except-raise
+            raise
+        except Exception as exc:  # pylint: disable=broad-except
+            error = exc
+        await self._output.put(_TaskDone(error))
+
+    async def _get_properties(self, path):
+        error = None
+        try:
+            properties = await self.directory_client.get_file_client(path).get_file_properties(
+                **self.properties_options)
+            properties.name = path
+            await self._output.put((None, [properties]))
+        except asyncio.CancelledError:  # pylint: disable=try-except-raise
+            raise
+        except Exception as exc:  # pylint: disable=broad-except
+            error = exc
+        await self._output.put(_TaskDone(error))
@@ -11,19 +11,24 @@ from itertools import islice
 import warnings
 
 from azure.core.exceptions import HttpResponseError
+from .._shared.checksums import content_checksum
 from .._shared.encryption import decrypt_blob
 from .._shared.request_handlers import validate_and_format_range_headers
 from .._shared.response_handlers import process_storage_error, parse_length_from_content_range
-from .._download import process_range_and_offset, _ChunkDownloader
+from .._download import process_range_and_offset, empty_chunk, leaves_holes, _ChunkDownloader
 
 
-async def process_content(data, start_offset, end_offset, encryption):
+async def process_content(data, start_offset, end_offset, encryption, validate_content=None):
     if data is None:
         raise ValueError("Response cannot be None.")
     try:
         content = data.response.body()
     except Exception as error:
         raise HttpResponseError(message="Download stream interrupted.", response=data.response, error=error)
+    checksum = content_checksum(validate_content)
+    if checksum is not None:
+        checksum.update(content)
+        checksum.check(data.response.headers, response=data.response)
     if encryption.get('key') is not None or encryption.get('resolver') is not None:
         try:
             return decrypt_blob(
@@ -50,6 +55,9 @@ class _AsyncChunkDownloader(_ChunkDownloader):
 
     async def process_chunk(self, chunk_start):
         chunk_start, chunk_end = self._calculate_range(chunk_start)
+        if self._skip_empty_chunk(chunk_start, chunk_end):
+            await self._update_progress(chunk_end - chunk_start)
+            return
         chunk_data = await self._download_chunk(chunk_start, chunk_end - 1)
         length = chunk_end - chunk_start
         if length > 0:
@@ -76,6 +84,9 @@ class _AsyncChunkDownloader(_ChunkDownloader):
             self.stream.write(chunk_data)
 
     async def _download_chunk(self, chunk_start, chunk_end):
+        # The empty chunks are not downloaded, but made of zeros locally
+        if self._is_empty(chunk_start, chunk_end):
+            return empty_chunk(chunk_end - chunk_start + 1)
         download_range, offset = process_range_and_offset(
             chunk_start, chunk_end, chunk_end, self.encryption_options
         )
@@ -96,7 +107,8 @@ class _AsyncChunkDownloader(_ChunkDownloader):
         except HttpResponseError as error:
             process_storage_error(error)
 
-        chunk_data = await process_content(response, offset[0], offset[1], self.encryption_options)
+        chunk_data = await process_content(
+            response, offset[0], offset[1], self.encryption_options, self.validate_content)
         return chunk_data
 
 
@@ -171,6 +183,8 @@ class StorageStreamDownloader(object):  # pylint: disable=too-many-instance-attr
             path=None,
             share=None,
             encoding=None,
+            executor=None,
+            sparse=False,
             **kwargs
     ):
         self.name = name
@@ -184,6 +198,8 @@ class StorageStreamDownloader(object):  # pylint: disable=too-many-instance-attr
         self._start_range = start_range
         self._end_range = end_range
         self._max_concurrency = max_concurrency
+        self._executor = executor
+        self._sparse = sparse
         self._encoding = encoding
         self._validate_content = validate_content
         self._encryption_options = encryption_options or {}
@@ -192,6 +208,7 @@ class StorageStreamDownloader(object):  # pylint: disable=too-many-instance-attr
         self._download_complete = False
         self._current_content = None
         self._file_size = None
+        self._non_empty_ranges = None
         self._response = None
 
         # The service only provides transactional MD5s for chunks under 4MB.
@@ -242,7 +259,8 @@ class StorageStreamDownloader(object):  # pylint: disable=too-many-instance-attr
                 self._response,
                 self._initial_offset[0],
                 self._initial_offset[1],
-                self._encryption_options
+                self._encryption_options,
+                self._validate_content
             )
 
     async def _initial_request(self):
@@ -301,8 +319,25 @@ class StorageStreamDownloader(object):  # pylint: disable=too-many-instance-attr
         # If file size is large, download the rest of the file in chunks.
         if response.properties.size == self.size:
             self._download_complete = True
+        elif self._sparse:
+            self._non_empty_ranges = await self._get_ranges()
         return response
 
+    async def _get_ranges(self):
+        # The ranges holding data in the rest of the download, for its empty chunks to be skipped
+        data_end = self._file_size
+        if self._end_range is not None:
+            data_end = min(self._file_size, self._end_range + 1)
+        try:
+            ranges = await self._client.get_range_list(
+                range='bytes={0}-{1}'.format(self._initial_range[1] + 1, data_end - 1),
+                lease_access_conditions=self._request_options.get('lease_access_conditions'),
+                timeout=self._request_options.get('timeout'))
+        except HttpResponseError:
+            # A heavily fragmented file may fail to list its ranges, it is then downloaded in full
+            return None
+        return [{'start': file_range.start, 'end': file_range.end} for file_range in ranges]
+
     def chunks(self):
         """Iterate over chunks in the download stream.
 
@@ -326,6 +361,7 @@ class StorageStreamDownloader(object):  # pylint: disable=too-many-instance-attr
                 parallel=False,
                 validate_content=self._validate_content,
                 encryption_options=self._encryption_options,
+                non_empty_ranges=self._non_empty_ranges,
                 use_location=self._location_mode,
                 **self._request_options)
         return _AsyncChunkIterator(
@@ -387,7 +423,9 @@ class StorageStreamDownloader(object):  # pylint: disable=too-many-instance-attr
         :param stream:
             The stream to download to. This can be an open file-handle,
             or any writable stream. The stream must be seekable if the download
-            uses more than one parallel connection.
+            uses more than one parallel connection. When a download with `sparse`
+            is written to the end of a file, its empty ranges are skipped over rather
+            than written, leaving them as holes of a sparse file.
         :returns: The number of bytes read.
         :rtype: int
         """
@@ -424,28 +462,37 @@ class StorageStreamDownloader(object):  # pylint: disable=too-many-instance-attr
             parallel=parallel,
             validate_content=self._validate_content,
             encryption_options=self._encryption_options,
+            non_empty_ranges=self._non_empty_ranges,
+            sparse=self._non_empty_ranges is not None and leaves_holes(stream),
             use_location=self._location_mode,
             **self._request_options)
 
+        # A shared executor bounds the requests in flight across transfers
+        schedule = self._executor.submit if self._executor is not None else asyncio.ensure_future
         dl_tasks = downloader.get_chunk_offsets()
         running_futures = [
-            asyncio.ensure_future(downloader.process_chunk(d))
+            schedule(downloader.process_chunk(d))
             for d in islice(dl_tasks, 0, self._max_concurrency)
         ]
         while running_futures:
             # Wait for some download to finish before adding a new one
-            _done, running_futures = await asyncio.wait(
+            done, running_futures = await asyncio.wait(
                 running_futures, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                task.result()
             try:
                 next_chunk = next(dl_tasks)
             except StopIteration:
                 break
             else:
-                running_futures.add(asyncio.ensure_future(downloader.process_chunk(next_chunk)))
+                running_futures.add(schedule(downloader.process_chunk(next_chunk)))
 
         if running_futures:
             # Wait for the remaining downloads to finish
-            await asyncio.wait(running_futures)
+            done, _running = await asyncio.wait(running_futures)
+            for task in done:
+                task.result()
+        downloader.finish_stream()
         return self.size
 
     async def download_to_stream(self, stream, max_concurrency=1):
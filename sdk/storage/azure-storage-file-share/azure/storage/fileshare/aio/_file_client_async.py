@@ -53,6 +53,8 @@ async def _upload_file_helper(
     file_last_write_time="now",
     file_permission=None,
     file_permission_key=None,
+    executor=None,
+    sparse=False,
     **kwargs
 ):
     try:
@@ -78,10 +80,15 @@ async def _upload_file_helper(
             chunk_size=file_settings.max_range_size,
             stream=stream,
             max_concurrency=max_concurrency,
+            executor=executor,
+            sparse=sparse,
             validate_content=validate_content,
             timeout=timeout,
             **kwargs
         )
+        if not responses:
+            # The data was all zeros, as the file created
+            return response
         return sorted(responses, key=lambda r: r.get('last_modified'))[-1]
     except StorageErrorException as error:
         process_storage_error(error)
@@ -289,6 +296,9 @@ class ShareFileClient(AsyncStorageAccountHostsMixin, ShareFileClientBase):
         # type: (...) -> Dict[str, Any]
         """Uploads a new file.
 
+        The file is created at its full length, filled with zeros, and the ranges of the data
+        made only of zeros are not uploaded, leaving them empty, without storage.
+
         :param Any data:
             Content of the file.
         :param int length:
@@ -330,6 +340,9 @@ class ShareFileClient(AsyncStorageAccountHostsMixin, ShareFileClientBase):
             file.
         :keyword int max_concurrency:
             Maximum number of parallel connections to use.
+        :keyword bool sparse:
+            If true, the ranges of the data made only of zeros are not uploaded, and stay
+            empty in the file created. Defaults to False.
         :keyword str encoding:
             Defaults to UTF-8.
         :keyword lease:
@@ -578,6 +591,11 @@ class ShareFileClient(AsyncStorageAccountHostsMixin, ShareFileClientBase):
             file. Also note that if enabled, the memory-efficient upload algorithm
             will not be used, because computing the MD5 hash requires buffering
             entire blocks, and doing so defeats the purpose of the memory-efficient algorithm.
+        :keyword bool sparse:
+            If true, and the file is larger than a single get, the ranges of the file holding
+            data are listed with a single request, and the chunks between them are not
+            downloaded. When such a download is written to the end of a local file, the
+            empty chunks are skipped over, leaving them as holes of a sparse file.
         :keyword lease:
             Required if the file has an active lease. Value can be a ShareLeaseClient object
             or the lease ID as a string.
@@ -0,0 +1,228 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+
+import asyncio
+from typing import (  # pylint: disable=unused-import
+    Optional, Any, Callable, Dict, TypeVar, TYPE_CHECKING
+)
+
+from azure.core.exceptions import ResourceExistsError
+
+from .._shared.transfers import FileTransfer, local_path, walk_local_files
+from .._shared.transfers_async import AsyncTransferManagerBase
+from .._transfer_manager import _COPY_RANGE_SIZE, copy_ranges
+from ._file_client_async import ShareFileClient
+
+if TYPE_CHECKING:
+    from .._shared.transfers import DirectoryTransferReport
+    ShareDirectoryClient = TypeVar("ShareDirectoryClient")
+
+
+class ShareTransferManager(AsyncTransferManagerBase):
+    """Upload and download directory trees to and from a directory of a share, or copy files into it.
+
+    Up to `max_file_concurrency` files are transferred in parallel, and the ranges of large
+    files are scheduled on a single pool running at most `max_concurrency` of them at once,
+    shared by all the files. A file whose transfer fails with an error that the pipeline
+    does not retry, like a connection dropped while streaming, is transferred again.
+    The copies are made by the service, range by range, and no data goes through the client.
+
+    :param directory_client: The client of the directory.
+    :type directory_client: ~azure.storage.fileshare.aio.ShareDirectoryClient
+    :param int max_concurrency:
+        The largest number of range requests in flight, across all the files.
+        Defaults to 8.
+    :param int max_file_concurrency: The largest number of files in progress. Defaults to 8.
+    :param int max_retries:
+        The number of times the transfer of a file is started over after an error.
+        Defaults to 2.
+    :param callable progress_hook:
+        A callback called with the :class:`~azure.storage.fileshare.FileTransfer` of each file,
+        once it is transferred or failed.
+    """
+
+    def __init__(
+            self, directory_client,  # type: ShareDirectoryClient
+            max_concurrency=8,  # type: int
+            max_file_concurrency=8,  # type: int
+            max_retries=2,  # type: int
+            progress_hook=None  # type: Optional[Callable[[FileTransfer], None]]
+        ):
+        # type: (...) -> None
+        super(ShareTransferManager, self).__init__(
+            max_concurrency=max_concurrency,
+            max_file_concurrency=max_file_concurrency,
+            max_retries=max_retries,
+            progress_hook=progress_hook)
+        self.directory_client = directory_client
+
+    async def _create_directory(self, directory, timeout):
+        try:
+            await self.directory_client.get_subdirectory_client(directory).create_directory(timeout=timeout)
+        except ResourceExistsError:
+            pass
+
+    async def upload_directory(self, source, **kwargs):
+        # type: (str, **Any) -> DirectoryTransferReport
+        """Upload the files under a local directory, creating the subdirectories needed.
+
+        :param str source: The path of the local directory.
+        :keyword ~azure.storage.fileshare.ContentSettings content_settings:
+            The ContentSettings of the files.
+        :keyword bool sparse:
+            If true, the ranges of the files made only of zeros are not uploaded, and stay
+            empty in the files created.
+        :keyword int timeout:
+            The timeout parameter is expressed in seconds.
+        :returns: The report of the transfer, listing the files transferred and failed.
+        :rtype: ~azure.storage.fileshare.DirectoryTransferReport
+        """
+        timeout = kwargs.get('timeout')
+        kwargs.update(self._transfer_options())
+        transfers = list(walk_local_files(source))
+
+        # The subdirectories are created in order, before the files in them are started
+        created = set([""])
+        for transfer in transfers:
+            parts = transfer.name.split("/")[:-1]
+            for depth in range(1, len(parts) + 1):
+                directory = "/".join(parts[:depth])
+                if directory not in created:
+                    await self._create_directory(directory, timeout)
+                    created.add(directory)
+
+        async def upload(transfer):
+            with open(transfer.path, "rb") as data:
+                await self.directory_client.get_file_client(transfer.name).upload_file(
+                    data, length=transfer.size, **kwargs)
+
+        return await self._run(transfers, upload)
+
+    async def download_directory(self, destination, **kwargs):
+        # type: (str, **Any) -> DirectoryTransferReport
+        """Download the files of the directory and its subdirectories into a local directory.
+
+        :param str destination: The path of the local directory.
+        :keyword bool sparse:
+            If true, the empty ranges of the files are not downloaded, and are left as
+            holes of sparse local files.
+        :keyword int timeout:
+            The timeout parameter is expressed in seconds.
+        :returns: The report of the transfer, listing the files transferred and failed.
+        :rtype: ~azure.storage.fileshare.DirectoryTransferReport
+        """
+        timeout = kwargs.get('timeout')
+        kwargs.update(self._transfer_options())
+
+        transfers = []
+        directories = [""]
+        while directories:
+            directory = directories.pop(0)
+            client = self.directory_client.get_subdirectory_client(directory) if directory \
+                else self.directory_client
+            async for item in client.list_directories_and_files(timeout=timeout):
+                name = directory + "/" + item['name'] if directory else item['name']
+                if item['is_directory']:
+                    directories.append(name)
+                else:
+                    transfers.append(FileTransfer(name, None, item['size']))
+
+        async def download(transfer):
+            transfer.path = local_path(destination, transfer.name)
+            downloader = await self.directory_client.get_file_client(transfer.name).download_file(**kwargs)
+            with open(transfer.path, "wb") as stream:
+                await downloader.readinto(stream)
+
+        return await self._run(transfers, download)
+
+    async def _copy(self, target_client, source_client, source_url, **kwargs):
+        # type: (ShareFileClient, ShareFileClient, str, **Any) -> Dict[str, Any]
+        timeout = kwargs.get('timeout')
+        source = await source_client.get_file_properties(timeout=timeout)
+        ranges = copy_ranges(
+            await source_client.get_ranges(timeout=timeout), kwargs.pop('range_size', _COPY_RANGE_SIZE))
+        responses = [await target_client.create_file(
+            source.size, content_settings=source.content_settings, metadata=source.metadata, **kwargs)]
+
+        async def write(file_range):
+            offset, length = file_range
+            return await target_client.upload_range_from_url(source_url, offset, length, offset, timeout=timeout)
+
+        if self._pool is None:
+            for file_range in ranges:
+                responses.append(await write(file_range))
+        else:
+            results = await asyncio.gather(
+                *[self._pool.submit(write(file_range)) for file_range in ranges], return_exceptions=True)
+            for result in results:
+                if isinstance(result, BaseException):
+                    raise result
+            responses.extend(results)
+        return sorted(responses, key=lambda r: r.get('last_modified'))[-1]
+
+    async def copy_file(self, source_url, name, **kwargs):
+        # type: (str, str, **Any) -> Dict[str, Any]
+        """Copy a file, from any share or account, to a file of the directory.
+
+        The target is created at the size of the source, with its content settings and
+        metadata, and the ranges of the source holding data are copied by the service with
+        concurrent `upload_range_from_url` calls, on the shared pool. The empty ranges of
+        the source are not copied, and stay empty in the target.
+
+        :param str source_url:
+            The URL of the source file, authorized with a SAS or public access.
+        :param str name: The path of the target file, from the directory.
+        :keyword int range_size: The size of the ranges copied, up to 4 MiB. Defaults to 4 MiB.
+        :keyword int timeout:
+            The timeout parameter is expressed in seconds, for each request.
+        :returns: File-updated property dict (Etag and last modified).
+        :rtype: dict[str, Any]
+        """
+        async with ShareFileClient.from_file_url(source_url) as source_client:
+            return await self._copy(
+                self.directory_client.get_file_client(name), source_client, source_url, **kwargs)
+
+    async def copy_directory(self, source_directory_client, **kwargs):
+        # type: (ShareDirectoryClient, **Any) -> DirectoryTransferReport
+        """Copy a directory tree, from any share or account, into the directory.
+
+        The source is walked with
+        :func:`~azure.storage.fileshare.aio.ShareDirectoryClient.walk_directories_and_files`,
+        its subdirectories are created, and its files copied by the service with :func:`copy_file`,
+        up to `max_file_concurrency` at once, while the ranges of all of them share the pool
+        of `max_concurrency` requests.
+
+        :param source_directory_client: The client of the source directory.
+        :type source_directory_client: ~azure.storage.fileshare.aio.ShareDirectoryClient
+        :keyword str source_sas:
+            A SAS token authorizing the service to read the source files, if the source
+            directory client is not authorized with one.
+        :keyword int range_size: The size of the ranges copied, up to 4 MiB. Defaults to 4 MiB.
+        :keyword int timeout:
+            The timeout parameter is expressed in seconds, for each request.
+        :returns: The report of the copy, listing the files copied and failed.
+        :rtype: ~azure.storage.fileshare.DirectoryTransferReport
+        """
+        timeout = kwargs.get('timeout')
+        source_sas = (kwargs.pop('source_sas', None) or "").lstrip("?")
+
+        # A directory is listed before its entries, so it is created before them
+        transfers = []
+        async for item in source_directory_client.walk_directories_and_files(timeout=timeout):
+            if item['is_directory']:
+                await self._create_directory(item['name'], timeout)
+            else:
+                transfers.append(FileTransfer(item['name'], None, item['size']))
+
+        async def copy(transfer):
+            source_client = source_directory_client.get_file_client(transfer.name)
+            source_url = source_client.url
+            if source_sas:
+                source_url += ("&" if "?" in source_url else "?") + source_sas
+            await self._copy(
+                self.directory_client.get_file_client(transfer.name), source_client, source_url, **kwargs)
+
+        return await self._run(transfers, copy)
@@ -0,0 +1,168 @@
+# coding: utf-8
+
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+
+import time
+from threading import Lock
+
+from azure.core.exceptions import ResourceNotFoundError
+from azure.storage.fileshare import FileProperties, ShareDirectoryClient
+
+from _shared.testcase import StorageTestCase, GlobalStorageAccountPreparer
+
+# ------------------------------------------------------------------------------
+
+
+class _Paged(object):
+    def __init__(self, share, entries):
+        self.share = share
+        self.entries = entries
+
+    def by_page(self):
+        # pages of 10 entries, each a request
+        for start in range(0, len(self.entries), 10):
+            self.share.request()
+            yield iter([dict(entry) for entry in self.entries[start:start + 10]])
+
+
+class _Share(object):
+    # a tree of directories and files in memory, tracking the requests in flight
+    def __init__(self, paths):
+        self.paths = paths
+        self.missing = set()
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.properties_fetched = []
+        self._lock = Lock()
+
+    def request(self):
+        with self._lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        time.sleep(0.002)
+        with self._lock:
+            self.in_flight -= 1
+
+    def list(self, directory):
+        if directory in self.missing:
+            raise ResourceNotFoundError("The specified resource does not exist.")
+        prefix = directory + "/" if directory else ""
+        entries = []
+        for path, size in sorted(self.paths.items()):
+            if path.startswith(prefix) and "/" not in path[len(prefix):]:
+                name = path[len(prefix):]
+                if size is None:
+                    entries.append({'name': name, 'is_directory': True})
+                else:
+                    entries.append({'name': name, 'size': size, 'is_directory': False})
+        return _Paged(self, entries)
+
+    def get_properties(self, path):
+        self.request()
+        properties = FileProperties()
+        properties.name = path.split("/")[-1]
+        properties.size = self.paths[path]
+        with self._lock:
+            self.properties_fetched.append(path)
+        return properties
+
+
+class _FileClient(object):
+    def __init__(self, share, path):
+        self.share = share
+        self.path = path
+
+    def get_file_properties(self, **kwargs):
+        return self.share.get_properties(self.path)
+
+
+class _DirectoryClient(object):
+    def __init__(self, share, path=""):
+        self.share = share
+        self.path = path
+
+    def _join(self, name):
+        return self.path + "/" + name if self.path else name
+
+    def get_subdirectory_client(self, directory_name):
+        return _DirectoryClient(self.share, self._join(directory_name))
+
+    def get_file_client(self, file_name):
+        return _FileClient(self.share, self._join(file_name))
+
+    def list_directories_and_files(self, **kwargs):
+        return self.share.list(self.path)
+
+
+def _tree():
+    paths = {}
+    for i in range(4):
+        paths["d{}".format(i)] = None
+        for j in range(3):
+            paths["d{}/s{}".format(i, j)] = None
+            for k in range(12):
+                paths["d{}/s{}/f{}".format(i, j, k)] = k
+        paths["d{}/top".format(i)] = 1
+    paths["root.txt"] = 5
+    return paths
+
+
+class StorageDirectoryWalkerTest(StorageTestCase):
+
+    def _directory_client(self, share, path, credential):
+        client = ShareDirectoryClient(
+            "https://account.file.core.windows.net", "share", directory_path=path, credential=credential)
+        directory = _DirectoryClient(share, path)
+        client.get_subdirectory_client = directory.get_subdirectory_client
+        client.get_file_client = directory.get_file_client
+        client.list_directories_and_files = directory.list_directories_and_files
+        return client
+
+    # this is a white box test that's designed to make sure the subdirectories are listed
+    # concurrently within the bound, and the items named by their path from the root
+    @GlobalStorageAccountPreparer()
+    def test_walk_directories_and_files(self, resource_group, location, storage_account, storage_account_key):
+        paths = _tree()
+        share = _Share(paths)
+
+        client = self._directory_client(share, "", storage_account_key)
+        items = list(client.walk_directories_and_files(max_concurrency=4))
+
+        self.assertEqual(sorted(item['name'] for item in items), sorted(paths))
+        self.assertTrue(all(item['is_directory'] == (paths[item['name']] is None) for item in items))
+        self.assertLessEqual(share.max_in_flight, 4)
+        self.assertGreater(share.max_in_flight, 1)
+        self.assertEqual(share.properties_fetched, [])
+
+    @GlobalStorageAccountPreparer()
+    def test_walk_with_file_properties(self, resource_group, location, storage_account, storage_account_key):
+        paths = _tree()
+        share = _Share(paths)
+
+        directory = self._directory_client(share, "d1", storage_account_key)
+        items = list(directory.walk_directories_and_files(max_concurrency=3, include_properties=True))
+
+        files = [item for item in items if isinstance(item, FileProperties)]
+        self.assertEqual(sorted(item.name for item in files),
+                         sorted(path[3:] for path, size in paths.items() if path.startswith("d1/") and size is not None))
+        self.assertTrue(all(item.size == paths["d1/" + item.name] for item in files))
+        self.assertEqual(len(share.properties_fetched), len(files))
+        self.assertLessEqual(share.max_in_flight, 3)
+
+    @GlobalStorageAccountPreparer()
+    def test_walk_stops(self, resource_group, location, storage_account, storage_account_key):
+        share = _Share(_tree())
+        share.missing.add("d2/s1")
+
+        client = self._directory_client(share, "", storage_account_key)
+        with self.assertRaises(ResourceNotFoundError):
+            list(client.walk_directories_and_files(max_concurrency=2))
+
+        walk = client.walk_directories_and_files(max_concurrency=2)
+        self.assertIsNotNone(next(walk))
+        walk.close()
+        self.assertEqual(share.in_flight, 0)
@@ -0,0 +1,145 @@
+# coding: utf-8
+
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+import asyncio
+
+from azure.core.exceptions import ResourceNotFoundError
+from azure.storage.fileshare import FileProperties
+from azure.storage.fileshare.aio import ShareDirectoryClient
+
+from _shared.testcase import GlobalStorageAccountPreparer
+from _shared.asynctestcase import AsyncStorageTestCase
+from test_directory_walker import _Share, _tree
+
+# ------------------------------------------------------------------------------
+
+
+class _AsyncIterator(object):
+    def __init__(self, items):
+        self._items = iter(items)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        try:
+            return next(self._items)
+        except StopIteration:
+            raise StopAsyncIteration
+
+
+class _AsyncShare(object):
+    # the in-memory tree of the sync tests, behind coroutines
+    def __init__(self, share):
+        self.share = share
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def request(self):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(0.002)
+        finally:
+            self.in_flight -= 1
+
+    def list(self, directory):
+        share = self
+
+        class _Pages(object):
+            def __init__(self):
+                self.pages = None
+
+            def __aiter__(self):
+                return self
+
+            async def __anext__(self):
+                await share.request()
+                if self.pages is None:
+                    entries = share.share.list(directory).entries
+                    self.pages = iter([entries[start:start + 10] for start in range(0, len(entries), 10)])
+                try:
+                    return _AsyncIterator([dict(entry) for entry in next(self.pages)])
+                except StopIteration:
+                    raise StopAsyncIteration
+
+        class _ItemPaged(object):
+            def by_page(self):
+                return _Pages()
+        return _ItemPaged()
+
+
+class _AsyncFileClient(object):
+    def __init__(self, share, path):
+        self.share = share
+        self.path = path
+
+    async def get_file_properties(self, **kwargs):
+        await self.share.request()
+        properties = FileProperties()
+        properties.name = self.path.split("/")[-1]
+        properties.size = self.share.share.paths[self.path]
+        return properties
+
+
+class StorageDirectoryWalkerAsyncTest(AsyncStorageTestCase):
+
+    def _directory_client(self, share, credential):
+        client = ShareDirectoryClient(
+            "https://account.file.core.windows.net", "share", directory_path="", credential=credential)
+        client.get_subdirectory_client = lambda path: self._subdirectory_client(share, path)
+        client.get_file_client = lambda path: _AsyncFileClient(share, path)
+        client.list_directories_and_files = lambda **kwargs: share.list("")
+        return client
+
+    @staticmethod
+    def _subdirectory_client(share, path):
+        class _SubdirectoryClient(object):
+            def list_directories_and_files(self, **kwargs):
+                return share.list(path)
+        return _SubdirectoryClient()
+
+    # this is a white box test that's designed to make sure the subdirectories are listed
+    # as concurrent tasks within the bound, and the listings cancelled when the walk is closed
+    @GlobalStorageAccountPreparer()
+    @AsyncStorageTestCase.await_prepared_test
+    async def test_walk_directories_and_files(self, resource_group, location, storage_account, storage_account_key):
+        paths = _tree()
+        share = _AsyncShare(_Share(paths))
+        client = self._directory_client(share, storage_account_key)
+
+        names = []
+        async for item in client.walk_directories_and_files(max_concurrency=4):
+            names.append(item['name'])
+        self.assertEqual(sorted(names), sorted(paths))
+        self.assertLessEqual(share.max_in_flight, 4)
+        self.assertGreater(share.max_in_flight, 1)
+
+        files = []
+        async for item in client.walk_directories_and_files(max_concurrency=3, include_properties=True):
+            if isinstance(item, FileProperties):
+                files.append((item.name, item.size))
+        self.assertEqual(sorted(files), sorted((path, size) for path, size in paths.items() if size is not None))
+
+        walk = client.walk_directories_and_files(max_concurrency=2)
+        self.assertIsNotNone(await walk.__anext__())
+        await walk.close()
+        self.assertEqual(share.in_flight, 0)
+        with self.assertRaises(StopAsyncIteration):
+            await walk.__anext__()
+
+    @GlobalStorageAccountPreparer()
+    @AsyncStorageTestCase.await_prepared_test
+    async def test_walk_error(self, resource_group, location, storage_account, storage_account_key):
+        share = _AsyncShare(_Share(_tree()))
+        share.share.missing.add("d3")
+        client = self._directory_client(share, storage_account_key)
+
+        with self.assertRaises(ResourceNotFoundError):
+            async for _ in client.walk_directories_and_files():
+                pass
+        self.assertEqual(share.in_flight, 0)
@@ -0,0 +1,304 @@
+# coding: utf-8
+
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+
+import os
+import re
+import shutil
+import tempfile
+from io import BytesIO
+from threading import Lock
+
+from azure.storage.fileshare import ContentSettings, FileProperties, ShareTransferManager
+from azure.storage.fileshare._download import RangeIndex, StorageStreamDownloader
+from azure.storage.fileshare._shared.uploads import FileChunkUploader, upload_data_chunks
+from azure.storage.fileshare._transfer_manager import copy_ranges
+
+from _shared.testcase import StorageTestCase, GlobalStorageAccountPreparer
+
+# ------------------------------------------------------------------------------
+
+
+def _parse_range(content_range):
+    return [int(i) for i in re.match(r'bytes=(\d+)-(\d+)', content_range).groups()]
+
+
+class _FileService(object):
+    # record the ranges uploaded
+    def __init__(self):
+        self.ranges = []
+
+    def upload_range(self, data, offset, length, **kwargs):
+        assert len(data) == length
+        self.ranges.append((offset, bytes(data)))
+        return {'etag': '"etag"', 'last_modified': None}
+
+
+class _Range(object):
+    def __init__(self, start, end):
+        self.start = start
+        self.end = end
+
+
+class _Response(list):
+    def __init__(self, data, start, end, total):
+        super(_Response, self).__init__([data])
+        self.response = self
+        self.headers = {}
+        self.properties = _Properties(start, end, total)
+
+
+class _Properties(object):
+    def __init__(self, start, end, total):
+        self.content_range = 'bytes {}-{}/{}'.format(start, end, total)
+        self.etag = '"etag"'
+        self.size = end - start + 1
+
+
+class _Config(object):
+    max_single_get_size = 1024
+    max_chunk_get_size = 1024
+
+
+_SOURCES = {}
+
+
+class _SourceFile(object):
+    # a file of a source share, the service reads the ranges copied from it by its URL
+    def __init__(self, name, data, ranges):
+        self.name = name
+        self.ranges = ranges
+        self.properties = FileProperties()
+        self.properties.size = len(data)
+        self.properties.content_settings = ContentSettings(content_type="application/octet-stream")
+        self.properties.metadata = {"kind": name}
+        self.url = "https://source.file.core.windows.net/share/" + name
+        _SOURCES[self.url] = data
+
+    def get_file_properties(self, **kwargs):
+        return self.properties
+
+    def get_ranges(self, **kwargs):
+        return [{'start': start, 'end': end} for start, end in self.ranges]
+
+
+class _SourceDirectoryClient(object):
+    def __init__(self, files):
+        self.files = files
+
+    def get_file_client(self, name):
+        return [source for source in self.files if source.name == name][0]
+
+    def walk_directories_and_files(self, **kwargs):
+        directories = sorted(set(source.name.rsplit("/", 1)[0] for source in self.files if "/" in source.name))
+        for directory in directories:
+            yield {'name': directory, 'is_directory': True}
+        for source in self.files:
+            yield {'name': source.name, 'is_directory': False, 'size': source.properties.size}
+
+
+class _TargetDirectoryClient(object):
+    # write the ranges copied from the source URLs, without any data going through the client
+    def __init__(self):
+        self.directories = []
+        self.files = {}
+        self.properties = {}
+        self.copied = []
+        self._lock = Lock()
+
+    def get_subdirectory_client(self, directory):
+        target = self
+
+        class _SubdirectoryClient(object):
+            def create_directory(self, **kwargs):
+                target.directories.append(directory)
+        return _SubdirectoryClient()
+
+    def get_file_client(self, name):
+        target = self
+
+        class _FileClient(object):
+            def create_file(self, size, content_settings=None, metadata=None, **kwargs):
+                target.files[name] = bytearray(size)
+                target.properties[name] = (content_settings.content_type, metadata)
+                return {'etag': '"created"', 'last_modified': 0}
+
+            def upload_range_from_url(self, source_url, offset, length, source_offset, **kwargs):
+                assert source_url.endswith("?sv=sas") and offset == source_offset
+                data = _SOURCES[source_url[:-len("?sv=sas")]]
+                with target._lock:
+                    target.files[name][offset:offset + length] = data[source_offset:source_offset + length]
+                    target.copied.append((name, offset, length))
+                return {'etag': '"copied"', 'last_modified': 1}
+        return _FileClient()
+
+
+class StorageSparseFileTest(StorageTestCase):
+
+    def setUp(self):
+        super(StorageSparseFileTest, self).setUp()
+        self.temp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+        return super(StorageSparseFileTest, self).tearDown()
+
+    def _sparse_data(self, size, ranges):
+        data = bytearray(size)
+        for start, end in ranges:
+            data[start:end + 1] = os.urandom(end - start + 1)
+        return bytes(data)
+
+    def _downloader(self, data, ranges, requests, **kwargs):
+        class _Client(object):
+            def download(self, range=None, **kwargs):
+                start, end = _parse_range(range)
+                end = min(end, len(data) - 1)
+                requests.append(start)
+                return None, _Response(data[start:end + 1], start, end, len(data))
+
+            def get_range_list(self, range=None, **kwargs):
+                start, end = _parse_range(range)
+                requests.append(range)
+                return [_Range(max(first, start), min(last, end)) for first, last in ranges
+                        if first <= end and start <= last]
+
+        return StorageStreamDownloader(client=_Client(), config=_Config(), name='file', share='share', **kwargs)
+
+    # these are white box tests that are designed to make sure the empty ranges of a file are
+    # neither uploaded nor downloaded, and left as holes of the local files written
+    @GlobalStorageAccountPreparer()
+    def test_upload_skips_empty_ranges(self, resource_group, location, storage_account, storage_account_key):
+        chunk_size = 256 * 1024
+        data = self._sparse_data(
+            4 * chunk_size, [(100, 199), (200 * 1024, 200 * 1024 + 3), (3 * chunk_size, 4 * chunk_size - 1)])
+
+        service = _FileService()
+        responses = upload_data_chunks(
+            service=service,
+            uploader_class=FileChunkUploader,
+            total_size=len(data),
+            chunk_size=chunk_size,
+            max_concurrency=2,
+            stream=BytesIO(data),
+            sparse=True)
+
+        # the empty chunks have no response
+        self.assertEqual(len(responses), 2)
+        self.assertEqual([offset for offset, _ in sorted(service.ranges)], [0, 200 * 1024, 3 * chunk_size])
+        uploaded = bytearray(len(data))
+        for offset, body in service.ranges:
+            uploaded[offset:offset + len(body)] = body
+        self.assertEqual(bytes(uploaded), data)
+
+        service = _FileService()
+        self.assertIsNone(upload_data_chunks(
+            service=service,
+            uploader_class=FileChunkUploader,
+            total_size=chunk_size,
+            chunk_size=chunk_size,
+            max_concurrency=1,
+            stream=BytesIO(b"\x00" * chunk_size),
+            sparse=True))
+        self.assertEqual(service.ranges, [])
+
+        # without sparse, all the chunks are uploaded
+        service = _FileService()
+        responses = upload_data_chunks(
+            service=service,
+            uploader_class=FileChunkUploader,
+            total_size=len(data),
+            chunk_size=chunk_size,
+            max_concurrency=2,
+            stream=BytesIO(data))
+        self.assertEqual(len(responses), 4)
+        self.assertEqual(sorted(service.ranges), [(offset, data[offset:offset + chunk_size])
+                                                  for offset in range(0, len(data), chunk_size)])
+
+    @GlobalStorageAccountPreparer()
+    def test_download_sparse_file(self, resource_group, location, storage_account, storage_account_key):
+        size = 64 * 1024
+        ranges = [(2048, 3071), (40 * 1024, 41 * 1024 - 1)]
+        data = self._sparse_data(size, ranges)
+        index = RangeIndex([{'start': start, 'end': end} for start, end in reversed(ranges)])
+        self.assertEqual(len(index), 2)
+        self.assertTrue(index.overlaps(3000, 5000))
+        self.assertFalse(index.overlaps(3072, 40 * 1024 - 1))
+
+        for max_concurrency in (1, 3):
+            requests = []
+            path = os.path.join(self.temp_dir, 'file{}'.format(max_concurrency))
+            with open(path, 'wb') as stream:
+                downloaded = self._downloader(data, ranges, requests, max_concurrency=max_concurrency, sparse=True)
+                self.assertEqual(downloaded.readinto(stream), size)
+                self.assertEqual(stream.tell(), size)
+
+            # the ranges were listed once, only the first and non-empty chunks were requested,
+            # and the empty chunks left as holes
+            self.assertEqual(requests[:2], [0, 'bytes=1024-65535'])
+            self.assertEqual(sorted(requests[2:]), [2048, 40 * 1024])
+            self.assertEqual(os.path.getsize(path), size)
+            with open(path, 'rb') as downloaded_file:
+                self.assertEqual(downloaded_file.read(), data)
+
+        # the empty chunks are made of zeros for the other streams, and without sparse they are all downloaded
+        requests = []
+        self.assertEqual(self._downloader(data, ranges, requests, sparse=True).readall(), data)
+        self.assertEqual(len(requests), 4)
+        requests = []
+        stream = BytesIO()
+        self._downloader(data, ranges, requests).readinto(stream)
+        self.assertEqual(stream.getvalue(), data)
+        self.assertEqual(len(requests), 64)
+
+        # the empty chunks are written to a file opened for appending, whose writes ignore the seeks
+        path = os.path.join(self.temp_dir, 'appended')
+        with open(path, 'wb') as existing:
+            existing.write(b'x' * 100)
+        with open(path, 'ab') as stream:
+            self._downloader(data, ranges, [], sparse=True).readinto(stream)
+        if os.name != 'nt':
+            with os.fdopen(os.open(path, os.O_WRONLY | os.O_APPEND), 'wb') as stream:
+                self._downloader(data, ranges, [], sparse=True).readinto(stream)
+        else:
+            with open(path, 'ab') as stream:
+                self._downloader(data, ranges, [], sparse=True).readinto(stream)
+        with open(path, 'rb') as downloaded_file:
+            self.assertEqual(downloaded_file.read(), b'x' * 100 + data + data)
+
+        # the last chunks left as holes still extend the file
+        path = os.path.join(self.temp_dir, 'trailing')
+        with open(path, 'wb') as stream:
+            self._downloader(data[:4096] + b"\x00" * (size - 4096), ranges[:1], [], sparse=True).readinto(stream)
+        self.assertEqual(os.path.getsize(path), size)
+
+    # this is a white box test that's designed to make sure the files are copied by the service,
+    # range by range, and that the empty ranges of the source are not copied
+    @GlobalStorageAccountPreparer()
+    def test_copy_directory(self, resource_group, location, storage_account, storage_account_key):
+        self.assertEqual(copy_ranges([]), [])
+        self.assertEqual(copy_ranges([{'start': 0, 'end': 2499}, {'start': 4096, 'end': 4607}], 1024), [
+            (0, 1024), (1024, 1024), (2048, 452), (4096, 512)])
+
+        size = 16 * 1024
+        files = [_SourceFile("a.bin", self._sparse_data(size, [(0, 511), (8192, 12287)]), [(0, 511), (8192, 12287)]),
+                 _SourceFile("sub/b.bin", self._sparse_data(size, []), []),
+                 _SourceFile("sub/c.bin", self._sparse_data(size, [(0, size - 1)]), [(0, size - 1)])]
+        target = _TargetDirectoryClient()
+
+        with ShareTransferManager(target, max_concurrency=3) as manager:
+            report = manager.copy_directory(
+                _SourceDirectoryClient(files), source_sas="?sv=sas", range_size=2048)
+
+        self.assertEqual(len(report.succeeded), 3)
+        self.assertEqual(target.directories, ["sub"])
+        for source in files:
+            self.assertEqual(bytes(target.files[source.name]), _SOURCES[source.url])
+            self.assertEqual(target.properties[source.name], ("application/octet-stream", {"kind": source.name}))
+        self.assertEqual(sorted(length for name, _, length in target.copied if name == "a.bin"), [512, 2048, 2048])
+        self.assertEqual([name for name, _, _ in target.copied if name == "sub/b.bin"], [])
+        self.assertEqual(len([name for name, _, _ in target.copied if name == "sub/c.bin"]), 8)
@@ -0,0 +1,177 @@
+# coding: utf-8
+
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+import asyncio
+import os
+import shutil
+import tempfile
+
+from azure.storage.fileshare.aio import ShareTransferManager
+from azure.storage.fileshare.aio._download_async import StorageStreamDownloader
+
+from _shared.testcase import GlobalStorageAccountPreparer
+from _shared.asynctestcase import AsyncStorageTestCase
+from test_sparse_file import (
+    _SOURCES, _Config, _Range, _Response, _SourceDirectoryClient, _SourceFile, _TargetDirectoryClient, _parse_range)
+
+# ------------------------------------------------------------------------------
+
+
+class _AsyncResponse(_Response):
+    def body(self):
+        return self[0]
+
+
+class _AsyncSourceFile(_SourceFile):
+    async def get_file_properties(self, **kwargs):
+        return self.properties
+
+    async def get_ranges(self, **kwargs):
+        return super(_AsyncSourceFile, self).get_ranges()
+
+
+class _AsyncSourceDirectoryClient(_SourceDirectoryClient):
+    def walk_directories_and_files(self, **kwargs):
+        items = iter(super(_AsyncSourceDirectoryClient, self).walk_directories_and_files())
+
+        class _Walk(object):
+            def __aiter__(self):
+                return self
+
+            async def __anext__(self):
+                try:
+                    return next(items)
+                except StopIteration:
+                    raise StopAsyncIteration
+        return _Walk()
+
+
+class _AsyncTargetDirectoryClient(_TargetDirectoryClient):
+    # the coroutines of the sync target, tracking the ranges copied at once
+    def __init__(self):
+        super(_AsyncTargetDirectoryClient, self).__init__()
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    def get_subdirectory_client(self, directory):
+        client = super(_AsyncTargetDirectoryClient, self).get_subdirectory_client(directory)
+
+        class _SubdirectoryClient(object):
+            async def create_directory(self, **kwargs):
+                return client.create_directory(**kwargs)
+        return _SubdirectoryClient()
+
+    def get_file_client(self, name):
+        client = super(_AsyncTargetDirectoryClient, self).get_file_client(name)
+        target = self
+
+        class _FileClient(object):
+            async def create_file(self, *args, **kwargs):
+                return client.create_file(*args, **kwargs)
+
+            async def upload_range_from_url(self, *args, **kwargs):
+                target.in_flight += 1
+                target.max_in_flight = max(target.max_in_flight, target.in_flight)
+                try:
+                    await asyncio.sleep(0.002)
+                    return client.upload_range_from_url(*args, **kwargs)
+                finally:
+                    target.in_flight -= 1
+        return _FileClient()
+
+
+class StorageSparseFileAsyncTest(AsyncStorageTestCase):
+
+    def setUp(self):
+        super(StorageSparseFileAsyncTest, self).setUp()
+        self.temp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+        return super(StorageSparseFileAsyncTest, self).tearDown()
+
+    def _sparse_data(self, size, ranges):
+        data = bytearray(size)
+        for start, end in ranges:
+            data[start:end + 1] = os.urandom(end - start + 1)
+        return bytes(data)
+
+    async def _downloader(self, data, ranges, requests, **kwargs):
+        class _Client(object):
+            async def download(self, range=None, **kwargs):
+                start, end = _parse_range(range)
+                end = min(end, len(data) - 1)
+                requests.append(start)
+                return None, _AsyncResponse(data[start:end + 1], start, end, len(data))
+
+            async def get_range_list(self, range=None, **kwargs):
+                start, end = _parse_range(range)
+                requests.append(range)
+                return [_Range(max(first, start), min(last, end)) for first, last in ranges
+                        if first <= end and start <= last]
+
+        downloader = StorageStreamDownloader(client=_Client(), config=_Config(), name='file', share='share', **kwargs)
+        await downloader._setup()
+        return downloader
+
+    # these are white box tests that are designed to make sure the empty ranges of a file are
+    # not downloaded, and the ranges of a copy written by the service on the shared pool
+    @GlobalStorageAccountPreparer()
+    @AsyncStorageTestCase.await_prepared_test
+    async def test_download_sparse_file(self, resource_group, location, storage_account, storage_account_key):
+        size = 64 * 1024
+        ranges = [(2048, 3071), (40 * 1024, 41 * 1024 - 1)]
+        data = self._sparse_data(size, ranges)
+
+        for max_concurrency in (1, 3):
+            requests = []
+            path = os.path.join(self.temp_dir, 'file{}'.format(max_concurrency))
+            with open(path, 'wb') as stream:
+                downloaded = await self._downloader(
+                    data, ranges, requests, max_concurrency=max_concurrency, sparse=True)
+                self.assertEqual(await downloaded.readinto(stream), size)
+                self.assertEqual(stream.tell(), size)
+
+            self.assertEqual(requests[:2], [0, 'bytes=1024-65535'])
+            self.assertEqual(sorted(requests[2:]), [2048, 40 * 1024])
+            self.assertEqual(os.path.getsize(path), size)
+            with open(path, 'rb') as downloaded_file:
+                self.assertEqual(downloaded_file.read(), data)
+
+        requests = []
+        downloaded = await self._downloader(data, ranges, requests, sparse=True)
+        self.assertEqual(await downloaded.readall(), data)
+        self.assertEqual(len(requests), 4)
+
+        path = os.path.join(self.temp_dir, 'appended')
+        with open(path, 'wb') as existing:
+            existing.write(b'x' * 100)
+        with open(path, 'ab') as stream:
+            downloaded = await self._downloader(data, ranges, [], max_concurrency=3, sparse=True)
+            await downloaded.readinto(stream)
+        with open(path, 'rb') as downloaded_file:
+            self.assertEqual(downloaded_file.read(), b'x' * 100 + data)
+
+    @GlobalStorageAccountPreparer()
+    @AsyncStorageTestCase.await_prepared_test
+    async def test_copy_directory(self, resource_group, location, storage_account, storage_account_key):
+        size = 16 * 1024
+        files = [_AsyncSourceFile("a.bin", self._sparse_data(size, [(8192, 12287)]), [(8192, 12287)]),
+                 _AsyncSourceFile("sub/c.bin", self._sparse_data(size, [(0, size - 1)]), [(0, size - 1)])]
+        target = _AsyncTargetDirectoryClient()
+
+        async with ShareTransferManager(target, max_concurrency=3) as manager:
+            report = await manager.copy_directory(
+                _AsyncSourceDirectoryClient(files), source_sas="sv=sas", range_size=2048)
+
+        self.assertEqual(len(report.succeeded), 2)
+        self.assertEqual(target.directories, ["sub"])
+        for source in files:
+            self.assertEqual(bytes(target.files[source.name]), _SOURCES[source.url])
+        self.assertEqual(len([name for name, _, _ in target.copied if name == "a.bin"]), 2)
+        self.assertLessEqual(target.max_in_flight, 3)
+        self.assertGreater(target.max_in_flight, 1)
@@ -7,6 +7,7 @@
 from ._version import VERSION
 from ._queue_client import QueueClient
 from ._queue_service_client import QueueServiceClient
+from ._queue_worker import QueueWorker, QueueWorkerStats
 from ._shared_access_signature import generate_account_sas, generate_queue_sas
 from ._shared.policies import ExponentialRetry, LinearRetry
 from ._shared.models import(
@@ -37,6 +38,8 @@ __version__ = VERSION
 __all__ = [
     'QueueClient',
     'QueueServiceClient',
+    'QueueWorker',
+    'QueueWorkerStats',
     'ExponentialRetry',
     'LinearRetry',
     'LocationMode',
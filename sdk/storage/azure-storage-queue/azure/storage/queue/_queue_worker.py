@@ -0,0 +1,343 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from typing import (  # pylint: disable=unused-import
+    Optional, Any, Callable, Dict, Iterable, Iterator, List, Set, TypeVar, TYPE_CHECKING
+)
+
+from six.moves import queue
+
+from azure.core.tracing.common import with_current_context
+
+if TYPE_CHECKING:
+    from concurrent.futures import Future
+    from ._models import QueueMessage
+    QueueClient = TypeVar("QueueClient")
+
+# The largest number of messages of a Get Messages request
+MAX_MESSAGES_PER_PAGE = 32
+# The delays between the receive calls finding the queue empty, doubled from the first to the last
+_POLL_DELAY = 0.1
+_MAX_POLL_DELAY = 5.0
+
+
+class QueueWorkerStats(object):
+    """The throughput of a :class:`QueueWorker`.
+
+    :ivar int sent: The number of messages sent.
+    :ivar int received: The number of messages received.
+    :ivar int deleted: The number of messages deleted.
+    :ivar int updated: The number of messages updated.
+    :ivar int failed: The number of operations failed.
+    :ivar float started: The time the worker was created, as seconds since the epoch.
+    """
+
+    def __init__(self):
+        self.sent = 0
+        self.received = 0
+        self.deleted = 0
+        self.updated = 0
+        self.failed = 0
+        self.started = time.time()
+        self._lock = threading.Lock()
+
+    def _add(self, counter, count=1):
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + count)
+
+    @property
+    def elapsed(self):
+        # type: () -> float
+        """The time since the worker was created, in seconds."""
+        return time.time() - self.started
+
+    def _rate(self, count):
+        elapsed = self.elapsed
+        return count / elapsed if elapsed else 0.0
+
+    @property
+    def send_rate(self):
+        # type: () -> float
+        """The number of messages sent per second."""
+        return self._rate(self.sent)
+
+    @property
+    def receive_rate(self):
+        # type: () -> float
+        """The number of messages received per second."""
+        return self._rate(self.received)
+
+    @property
+    def delete_rate(self):
+        # type: () -> float
+        """The number of messages deleted per second."""
+        return self._rate(self.deleted)
+
+    def __repr__(self):
+        return "QueueWorkerStats(sent={}, received={}, deleted={}, updated={}, failed={})".format(
+            self.sent, self.received, self.deleted, self.updated, self.failed)
+
+
+def _refresh_receipt(message, updated):
+    # The pop receipt of a message changes with each update, and is needed for the next one
+    if hasattr(message, 'pop_receipt'):
+        message.pop_receipt = updated.pop_receipt
+        message.next_visible_on = updated.next_visible_on
+
+
+class QueueWorker(object):  # pylint: disable=too-many-instance-attributes
+    """Send, receive and delete the messages of a queue with many requests in flight.
+
+    Each message operation of a queue is a request, and a receive request gets up to 32
+    messages. The worker keeps up to `max_in_flight` of the send, delete and update requests
+    in flight, on a pool of threads, and the calls scheduling them wait once the window is
+    full. The messages are received by `prefetch` concurrent receive calls, buffering them
+    ahead of their processing, and the deletes and updates are scheduled rather than waited
+    for. The operations on a message are run in the order they were scheduled.
+
+    :param queue_client: The client of the queue.
+    :type queue_client: ~azure.storage.queue.QueueClient
+    :param int max_in_flight:
+        The largest number of send, delete and update requests in flight. Defaults to 16.
+    :param int prefetch: The number of receive calls kept outstanding. Defaults to 4.
+    :param int messages_per_page: The number of messages received per call, up to 32, the default.
+    :param int visibility_timeout:
+        The visibility timeout of the messages received, in seconds. The messages prefetched
+        are invisible while they wait to be processed, so it should allow for the buffer.
+    """
+
+    def __init__(
+            self, queue_client,  # type: QueueClient
+            max_in_flight=16,  # type: int
+            prefetch=4,  # type: int
+            messages_per_page=MAX_MESSAGES_PER_PAGE,  # type: int
+            visibility_timeout=None  # type: Optional[int]
+        ):
+        # type: (...) -> None
+        if max_in_flight < 1 or prefetch < 1:
+            raise ValueError("max_in_flight and prefetch must be greater than 0.")
+        if not 0 < messages_per_page <= MAX_MESSAGES_PER_PAGE:
+            raise ValueError("messages_per_page must be between 1 and {}.".format(MAX_MESSAGES_PER_PAGE))
+        self.queue_client = queue_client
+        self.max_in_flight = max_in_flight
+        self.prefetch = prefetch
+        self.messages_per_page = messages_per_page
+        self.visibility_timeout = visibility_timeout
+        self.stats = QueueWorkerStats()
+        self._pending = set()  # type: Set[Any]
+        self._message_operations = {}  # type: Dict[str, Any]
+        self._errors = []  # type: List[BaseException]
+        self._lock = threading.Lock()
+        self._window = threading.BoundedSemaphore(max_in_flight)
+        self._executor = None  # type: Optional[ThreadPoolExecutor]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def _call(self, counter, previous, operation, *args, **kwargs):
+        if previous is not None:
+            # Run after the operation scheduled before on the same message, whatever its outcome
+            previous.exception()
+        try:
+            result = operation(*args, **kwargs)
+        except Exception:
+            self.stats._add('failed')  # pylint: disable=protected-access
+            raise
+        self.stats._add(counter)  # pylint: disable=protected-access
+        return result
+
+    def _done(self, future, message_id):
+        with self._lock:
+            self._pending.discard(future)
+            if self._message_operations.get(message_id) is future:
+                del self._message_operations[message_id]
+            if future.exception() is not None:
+                self._errors.append(future.exception())
+        self._window.release()
+
+    def _submit(self, counter, message_id, operation, *args, **kwargs):
+        # type: (str, Optional[str], Callable, *Any, **Any) -> Future
+        self._window.acquire()
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(self.max_in_flight)
+            previous = self._message_operations.get(message_id) if message_id else None
+            future = self._executor.submit(
+                with_current_context(self._call), counter, previous, operation, *args, **kwargs)
+            self._pending.add(future)
+            if message_id:
+                self._message_operations[message_id] = future
+        future.add_done_callback(lambda done: self._done(done, message_id))
+        return future
+
+    def send_message(self, content, **kwargs):
+        # type: (Any, **Any) -> Future
+        """Schedule the send of a message, once there is room in the window.
+
+        :param obj content: The message content, as for :func:`~QueueClient.send_message`.
+        :keyword int visibility_timeout: The visibility timeout of the message, in seconds.
+        :keyword int time_to_live: The time-to-live of the message, in seconds.
+        :keyword int timeout: The server timeout, expressed in seconds.
+        :returns: A future of the :class:`~azure.storage.queue.QueueMessage` sent.
+        :rtype: ~concurrent.futures.Future
+        """
+        return self._submit('sent', None, self.queue_client.send_message, content, **kwargs)
+
+    def send_messages(self, contents, **kwargs):
+        # type: (Iterable[Any], **Any) -> List[QueueMessage]
+        """Send messages, with up to `max_in_flight` requests in flight.
+
+        :param contents: The contents of the messages.
+        :keyword int visibility_timeout: The visibility timeout of the messages, in seconds.
+        :keyword int time_to_live: The time-to-live of the messages, in seconds.
+        :keyword int timeout: The server timeout, expressed in seconds.
+        :returns: The messages sent, in order. The error of the first failed send is raised.
+        :rtype: list[~azure.storage.queue.QueueMessage]
+        """
+        return [future.result() for future in [self.send_message(content, **kwargs) for content in contents]]
+
+    def delete_message(self, message, pop_receipt=None, **kwargs):
+        # type: (Any, Optional[str], **Any) -> Future
+        """Schedule the delete of a message, once there is room in the window.
+
+        :param message: The message, or the ID of the message, to delete.
+        :type message: str or ~azure.storage.queue.QueueMessage
+        :param str pop_receipt: The pop receipt of the message, if its ID is given.
+        :keyword int timeout: The server timeout, expressed in seconds.
+        :returns: A future of the delete.
+        :rtype: ~concurrent.futures.Future
+        """
+        message_id = getattr(message, 'id', message)
+
+        def delete():
+            # The pop receipt is read once the updates scheduled before have refreshed it
+            return self.queue_client.delete_message(message, pop_receipt=pop_receipt, **kwargs)
+        return self._submit('deleted', message_id, delete)
+
+    def update_message(self, message, pop_receipt=None, content=None, **kwargs):
+        # type: (Any, Optional[str], Optional[Any], **Any) -> Future
+        """Schedule an update of the visibility timeout, or the content, of a message.
+
+        The pop receipt of a message given as a :class:`~azure.storage.queue.QueueMessage`
+        is refreshed once it is updated, for the operations scheduled after.
+
+        :param message: The message, or the ID of the message, to update.
+        :type message: str or ~azure.storage.queue.QueueMessage
+        :param str pop_receipt: The pop receipt of the message, if its ID is given.
+        :param obj content: The new content of the message.
+        :keyword int visibility_timeout: The new visibility timeout of the message, in seconds.
+        :keyword int timeout: The server timeout, expressed in seconds.
+        :returns: A future of the :class:`~azure.storage.queue.QueueMessage` updated.
+        :rtype: ~concurrent.futures.Future
+        """
+        message_id = getattr(message, 'id', message)
+
+        def update():
+            updated = self.queue_client.update_message(message, pop_receipt=pop_receipt, content=content, **kwargs)
+            _refresh_receipt(message, updated)
+            return updated
+        return self._submit('updated', message_id, update)
+
+    def _receive_page(self, **kwargs):
+        page = next(self.queue_client.receive_messages(
+            messages_per_page=self.messages_per_page,
+            visibility_timeout=self.visibility_timeout,
+            **kwargs).by_page(), None)
+        return list(page) if page is not None else []
+
+    def receive_messages(self, max_wait_time=None, **kwargs):
+        # type: (Optional[float], **Any) -> Iterator[QueueMessage]
+        """Iterate over the messages of the queue, received by `prefetch` concurrent calls.
+
+        Up to `prefetch` pages of messages are buffered ahead of the iteration. A call finding
+        the queue empty is made again after a delay, doubled up to 5 seconds while the queue
+        stays empty. The receive calls stop with the iteration, and the messages left in the
+        buffer become visible again after their visibility timeout.
+
+        :param float max_wait_time:
+            The longest time to wait for a message, in seconds, after which the iteration
+            stops. By default, the iteration waits for messages until it is stopped.
+        :keyword int timeout: The server timeout, expressed in seconds.
+        :returns: An iterator of the messages received.
+        :rtype: Iterator[~azure.storage.queue.QueueMessage]
+        """
+        buffered = queue.Queue(self.prefetch * self.messages_per_page)
+        stopped = threading.Event()
+
+        def put(item):
+            while not stopped.is_set():
+                try:
+                    buffered.put(item, timeout=_POLL_DELAY)
+                    return
+                except queue.Full:
+                    pass
+
+        def receive():
+            delay = _POLL_DELAY
+            while not stopped.is_set():
+                try:
+                    messages = self._receive_page(**kwargs)
+                except Exception as error:  # pylint: disable=broad-except
+                    put(error)
+                    return
+                self.stats._add('received', len(messages))  # pylint: disable=protected-access
+                for message in messages:
+                    put(message)
+                if messages:
+                    delay = _POLL_DELAY
+                else:
+                    stopped.wait(delay)
+                    delay = min(delay * 2, _MAX_POLL_DELAY)
+
+        receivers = [threading.Thread(target=with_current_context(receive)) for _ in range(self.prefetch)]
+        for receiver in receivers:
+            receiver.daemon = True
+            receiver.start()
+        try:
+            while True:
+                try:
+                    item = buffered.get(timeout=max_wait_time)
+                except queue.Empty:
+                    return
+                if isinstance(item, Exception):
+                    raise item
+                yield item
+        finally:
+            stopped.set()
+            for receiver in receivers:
+                receiver.join()
+
+    def flush(self):
+        # type: () -> None
+        """Wait for the operations scheduled, and raise the first error of those failed since the last flush."""
+        while True:
+            with self._lock:
+                pending = list(self._pending)
+            if not pending:
+                break
+            for future in pending:
+                future.exception()
+        with self._lock:
+            errors, self._errors = self._errors, []
+        if errors:
+            raise errors[0]
+
+    def close(self):
+        # type: () -> None
+        """Flush the worker, and stop its threads."""
+        try:
+            self.flush()
+        finally:
+            if self._executor is not None:
+                self._executor.shutdown()
+                self._executor = None
@@ -9,34 +9,35 @@ import asyncio
 from asyncio import Lock
 from itertools import islice
 import threading
-
-from math import ceil
-
-import six
+import time
 
 from . import encode_base64, url_quote
 from .request_handlers import get_length
 from .response_handlers import return_response_headers
 from .encryption import get_blob_encryptor_and_padder
-from .uploads import SubStream, IterStreamer  # pylint: disable=unused-import
+from .tuning import start_tuner
+from .uploads import (  # pylint: disable=unused-import
+    SubStream, IterStreamer, MemoryViewStream, PooledChunkStream, chunk_buffer, chunk_range, map_stream,
+    non_empty_page_runs, read_chunk)
 
 
 _LARGE_BLOB_UPLOAD_MAX_READ_BUFFER_SIZE = 4 * 1024 * 1024
 _ERROR_VALUE_SHOULD_BE_SEEKABLE_STREAM = '{0} should be a seekable file-like/io.IOBase type stream object.'
 
 
-async def _parallel_uploads(uploader, pending, running):
+async def _parallel_uploads(uploader, pending, running, tuner=None, schedule=asyncio.ensure_future):
     range_ids = []
     while True:
         # Wait for some download to finish before adding a new one
         done, running = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
         range_ids.extend([chunk.result() for chunk in done])
+        # An autotuned upload adjusts the number of uploads in flight as it goes
+        in_flight = tuner.concurrency if tuner else len(running) + 1
         try:
-            next_chunk = next(pending)
+            while len(running) < in_flight:
+                running.add(schedule(uploader(next(pending))))
         except StopIteration:
             break
-        else:
-            running.add(asyncio.ensure_future(uploader(next_chunk)))
 
     # Wait for the remaining uploads to finish
     if running:
@@ -53,6 +54,8 @@ async def upload_data_chunks(
         max_concurrency=None,
         stream=None,
         encryption_options=None,
+        tuner=None,
+        executor=None,
         **kwargs):
 
     if encryption_options:
@@ -63,6 +66,7 @@ async def upload_data_chunks(
         kwargs['encryptor'] = encryptor
         kwargs['padder'] = padder
 
+    max_concurrency = start_tuner(tuner, chunk_size, max_concurrency)
     parallel = max_concurrency > 1
     if parallel and 'modified_access_conditions' in kwargs:
         # Access conditions do not work with parallelism
@@ -74,22 +78,26 @@ async def upload_data_chunks(
         chunk_size=chunk_size,
         stream=stream,
         parallel=parallel,
+        tuner=tuner,
         **kwargs)
 
     if parallel:
+        # A shared executor bounds the requests in flight across transfers
+        schedule = executor.submit if executor is not None else asyncio.ensure_future
         upload_tasks = uploader.get_chunk_streams()
         running_futures = [
-            asyncio.ensure_future(uploader.process_chunk(u))
-            for u in islice(upload_tasks, 0, max_concurrency)
+            schedule(uploader.process_chunk(u))
+            for u in islice(upload_tasks, 0, tuner.concurrency if tuner else max_concurrency)
         ]
-        range_ids = await _parallel_uploads(uploader.process_chunk, upload_tasks, running_futures)
+        range_ids = await _parallel_uploads(uploader.process_chunk, upload_tasks, running_futures, tuner, schedule)
     else:
         range_ids = []
         for chunk in uploader.get_chunk_streams():
             range_ids.append(await uploader.process_chunk(chunk))
 
     if any(range_ids):
-        return [r[1] for r in sorted(range_ids, key=lambda r: r[0])]
+        # The chunks left empty have no range ID
+        return [r[1] for r in sorted((r for r in range_ids if r), key=lambda r: r[0])]
     return uploader.response_headers
 
 
@@ -100,40 +108,51 @@ async def upload_substream_blocks(
         chunk_size=None,
         max_concurrency=None,
         stream=None,
+        tuner=None,
+        executor=None,
         **kwargs):
+    max_concurrency = start_tuner(tuner, chunk_size, max_concurrency)
     parallel = max_concurrency > 1
     if parallel and 'modified_access_conditions' in kwargs:
         # Access conditions do not work with parallelism
         kwargs['modified_access_conditions'] = None
-    uploader = uploader_class(
-        service=service,
-        total_size=total_size,
-        chunk_size=chunk_size,
-        stream=stream,
-        parallel=parallel,
-        **kwargs)
-
-    if parallel:
-        upload_tasks = uploader.get_substream_blocks()
-        running_futures = [
-            asyncio.ensure_future(uploader.process_substream_block(u))
-            for u in islice(upload_tasks, 0, max_concurrency)
-        ]
-        range_ids = await _parallel_uploads(uploader.process_substream_block, upload_tasks, running_futures)
-    else:
-        range_ids = []
-        for block in uploader.get_substream_blocks():
-            range_ids.append(await uploader.process_substream_block(block))
+    with map_stream(stream) as stream_view:
+        uploader = uploader_class(
+            service=service,
+            total_size=total_size,
+            chunk_size=chunk_size,
+            stream=stream,
+            parallel=parallel,
+            stream_view=stream_view,
+            tuner=tuner,
+            **kwargs)
+
+        if parallel:
+            schedule = executor.submit if executor is not None else asyncio.ensure_future
+            upload_tasks = uploader.get_substream_blocks()
+            running_futures = [
+                schedule(uploader.process_substream_block(u))
+                for u in islice(upload_tasks, 0, tuner.concurrency if tuner else max_concurrency)
+            ]
+            range_ids = await _parallel_uploads(
+                uploader.process_substream_block, upload_tasks, running_futures, tuner, schedule)
+        else:
+            range_ids = []
+            for block in uploader.get_substream_blocks():
+                range_ids.append(await uploader.process_substream_block(block))
     return sorted(range_ids)
 
 
 class _ChunkUploader(object):  # pylint: disable=too-many-instance-attributes
 
-    def __init__(self, service, total_size, chunk_size, stream, parallel, encryptor=None, padder=None, **kwargs):
+    def __init__(self, service, total_size, chunk_size, stream, parallel, encryptor=None, padder=None,
+                 stream_view=None, tuner=None, **kwargs):
         self.service = service
         self.total_size = total_size
         self.chunk_size = chunk_size
+        self.tuner = tuner
         self.stream = stream
+        self.stream_view = stream_view
         self.parallel = parallel
 
         # Stream management
@@ -155,43 +174,54 @@ class _ChunkUploader(object):  # pylint: disable=too-many-instance-attributes
     def get_chunk_streams(self):
         index = 0
         while True:
-            data = b''
-            read_size = self.chunk_size
+            chunk_size = self._next_chunk_size()
+            read_size = chunk_size
+            if self.total_size:
+                read_size = min(chunk_size, self.total_size - index)
 
             # Buffer until we either reach the end of the stream or get a whole chunk.
-            while True:
-                if self.total_size:
-                    read_size = min(self.chunk_size - len(data), self.total_size - (index + len(data)))
-                temp = self.stream.read(read_size)
-                if not isinstance(temp, six.binary_type):
-                    raise TypeError('Blob data should be of type bytes.')
-                data += temp or b""
-
-                # We have read an empty string and so are at the end
-                # of the buffer or we have read a full chunk.
-                if temp == b'' or len(data) == self.chunk_size:
-                    break
-
-            if len(data) == self.chunk_size:
-                if self.padder:
-                    data = self.padder.update(data)
-                if self.encryptor:
-                    data = self.encryptor.update(data)
+            data = read_chunk(self.stream, read_size)
+            is_last_chunk = len(data) != chunk_size
+            if self.padder or self.encryptor:
+                data = self._encrypt_chunk(data, is_last_chunk)
+
+            if data:
                 yield index, data
-            else:
-                if self.padder:
-                    data = self.padder.update(data) + self.padder.finalize()
-                if self.encryptor:
-                    data = self.encryptor.update(data) + self.encryptor.finalize()
-                if data:
-                    yield index, data
+            if is_last_chunk:
                 break
             index += len(data)
 
+    def _encrypt_chunk(self, chunk, is_last_chunk):
+        data = chunk_buffer(chunk)
+        if self.padder:
+            data = self.padder.update(data)
+            if is_last_chunk:
+                data += self.padder.finalize()
+        if self.encryptor:
+            data = self.encryptor.update(data)
+            if is_last_chunk:
+                data += self.encryptor.finalize()
+        if isinstance(chunk, PooledChunkStream):
+            chunk.close()
+        return data
+
+    def _next_chunk_size(self):
+        if self.tuner is not None:
+            return self.tuner.chunk_size
+        return self.chunk_size
+
+    def _record_chunk(self, length, started):
+        if self.tuner is not None:
+            self.tuner.record(length, time.time() - started)
+
     async def process_chunk(self, chunk_data):
         chunk_bytes = chunk_data[1]
         chunk_offset = chunk_data[0]
-        return await self._upload_chunk_with_progress(chunk_offset, chunk_bytes)
+        try:
+            return await self._upload_chunk_with_progress(chunk_offset, chunk_bytes)
+        finally:
+            if isinstance(chunk_bytes, PooledChunkStream):
+                chunk_bytes.close()
 
     async def _update_progress(self, length):
         if self.progress_lock is not None:
@@ -204,7 +234,9 @@ class _ChunkUploader(object):  # pylint: disable=too-many-instance-attributes
         raise NotImplementedError("Must be implemented by child class.")
 
     async def _upload_chunk_with_progress(self, chunk_offset, chunk_data):
+        started = time.time()
         range_id = await self._upload_chunk(chunk_offset, chunk_data)
+        self._record_chunk(len(chunk_data), started)
         await self._update_progress(len(chunk_data))
         return range_id
 
@@ -218,13 +250,22 @@ class _ChunkUploader(object):  # pylint: disable=too-many-instance-attributes
             if blob_length is None:
                 raise ValueError("Unable to determine content length of upload data.")
 
-        blocks = int(ceil(blob_length / (self.chunk_size * 1.0)))
-        last_block_size = self.chunk_size if blob_length % self.chunk_size == 0 else blob_length % self.chunk_size
+        # Memory-mapped files are sliced without copy nor lock
+        stream_view = self.stream_view
+        if stream_view is not None and len(stream_view) < blob_length:
+            stream_view = None
 
-        for i in range(blocks):
-            index = i * self.chunk_size
-            length = last_block_size if i == blocks - 1 else self.chunk_size
-            yield ('BlockId{}'.format("%05d" % i), SubStream(self.stream, index, length, lock))
+        index = 0
+        block_index = 0
+        while index < blob_length:
+            length = min(self._next_chunk_size(), blob_length - index)
+            if stream_view is not None:
+                block_stream = MemoryViewStream(stream_view[index:index + length])
+            else:
+                block_stream = SubStream(self.stream, index, length, lock)
+            yield ('BlockId{}'.format("%05d" % block_index), block_stream)
+            index += length
+            block_index += 1
 
     async def process_substream_block(self, block_data):
         return await self._upload_substream_block_with_progress(block_data[0], block_data[1])
@@ -233,8 +274,11 @@ class _ChunkUploader(object):  # pylint: disable=too-many-instance-attributes
         raise NotImplementedError("Must be implemented by child class.")
 
     async def _upload_substream_block_with_progress(self, block_id, block_stream):
+        length = len(block_stream)
+        started = time.time()
         range_id = await self._upload_substream_block(block_id, block_stream)
-        await self._update_progress(len(block_stream))
+        self._record_chunk(length, started)
+        await self._update_progress(length)
         return range_id
 
     def set_response_properties(self, resp):
@@ -279,22 +323,18 @@ class BlockBlobChunkUploader(_ChunkUploader):
 class PageBlobChunkUploader(_ChunkUploader):  # pylint: disable=abstract-method
 
     def _is_chunk_empty(self, chunk_data):
-        # read until non-zero byte is encountered
-        # if reached the end without returning, then chunk_data is all 0's
-        for each_byte in chunk_data:
-            if each_byte not in [0, b'\x00']:
-                return False
-        return True
+        return not non_empty_page_runs(chunk_buffer(chunk_data))
 
     async def _upload_chunk(self, chunk_offset, chunk_data):
         # avoid uploading the empty pages
-        if not self._is_chunk_empty(chunk_data):
-            chunk_end = chunk_offset + len(chunk_data) - 1
-            content_range = 'bytes={0}-{1}'.format(chunk_offset, chunk_end)
+        data = chunk_buffer(chunk_data)
+        for run_start, run_end in non_empty_page_runs(data):
+            run_data = chunk_range(data, run_start, run_end)
+            content_range = 'bytes={0}-{1}'.format(chunk_offset + run_start, chunk_offset + run_end - 1)
             computed_md5 = None
             self.response_headers = await self.service.upload_pages(
-                chunk_data,
-                content_length=len(chunk_data),
+                run_data,
+                content_length=len(run_data),
                 transactional_content_md5=computed_md5,
                 range=content_range,
                 cls=return_response_headers,
@@ -336,15 +376,27 @@ class AppendBlobChunkUploader(_ChunkUploader):  # pylint: disable=abstract-metho
 
 class FileChunkUploader(_ChunkUploader):  # pylint: disable=abstract-method
 
+    def __init__(self, *args, **kwargs):
+        self.sparse = kwargs.pop('sparse', False)
+        super(FileChunkUploader, self).__init__(*args, **kwargs)
+
     async def _upload_chunk(self, chunk_offset, chunk_data):
-        chunk_end = chunk_offset + len(chunk_data) - 1
-        response = await self.service.upload_range(
-            chunk_data,
-            chunk_offset,
-            chunk_end,
-            data_stream_total=self.total_size,
-            upload_stream_current=self.progress_total,
-            **self.request_options
-        )
-        range_id = 'bytes={0}-{1}'.format(chunk_offset, chunk_end)
+        # The file is created filled with zeros, so when sparse only the runs holding data are
+        # uploaded, and the empty ranges are left without storage
+        data = chunk_buffer(chunk_data)
+        runs = non_empty_page_runs(data) if self.sparse else [(0, len(data))]
+        response = None
+        for run_start, run_end in runs:
+            run_data = chunk_range(data, run_start, run_end)
+            response = await self.service.upload_range(
+                run_data,
+                chunk_offset + run_start,
+                len(run_data),
+                data_stream_total=self.total_size,
+                upload_stream_current=self.progress_total,
+                **self.request_options
+            )
+        if response is None:
+            return None
+        range_id = 'bytes={0}-{1}'.format(chunk_offset, chunk_offset + len(chunk_data) - 1)
         return range_id, response
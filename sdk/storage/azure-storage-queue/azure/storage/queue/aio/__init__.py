@@ -6,9 +6,11 @@
 
 from ._queue_client_async import QueueClient
 from ._queue_service_client_async import QueueServiceClient
+from ._queue_worker_async import QueueWorker
 
 
 __all__ = [
     'QueueClient',
     'QueueServiceClient',
+    'QueueWorker',
 ]
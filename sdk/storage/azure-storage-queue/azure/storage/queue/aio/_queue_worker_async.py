@@ -0,0 +1,267 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+
+import asyncio
+
+from typing import (  # pylint: disable=unused-import
+    Optional, Any, Callable, Iterable, List, TYPE_CHECKING
+)
+
+from .._queue_worker import QueueWorker as QueueWorkerBase, _refresh_receipt, _MAX_POLL_DELAY, _POLL_DELAY
+
+if TYPE_CHECKING:
+    from .._models import QueueMessage
+
+
+class _MessagePrefetcher(object):
+    """An async iterator of the messages of a queue, received by concurrent calls."""
+
+    def __init__(self, worker, max_wait_time, kwargs):
+        self._worker = worker
+        self._max_wait_time = max_wait_time
+        self._kwargs = kwargs
+        self._buffered = None  # type: Optional[asyncio.Queue]
+        self._receivers = []  # type: List[asyncio.Future]
+        self._closed = False
+
+    def __aiter__(self):
+        return self
+
+    async def _receive(self):
+        delay = _POLL_DELAY
+        while True:
+            try:
+                messages = await self._worker._receive_page(**self._kwargs)  # pylint: disable=protected-access
+            except Exception as error:  # pylint: disable=broad-except
+                await self._buffered.put(error)
+                return
+            self._worker.stats._add('received', len(messages))  # pylint: disable=protected-access
+            for message in messages:
+                await self._buffered.put(message)
+            if messages:
+                delay = _POLL_DELAY
+            else:
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, _MAX_POLL_DELAY)
+
+    async def __anext__(self):
+        if self._closed:
+            raise StopAsyncIteration
+        if self._buffered is None:
+            self._buffered = asyncio.Queue(self._worker.prefetch * self._worker.messages_per_page)
+            self._receivers = [asyncio.ensure_future(self._receive()) for _ in range(self._worker.prefetch)]
+        try:
+            item = await asyncio.wait_for(self._buffered.get(), self._max_wait_time)
+        except asyncio.TimeoutError:
+            await self.close()
+            raise StopAsyncIteration
+        if isinstance(item, Exception):
+            await self.close()
+            raise item
+        return item
+
+    async def close(self):
+        """Stop the receive calls. The messages left in the buffer become visible again."""
+        self._closed = True
+        for receiver in self._receivers:
+            receiver.cancel()
+        await asyncio.gather(*self._receivers, return_exceptions=True)
+        self._receivers = []
+
+
+class QueueWorker(QueueWorkerBase):
+    """Send, receive and delete the messages of a queue with many requests in flight.
+
+    Each message operation of a queue is a request, and a receive request gets up to 32
+    messages. The worker keeps up to `max_in_flight` of the send, delete and update requests
+    in flight, as tasks, and the calls scheduling them wait once the window is full. The
+    messages are received by `prefetch` concurrent receive calls, buffering them ahead of
+    their processing, and the deletes and updates are scheduled rather than waited for.
+    The operations on a message are run in the order they were scheduled.
+
+    :param queue_client: The client of the queue.
+    :type queue_client: ~azure.storage.queue.aio.QueueClient
+    :param int max_in_flight:
+        The largest number of send, delete and update requests in flight. Defaults to 16.
+    :param int prefetch: The number of receive calls kept outstanding. Defaults to 4.
+    :param int messages_per_page: The number of messages received per call, up to 32, the default.
+    :param int visibility_timeout:
+        The visibility timeout of the messages received, in seconds. The messages prefetched
+        are invisible while they wait to be processed, so it should allow for the buffer.
+    """
+
+    def __init__(self, *args, **kwargs):
+        # type: (*Any, **Any) -> None
+        super(QueueWorker, self).__init__(*args, **kwargs)
+        self._window = None  # type: Optional[asyncio.Semaphore]
+        self._prefetchers = []  # type: List[_MessagePrefetcher]
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        await self.close()
+
+    async def _call(self, counter, previous, operation, *args, **kwargs):
+        if previous is not None:
+            # Run after the operation scheduled before on the same message, whatever its outcome
+            await asyncio.wait([previous])
+        try:
+            result = await operation(*args, **kwargs)
+        except Exception:
+            self.stats._add('failed')  # pylint: disable=protected-access
+            raise
+        self.stats._add(counter)  # pylint: disable=protected-access
+        return result
+
+    def _done(self, future, message_id):
+        self._pending.discard(future)
+        if self._message_operations.get(message_id) is future:
+            del self._message_operations[message_id]
+        if not future.cancelled() and future.exception() is not None:
+            self._errors.append(future.exception())
+        self._window.release()
+
+    async def _submit(self, counter, message_id, operation, *args, **kwargs):
+        # type: (str, Optional[str], Callable, *Any, **Any) -> asyncio.Future
+        if self._window is None:
+            self._window = asyncio.Semaphore(self.max_in_flight)
+        await self._window.acquire()
+        previous = self._message_operations.get(message_id) if message_id else None
+        task = asyncio.ensure_future(self._call(counter, previous, operation, *args, **kwargs))
+        self._pending.add(task)
+        if message_id:
+            self._message_operations[message_id] = task
+        task.add_done_callback(lambda done: self._done(done, message_id))
+        return task
+
+    async def send_message(self, content, **kwargs):
+        # type: (Any, **Any) -> asyncio.Future
+        """Schedule the send of a message, once there is room in the window.
+
+        :param obj content: The message content, as for :func:`~QueueClient.send_message`.
+        :keyword int visibility_timeout: The visibility timeout of the message, in seconds.
+        :keyword int time_to_live: The time-to-live of the message, in seconds.
+        :keyword int timeout: The server timeout, expressed in seconds.
+        :returns: The task of the send, whose result is the :class:`~azure.storage.queue.QueueMessage` sent.
+        :rtype: ~asyncio.Future
+        """
+        return await self._submit('sent', None, self.queue_client.send_message, content, **kwargs)
+
+    async def send_messages(self, contents, **kwargs):
+        # type: (Iterable[Any], **Any) -> List[QueueMessage]
+        """Send messages, with up to `max_in_flight` requests in flight.
+
+        :param contents: The contents of the messages.
+        :keyword int visibility_timeout: The visibility timeout of the messages, in seconds.
+        :keyword int time_to_live: The time-to-live of the messages, in seconds.
+        :keyword int timeout: The server timeout, expressed in seconds.
+        :returns: The messages sent, in order. The error of the first failed send is raised.
+        :rtype: list[~azure.storage.queue.QueueMessage]
+        """
+        tasks = []
+        for content in contents:
+            tasks.append(await self.send_message(content, **kwargs))
+        if tasks:
+            await asyncio.wait(tasks)
+        return [task.result() for task in tasks]
+
+    async def delete_message(self, message, pop_receipt=None, **kwargs):
+        # type: (Any, Optional[str], **Any) -> asyncio.Future
+        """Schedule the delete of a message, once there is room in the window.
+
+        :param message: The message, or the ID of the message, to delete.
+        :type message: str or ~azure.storage.queue.QueueMessage
+        :param str pop_receipt: The pop receipt of the message, if its ID is given.
+        :keyword int timeout: The server timeout, expressed in seconds.
+        :returns: The task of the delete.
+        :rtype: ~asyncio.Future
+        """
+        message_id = getattr(message, 'id', message)
+
+        async def delete():
+            # The pop receipt is read once the updates scheduled before have refreshed it
+            return await self.queue_client.delete_message(message, pop_receipt=pop_receipt, **kwargs)
+        return await self._submit('deleted', message_id, delete)
+
+    async def update_message(self, message, pop_receipt=None, content=None, **kwargs):
+        # type: (Any, Optional[str], Optional[Any], **Any) -> asyncio.Future
+        """Schedule an update of the visibility timeout, or the content, of a message.
+
+        The pop receipt of a message given as a :class:`~azure.storage.queue.QueueMessage`
+        is refreshed once it is updated, for the operations scheduled after.
+
+        :param message: The message, or the ID of the message, to update.
+        :type message: str or ~azure.storage.queue.QueueMessage
+        :param str pop_receipt: The pop receipt of the message, if its ID is given.
+        :param obj content: The new content of the message.
+        :keyword int visibility_timeout: The new visibility timeout of the message, in seconds.
+        :keyword int timeout: The server timeout, expressed in seconds.
+        :returns: The task of the update, whose result is the :class:`~azure.storage.queue.QueueMessage` updated.
+        :rtype: ~asyncio.Future
+        """
+        message_id = getattr(message, 'id', message)
+
+        async def update():
+            updated = await self.queue_client.update_message(
+                message, pop_receipt=pop_receipt, content=content, **kwargs)
+            _refresh_receipt(message, updated)
+            return updated
+        return await self._submit('updated', message_id, update)
+
+    async def _receive_page(self, **kwargs):
+        pages = self.queue_client.receive_messages(
+            messages_per_page=self.messages_per_page,
+            visibility_timeout=self.visibility_timeout,
+            **kwargs).by_page()
+        messages = []
+        try:
+            page = await pages.__anext__()
+        except StopAsyncIteration:
+            return messages
+        async for message in page:
+            messages.append(message)
+        return messages
+
+    def receive_messages(self, max_wait_time=None, **kwargs):
+        # type: (Optional[float], **Any) -> _MessagePrefetcher
+        """Iterate over the messages of the queue, received by `prefetch` concurrent calls.
+
+        Up to `prefetch` pages of messages are buffered ahead of the iteration. A call finding
+        the queue empty is made again after a delay, doubled up to 5 seconds while the queue
+        stays empty. The receive calls stop when the iteration ends, or when the worker is
+        closed, and the messages left in the buffer become visible again after their
+        visibility timeout.
+
+        :param float max_wait_time:
+            The longest time to wait for a message, in seconds, after which the iteration
+            stops. By default, the iteration waits for messages until it is stopped.
+        :keyword int timeout: The server timeout, expressed in seconds.
+        :returns: An async iterator of the messages received.
+        :rtype: AsyncIterator[~azure.storage.queue.QueueMessage]
+        """
+        prefetcher = _MessagePrefetcher(self, max_wait_time, kwargs)
+        self._prefetchers.append(prefetcher)
+        return prefetcher
+
+    async def flush(self):
+        # type: () -> None
+        """Wait for the operations scheduled, and raise the first error of those failed since the last flush."""
+        while self._pending:
+            await asyncio.wait(list(self._pending))
+        errors, self._errors = self._errors, []
+        if errors:
+            raise errors[0]
+
+    async def close(self):
+        # type: () -> None
+        """Flush the worker, and stop the receive calls of its iterations."""
+        try:
+            await self.flush()
+        finally:
+            prefetchers, self._prefetchers = self._prefetchers, []
+            for prefetcher in prefetchers:
+                await prefetcher.close()
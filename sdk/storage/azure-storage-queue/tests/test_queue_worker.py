@@ -0,0 +1,142 @@
+# coding: utf-8
+
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+
+import itertools
+import time
+from threading import Lock
+
+from azure.core.exceptions import ResourceNotFoundError
+from azure.storage.queue import QueueMessage, QueueWorker
+
+from _shared.testcase import GlobalStorageAccountPreparer, StorageTestCase
+
+# ------------------------------------------------------------------------------
+
+
+class _Paged(object):
+    def __init__(self, messages):
+        self.messages = messages
+
+    def by_page(self):
+        return iter([iter(self.messages)] if self.messages else [])
+
+
+class _QueueClient(object):
+    # keep the messages of a queue in memory, checking their pop receipts
+    def __init__(self):
+        self.messages = []
+        self.invisible = {}
+        self.receipts = itertools.count()
+        self.requests = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = Lock()
+
+    def _request(self, operation):
+        with self._lock:
+            self.requests.append(operation)
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        time.sleep(0.001)
+        with self._lock:
+            self.in_flight -= 1
+
+    def _message(self, message_id, content):
+        message = QueueMessage(content=content)
+        message.id = message_id
+        message.pop_receipt = str(next(self.receipts))
+        return message
+
+    def send_message(self, content, **kwargs):
+        self._request('send')
+        with self._lock:
+            message = self._message(str(len(self.messages) + len(self.invisible)), content)
+            self.messages.append(message)
+        return message
+
+    def receive_messages(self, messages_per_page=None, visibility_timeout=None, **kwargs):
+        self._request('receive')
+        with self._lock:
+            received, self.messages = self.messages[:messages_per_page], self.messages[messages_per_page:]
+            received = [self._message(message.id, message.content) for message in received]
+            for message in received:
+                self.invisible[message.id] = message
+        return _Paged(received)
+
+    def _check_receipt(self, message, pop_receipt):
+        message_id = getattr(message, 'id', message)
+        pop_receipt = pop_receipt or message.pop_receipt
+        if message_id not in self.invisible or self.invisible[message_id].pop_receipt != pop_receipt:
+            raise ResourceNotFoundError("The specified message does not exist.")
+        return message_id
+
+    def update_message(self, message, pop_receipt=None, content=None, **kwargs):
+        self._request('update')
+        with self._lock:
+            message_id = self._check_receipt(message, pop_receipt)
+            updated = self._message(message_id, content or self.invisible[message_id].content)
+            self.invisible[message_id] = updated
+        return updated
+
+    def delete_message(self, message, pop_receipt=None, **kwargs):
+        self._request('delete')
+        with self._lock:
+            del self.invisible[self._check_receipt(message, pop_receipt)]
+
+
+class StorageQueueWorkerTest(StorageTestCase):
+
+    # this is a white box test that's designed to make sure the requests are kept in flight
+    # within the window, the receives prefetched, and the operations on a message kept in order
+    @GlobalStorageAccountPreparer()
+    def test_send_receive_delete(self, resource_group, location, storage_account, storage_account_key):
+        queue = _QueueClient()
+
+        with QueueWorker(queue, max_in_flight=4, prefetch=3, messages_per_page=8) as worker:
+            sent = worker.send_messages(u"message {}".format(i) for i in range(100))
+            self.assertEqual([message.content for message in sent], [u"message {}".format(i) for i in range(100)])
+            self.assertEqual(worker.stats.sent, 100)
+            self.assertLessEqual(queue.max_in_flight, 4)
+
+            received = []
+            for message in worker.receive_messages(max_wait_time=0.5):
+                received.append(message.content)
+                if len(received) % 2:
+                    # the delete waits for the update, and uses its pop receipt
+                    worker.update_message(message, visibility_timeout=30)
+                worker.delete_message(message)
+            worker.flush()
+
+        self.assertEqual(sorted(received), sorted(message.content for message in sent))
+        self.assertEqual((queue.messages, queue.invisible), ([], {}))
+        self.assertEqual((worker.stats.received, worker.stats.deleted, worker.stats.updated), (100, 100, 50))
+        self.assertEqual(worker.stats.failed, 0)
+        # each receive call got up to a page of messages
+        self.assertLessEqual(queue.requests.count('receive'), 100 // 8 + 3 * 4)
+
+    @GlobalStorageAccountPreparer()
+    def test_operation_error(self, resource_group, location, storage_account, storage_account_key):
+        queue = _QueueClient()
+        message = queue.send_message(u"message")
+        worker = QueueWorker(queue)
+
+        future = worker.delete_message(message.id, pop_receipt="expired")
+        with self.assertRaises(ResourceNotFoundError):
+            future.result()
+        with self.assertRaises(ResourceNotFoundError):
+            worker.flush()
+        # the error is raised once
+        worker.flush()
+        self.assertEqual(worker.stats.failed, 1)
+
+        def receive_messages(**kwargs):
+            raise ResourceNotFoundError("The specified queue does not exist.")
+        queue.receive_messages = receive_messages
+        with self.assertRaises(ResourceNotFoundError):
+            list(worker.receive_messages())
+        worker.close()
@@ -0,0 +1,94 @@
+# coding: utf-8
+
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+
+import asyncio
+
+from azure.core.exceptions import ResourceNotFoundError
+from azure.storage.queue.aio import QueueWorker
+
+from _shared.asynctestcase import AsyncStorageTestCase
+from _shared.testcase import GlobalStorageAccountPreparer
+from test_queue_worker import _QueueClient
+
+# ------------------------------------------------------------------------------
+
+
+class _AsyncPage(object):
+    def __init__(self, messages):
+        self.messages = iter(messages)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        try:
+            return next(self.messages)
+        except StopIteration:
+            raise StopAsyncIteration
+
+
+class _AsyncPaged(object):
+    def __init__(self, paged):
+        self.pages = paged.by_page()
+
+    def by_page(self):
+        return self
+
+    async def __anext__(self):
+        try:
+            return _AsyncPage(next(self.pages))
+        except StopIteration:
+            raise StopAsyncIteration
+
+
+class _AsyncQueueClient(object):
+    # the coroutines of the methods of a queue in memory
+    def __init__(self, queue):
+        self.queue = queue
+
+    def receive_messages(self, **kwargs):
+        return _AsyncPaged(self.queue.receive_messages(**kwargs))
+
+    def __getattr__(self, name):
+        method = getattr(self.queue, name)
+
+        async def call(*args, **kwargs):
+            await asyncio.sleep(0)
+            return method(*args, **kwargs)
+        return call
+
+
+class StorageQueueWorkerAsyncTest(AsyncStorageTestCase):
+
+    # this is a white box test that's designed to make sure the requests are kept in flight
+    # within the window, the receives prefetched, and the operations on a message kept in order
+    @GlobalStorageAccountPreparer()
+    @AsyncStorageTestCase.await_prepared_test
+    async def test_send_receive_delete(self, resource_group, location, storage_account, storage_account_key):
+        queue = _QueueClient()
+
+        async with QueueWorker(_AsyncQueueClient(queue), max_in_flight=4, prefetch=3, messages_per_page=8) as worker:
+            sent = await worker.send_messages(u"message {}".format(i) for i in range(50))
+            self.assertEqual(worker.stats.sent, 50)
+
+            received = []
+            async for message in worker.receive_messages(max_wait_time=0.5):
+                received.append(message.content)
+                if len(received) % 2:
+                    await worker.update_message(message, visibility_timeout=30)
+                await worker.delete_message(message)
+
+            # the error of a failed operation is raised by the flush
+            task = await worker.delete_message(sent[0].id, pop_receipt="expired")
+            with self.assertRaises(ResourceNotFoundError):
+                await worker.flush()
+            self.assertIsInstance(task.exception(), ResourceNotFoundError)
+
+        self.assertEqual(sorted(received), sorted(message.content for message in sent))
+        self.assertEqual((queue.messages, queue.invisible), ([], {}))
+        self.assertEqual((worker.stats.received, worker.stats.deleted, worker.stats.updated), (50, 50, 25))